@@ -11,8 +11,15 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from app.core.config import settings
 from app.core.database import Base
 from app.models.job import Job  # noqa: F401 - for autogenerate
+from app.models.job_lsh_bucket import JobLshBucket  # noqa: F401
+from app.models.llm_call import LLMCall  # noqa: F401
 from app.models.preference import UserABJobPreference  # noqa: F401
+from app.models.ranking_state import RankingState  # noqa: F401
 from app.models.resume import Resume  # noqa: F401
+from app.models.resume_artifact import ResumeArtifact  # noqa: F401
+from app.models.run_event import RunEvent  # noqa: F401
+from app.models.table_change import TableChange  # noqa: F401
+from app.models.table_version import TableVersion  # noqa: F401
 
 config = context.config
 config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
@@ -0,0 +1,46 @@
+"""add llm_calls per-call instrumentation log
+
+Revision ID: 006_llm_calls
+Revises: 005_ab_preferences
+Create Date: 2026-10-19 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "006_llm_calls"
+down_revision = "005_ab_preferences"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_calls",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("endpoint", sa.String(200), nullable=False),
+        sa.Column("template", sa.String(100), nullable=False),
+        sa.Column("model", sa.String(100), nullable=False),
+        sa.Column("outcome", sa.String(50), nullable=False),
+        sa.Column("input_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("output_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("cache_read_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("cache_creation_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("ttft_ms", sa.Integer(), nullable=True),
+        sa.Column("latency_ms", sa.Integer(), nullable=False),
+        sa.Column("cost_usd", sa.Float(), nullable=False, server_default="0"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_llm_calls_created_at", "llm_calls", ["created_at"])
+    op.create_index("ix_llm_calls_endpoint_created_at", "llm_calls", ["endpoint", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_calls_endpoint_created_at", table_name="llm_calls")
+    op.drop_index("ix_llm_calls_created_at", table_name="llm_calls")
+    op.drop_table("llm_calls")
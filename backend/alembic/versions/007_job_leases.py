@@ -0,0 +1,32 @@
+"""add job lease columns for single-flight LLM work
+
+Revision ID: 007_job_leases
+Revises: 006_llm_calls
+Create Date: 2026-10-19 12:10:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "007_job_leases"
+down_revision = "006_llm_calls"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("lease_owner", postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column("jobs", sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True))
+    # Only rows with a live lease are indexed; waiters poll this.
+    op.create_index(
+        "ix_jobs_lease_expires_at",
+        "jobs",
+        ["lease_expires_at"],
+        postgresql_where=sa.text("lease_expires_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_lease_expires_at", table_name="jobs")
+    op.drop_column("jobs", "lease_expires_at")
+    op.drop_column("jobs", "lease_owner")
@@ -0,0 +1,35 @@
+"""composite (created_at, id) indexes for keyset pagination of GET /jobs
+
+Revision ID: 008_jobs_keyset_indexes
+Revises: 007_job_leases
+Create Date: 2026-10-19 15:40:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "008_jobs_keyset_indexes"
+down_revision = "007_job_leases"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keyset comparison (created_at, id) < (:t, :id) needs a total order: no NULL created_at.
+    op.execute("UPDATE jobs SET created_at = COALESCE(captured_at, now()) WHERE created_at IS NULL")
+    op.alter_column("jobs", "created_at", existing_type=sa.DateTime(timezone=True), nullable=False)
+
+    # Backward scans serve ORDER BY created_at DESC, id DESC.
+    op.create_index("ix_jobs_created_at_id", "jobs", ["created_at", "id"])
+    # analyzed_only=true pages walk only analyzed rows.
+    op.create_index(
+        "ix_jobs_analyzed_created_at_id",
+        "jobs",
+        ["created_at", "id"],
+        postgresql_where=sa.text("analyzed_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_analyzed_created_at_id", table_name="jobs")
+    op.drop_index("ix_jobs_created_at_id", table_name="jobs")
+    op.alter_column("jobs", "created_at", existing_type=sa.DateTime(timezone=True), nullable=True)
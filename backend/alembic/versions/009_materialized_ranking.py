@@ -0,0 +1,53 @@
+"""materialised ranking: preference_norm / combined_score columns and ranking_state
+
+Revision ID: 009_materialized_ranking
+Revises: 008_jobs_keyset_indexes
+Create Date: 2026-10-19 17:05:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "009_materialized_ranking"
+down_revision = "008_jobs_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("preference_norm", sa.Float(), nullable=True))
+    op.add_column("jobs", sa.Column("combined_score", sa.Float(), nullable=True))
+
+    # GET /rank walks this index for its top-k pages; only analyzed jobs have a combined_score.
+    op.create_index(
+        "ix_jobs_combined_score_id",
+        "jobs",
+        [sa.text("combined_score DESC"), "id"],
+        postgresql_where=sa.text("combined_score IS NOT NULL"),
+    )
+    # min()/max() of preference_score over analyzed jobs become index endpoint lookups.
+    op.create_index(
+        "ix_jobs_analyzed_preference_score",
+        "jobs",
+        ["preference_score"],
+        postgresql_where=sa.text("analyzed_at IS NOT NULL AND preference_score IS NOT NULL"),
+    )
+
+    op.create_table(
+        "ranking_state",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("elo_min", sa.Float(), nullable=True),
+        sa.Column("elo_max", sa.Float(), nullable=True),
+        sa.Column("weight_llm", sa.Float(), nullable=True),
+        sa.Column("weight_preference", sa.Float(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    # A single row; NULL weights never match the settings, so the first refresh recomputes every job.
+    op.execute("INSERT INTO ranking_state (id) VALUES (1)")
+
+
+def downgrade() -> None:
+    op.drop_table("ranking_state")
+    op.drop_index("ix_jobs_analyzed_preference_score", table_name="jobs")
+    op.drop_index("ix_jobs_combined_score_id", table_name="jobs")
+    op.drop_column("jobs", "combined_score")
+    op.drop_column("jobs", "preference_norm")
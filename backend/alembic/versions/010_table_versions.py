@@ -0,0 +1,48 @@
+"""per-table change counters bumped by statement-level triggers
+
+Revision ID: 010_table_versions
+Revises: 009_materialized_ranking
+Create Date: 2026-10-19 18:20:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "010_table_versions"
+down_revision = "009_materialized_ranking"
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ("jobs", "resumes", "user_ab_job_preferences")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "table_versions",
+        sa.Column("table_name", sa.String(100), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    # The bump is part of the writing transaction, so a reader never sees a new
+    # version before the rows it stands for are visible.
+    op.execute(
+        """
+        CREATE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE table_name = TG_TABLE_NAME;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in VERSIONED_TABLES:
+        op.execute(f"INSERT INTO table_versions (table_name, version) VALUES ('{table}', 0)")
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+        )
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_table_version()")
+    op.drop_table("table_versions")
@@ -0,0 +1,24 @@
+"""index the remaining preference foreign keys for set-based job deletes
+
+Revision ID: 011_pref_fk_indexes
+Revises: 010_table_versions
+Create Date: 2026-10-19 19:10:00.000000
+"""
+from alembic import op
+
+revision = "011_pref_fk_indexes"
+down_revision = "010_table_versions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ON DELETE CASCADE looks up every FK column per deleted job; without these
+    # a bulk DELETE /jobs scans user_ab_job_preferences twice per job.
+    op.create_index("ix_pref_chosen_job", "user_ab_job_preferences", ["chosen_job_id"])
+    op.create_index("ix_pref_rejected_job", "user_ab_job_preferences", ["rejected_job_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pref_rejected_job", table_name="user_ab_job_preferences")
+    op.drop_index("ix_pref_chosen_job", table_name="user_ab_job_preferences")
@@ -0,0 +1,32 @@
+"""generated tsvector over title, company and raw_text with a GIN index for GET /jobs/search
+
+Revision ID: 012_job_search_vector
+Revises: 011_pref_fk_indexes
+Create Date: 2026-10-19 20:30:00.000000
+"""
+from alembic import op
+
+revision = "012_job_search_vector"
+down_revision = "011_pref_fk_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Weighted so a hit in the title outranks one in the company, which outranks the body.
+    # STORED: written once per insert/update of these columns, never computed at query time.
+    op.execute(
+        """
+        ALTER TABLE jobs ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A')
+            || setweight(to_tsvector('english'::regconfig, coalesce(company, '')), 'B')
+            || setweight(to_tsvector('english'::regconfig, coalesce(raw_text, '')), 'C')
+        ) STORED
+        """
+    )
+    op.create_index("ix_jobs_search_vector", "jobs", ["search_vector"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_search_vector", table_name="jobs")
+    op.drop_column("jobs", "search_vector")
@@ -0,0 +1,54 @@
+"""near-duplicate detection: MinHash signature, duplicate_of link and LSH bucket table
+
+Revision ID: 013_near_duplicates
+Revises: 012_job_search_vector
+Create Date: 2026-10-19 21:15:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "013_near_duplicates"
+down_revision = "012_job_search_vector"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("minhash", sa.LargeBinary(), nullable=True))
+    op.add_column(
+        "jobs",
+        sa.Column(
+            "duplicate_of",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("jobs.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+    # Copying results to duplicates and the ON DELETE SET NULL both look jobs up by canonical id.
+    op.create_index(
+        "ix_jobs_duplicate_of", "jobs", ["duplicate_of"], postgresql_where=sa.text("duplicate_of IS NOT NULL")
+    )
+
+    # One row per (LSH band, bucket hash) a job falls into; ingest probes it by (band, bucket).
+    op.create_table(
+        "job_lsh_buckets",
+        sa.Column("band", sa.SmallInteger(), nullable=False),
+        sa.Column("bucket", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "job_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("jobs.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("band", "bucket", "job_id"),
+    )
+    op.create_index("ix_job_lsh_buckets_job_id", "job_lsh_buckets", ["job_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_lsh_buckets_job_id", table_name="job_lsh_buckets")
+    op.drop_table("job_lsh_buckets")
+    op.drop_index("ix_jobs_duplicate_of", table_name="jobs")
+    op.drop_column("jobs", "duplicate_of")
+    op.drop_column("jobs", "minhash")
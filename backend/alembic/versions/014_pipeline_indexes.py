@@ -0,0 +1,40 @@
+"""partial indexes for pipeline selection queries and the latest-resume lookup
+
+Revision ID: 014_pipeline_indexes
+Revises: 013_near_duplicates
+Create Date: 2026-10-19 22:05:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "014_pipeline_indexes"
+down_revision = "013_near_duplicates"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # /sort and /analyze pick canonical jobs not yet analysed. The predicate matches
+    # canonical_only(...).filter(analyzed_at IS NULL), so the index holds only pending
+    # work and /sort's id-only query is an index-only scan however large the table grows.
+    op.create_index(
+        "ix_jobs_pending_analysis",
+        "jobs",
+        ["created_at", "id"],
+        postgresql_where=sa.text("analyzed_at IS NULL AND duplicate_of IS NULL"),
+    )
+    # Semantic search embeds the newest jobs without a vector, a few hundred per request.
+    op.create_index(
+        "ix_jobs_unembedded",
+        "jobs",
+        ["created_at"],
+        postgresql_where=sa.text("embedding IS NULL"),
+    )
+    # /sort, /cull and /analyze read the most recently updated resume (ORDER BY updated_at DESC LIMIT 1).
+    op.create_index("ix_resumes_updated_at", "resumes", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_resumes_updated_at", table_name="resumes")
+    op.drop_index("ix_jobs_unembedded", table_name="jobs")
+    op.drop_index("ix_jobs_pending_analysis", table_name="jobs")
@@ -0,0 +1,77 @@
+"""structured_requirements as JSONB with a generated is_parse_complete flag and a pending-parse index
+
+Revision ID: 015_structured_jsonb
+Revises: 014_pipeline_indexes
+Create Date: 2026-10-19 22:40:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "015_structured_jsonb"
+down_revision = "014_pipeline_indexes"
+branch_labels = None
+depends_on = None
+
+REQUIRED_FIELDS = (
+    "about_summary",
+    "experience_requirements",
+    "expertise_requirements",
+    "business_cultural_requirements",
+    "sponsorship_requirements",
+    "work_location_requirements",
+    "education_requirements",
+)
+PLACEHOLDER = "x, y, z"
+
+
+def _present(field: str) -> str:
+    value = f"structured_requirements->'{field}'"
+    return (
+        f"CASE jsonb_typeof({value}) "
+        f"WHEN 'string' THEN lower(btrim({value} #>> '{{}}', E' \\t\\n\\r\\f\\x0b')) NOT IN ('', '{PLACEHOLDER}') "
+        f"WHEN 'array' THEN {value} <> '[]'::jsonb "
+        f"WHEN 'object' THEN {value} <> '{{}}'::jsonb "
+        f"WHEN 'number' THEN ({value})::numeric <> 0 "
+        f"WHEN 'boolean' THEN ({value})::boolean "
+        "ELSE false END"
+    )
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "jobs",
+        "structured_requirements",
+        type_=postgresql.JSONB(),
+        existing_type=postgresql.JSON(),
+        existing_nullable=True,
+        postgresql_using="structured_requirements::jsonb",
+    )
+    # Same rule /parse applied in Python: an object whose required fields are all
+    # non-empty and not the placeholder. STORED, so selecting pending work reads a flag.
+    complete = (
+        "coalesce(jsonb_typeof(structured_requirements) = 'object' AND "
+        + " AND ".join(f"({_present(field)})" for field in REQUIRED_FIELDS)
+        + ", false)"
+    )
+    op.execute(f"ALTER TABLE jobs ADD COLUMN is_parse_complete boolean NOT NULL GENERATED ALWAYS AS ({complete}) STORED")
+    # /parse selects canonical jobs still needing a parse; the index holds only those.
+    op.create_index(
+        "ix_jobs_parse_pending",
+        "jobs",
+        ["created_at", "id"],
+        postgresql_where=sa.text("NOT is_parse_complete AND duplicate_of IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_parse_pending", table_name="jobs")
+    op.drop_column("jobs", "is_parse_complete")
+    op.alter_column(
+        "jobs",
+        "structured_requirements",
+        type_=postgresql.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using="structured_requirements::json",
+    )
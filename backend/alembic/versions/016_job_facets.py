@@ -0,0 +1,37 @@
+"""facet columns (work mode, sponsorship, min years, degree level) derived from structured_requirements
+
+Revision ID: 016_job_facets
+Revises: 015_structured_jsonb
+Create Date: 2026-10-19 23:20:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "016_job_facets"
+down_revision = "015_structured_jsonb"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("work_mode", sa.String(16), nullable=True))
+    op.add_column("jobs", sa.Column("sponsorship", sa.Boolean(), nullable=True))
+    op.add_column("jobs", sa.Column("min_years", sa.SmallInteger(), nullable=True))
+    op.add_column("jobs", sa.Column("degree_level", sa.String(16), nullable=True))
+    # Facet counts read every facet (and analyzed_at for analyzed_only) from this index
+    # alone, an index-only scan over a few MB instead of the wide jobs heap; filters
+    # with a work_mode use its leading column.
+    op.create_index(
+        "ix_jobs_facets",
+        "jobs",
+        ["work_mode", "sponsorship", "degree_level", "min_years"],
+        postgresql_include=["analyzed_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_facets", table_name="jobs")
+    op.drop_column("jobs", "degree_level")
+    op.drop_column("jobs", "min_years")
+    op.drop_column("jobs", "sponsorship")
+    op.drop_column("jobs", "work_mode")
@@ -0,0 +1,37 @@
+"""resume_artifacts: per-resume embedding, token count, compacted text and prompt prefix
+
+Revision ID: 017_resume_artifacts
+Revises: 016_job_facets
+Create Date: 2026-10-20 00:10:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "017_resume_artifacts"
+down_revision = "016_job_facets"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One row per resume, rebuilt whenever its text changes (content_hash no longer matches).
+    op.create_table(
+        "resume_artifacts",
+        sa.Column(
+            "resume_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("resumes.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("content_hash", sa.String(64), nullable=False),
+        sa.Column("compact_text", sa.Text(), nullable=False),
+        sa.Column("prompt_prefix", sa.Text(), nullable=False),
+        sa.Column("token_count", sa.Integer(), nullable=False),
+        sa.Column("embedding", postgresql.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("resume_artifacts")
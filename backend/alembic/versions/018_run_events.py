@@ -0,0 +1,33 @@
+"""run_events: resumable progress log of background /sort, /parse and /cull runs
+
+Revision ID: 018_run_events
+Revises: 017_resume_artifacts
+Create Date: 2026-10-20 01:30:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "018_run_events"
+down_revision = "017_resume_artifacts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Streams read (run_id, seq > Last-Event-ID) through the primary key.
+    op.create_table(
+        "run_events",
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("seq", sa.Integer(), primary_key=True),
+        sa.Column("event", sa.String(16), nullable=False),
+        sa.Column("data", postgresql.JSONB(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    # Pruning of finished runs scans by age.
+    op.create_index("ix_run_events_created_at", "run_events", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_run_events_created_at", table_name="run_events")
+    op.drop_table("run_events")
@@ -0,0 +1,101 @@
+"""table_changes: append-only table versions; lease-only job updates no longer count
+
+Revision ID: 019_table_changes
+Revises: 018_run_events
+Create Date: 2026-10-20 09:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "019_table_changes"
+down_revision = "018_run_events"
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ("jobs", "resumes", "user_ab_job_preferences")
+# Columns whose updates do not change any cached response (services/job_claims.py).
+# Every other jobs column is named by jobs_bump_version_update, so a migration
+# that drops one must first run SELECT refresh_jobs_version_trigger(ARRAY['<column>'])
+# (see 020_job_embedded_at.downgrade).
+UNVERSIONED_JOB_COLUMNS = ("lease_owner", "lease_expires_at")
+
+
+def upgrade() -> None:
+    # One row per writing statement. Writers only insert (ids come from a
+    # sequence), so they never wait on each other; a table's version is
+    # table_versions.version (rows folded in by compaction) + its row count
+    # here, which grows with every committed write whatever order
+    # transactions commit in.
+    op.create_table(
+        "table_changes",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), primary_key=True),
+        sa.Column("table_name", sa.String(100), nullable=False),
+    )
+    op.create_index("ix_table_changes_table_name", "table_changes", ["table_name"])
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO table_changes (table_name) VALUES (TG_TABLE_NAME);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # UPDATE OF <every column but the lease ones>, built from the catalog.
+    # Postgres ties the trigger to each listed column, so:
+    #   adding a jobs column:   SELECT refresh_jobs_version_trigger() after adding it;
+    #   dropping a jobs column: SELECT refresh_jobs_version_trigger(ARRAY['<column>'])
+    #                           before dropping it, and with no argument after.
+    excluded = ", ".join(f"'{column}'" for column in UNVERSIONED_JOB_COLUMNS)
+    op.execute(
+        f"""
+        CREATE FUNCTION refresh_jobs_version_trigger(also_excluded text[] DEFAULT '{{}}') RETURNS void AS $$
+        DECLARE
+            columns text;
+        BEGIN
+            SELECT string_agg(quote_ident(column_name), ', ' ORDER BY ordinal_position) INTO columns
+            FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'jobs'
+              AND is_generated = 'NEVER' AND column_name NOT IN ({excluded})
+              AND column_name <> ALL (also_excluded);
+            EXECUTE 'DROP TRIGGER IF EXISTS jobs_bump_version_update ON jobs';
+            EXECUTE 'CREATE TRIGGER jobs_bump_version_update AFTER UPDATE OF ' || columns
+                || ' ON jobs FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()';
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS jobs_bump_version ON jobs")
+    op.execute(
+        "CREATE TRIGGER jobs_bump_version AFTER INSERT OR DELETE OR TRUNCATE ON jobs "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+    )
+    op.execute("SELECT refresh_jobs_version_trigger()")
+
+
+def downgrade() -> None:
+    # Fold the logged changes back into the counters so versions keep increasing.
+    for table in VERSIONED_TABLES:
+        op.execute(
+            f"UPDATE table_versions SET version = version + "
+            f"(SELECT count(*) FROM table_changes WHERE table_name = '{table}') WHERE table_name = '{table}'"
+        )
+    op.execute("DROP TRIGGER IF EXISTS jobs_bump_version_update ON jobs")
+    op.execute("DROP TRIGGER IF EXISTS jobs_bump_version ON jobs")
+    op.execute("DROP FUNCTION IF EXISTS refresh_jobs_version_trigger(text[])")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE table_name = TG_TABLE_NAME;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER jobs_bump_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON jobs "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+    )
+    op.drop_table("table_changes")
@@ -0,0 +1,50 @@
+"""jobs.embedded_at: when the stored embedding was written, for incremental index sync
+
+Revision ID: 020_job_embedded_at
+Revises: 019_table_changes
+Create Date: 2026-10-20 10:30:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "020_job_embedded_at"
+down_revision = "019_table_changes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("embedded_at", sa.DateTime(timezone=True), nullable=True))
+    # Set by the database at write time (clock_timestamp, not the transaction's
+    # now()), so a worker's index picks up new vectors with
+    # WHERE embedded_at > <its last sync> minus a short lookback.
+    op.execute(
+        """
+        CREATE FUNCTION set_job_embedded_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.embedded_at := clock_timestamp();
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER jobs_set_embedded_at BEFORE INSERT OR UPDATE OF embedding ON jobs "
+        "FOR EACH ROW WHEN (NEW.embedding IS NOT NULL) EXECUTE FUNCTION set_job_embedded_at()"
+    )
+    op.execute("UPDATE jobs SET embedded_at = created_at WHERE embedding IS NOT NULL")
+    op.create_index(
+        "ix_jobs_embedded_at", "jobs", ["embedded_at"], postgresql_where=sa.text("embedded_at IS NOT NULL")
+    )
+    # New jobs column: rebuild the UPDATE OF list of the version trigger (migration 019).
+    op.execute("SELECT refresh_jobs_version_trigger()")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_embedded_at", table_name="jobs")
+    op.execute("DROP TRIGGER IF EXISTS jobs_set_embedded_at ON jobs")
+    op.execute("DROP FUNCTION IF EXISTS set_job_embedded_at()")
+    # The version trigger lists embedded_at; rebuild it without the column first.
+    op.execute("SELECT refresh_jobs_version_trigger(ARRAY['embedded_at'])")
+    op.drop_column("jobs", "embedded_at")
+    op.execute("SELECT refresh_jobs_version_trigger()")
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import hmac
+
+from flask import Blueprint, Response, jsonify, request
+
+from app.core.config import settings
+from app.services import llm_metrics
+from app.services.response_cache import response_cache
+
+bp = Blueprint("internal_metrics", __name__)
+
+
+@bp.before_request
+def require_token():
+    """Per-template token counts, costs and latencies are not public: 404 without METRICS_TOKEN, else 401 without it."""
+    if not settings.METRICS_TOKEN:
+        return jsonify({"detail": "Not found"}), 404
+    supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+    if not hmac.compare_digest(supplied.encode(), settings.METRICS_TOKEN.encode()):
+        return jsonify({"detail": "Unauthorized"}), 401, {"WWW-Authenticate": "Bearer"}
+    return None
+
+
+@bp.get("/metrics")
+def metrics():
+    """LLM call histograms for this worker: Prometheus text, or ?format=json for a per-endpoint roll-up."""
+    if request.args.get("format") == "json":
+        return jsonify({"llm": llm_metrics.summary(), "response_cache": response_cache.stats()})
+    return Response(llm_metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")
@@ -1,26 +1,27 @@
 from __future__ import annotations
 
-import json
+import traceback
 from datetime import datetime, timezone
 from uuid import UUID
 
 from flask import Blueprint, jsonify, request
 
-from app.core.database import get_db
-from app.models.job import Job
+from app.core.config import settings
+from app.core.database import end_transaction, get_db
+from app.models.job import Job, load_columns
 from app.models.resume import Resume
-from app.services.llm import LLMError, claude_chat_json
+from app.services import resume_cache
+from app.services.embedding_index import job_index
+from app.services.llm import LLMError
+from app.services.llm_flow import LLMCall, Progress, run_sync
+from app.services.near_dup import canonical_only, copy_from_canonical, resolve_canonical
+from app.services.preference_engine import ensure_embeddings
+from app.services.prompts import build_cull_messages
+from app.services.ranking import refresh_scores
 
 bp = Blueprint("cull", __name__)
 
 
-def _get_latest_resume(db):
-    resume = db.query(Resume).order_by(Resume.updated_at.desc()).first()
-    if not resume:
-        return None, (jsonify({"detail": "No resume found. Upload a resume first."}), 400)
-    return resume, None
-
-
 @bp.post("/resume")
 def set_resume():
     data = request.get_json(silent=True)
@@ -41,39 +42,109 @@ def set_resume():
         else:
             resume = Resume(raw_text=text)
             db.add(resume)
-        db.commit()
+        db.flush()
         db.refresh(resume)
-        return jsonify({
-            "id": str(resume.id),
-            "updated_at": resume.updated_at.isoformat(),
-            "length": len(resume.raw_text),
-        })
+        # Built here, once per resume version, so /sort and /cull only read them.
+        artifacts = resume_cache.build(db, resume)
+        db.commit()
+        return jsonify(_resume_info(artifacts))
+
+
+def _resume_info(artifacts: resume_cache.ResumeArtifacts) -> dict:
+    return {
+        "id": str(artifacts.resume_id),
+        "updated_at": artifacts.updated_at.isoformat(),
+        "length": artifacts.length,
+        "token_count": artifacts.token_count,
+    }
 
 
 @bp.get("/resume")
 def get_resume():
     with get_db() as db:
-        resume, err = _get_latest_resume(db)
+        resume, err = resume_cache.latest_or_error(db)
         if err:
             return err
-        return jsonify({
-            "id": str(resume.id),
-            "updated_at": resume.updated_at.isoformat(),
-            "length": len(resume.raw_text),
-        })
+        return jsonify(_resume_info(resume))
+
+
+def _prefilter(db, resume, jobs: list[Job], k: int) -> list[Job]:
+    """Stage 1: keep the ``k`` jobs whose embeddings are closest to the resume."""
+    ensure_embeddings(jobs, db)
+    hits = job_index.search(resume_cache.embedding_of(resume), k, restrict=[job.id for job in jobs])
+    keep = {job_id for job_id, _ in hits}
+    return [job for job in jobs if job.id in keep]
+
+
+def _llm_cull(db, resume, jobs: list[Job], top_n: int):
+    """Stage 2: one LLM call ranking ``jobs``. Returns ({job_id: {score, reasoning}}, error_response)."""
+    job_payload = [
+        {
+            "job_id": str(job.id),
+            "title": job.title,
+            "company": job.company,
+            "location": job.location,
+            "url": job.url,
+            "raw_text": (job.raw_text or "")[:3000],
+        }
+        for job in jobs
+    ]
+
+    end_transaction(db)
+    try:
+        result = yield LLMCall(build_cull_messages(resume.compact_text, job_payload, top_n), "cull")
+    except LLMError as exc:
+        return None, (jsonify({"detail": str(exc)}), 502)
+
+    ranked = result.get("ranked", []) if isinstance(result, dict) else []
+    if not isinstance(ranked, list):
+        return None, (jsonify({"detail": "LLM response missing 'ranked' list"}), 502)
+
+    sent = {job.id for job in jobs}
+    scored: dict[UUID, dict] = {}
+    for item in ranked:
+        try:
+            job_id = UUID(item.get("job_id"))
+            score = float(item.get("fit_score", 0))
+            reasoning = str(item.get("reasoning", ""))
+        except Exception:
+            continue
+        if job_id in sent:
+            scored[job_id] = {"score": score, "reasoning": reasoning}
+    return scored, None
+
+
+def _top_ids(scored: dict[UUID, dict], top_n: int) -> list[UUID]:
+    return sorted(scored, key=lambda job_id: scored[job_id]["score"], reverse=True)[:top_n]
 
 
 @bp.post("/cull")
 def begin_cull():
-    data = request.get_json(silent=True) or {}
+    """Rank jobs against the resume.
+
+    With more candidates than ``prefilter_k`` (default CULL_PREFILTER_K), only the
+    top-K by resume/job embedding similarity are sent to the LLM. Pass
+    ``recall_check: true`` to also run the full-LLM cull and report how many of
+    its top_n the two-stage cull recovered (``recall.error`` if that second cull fails).
+    """
+    return run_sync(cull_flow(request.get_json(silent=True) or {}))
+
+
+def cull_flow(data: dict):
+    """POST /cull as a flow (services/llm_flow.py); app/asgi.py serves it on the event loop
+    and api/v1/runs.py runs it in the background with a "job" event per scored job."""
     job_ids = data.get("job_ids")
     top_n = data.get("top_n", 10)
+    prefilter_k = data.get("prefilter_k", settings.CULL_PREFILTER_K)
+    recall_check = bool(data.get("recall_check", False))
 
     if not isinstance(top_n, int) or top_n < 1 or top_n > 50:
         return jsonify({"detail": "top_n must be between 1 and 50"}), 422
+    if not isinstance(prefilter_k, int) or prefilter_k < 0 or prefilter_k > 1000:
+        return jsonify({"detail": "prefilter_k must be between 0 (disabled) and 1000"}), 422
 
     with get_db() as db:
-        resume, err = _get_latest_resume(db)
+        resume, err = resume_cache.latest_or_error(db)
         if err:
             return err
 
@@ -81,62 +152,33 @@ def begin_cull():
         if job_ids is not None:
             if len(job_ids) == 0:
                 return jsonify({"top_jobs": []})
-            query = query.filter(Job.id.in_([UUID(j) for j in job_ids]))
+            query = query.filter(Job.id.in_(resolve_canonical(db, [UUID(j) for j in job_ids])))
+        else:
+            # Near duplicates would only compete with their canonical job for a top_n slot.
+            query = canonical_only(query)
         jobs = query.order_by(Job.created_at.desc()).all()
         if not jobs:
             return jsonify({"top_jobs": []})
 
-        job_payload = [
-            {
-                "job_id": str(job.id),
-                "title": job.title,
-                "company": job.company,
-                "location": job.location,
-                "url": job.url,
-                "raw_text": (job.raw_text or "")[:3000],
-            }
-            for job in jobs
-        ]
-
-        system_prompt = (
-            "You are ranking jobs for FIT only. Ignore location, salary, and prestige. "
-            "Given a resume and job postings, score fit from 0-100 and provide 1-2 sentence reasoning per job. "
-            "Return ONLY valid JSON."
-        )
-        user_prompt = {
-            "resume": resume.raw_text,
-            "jobs": job_payload,
-            "top_n": top_n,
-            "output_format": {
-                "ranked": [{"job_id": "uuid", "fit_score": 0, "reasoning": "short rationale"}],
-                "top_10": ["uuid"],
-            },
-        }
-
-        try:
-            result = claude_chat_json([
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"JSON input:\n{json.dumps(user_prompt)}"},
-            ])
-        except LLMError as exc:
-            return jsonify({"detail": str(exc)}), 502
-
-        ranked = result.get("ranked", []) if isinstance(result, dict) else []
-        if not isinstance(ranked, list):
-            return jsonify({"detail": "LLM response missing 'ranked' list"}), 502
-
-        scored: dict[UUID, dict] = {}
-        for item in ranked:
+        candidates = jobs
+        prefilter = None
+        if prefilter_k and len(jobs) > max(prefilter_k, top_n):
             try:
-                job_id = UUID(item.get("job_id"))
-                score = float(item.get("fit_score", 0))
-                reasoning = str(item.get("reasoning", ""))
+                candidates = _prefilter(db, resume, jobs, max(prefilter_k, top_n))
+                prefilter = {"candidates": len(jobs), "sent_to_llm": len(candidates)}
             except Exception:
-                continue
-            scored[job_id] = {"score": score, "reasoning": reasoning}
+                # Embedding model unavailable: fall back to the single-stage cull.
+                traceback.print_exc()
+                candidates = jobs
+
+        load_columns(db, candidates, Job.raw_text)
+        yield Progress([("queued", {"job_count": len(candidates), "waiting_count": 0})])
+        scored, err = yield from _llm_cull(db, resume, candidates, top_n)
+        if err:
+            return err
 
         now = datetime.now(timezone.utc)
-        for job in jobs:
+        for job in candidates:
             if job.id in scored:
                 raw_score = scored[job.id]["score"]
                 job.score = max(0, min(100, int(round(raw_score))))
@@ -145,19 +187,41 @@ def begin_cull():
                 job.analysis = {"fit_score": raw_score, "reasoning": scored[job.id]["reasoning"]}
                 job.analyzed_at = now
 
+        refresh_scores(db, list(scored) + copy_from_canonical(db, scored))
         db.commit()
+        yield Progress([
+            ("job", {"job_id": str(job_id), "score": item["score"], "reasoning": item["reasoning"]})
+            for job_id, item in scored.items()
+        ])
+
+        top_sorted = [
+            {
+                "job_id": str(job_id),
+                "score": scored[job_id]["score"],
+                "reasoning": scored[job_id]["reasoning"],
+            }
+            for job_id in _top_ids(scored, max(1, min(top_n, 50)))
+        ]
+        resp = {"top_jobs": top_sorted}
+        if prefilter:
+            resp["prefilter"] = prefilter
+
+        if recall_check and prefilter:
+            load_columns(db, jobs, Job.raw_text)
+            full_scored, err = yield from _llm_cull(db, resume, jobs, top_n)
+            if err:
+                # The stage-one scores are already committed; keep them in the answer.
+                resp["recall"] = {"error": err[0].get_json()["detail"]}
+                return jsonify(resp)
+            full_top = _top_ids(full_scored, top_n)
+            two_stage_top = set(_top_ids(scored, top_n))
+            sent = {job.id for job in candidates}
+            resp["recall"] = {
+                "top_n": len(full_top),
+                # Share of the full-LLM top_n that the two-stage cull also ranked top_n.
+                "recall_at_top_n": round(sum(1 for j in full_top if j in two_stage_top) / max(1, len(full_top)), 3),
+                # Share of the full-LLM top_n that survived the embedding prefilter at all.
+                "prefilter_recall": round(sum(1 for j in full_top if j in sent) / max(1, len(full_top)), 3),
+            }
 
-        top_sorted = sorted(
-            [
-                {
-                    "job_id": str(job.id),
-                    "score": scored[job.id]["score"],
-                    "reasoning": scored[job.id]["reasoning"],
-                }
-                for job in jobs
-                if job.id in scored
-            ],
-            key=lambda x: x["score"],
-            reverse=True,
-        )
-        return jsonify({"top_jobs": top_sorted[:max(1, min(top_n, 50))]})
+        return jsonify(resp)
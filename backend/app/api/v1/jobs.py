@@ -1,31 +1,41 @@
 from __future__ import annotations
 
+import base64
 import json
 import traceback
 from datetime import datetime, timezone
 from uuid import UUID
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
+from sqlalchemy import delete, select, tuple_, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only, undefer
 
 from app.core.config import settings
-from app.core.database import get_db
-from app.models.job import Job
-from app.services.job_parser import parse_job_description
+from app.core.database import end_transaction, get_db
+from app.core.serialization import row_serializer
+from app.models.job import PLACEHOLDER_TEXT, REQUIRED_STRUCTURED_FIELDS, Job, JobStatus
+from app.services import facets, near_dup, search, semantic
+from app.services.embedding_index import job_index
+from app.services.export import FORMATS, export_stream, resolve_columns
+from app.services.ingest import ingest_postings, prepare_posting, upsert_posting
+from app.services.job_claims import claim_jobs, finished_since, marks, release_claim, wait_for_others, wait_steps
+from app.services.job_parser import parse_job_steps
+from app.services.llm_flow import Progress, gather, run_sync
+from app.services.ranking import refresh_scores
+from app.services.response_cache import cached_get
 
 bp = Blueprint("jobs", __name__)
 
-REQUIRED_STRUCTURED_FIELDS = [
-    "about_summary",
-    "experience_requirements",
-    "expertise_requirements",
-    "business_cultural_requirements",
-    "sponsorship_requirements",
-    "work_location_requirements",
-    "education_requirements",
-]
-
-PLACEHOLDER_TEXT = "x, y, z"
+# Columns _job_base_fields reads (in its key order); list endpoints load only these.
+BASE_COLUMNS = (
+    Job.id, Job.job_hash, Job.title, Job.company, Job.location, Job.url, Job.score, Job.preference_score,
+    Job.resume_recommendation, Job.reasoning, Job.downsides, Job.created_at, Job.analyzed_at,
+    Job.structured_requirements, Job.parsed_at, Job.duplicate_of, Job.work_mode, Job.sponsorship, Job.min_years,
+    Job.degree_level,
+)
+DETAIL_OPTIONS = (undefer(Job.raw_text), undefer(Job.raw_data), undefer(Job.analysis))
+_PARSE_CHUNK = 5  # /parse jobs per commit and progress event; their LLM calls overlap on the async server
 
 
 # ---------------------------------------------------------------------------
@@ -51,18 +61,6 @@ def _normalize_json_field(value):
     return {"_raw": str(value)}
 
 
-def _is_incomplete_structured(structured) -> bool:
-    if not structured or not isinstance(structured, dict):
-        return True
-    for field in REQUIRED_STRUCTURED_FIELDS:
-        value = structured.get(field)
-        if not value or not str(value).strip():
-            return True
-        if str(value).strip().lower() == PLACEHOLDER_TEXT:
-            return True
-    return False
-
-
 def _fill_placeholder_fields(structured: dict) -> dict:
     filled = dict(structured or {})
     for field in REQUIRED_STRUCTURED_FIELDS:
@@ -89,17 +87,61 @@ def _job_base_fields(job: Job) -> dict:
         "analyzed_at": _dt(job.analyzed_at),
         "structured_requirements": _normalize_json_field(job.structured_requirements),
         "parsed_at": _dt(job.parsed_at),
+        "duplicate_of": str(job.duplicate_of) if job.duplicate_of else None,
+        "work_mode": job.work_mode,
+        "sponsorship": job.sponsorship,
+        "min_years": job.min_years,
+        "degree_level": job.degree_level,
     }
 
 
-def _is_unique_url_violation(exc: IntegrityError) -> bool:
-    orig = getattr(exc, "orig", None)
-    if orig is None:
-        return "uq_jobs_url" in str(exc)
-    if getattr(orig, "pgcode", None) != "23505":
-        return False
-    diag = getattr(orig, "diag", None)
-    return diag is not None and getattr(diag, "constraint_name", None) == "uq_jobs_url"
+# Same keys as _job_base_fields, straight from a BASE_COLUMNS result row.
+_base_row = row_serializer(
+    [column.key for column in BASE_COLUMNS], {"structured_requirements": _normalize_json_field}
+)
+
+_search_row = row_serializer(
+    [column.key for column in BASE_COLUMNS] + ["search_rank", "title_headline", "headline"],
+    {"structured_requirements": _normalize_json_field},
+)
+
+
+def _with_similarity(db, hits) -> list[dict]:
+    """BASE_COLUMNS rows for (job_id, similarity) ``hits``, in hit order, each with its similarity."""
+    if not hits:
+        return []
+    rows = {row.id: row for row in db.execute(select(*BASE_COLUMNS).where(Job.id.in_([i for i, _ in hits])))}
+    semantic.forget_deleted([job_id for job_id, _ in hits], rows)
+    return [
+        {**_base_row(rows[job_id]), "similarity": round(sim, 4)} for job_id, sim in hits if job_id in rows
+    ]
+
+
+def _parse_k(default: int):
+    """``k`` query arg in 1..100; returns (k, error_response)."""
+    try:
+        k = int(request.args.get("k", default))
+    except ValueError:
+        return None, (jsonify({"detail": "k must be an integer"}), 422)
+    if not (1 <= k <= 100):
+        return None, (jsonify({"detail": "k must be between 1 and 100"}), 422)
+    return k, None
+
+
+def _encode_cursor(job: Job) -> str:
+    """Opaque keyset cursor pointing just past ``job`` in (created_at DESC, id DESC) order."""
+    raw = json.dumps([job.created_at.isoformat(), str(job.id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(token: str) -> tuple[datetime, UUID]:
+    """Inverse of _encode_cursor; raises ValueError for anything malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, job_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), UUID(job_id)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("invalid cursor") from exc
 
 
 # ---------------------------------------------------------------------------
@@ -108,95 +150,116 @@ def _is_unique_url_violation(exc: IntegrityError) -> bool:
 
 @bp.post("/ingest")
 def ingest_job():
+    """Capture one posting with a single upsert statement (services/ingest.upsert_posting)."""
     data = request.get_json(silent=True)
     if not data:
         return jsonify({"detail": "Request body must be JSON"}), 400
 
-    raw_text = data.get("raw_text", "")
-    if not raw_text or not raw_text.strip():
-        return jsonify({"detail": "raw_text must not be empty"}), 422
-    raw_text = raw_text.strip()
-    if len(raw_text) > 50000:
-        return jsonify({"detail": "raw_text must be 50,000 characters or fewer"}), 422
-
     try:
-        job_dict = {
-            "title": data.get("title") or "",
-            "company": data.get("company") or "",
-            "location": data.get("location") or "",
-            "url": data.get("url") or "",
-            "raw_text": raw_text,
-        }
-        job_hash = Job.generate_hash(job_dict)
+        row = prepare_posting(data)
+    except ValueError as exc:
+        return jsonify({"detail": str(exc)}), 422
 
+    try:
         with get_db() as db:
-            existing = db.query(Job).filter(Job.job_hash == job_hash).first()
-            if existing:
-                resp = _job_base_fields(existing)
-                resp["is_new"] = False
-                return jsonify(resp)
-
-            url = (data.get("url") or "").strip() or f"urn:job:{job_hash}"
-            new_job = Job(
-                job_hash=job_hash,
-                raw_text=raw_text,
-                raw_data=data.get("raw_data"),
-                title=data.get("title"),
-                company=data.get("company"),
-                location=data.get("location"),
-                url=url,
-                captured_at=datetime.now(timezone.utc),
-            )
-            db.add(new_job)
             try:
+                stored, is_new = upsert_posting(db, row, BASE_COLUMNS)
+                links = (
+                    near_dup.link_near_duplicates(
+                        db, [(stored.id, near_dup.posting_text(row["title"], row["company"], row["raw_text"]))]
+                    )
+                    if is_new else {}
+                )
                 db.commit()
-                db.refresh(new_job)
-                resp = _job_base_fields(new_job)
-                resp["is_new"] = True
-                return jsonify(resp), 201
-            except IntegrityError as exc:
+            except IntegrityError:
                 db.rollback()
-                if _is_unique_url_violation(exc):
-                    # URL collision — use URN fallback
-                    new_job_retry = Job(
-                        job_hash=job_hash,
-                        raw_text=raw_text,
-                        raw_data=data.get("raw_data"),
-                        title=data.get("title"),
-                        company=data.get("company"),
-                        location=data.get("location"),
-                        url=f"urn:job:{job_hash}",
-                        captured_at=datetime.now(timezone.utc),
-                    )
-                    db.add(new_job_retry)
-                    try:
-                        db.commit()
-                        db.refresh(new_job_retry)
-                        resp = _job_base_fields(new_job_retry)
-                        resp["is_new"] = True
-                        return jsonify(resp), 201
-                    except IntegrityError:
-                        db.rollback()
-                        existing = db.query(Job).filter(Job.job_hash == job_hash).first()
-                        if existing:
-                            resp = _job_base_fields(existing)
-                            resp["is_new"] = False
-                            return jsonify(resp)
-                        raise
-                existing = db.query(Job).filter(Job.job_hash == job_hash).first()
-                if existing:
-                    resp = _job_base_fields(existing)
-                    resp["is_new"] = False
-                    return jsonify(resp)
-                raise
+                return jsonify({"detail": "Posting conflicts with an edited job that kept its URL."}), 409
+            if is_new:
+                semantic.embed_in_background()
+            resp = _job_base_fields(stored)
+            resp["is_new"] = is_new
+            if stored.id in links:
+                resp["duplicate_of"] = str(links[stored.id][0])
+            return jsonify(resp), 201 if is_new else 200
     except Exception as exc:
         traceback.print_exc()
         return jsonify({"detail": f"Ingest failed: {type(exc).__name__}: {exc}"}), 500
 
 
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines")
+
+
+def _batch_items(req) -> list:
+    """Postings from a JSON array / {"jobs": [...]} body, or one per NDJSON line (bad lines become errors)."""
+    if req.mimetype not in NDJSON_MIMETYPES:
+        data = req.get_json(silent=True)
+        if isinstance(data, dict) and isinstance(data.get("jobs"), list):
+            return data["jobs"]
+        if isinstance(data, list):
+            return data
+        if req.is_json:
+            raise ValueError("JSON body must be an array of postings or {\"jobs\": [...]}")
+
+    items = []
+    for line in req.get_data(as_text=True).splitlines():
+        if not line.strip():
+            continue
+        try:
+            items.append(json.loads(line))
+        except json.JSONDecodeError as exc:
+            items.append(ValueError(f"invalid JSON line: {exc.msg}"))
+    return items
+
+
+@bp.post("/ingest/batch")
+def ingest_batch():
+    """
+    Capture many postings at once: NDJSON (one posting per line) or a JSON array.
+    Written with multi-row upserts (services/ingest.py); ``results`` holds one
+    {index, status: new|duplicate|error, id, job_hash, detail} per input item.
+    """
+    try:
+        items = _batch_items(request)
+    except ValueError as exc:
+        return jsonify({"detail": str(exc)}), 400
+    if not items:
+        return jsonify({"detail": "No postings in request body"}), 400
+    if len(items) > settings.INGEST_BATCH_MAX_ITEMS:
+        return jsonify({
+            "detail": f"Batch too large: {len(items)} postings (max {settings.INGEST_BATCH_MAX_ITEMS})."
+        }), 413
+
+    try:
+        with get_db() as db:
+            results = ingest_postings(db, items)
+    except Exception as exc:
+        traceback.print_exc()
+        return jsonify({"detail": f"Ingest failed: {type(exc).__name__}: {exc}"}), 500
+
+    counts = {"new": 0, "duplicate": 0, "error": 0}
+    for result in results:
+        counts[result.status] += 1
+    if counts["new"]:
+        semantic.embed_in_background()
+    return jsonify({
+        "new_count": counts["new"],
+        "duplicate_count": counts["duplicate"],
+        "error_count": counts["error"],
+        "results": [result.to_dict() for result in results],
+    })
+
+
 @bp.get("/jobs")
+@cached_get("jobs")
 def get_jobs():
+    """
+    Newest first. Pass ``cursor`` (empty for the first page) for keyset pagination:
+    the response is then {"jobs": [...], "next_cursor": str | null}. Without it the
+    legacy offset/limit form returns a bare list. Facet filters (remote, work_mode,
+    sponsorship, degree, years; see services/facets.py) narrow either form.
+    """
     analyzed_only = request.args.get("analyzed_only", "false").lower() == "true"
+    cursor = request.args.get("cursor")
     try:
         limit = int(request.args.get("limit", 100))
         offset = int(request.args.get("offset", 0))
@@ -206,19 +269,170 @@ def get_jobs():
         return jsonify({"detail": "limit must be between 1 and 500"}), 422
     if offset < 0:
         return jsonify({"detail": "offset must be >= 0"}), 422
+    if cursor is not None and offset:
+        return jsonify({"detail": "use either cursor or offset, not both"}), 422
+    after = None
+    if cursor:
+        try:
+            after = _decode_cursor(cursor)
+        except ValueError:
+            return jsonify({"detail": "invalid cursor"}), 422
+    try:
+        filters = facets.filters_from_args(request.args)
+    except ValueError as exc:
+        return jsonify({"detail": str(exc)}), 422
 
     with get_db() as db:
-        query = db.query(Job)
+        # Plain column tuples (no ORM instances), serialized by _base_row.
+        query = select(*BASE_COLUMNS).where(*filters.values())
         if analyzed_only:
-            query = query.filter(Job.analyzed_at.isnot(None))
-        jobs = query.order_by(Job.created_at.desc()).offset(offset).limit(limit).all()
-        return jsonify([_job_base_fields(j) for j in jobs])
+            query = query.where(Job.analyzed_at.isnot(None))
+        # Matches ix_jobs_created_at_id / ix_jobs_analyzed_created_at_id (migration 008).
+        query = query.order_by(Job.created_at.desc(), Job.id.desc())
+
+        if cursor is None:
+            rows = db.execute(query.offset(offset).limit(limit)).all()
+            return jsonify([_base_row(row) for row in rows])
+
+        if after is not None:
+            query = query.where(tuple_(Job.created_at, Job.id) < after)
+        rows = db.execute(query.limit(limit + 1)).all()
+        next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return jsonify({"jobs": [_base_row(row) for row in rows[:limit]], "next_cursor": next_cursor})
+
+
+@bp.get("/jobs/facets")
+@cached_get("jobs")
+def get_job_facets():
+    """
+    Job counts per facet value under the same filters GET /jobs takes:
+    {"total": n, "work_mode": {...}, "sponsorship": {...}, "degree": {...}, "years": {...}}.
+    Each facet's counts ignore that facet's own filter.
+    """
+    analyzed_only = request.args.get("analyzed_only", "false").lower() == "true"
+    try:
+        filters = facets.filters_from_args(request.args)
+    except ValueError as exc:
+        return jsonify({"detail": str(exc)}), 422
+    with get_db() as db:
+        return jsonify(facets.facet_counts(db, filters, analyzed_only))
+
+
+@bp.get("/jobs/search")
+@cached_get("jobs")
+def search_jobs():
+    """
+    Full-text search over title, company and raw_text. ``q`` takes web-search
+    syntax ("exact phrase", or, -exclude). Best match first; returns
+    {"results": [...], "next_cursor": str | null}, each result with
+    ``search_rank`` and ``title_headline`` / ``headline`` (matches in <mark>).
+    """
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"detail": "q must not be empty"}), 422
+    if len(q) > search.MAX_QUERY_CHARS:
+        return jsonify({"detail": f"q must be {search.MAX_QUERY_CHARS} characters or fewer"}), 422
+    analyzed_only = request.args.get("analyzed_only", "false").lower() == "true"
+    try:
+        limit = int(request.args.get("limit", 20))
+    except ValueError:
+        return jsonify({"detail": "limit must be an integer"}), 422
+    if not (1 <= limit <= 100):
+        return jsonify({"detail": "limit must be between 1 and 100"}), 422
+    after = None
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            after = search.decode_cursor(cursor)
+        except ValueError:
+            return jsonify({"detail": "invalid cursor"}), 422
+
+    with get_db() as db:
+        rows, next_cursor = search.search_jobs(db, q, BASE_COLUMNS, limit, after=after, analyzed_only=analyzed_only)
+        return jsonify({"results": [_search_row(row) for row in rows], "next_cursor": next_cursor})
+
+
+@bp.get("/jobs/semantic")
+@cached_get("jobs")
+def semantic_jobs():
+    """
+    Jobs closest in meaning to ``q`` (embedding cosine similarity, no LLM).
+    Optional ``k`` (default 20), ``min_similarity`` and ``analyzed_only``.
+    Returns {"results": [... with "similarity"], "indexed": jobs searched}.
+    """
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"detail": "q must not be empty"}), 422
+    if len(q) > semantic.MAX_QUERY_CHARS:
+        return jsonify({"detail": f"q must be {semantic.MAX_QUERY_CHARS} characters or fewer"}), 422
+    k, err = _parse_k(20)
+    if err:
+        return err
+    try:
+        min_similarity = float(request.args.get("min_similarity", -1.0))
+    except ValueError:
+        return jsonify({"detail": "min_similarity must be a number"}), 422
+    analyzed_only = request.args.get("analyzed_only", "false").lower() == "true"
+
+    with get_db() as db:
+        semantic.sync_index(db)
+        restrict = semantic.analyzed_ids(db) if analyzed_only else None
+        hits = semantic.search(semantic.embed_query(q), k, min_similarity, restrict=restrict)
+        return jsonify({"results": _with_similarity(db, hits), "indexed": len(job_index)})
+
+
+@bp.get("/jobs/<uuid:job_id>/similar")
+@cached_get("jobs")
+def similar_jobs(job_id):
+    """The ``k`` jobs (default 10) most similar to this one."""
+    k, err = _parse_k(10)
+    if err:
+        return err
+    with get_db() as db:
+        job = db.get(Job, job_id)
+        if not job:
+            return jsonify({"detail": "Job not found"}), 404
+        semantic.sync_index(db)
+        hits = semantic.search(semantic.vector_of(job), k, exclude=[job_id])
+        return jsonify({"job_id": str(job_id), "results": _with_similarity(db, hits)})
+
+
+@bp.get("/jobs/export")
+def export_jobs():
+    """
+    Stream every job (newest first) as NDJSON or CSV. ``columns`` is an optional
+    comma-separated list (default: all exportable columns, raw_text included).
+    Gzipped on the fly when the client sends Accept-Encoding: gzip.
+    """
+    fmt = request.args.get("format", "ndjson").lower()
+    if fmt not in FORMATS:
+        return jsonify({"detail": f"format must be one of: {', '.join(FORMATS)}"}), 422
+    try:
+        columns = resolve_columns(request.args.get("columns"))
+    except ValueError as e:
+        return jsonify({"detail": str(e)}), 422
+    analyzed_only = request.args.get("analyzed_only", "false").lower() == "true"
+    use_gzip = "gzip" in request.accept_encodings
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="jobs.{fmt}"',
+        "Cache-Control": "no-store",
+        "Vary": "Accept-Encoding",
+    }
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+    return Response(
+        export_stream(fmt, columns, analyzed_only=analyzed_only, gzip=use_gzip),
+        mimetype=FORMATS[fmt],
+        headers=headers,
+    )
 
 
 @bp.get("/jobs/<uuid:job_id>")
+@cached_get("jobs")
 def get_job(job_id):
     with get_db() as db:
-        job = db.query(Job).filter(Job.id == job_id).first()
+        job = db.query(Job).options(*DETAIL_OPTIONS).filter(Job.id == job_id).first()
         if not job:
             return jsonify({"detail": "Job not found"}), 404
         base = _job_base_fields(job)
@@ -245,7 +459,7 @@ def update_job(job_id):
         data["raw_text"] = rt.strip()
 
     with get_db() as db:
-        job = db.query(Job).filter(Job.id == job_id).first()
+        job = db.query(Job).options(*DETAIL_OPTIONS).filter(Job.id == job_id).first()
         if not job:
             return jsonify({"detail": "Job not found"}), 404
 
@@ -256,6 +470,7 @@ def update_job(job_id):
             job.raw_text = data["raw_text"]
             job.structured_requirements = None
             job.parsed_at = None
+            facets.set_facets(job)
 
         job.job_hash = Job.generate_hash({
             "title": job.title or "",
@@ -281,41 +496,151 @@ def update_job(job_id):
         return jsonify(base)
 
 
+MAX_BULK_IDS = 10000
+
+# PATCH /jobs "clear" groups: columns reset to NULL, plus the status the job returns to.
+CLEAR_GROUPS = {
+    "analysis": {
+        "score": None, "analysis": None, "reasoning": None, "downsides": None, "guidance_3_sentences": None,
+        "resume_recommendation": None, "analyzed_at": None, "preference_norm": None, "combined_score": None,
+        "status": JobStatus.new,
+    },
+    "structured_requirements": {
+        "structured_requirements": None, "parsed_at": None,
+        **{name: None for name in facets.FACET_COLUMNS},
+    },
+}
+
+
+def _bulk_job_ids(data) -> list[UUID]:
+    """``job_ids`` from a bulk request body; raises ValueError with a client-facing message."""
+    job_ids = (data or {}).get("job_ids")
+    if not isinstance(job_ids, list) or not job_ids:
+        raise ValueError("job_ids must be a non-empty list")
+    if len(job_ids) > MAX_BULK_IDS:
+        raise ValueError(f"at most {MAX_BULK_IDS} job_ids per request")
+    try:
+        return list(dict.fromkeys(UUID(str(j)) for j in job_ids))
+    except ValueError as exc:
+        raise ValueError("job_ids must be UUIDs") from exc
+
+
+def _delete_jobs(db, job_ids: list[UUID]) -> list[UUID]:
+    """One DELETE ... RETURNING for ``job_ids`` (preferences cascade); drops them from the job index."""
+    deleted = db.execute(
+        delete(Job).where(Job.id.in_(job_ids)).returning(Job.id).execution_options(synchronize_session=False)
+    ).scalars().all()
+    if deleted:
+        # A deleted job may have held the ELO min/max the other preference_norm values are scaled by.
+        refresh_scores(db, [])
+    db.commit()
+    job_index.discard(deleted)
+    return deleted
+
+
 @bp.delete("/jobs/<uuid:job_id>")
 def delete_job(job_id):
     with get_db() as db:
-        job = db.query(Job).filter(Job.id == job_id).first()
-        if not job:
+        if not _delete_jobs(db, [job_id]):
             return jsonify({"detail": "Job not found"}), 404
-        db.delete(job)
-        db.commit()
         return jsonify({"deleted": True, "job_id": str(job_id)})
 
 
+@bp.delete("/jobs")
+def delete_jobs():
+    """Delete many jobs in one transaction: body {"job_ids": [...]}. Unknown ids are reported, not an error."""
+    try:
+        job_ids = _bulk_job_ids(request.get_json(silent=True))
+    except ValueError as exc:
+        return jsonify({"detail": str(exc)}), 422
+    with get_db() as db:
+        deleted = set(_delete_jobs(db, job_ids))
+    return jsonify({
+        "deleted_count": len(deleted),
+        "deleted": [str(j) for j in job_ids if j in deleted],
+        "not_found": [str(j) for j in job_ids if j not in deleted],
+    })
+
+
+@bp.patch("/jobs")
+def update_jobs():
+    """
+    Update many jobs with one UPDATE: body {"job_ids": [...], "status": "new|analyzed|applied",
+    "clear": ["analysis", "structured_requirements"]}. Fields that feed job_hash are
+    per-job edits (PATCH /jobs/<id>) and are not accepted here.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        job_ids = _bulk_job_ids(data)
+    except ValueError as exc:
+        return jsonify({"detail": str(exc)}), 422
+
+    unknown = set(data) - {"job_ids", "status", "clear"}
+    if unknown:
+        return jsonify({"detail": f"Unsupported bulk fields: {', '.join(sorted(unknown))}"}), 422
+    values = {}
+    clear = data.get("clear") or []
+    if not isinstance(clear, list) or set(clear) - set(CLEAR_GROUPS):
+        return jsonify({"detail": f"clear must be a list of: {', '.join(CLEAR_GROUPS)}"}), 422
+    for group in clear:
+        values.update(CLEAR_GROUPS[group])
+    if "status" in data:
+        try:
+            values["status"] = JobStatus(data["status"])
+        except ValueError:
+            return jsonify({"detail": f"status must be one of: {', '.join(s.value for s in JobStatus)}"}), 422
+    if not values:
+        return jsonify({"detail": "Nothing to update: pass status and/or clear"}), 422
+
+    with get_db() as db:
+        updated = db.execute(
+            update(Job).where(Job.id.in_(job_ids)).values(**values).returning(Job.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        if "analysis" in clear and updated:
+            refresh_scores(db, [])
+        db.commit()
+    updated = set(updated)
+    return jsonify({
+        "updated_count": len(updated),
+        "updated": [str(j) for j in job_ids if j in updated],
+        "not_found": [str(j) for j in job_ids if j not in updated],
+    })
+
+
 @bp.post("/parse")
 def parse_jobs():
-    data = request.get_json(silent=True) or {}
+    return run_sync(parse_flow(request.get_json(silent=True) or {}))
+
+
+def parse_flow(data: dict):
+    """POST /parse as a flow (services/llm_flow.py). app/asgi.py serves it on the event loop,
+    where each chunk's LLM calls run concurrently; api/v1/runs.py runs it in the background
+    with a "job" event per parsed job."""
     job_ids = data.get("job_ids")
     force = data.get("force", False)
 
     try:
         with get_db() as db:
-            total = db.query(Job).count()
-            if total == 0:
-                return jsonify({"message": "No jobs in database. Capture some jobs first.", "parsed_count": 0})
-
-            query = db.query(Job)
+            # Near duplicates are never parsed themselves; they get their canonical job's result.
+            query = select(Job.id)
             if job_ids is not None:
                 if len(job_ids) == 0:
                     return jsonify({"message": "No job_ids provided; parsed 0 job(s)", "parsed_count": 0})
-                query = query.filter(Job.id.in_([UUID(j) for j in job_ids]))
-            jobs = query.all()
-
-            if not jobs:
-                return jsonify({"message": "No jobs found.", "parsed_count": 0})
+                query = query.where(Job.id.in_(near_dup.resolve_canonical(db, [UUID(j) for j in job_ids])))
+            else:
+                query = near_dup.canonical_only(query)
+            pending = query
+            if not force:
+                # Generated flag (migration 015); without job_ids this walks ix_jobs_parse_pending.
+                pending = query.where(~Job.is_parse_complete)
+            to_parse = list(db.execute(pending).scalars())
 
-            to_parse = [j for j in jobs if force or _is_incomplete_structured(j.structured_requirements)]
             if not to_parse:
+                if db.execute(query.limit(1)).first() is None:
+                    if job_ids is None:
+                        return jsonify({"message": "No jobs in database. Capture some jobs first.", "parsed_count": 0})
+                    return jsonify({"message": "No jobs found.", "parsed_count": 0})
                 return jsonify({"message": "All jobs already have structured requirements.", "parsed_count": 0})
 
             if len(to_parse) > settings.MAX_BATCH_JOBS:
@@ -326,25 +651,63 @@ def parse_jobs():
                     )
                 }), 422
 
-            parsed_count = 0
-            errors = []
-            for job in to_parse:
-                try:
-                    structured = parse_job_description(
-                        raw_text=job.raw_text, title=job.title, company=job.company
-                    )
-                    structured = _fill_placeholder_fields(structured)
-                    job.structured_requirements = structured
-                    job.parsed_at = datetime.now(timezone.utc)
-                    parsed_count += 1
-                except Exception as exc:
-                    errors.append(f"Error parsing job {job.id}: {exc}")
+            claim = claim_jobs(db, to_parse, pending=None if force else ~Job.is_parse_complete)
+            try:
+                before = marks(db, claim, Job.parsed_at)
+                # One SELECT of just the parser's inputs for the rows this request owns.
+                owned = (
+                    db.query(Job).options(load_only(Job.id, Job.title, Job.company, Job.location, Job.raw_text))
+                    .filter(Job.id.in_(claim.owned)).all()
+                    if claim.owned else []
+                )
+                yield Progress([("queued", {"job_count": len(owned), "waiting_count": len(claim.waiting)})])
+                parsed_ids = []
+                errors = []
+                # Committed and reported per chunk, so a streamed run shows jobs as they finish.
+                for start in range(0, len(owned), _PARSE_CHUNK):
+                    chunk = owned[start: start + _PARSE_CHUNK]
+                    end_transaction(db)
+                    results = yield from gather([
+                        parse_job_steps(
+                            raw_text=job.raw_text, title=job.title, company=job.company, location=job.location
+                        )
+                        for job in chunk
+                    ])
+                    events = []
+                    chunk_ids = []
+                    for job, structured in zip(chunk, results):
+                        if isinstance(structured, Exception):
+                            errors.append(f"Error parsing job {job.id}: {structured}")
+                            events.append(("job", {"job_id": str(job.id), "error": str(structured)}))
+                            continue
+                        structured = _fill_placeholder_fields(structured)
+                        job.structured_requirements = structured
+                        facets.set_facets(job)
+                        job.parsed_at = datetime.now(timezone.utc)
+                        chunk_ids.append(job.id)
+                        events.append(("job", {
+                            "job_id": str(job.id), "work_mode": job.work_mode, "error": structured.get("_error"),
+                        }))
+                    near_dup.copy_from_canonical(db, chunk_ids)
+                    end_transaction(db)
+                    parsed_ids.extend(chunk_ids)
+                    yield Progress(events)
+            finally:
+                release_claim(db, claim)
+
+            parsed_count = len(parsed_ids)
+
+            reused_count = len(claim.done)
+            if claim.waiting:
+                released = yield from wait_steps(db, claim)
+                reused_count += len(finished_since(db, released, before, Job.parsed_at))
 
-            db.commit()
             msg = f"Parsed {parsed_count} job(s)"
+            if reused_count:
+                msg += f". Reused {reused_count} job(s) parsed by a concurrent request"
             if errors:
                 msg += f". {len(errors)} error(s) occurred."
-            return jsonify({"message": msg, "parsed_count": parsed_count})
+            return jsonify({"message": msg, "parsed_count": parsed_count, "reused_count": reused_count})
 
     except Exception as exc:
         traceback.print_exc()
@@ -353,7 +716,8 @@ def parse_jobs():
 
 @bp.post("/analyze")
 def analyze_jobs():
-    from app.models.job import JobStatus
+    from app.models.resume import Resume
+    from app.services import resume_cache
     from app.services.analyzer import get_analyzer
     from app.services.llm import LLMError
 
@@ -361,18 +725,53 @@ def analyze_jobs():
     job_ids = data.get("job_ids")
 
     with get_db() as db:
+        # The local scorer reads the full text (keywords, years claimed) but
+        # reuses the cached embedding instead of encoding the resume per call.
+        resume = resume_cache.latest(db)
+        if resume is None:
+            analyzer = get_analyzer(None)
+        else:
+            analyzer = get_analyzer(db.get(Resume, resume.resume_id).raw_text, resume.embedding)
+
         query = db.query(Job)
         if job_ids is not None:
             if len(job_ids) == 0:
                 return jsonify({"message": "No job_ids provided; analyzed 0 job(s)", "analyzed_count": 0})
-            query = query.filter(Job.id.in_([UUID(j) for j in job_ids]))
+            query = query.filter(Job.id.in_(near_dup.resolve_canonical(db, [UUID(j) for j in job_ids])))
         else:
-            query = query.filter(Job.analyzed_at.is_(None))
+            query = near_dup.canonical_only(query.filter(Job.analyzed_at.is_(None)))
+        if not analyzer.uses_llm:
+            # The local scorer reads the text; embeddings come from the job index.
+            query = query.options(undefer(Job.raw_text))
+            job_index.ensure_loaded(db)
 
         jobs = query.all()
         if not jobs:
             return jsonify({"message": "No jobs to analyze", "analyzed_count": 0})
 
+        def store(batch):
+            now = datetime.now(timezone.utc)
+            for job, result in zip(batch, analyzer.analyze_many(batch)):
+                job.score = result.score
+                job.resume_recommendation = result.recommended_resume
+                job.guidance_3_sentences = result.guidance_3_sentences
+                job.analysis = result.analysis_raw
+                job.status = JobStatus.analyzed
+                job.analyzed_at = now
+            return len(batch)
+
+        # Local scoring costs nothing and runs over the whole batch at once: no size guard, no claims.
+        if not analyzer.uses_llm:
+            analyzed_count = store(jobs)
+            copied = near_dup.copy_from_canonical(db, [job.id for job in jobs])
+            refresh_scores(db, [job.id for job in jobs] + copied)
+            db.commit()
+            return jsonify({
+                "message": f"Analyzed {analyzed_count} job(s)",
+                "analyzed_count": analyzed_count,
+                "reused_count": 0,
+            })
+
         if len(jobs) > settings.MAX_BATCH_JOBS:
             return jsonify({
                 "detail": (
@@ -381,21 +780,30 @@ def analyze_jobs():
                 )
             }), 422
 
-        analyzer = get_analyzer()
-        now = datetime.now(timezone.utc)
-        analyzed_count = 0
-        for job in jobs:
+        # Explicit job_ids are re-analyzed on purpose; otherwise only still-unanalyzed jobs are claimed.
+        pending = Job.analyzed_at.is_(None) if job_ids is None else None
+        claim = claim_jobs(db, [j.id for j in jobs], pending=pending)
+        try:
+            before = marks(db, claim, Job.analyzed_at)
+            owned = (
+                db.query(Job).options(undefer(Job.raw_text)).filter(Job.id.in_(claim.owned)).all()
+                if claim.owned else []
+            )
             try:
-                result = analyzer.analyze(job)
+                analyzed_count = store(owned)
             except LLMError as exc:
                 return jsonify({"detail": str(exc)}), 502
-            job.score = result.score
-            job.resume_recommendation = result.recommended_resume
-            job.guidance_3_sentences = result.guidance_3_sentences
-            job.analysis = result.analysis_raw
-            job.status = JobStatus.analyzed
-            job.analyzed_at = now
-            analyzed_count += 1
-
-        db.commit()
-        return jsonify({"message": f"Analyzed {analyzed_count} job(s)", "analyzed_count": analyzed_count})
+            copied = near_dup.copy_from_canonical(db, [job.id for job in owned])
+            refresh_scores(db, [job.id for job in owned] + copied)
+            db.commit()
+        finally:
+            release_claim(db, claim)
+
+        reused_count = len(claim.done)
+        if claim.waiting:
+            reused_count += len(finished_since(db, wait_for_others(db, claim), before, Job.analyzed_at))
+        return jsonify({
+            "message": f"Analyzed {analyzed_count} job(s)",
+            "analyzed_count": analyzed_count,
+            "reused_count": reused_count,
+        })
@@ -5,14 +5,20 @@ from uuid import UUID
 
 from flask import Blueprint, jsonify, request
 from sqlalchemy import func
+from sqlalchemy.orm import load_only
 
 from app.core.database import get_db
 from app.models.job import Job
 from app.models.preference import UserABJobPreference
+from app.services.near_dup import canonical_only
 from app.services.preference_engine import ensure_embeddings, record_preference
+from app.services.ranking import refresh_scores
 
 bp = Blueprint("preferences", __name__)
 
+# Columns _job_summary reads.
+SUMMARY_COLUMNS = (Job.id, Job.title, Job.company, Job.location, Job.structured_requirements, Job.preference_score)
+
 
 def _job_summary(job: Job) -> dict:
     about = None
@@ -32,12 +38,13 @@ def _job_summary(job: Job) -> dict:
 def get_pair():
     """Return two jobs to compare, prioritising those with the fewest prior comparisons."""
     with get_db() as db:
-        jobs = db.query(Job).all()
-        if len(jobs) < 2:
+        # Comparing a posting with its own repost teaches nothing.
+        job_ids = [row.id for row in canonical_only(db.query(Job.id)).all()]
+        if len(job_ids) < 2:
             return jsonify({"detail": "Need at least 2 saved jobs to compare."}), 400
 
         # Count appearances per job in the preference table
-        counts: dict[UUID, int] = {job.id: 0 for job in jobs}
+        counts: dict[UUID, int] = {job_id: 0 for job_id in job_ids}
         rows = db.query(
             UserABJobPreference.job_a_id,
             UserABJobPreference.job_b_id,
@@ -49,11 +56,13 @@ def get_pair():
                 counts[row.job_b_id] += 1
 
         # Sort by count ascending, break ties randomly
-        shuffled = list(jobs)
+        shuffled = list(job_ids)
         random.shuffle(shuffled)
-        shuffled.sort(key=lambda j: counts[j.id])
+        shuffled.sort(key=lambda job_id: counts[job_id])
 
-        job_a, job_b = shuffled[0], shuffled[1]
+        pair = {job.id: job for job in db.query(Job).options(load_only(*SUMMARY_COLUMNS))
+                .filter(Job.id.in_(shuffled[:2])).all()}
+        job_a, job_b = pair[shuffled[0]], pair[shuffled[1]]
 
         # Ensure both have embeddings (lazy compute on first use)
         ensure_embeddings([job_a, job_b], db)
@@ -87,8 +96,9 @@ def post_preference():
         if not job_a or not job_b:
             return jsonify({"detail": "One or both jobs not found."}), 404
 
-        # Ensure all jobs have embeddings before spreading
-        all_jobs = db.query(Job).all()
+        # Ensure all jobs have embeddings before spreading. The spread reads vectors
+        # from the job index, so only id and preference_score are loaded here.
+        all_jobs = db.query(Job).options(load_only(Job.id, Job.preference_score)).all()
         ensure_embeddings(all_jobs, db)
 
         winner = job_a if chosen_id == job_a_id else job_b
@@ -105,6 +115,8 @@ def post_preference():
 
         # Run ELO + vector spread
         record_preference(winner, loser, all_jobs, db)
+        # The spread moves every job's preference_score, so every combined_score is rewritten.
+        refresh_scores(db)
         db.commit()
 
         return jsonify({
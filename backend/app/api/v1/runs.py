@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import logging
+import threading
+from uuid import UUID, uuid4
+
+from flask import Blueprint, Flask, Response, current_app, jsonify, request
+
+from app.api.v1.cull import cull_flow
+from app.api.v1.jobs import parse_flow
+from app.api.v1.sort import sort_flow
+from app.core.database import get_db
+from app.services import llm_metrics, run_events
+from app.services.llm_flow import Flow, run_sync
+from app.services.run_events import RunLog
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint("runs", __name__)
+
+# kind -> (the plain route's Flask endpoint, which labels the run's LLM calls in metrics; flow)
+FLOWS = {
+    "sort": ("sort.sort_jobs", sort_flow),
+    "parse": ("jobs.parse_jobs", parse_flow),
+    "cull": ("cull.begin_cull", cull_flow),
+}
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def finish(app: Flask, log: RunLog, rv) -> None:
+    """Record the flow's return value as the "done" event (call inside an app context)."""
+    response = app.make_response(rv)
+    log.append([("done", {"status": response.status_code, "body": response.get_json(silent=True)})])
+
+
+def fail(log: RunLog) -> None:
+    """Record a flow that raised (the caller logs the exception)."""
+    log.append([("done", {"status": 500, "body": {"detail": "Run failed. Check server logs."}})])
+
+
+def run_inline(app: Flask, log: RunLog, flow: Flow, endpoint: str) -> None:
+    # No request context here, so LLM calls would otherwise be labelled "-".
+    token = llm_metrics.endpoint_label.set(endpoint)
+    try:
+        with app.app_context():
+            try:
+                rv = run_sync(flow, on_progress=log.progress)
+            except Exception:
+                logger.exception("Run %s failed", log.run_id)
+                fail(log)
+                return
+            finish(app, log, rv)
+    finally:
+        llm_metrics.endpoint_label.reset(token)
+
+
+def run_in_thread(app: Flask, log: RunLog, flow: Flow, endpoint: str) -> None:
+    threading.Thread(
+        target=run_inline, args=(app, log, flow, endpoint), name=f"run-{log.run_id}", daemon=True
+    ).start()
+
+
+# How POST /runs starts a flow; app/asgi.py swaps in one that drives it on the event loop.
+launcher = run_in_thread
+
+
+# ---------------------------------------------------------------------------
+# POST /api/v1/runs
+# ---------------------------------------------------------------------------
+
+@bp.post("/runs")
+def start_run():
+    """Start /sort, /parse or /cull in the background and answer 202 at once.
+
+    Body: {"kind": "sort" | "parse" | "cull", ...that route's own body}.
+    Progress is read from ``events_url`` (services/run_events.py).
+    """
+    data = request.get_json(silent=True) or {}
+    kind = data.get("kind")
+    if kind not in FLOWS:
+        return jsonify({"detail": f"kind must be one of: {', '.join(FLOWS)}"}), 422
+
+    run_id = uuid4()
+    log = RunLog(run_id)
+    with get_db() as db:
+        run_events.prune(db)
+        db.commit()
+    log.append([("started", {"kind": kind})])
+    endpoint, flow_fn = FLOWS[kind]
+    launcher(current_app._get_current_object(), log, flow_fn(data), endpoint)
+    return jsonify({"run_id": str(run_id), "events_url": f"/api/v1/runs/{run_id}/events"}), 202
+
+
+# ---------------------------------------------------------------------------
+# GET /api/v1/runs/<run_id>/events
+# ---------------------------------------------------------------------------
+
+@bp.get("/runs/<uuid:run_id>/events")
+def run_event_stream(run_id: UUID):
+    """text/event-stream of the run's events after Last-Event-ID (or ?last_event_id=), until "done".
+
+    Under WSGI the stream holds a request thread while it lasts; app/asgi.py
+    serves this path on the event loop instead.
+    """
+    after = run_events.last_event_id(request.headers.get("Last-Event-ID") or request.args.get("last_event_id"))
+    with get_db() as db:
+        if not run_events.exists(db, run_id):
+            return jsonify({"detail": "Run not found"}), 404
+    return Response(run_events.follow(run_id, after), mimetype="text/event-stream", headers=SSE_HEADERS)
@@ -5,26 +5,28 @@ from datetime import datetime, timezone
 from uuid import UUID
 
 from flask import Blueprint, jsonify, request
+from sqlalchemy import func, select
+from sqlalchemy.orm import undefer
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import end_transaction, get_db
+from app.core.serialization import row_serializer
 from app.models.job import Job, JobStatus
-from app.models.resume import Resume
-from app.services.llm import LLMError, claude_chat_json
+from app.services.facets import set_facets
+from app.services.job_claims import claim_jobs, finished_since, marks, release_claim, wait_steps
+from app.services.llm import LLMError
+from app.services.llm_flow import LLMCall, Progress, run_sync
+from app.services.near_dup import canonical_only, copy_from_canonical, resolve_canonical
 from app.services.prompts import build_batch_sort_messages
+from app.services.ranking import blend, default_weights, refresh_scores, stored_current
+from app.services.response_cache import cached_get
+from app.services.resume_cache import latest_or_error
 
 bp = Blueprint("sort", __name__)
 
 _BATCH_SIZE = 20  # max jobs per Claude call regardless of MAX_BATCH_JOBS
 
 
-def _get_latest_resume(db):
-    resume = db.query(Resume).order_by(Resume.updated_at.desc()).first()
-    if not resume:
-        return None, (jsonify({"detail": "No resume found. Upload a resume first."}), 400)
-    return resume, None
-
-
 def _normalize_score(value) -> int:
     try:
         s = int(round(float(value)))
@@ -39,160 +41,235 @@ def _normalize_score(value) -> int:
 
 @bp.post("/sort")
 def sort_jobs():
-    """Batch parse + score up to MAX_BATCH_JOBS jobs in one Claude call per batch."""
-    data = request.get_json(silent=True) or {}
+    """Batch parse + score up to MAX_BATCH_JOBS jobs in one Claude call per batch.
+
+    Jobs are claimed first (see services/job_claims.py): jobs another request is
+    already sorting are waited for and reported as reused instead of re-sent.
+    """
+    return run_sync(sort_flow(request.get_json(silent=True) or {}))
+
+
+def sort_flow(data: dict):
+    """POST /sort as a flow (services/llm_flow.py); app/asgi.py serves it on the event loop
+    and api/v1/runs.py runs it in the background with a "job" event per sorted job."""
     job_ids = data.get("job_ids")
 
     try:
         with get_db() as db:
-            resume, err = _get_latest_resume(db)
+            resume, err = latest_or_error(db)
             if err:
                 return err
 
-            query = db.query(Job)
+            query = db.query(Job.id)
             if job_ids is not None:
                 if len(job_ids) == 0:
                     return jsonify({"message": "No job_ids provided; sorted 0 job(s)", "sorted_count": 0})
-                query = query.filter(Job.id.in_([UUID(j) for j in job_ids]))
+                query = query.filter(Job.id.in_(resolve_canonical(db, [UUID(j) for j in job_ids])))
+            else:
+                # Near duplicates take their canonical job's result instead of an LLM call.
+                query = canonical_only(query)
 
             # Only process jobs not yet analysed
-            jobs = query.filter(Job.analyzed_at.is_(None)).all()
+            candidate_ids = [row.id for row in query.filter(Job.analyzed_at.is_(None)).all()]
 
-            if not jobs:
+            if not candidate_ids:
                 return jsonify({"message": "All jobs already sorted.", "sorted_count": 0})
 
-            if len(jobs) > settings.MAX_BATCH_JOBS:
+            if len(candidate_ids) > settings.MAX_BATCH_JOBS:
                 return jsonify({
                     "detail": (
-                        f"Batch too large: {len(jobs)} unsorted jobs. "
+                        f"Batch too large: {len(candidate_ids)} unsorted jobs. "
                         f"Select ≤{settings.MAX_BATCH_JOBS} at a time, or raise MAX_BATCH_JOBS in .env."
                     )
                 }), 422
 
-            now = datetime.now(timezone.utc)
-            sorted_count = 0
-            errors = []
-
-            # Process in sub-batches of up to _BATCH_SIZE
-            for batch_start in range(0, len(jobs), _BATCH_SIZE):
-                batch = jobs[batch_start: batch_start + _BATCH_SIZE]
-                job_payloads = [
-                    {
-                        "job_id": str(job.id),
-                        "title": job.title or "",
-                        "company": job.company or "",
-                        "raw_text": (job.raw_text or "")[:3000],
-                    }
-                    for job in batch
-                ]
-
-                try:
-                    messages = build_batch_sort_messages(resume.raw_text, job_payloads)
-                    results = claude_chat_json(messages)
-                except LLMError as exc:
-                    return jsonify({"detail": str(exc)}), 502
-
-                if not isinstance(results, list):
-                    return jsonify({"detail": "Claude returned unexpected format (expected JSON array)"}), 502
-
-                # Index results by job_id for fast lookup
-                result_map = {}
-                for item in results:
-                    if isinstance(item, dict) and "job_id" in item:
-                        result_map[item["job_id"]] = item
-
-                for job in batch:
-                    item = result_map.get(str(job.id))
-                    if not item:
-                        errors.append(f"No result returned for job {job.id}")
-                        continue
-
-                    structured = {
-                        "about_summary": item.get("about_summary"),
-                        "experience_requirements": item.get("experience_requirements"),
-                        "expertise_requirements": item.get("expertise_requirements"),
-                        "business_cultural_requirements": item.get("business_cultural_requirements"),
-                        "sponsorship_requirements": item.get("sponsorship_requirements"),
-                        "work_location_requirements": item.get("work_location_requirements"),
-                        "education_requirements": item.get("education_requirements"),
-                    }
-                    job.structured_requirements = structured
-                    job.parsed_at = now
-                    job.score = _normalize_score(item.get("score", 0))
-                    job.resume_recommendation = str(item.get("resume_key") or "general")[:32]
-                    job.guidance_3_sentences = str(item.get("guidance_3_sentences") or "")
-                    job.analysis = {"source": "batch_sort", "raw": item}
-                    job.status = JobStatus.analyzed
-                    job.analyzed_at = now
-                    sorted_count += 1
-
-            db.commit()
+            claim = claim_jobs(db, candidate_ids, pending=Job.analyzed_at.is_(None))
+            try:
+                before = marks(db, claim, Job.analyzed_at)
+                jobs = (
+                    db.query(Job).options(undefer(Job.raw_text)).filter(Job.id.in_(claim.owned)).all()
+                    if claim.owned else []
+                )
+                yield Progress([("queued", {"job_count": len(jobs), "waiting_count": len(claim.waiting)})])
+                sorted_count, errors, failure = yield from _sort_batches(db, resume, jobs)
+            finally:
+                release_claim(db, claim)
+            if failure:
+                return failure
+
+            # Sorted by a concurrent request: before we could claim them, or while we waited.
+            reused_count = len(claim.done)
+            if claim.waiting:
+                released = yield from wait_steps(db, claim)
+                reused_count += len(finished_since(db, released, before, Job.analyzed_at))
 
             msg = f"Sorted {sorted_count} job(s)."
+            if reused_count:
+                msg += f" Reused {reused_count} job(s) sorted by a concurrent request."
             if errors:
                 msg += f" {len(errors)} job(s) had no result from Claude."
-            return jsonify({"message": msg, "sorted_count": sorted_count})
+            return jsonify({"message": msg, "sorted_count": sorted_count, "reused_count": reused_count})
 
     except Exception:
         traceback.print_exc()
         return jsonify({"detail": "Sort failed. Check server logs."}), 500
 
 
+def _sort_batches(db, resume, jobs):
+    """Send owned jobs to Claude in sub-batches, committing each. Returns (count, errors, error_response).
+
+    A failed call ends the request with 502, but batches already sorted are kept.
+    """
+    now = datetime.now(timezone.utc)
+    sorted_count = 0
+    errors = []
+    # Free the connection for the LLM waits; commits below keep the loaded jobs.
+    end_transaction(db)
+
+    # Process in sub-batches of up to _BATCH_SIZE
+    for batch_start in range(0, len(jobs), _BATCH_SIZE):
+        batch = jobs[batch_start: batch_start + _BATCH_SIZE]
+        job_payloads = [
+            {
+                "job_id": str(job.id),
+                "title": job.title or "",
+                "company": job.company or "",
+                "raw_text": (job.raw_text or "")[:3000],
+            }
+            for job in batch
+        ]
+
+        try:
+            messages = build_batch_sort_messages(resume.prompt_prefix, job_payloads)
+            results = yield LLMCall(messages, "batch_sort")
+        except LLMError as exc:
+            return sorted_count, errors, (jsonify({"detail": str(exc), "sorted_count": sorted_count}), 502)
+
+        if not isinstance(results, list):
+            return sorted_count, errors, (jsonify({
+                "detail": "Claude returned unexpected format (expected JSON array)", "sorted_count": sorted_count,
+            }), 502)
+
+        # Index results by job_id for fast lookup
+        result_map = {}
+        for item in results:
+            if isinstance(item, dict) and "job_id" in item:
+                result_map[item["job_id"]] = item
+
+        events = []
+        for job in batch:
+            item = result_map.get(str(job.id))
+            if not item:
+                errors.append(f"No result returned for job {job.id}")
+                events.append(("job", {"job_id": str(job.id), "error": "No result returned"}))
+                continue
+
+            structured = {
+                "about_summary": item.get("about_summary"),
+                "experience_requirements": item.get("experience_requirements"),
+                "expertise_requirements": item.get("expertise_requirements"),
+                "business_cultural_requirements": item.get("business_cultural_requirements"),
+                "sponsorship_requirements": item.get("sponsorship_requirements"),
+                "work_location_requirements": item.get("work_location_requirements"),
+                "education_requirements": item.get("education_requirements"),
+            }
+            job.structured_requirements = structured
+            set_facets(job)
+            job.parsed_at = now
+            job.score = _normalize_score(item.get("score", 0))
+            job.resume_recommendation = str(item.get("resume_key") or "general")[:32]
+            job.guidance_3_sentences = str(item.get("guidance_3_sentences") or "")
+            job.analysis = {"source": "batch_sort", "raw": item}
+            job.status = JobStatus.analyzed
+            job.analyzed_at = now
+            sorted_count += 1
+            events.append(("job", {
+                "job_id": str(job.id), "score": job.score, "resume_key": job.resume_recommendation,
+            }))
+
+        sorted_ids = [job.id for job in batch if job.analyzed_at == now]
+        refresh_scores(db, sorted_ids + copy_from_canonical(db, sorted_ids))
+        end_transaction(db)
+        yield Progress(events)
+
+    return sorted_count, errors, None
+
+
 # ---------------------------------------------------------------------------
 # GET /api/v1/rank
 # ---------------------------------------------------------------------------
 
+# Response entry for a (rank, *_rank_columns(combined)) row.
+_rank_row = row_serializer(
+    (
+        "rank", "job_id", "title", "company", "location", "score", "preference_score", "combined_score",
+        "guidance_3_sentences", "resume_recommendation", "url",
+    ),
+    {"combined_score": lambda value: round(value, 2)},
+)
+
+
+def _rank_columns(combined):
+    return (
+        Job.id, Job.title, Job.company, Job.location, Job.score, Job.preference_score, combined,
+        Job.guidance_3_sentences, Job.resume_recommendation, Job.url,
+    )
+
+
 @bp.get("/rank")
+@cached_get("jobs")
 def rank_jobs():
-    """Pure-backend ranking: blend LLM score + ELO preference_score, return 1,2,3... list."""
-    with get_db() as db:
-        jobs = db.query(Job).filter(Job.analyzed_at.isnot(None)).all()
+    """Top-k of analyzed jobs by combined score (LLM score + normalised ELO preference_score), 1,2,3...
 
-        if not jobs:
-            return jsonify({"detail": "No sorted jobs yet. Run Sort Things first."}), 400
+    Reads the materialised jobs.combined_score (see services/ranking.py) through its index.
+    Query params: limit (default 100, max 500), offset, min_score, company (substring),
+    w_llm / w_pref to rank with other blend weights from the stored components, and
+    with_total=1 to also count all matches (a scan; next_offset does not need it).
+    """
+    try:
+        limit = int(request.args.get("limit", 100))
+        offset = int(request.args.get("offset", 0))
+        min_score = float(request.args["min_score"]) if request.args.get("min_score") else None
+        w_llm = float(request.args.get("w_llm", settings.RANK_WEIGHT_LLM))
+        w_pref = float(request.args.get("w_pref", settings.RANK_WEIGHT_PREFERENCE))
+    except ValueError:
+        return jsonify({"detail": "limit, offset, min_score, w_llm and w_pref must be numbers"}), 422
+    if limit < 1 or limit > 500 or offset < 0:
+        return jsonify({"detail": "limit must be between 1 and 500 and offset >= 0"}), 422
+    if w_llm < 0 or w_pref < 0 or w_llm + w_pref <= 0:
+        return jsonify({"detail": "w_llm and w_pref must be >= 0 and not both 0"}), 422
+    company = (request.args.get("company") or "").strip()
+    with_total = request.args.get("with_total", "").lower() in ("1", "true")
 
-        # Normalise ELO to 0-100
-        elo_scores = [j.preference_score for j in jobs if j.preference_score is not None]
-        if len(elo_scores) >= 2:
-            elo_min, elo_max = min(elo_scores), max(elo_scores)
-            elo_range = elo_max - elo_min
+    with get_db() as db:
+        # Until the stored blend catches up with new RANK_WEIGHT_* it is computed from the components.
+        if (w_llm, w_pref) == default_weights() and stored_current(db):
+            combined = Job.combined_score
         else:
-            elo_min, elo_max, elo_range = 0.0, 0.0, 0.0
-
-        def _elo_norm(ps) -> float:
-            if ps is None or elo_range == 0:
-                return 50.0
-            return (ps - elo_min) / elo_range * 100.0
-
-        ranked_jobs = []
-        for job in jobs:
-            llm = job.score if job.score is not None else None
-            elo = _elo_norm(job.preference_score) if job.preference_score is not None else None
-
-            if llm is not None and elo is not None:
-                combined = 0.6 * llm + 0.4 * elo
-            elif llm is not None:
-                combined = float(llm)
-            elif elo is not None:
-                combined = elo
-            else:
-                combined = 0.0
+            combined = blend(Job.score, Job.preference_norm, w_llm, w_pref)
+
+        filters = [Job.combined_score.isnot(None)]
+        if min_score is not None:
+            filters.append(combined >= min_score)
+        if company:
+            filters.append(Job.company.ilike(f"%{company}%"))
+
+        # One row past the page tells whether there is a next one.
+        rows = db.execute(
+            canonical_only(select(*_rank_columns(combined)).where(*filters))
+            .order_by(combined.desc(), Job.id)
+            .offset(offset)
+            .limit(limit + 1)
+        ).all()
+        if not rows and offset == 0 and not (min_score is not None or company):
+            return jsonify({"detail": "No sorted jobs yet. Run Sort Things first."}), 400
 
-            ranked_jobs.append({
-                "job_id": str(job.id),
-                "title": job.title,
-                "company": job.company,
-                "location": job.location,
-                "score": job.score,
-                "preference_score": job.preference_score,
-                "combined_score": round(combined, 2),
-                "guidance_3_sentences": job.guidance_3_sentences,
-                "resume_recommendation": job.resume_recommendation,
-                "url": job.url,
-            })
-
-        ranked_jobs.sort(key=lambda x: x["combined_score"], reverse=True)
-        for i, entry in enumerate(ranked_jobs, start=1):
-            entry["rank"] = i
-
-        return jsonify({"ranked": ranked_jobs})
+        ranked_jobs = [_rank_row((offset + i, *row)) for i, row in enumerate(rows[:limit], start=1)]
+        body = {
+            "ranked": ranked_jobs,
+            "next_offset": offset + limit if len(rows) > limit else None,
+            "weights": {"llm": w_llm, "preference": w_pref},
+        }
+        if with_total:
+            body["total"] = canonical_only(db.query(func.count(Job.id)).filter(*filters)).scalar()
+        return jsonify(body)
@@ -0,0 +1,219 @@
+"""
+ASGI entry point: LLM-bound routes on an event loop, everything else on Flask.
+
+    cd backend && WEB_MODE=asgi python -m app.serving    # gunicorn + uvicorn workers
+    cd backend && uvicorn app.asgi:app --port 5000        # single process
+
+POST /api/v1/sort, /cull and /parse run their flows (services/llm_flow.py)
+natively: each DB segment runs on the worker's thread pool inside a Flask
+request context, and LLM calls are awaited on the async client, at most
+LLM_MAX_CONCURRENCY per process. A request waiting on the LLM is a coroutine
+holding neither a thread nor a DB connection, so /jobs and /health stay
+responsive while thousands of such waits are in flight. At most
+ASYNC_MAX_REQUESTS of them are admitted per process; beyond that the answer
+is 503 with Retry-After.
+
+Background runs started with POST /api/v1/runs are driven the same way, as
+tasks on the loop, and GET /api/v1/runs/<id>/events streams natively: the
+route's Flask view answers the status and headers (404, CORS), then the
+event log is polled on the thread pool between asyncio sleeps, so an open
+stream holds no thread either.
+
+Every other request goes to the unchanged Flask app through a2wsgi, on the
+same pool of WEB_THREADS threads, which is also what the DB pool is sized
+for (core/database.pool_settings).
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import re
+from functools import partial
+
+from a2wsgi import WSGIMiddleware
+from a2wsgi.wsgi import build_environ
+from flask import request
+
+from app.api.v1 import runs as runs_api
+from app.api.v1.cull import cull_flow
+from app.api.v1.jobs import parse_flow
+from app.api.v1.sort import sort_flow
+from app.core.config import settings
+from app.main import app as flask_app
+from app.services import llm_metrics, run_events
+from app.services.llm_flow import Wait, run_async
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/v1"
+# path -> (Flask endpoint name, for metrics labels; flow)
+FLOW_ROUTES = {
+    f"{API_PREFIX}/sort": ("sort.sort_jobs", sort_flow),
+    f"{API_PREFIX}/cull": ("cull.begin_cull", cull_flow),
+    f"{API_PREFIX}/parse": ("jobs.parse_jobs", parse_flow),
+}
+EVENTS_PATH = re.compile(rf"^{API_PREFIX}/runs/[0-9a-fA-F-]{{36}}/events$")
+RETRY_AFTER_S = 5
+
+wsgi = WSGIMiddleware(flask_app, workers=settings.WEB_THREADS)
+_in_flight = 0
+_runs: set = set()
+_launch_loop = None
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+async def _send(send, status: int, headers, body: bytes) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _request_context(scope, body: bytes):
+    environ = build_environ(scope, io.BytesIO(body))
+    environ["wsgi.input_terminated"] = True
+    return flask_app.request_context(environ)
+
+
+async def _request_json(base) -> dict:
+    def read():
+        with base.copy():
+            return request.get_json(silent=True) or {}
+
+    return await asyncio.get_running_loop().run_in_executor(wsgi.executor, read)
+
+
+async def _run_flow(scope, receive, send, endpoint: str, flow_fn) -> None:
+    base = _request_context(scope, await _read_body(receive))
+    llm_metrics.endpoint_label.set(endpoint)
+    try:
+        rv = await run_async(flow_fn(await _request_json(base)), wsgi.executor, base.copy)
+    except Exception:
+        logger.exception("Unhandled error in %s", endpoint)
+        await _send(send, 500, [("content-type", "application/json")], b'{"detail": "Internal server error"}')
+        return
+
+    def finish():
+        with base.copy():
+            response = flask_app.process_response(flask_app.make_response(rv))
+            return response.status_code, list(response.headers.items()), response.get_data()
+
+    status, headers, body = await asyncio.get_running_loop().run_in_executor(wsgi.executor, finish)
+    await _send(send, status, headers, body)
+
+
+async def _drive_run(log: run_events.RunLog, flow, endpoint: str) -> None:
+    loop = asyncio.get_running_loop()
+    llm_metrics.endpoint_label.set(endpoint)
+    try:
+        rv = await run_async(flow, wsgi.executor, flask_app.app_context, log.progress)
+    except Exception:
+        logger.exception("Run %s failed", log.run_id)
+        await loop.run_in_executor(wsgi.executor, runs_api.fail, log)
+        return
+
+    def finish():
+        with flask_app.app_context():
+            runs_api.finish(flask_app, log, rv)
+
+    await loop.run_in_executor(wsgi.executor, finish)
+
+
+def _launch(loop, _app, log: run_events.RunLog, flow, endpoint: str) -> None:
+    """runs_api.launcher under ASGI: called on a pool thread, schedules the run on ``loop``."""
+    future = asyncio.run_coroutine_threadsafe(_drive_run(log, flow, endpoint), loop)
+    _runs.add(future)
+    future.add_done_callback(_runs.discard)
+
+
+async def _stream_events(scope, receive, send) -> None:
+    loop = asyncio.get_running_loop()
+    base = _request_context(scope, b"")
+
+    def start():
+        with base.copy():
+            response = flask_app.full_dispatch_request()
+            headers = list(response.headers.items())
+            if response.mimetype != "text/event-stream":
+                return response.status_code, headers, response.get_data(), None
+            response.close()
+            after = run_events.last_event_id(request.headers.get("Last-Event-ID") or request.args.get("last_event_id"))
+            return response.status_code, headers, None, run_events.follow_steps(request.view_args["run_id"], after)
+
+    try:
+        status, headers, body, steps = await loop.run_in_executor(wsgi.executor, start)
+    except Exception:
+        logger.exception("Unhandled error in runs.run_event_stream")
+        await _send(send, 500, [("content-type", "application/json")], b'{"detail": "Internal server error"}')
+        return
+    if steps is None:
+        await _send(send, status, headers, body)
+        return
+
+    disconnected = asyncio.Event()
+
+    async def watch():
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        disconnected.set()
+
+    watcher = asyncio.create_task(watch())
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+    })
+    try:
+        while not disconnected.is_set():
+            chunk = await loop.run_in_executor(wsgi.executor, next, steps, None)
+            if chunk is None:
+                await send({"type": "http.response.body", "body": b""})
+                break
+            if isinstance(chunk, Wait):
+                try:
+                    await asyncio.wait_for(disconnected.wait(), chunk.seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await send({"type": "http.response.body", "body": chunk.encode(), "more_body": True})
+    finally:
+        watcher.cancel()
+        steps.close()
+
+
+async def app(scope, receive, send) -> None:
+    global _in_flight, _launch_loop
+    loop = asyncio.get_running_loop()
+    if _launch_loop is not loop:
+        _launch_loop = loop
+        runs_api.launcher = partial(_launch, loop)
+    if scope["type"] == "http" and scope["method"] == "GET" and EVENTS_PATH.match(scope["path"]):
+        await _stream_events(scope, receive, send)
+        return
+    route = FLOW_ROUTES.get(scope["path"]) if scope["type"] == "http" and scope["method"] == "POST" else None
+    if route is None:
+        await wsgi(scope, receive, send)
+        return
+    if _in_flight >= settings.ASYNC_MAX_REQUESTS:
+        await _send(send, 503, [("content-type", "application/json"), ("retry-after", str(RETRY_AFTER_S))],
+                    b'{"detail": "Too many LLM requests in progress; retry shortly."}')
+        return
+    _in_flight += 1
+    try:
+        await _run_flow(scope, receive, send, *route)
+    finally:
+        _in_flight -= 1
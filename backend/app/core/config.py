@@ -18,10 +18,121 @@ class Settings:
     ANTHROPIC_API_KEY: str | None = os.getenv("ANTHROPIC_API_KEY") or None
     ANTHROPIC_MODEL: str = os.getenv("ANTHROPIC_MODEL", "claude-haiku-4-5")
 
+    # LLM backend: "anthropic" (real API) or "standin" (local Anthropic-compatible
+    # server from app/services/llm_standin.py; no API key needed, no cost).
+    LLM_BACKEND: str = os.getenv("LLM_BACKEND", "anthropic").lower()
+    LLM_STANDIN_URL: str = os.getenv("LLM_STANDIN_URL", "http://127.0.0.1:5055")
+
+    # Stand-in server behaviour (only read by the stand-in process).
+    # LLM_STANDIN_LATENCY is time-to-first-token as "<dist>:<a>[:<b>]" in ms:
+    #   fixed:800 | uniform:200:1500 | normal:800:200 | lognormal:800:0.5 (median, sigma)
+    LLM_STANDIN_LATENCY: str = os.getenv("LLM_STANDIN_LATENCY", "lognormal:800:0.5")
+    LLM_STANDIN_TOKENS_PER_SEC: float = float(os.getenv("LLM_STANDIN_TOKENS_PER_SEC", "80"))
+    LLM_STANDIN_429_RATE: float = float(os.getenv("LLM_STANDIN_429_RATE", "0"))
+    LLM_STANDIN_529_RATE: float = float(os.getenv("LLM_STANDIN_529_RATE", "0"))
+    LLM_STANDIN_TRUNCATE_RATE: float = float(os.getenv("LLM_STANDIN_TRUNCATE_RATE", "0"))
+    LLM_STANDIN_SEED: int = int(os.getenv("LLM_STANDIN_SEED", "0"))
+
+    # LLM instrumentation: also write one llm_calls row per call (aggregates are always kept
+    # in memory and served at /internal/metrics). Price overrides are USD per million tokens;
+    # unset means the built-in table in services/llm_metrics.py.
+    LLM_CALL_LOG: bool = os.getenv("LLM_CALL_LOG", "false").lower() == "true"
+    LLM_PRICE_INPUT_PER_MTOK: float | None = (
+        float(os.environ["LLM_PRICE_INPUT_PER_MTOK"]) if os.getenv("LLM_PRICE_INPUT_PER_MTOK") else None
+    )
+    LLM_PRICE_OUTPUT_PER_MTOK: float | None = (
+        float(os.environ["LLM_PRICE_OUTPUT_PER_MTOK"]) if os.getenv("LLM_PRICE_OUTPUT_PER_MTOK") else None
+    )
+
+    # GET /internal/metrics is off (404) unless METRICS_TOKEN is set; scrapers then send
+    # "Authorization: Bearer <token>". The route is never CORS-enabled.
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+
     # Cost guardrail: max jobs processed per LLM batch call (analyze / parse).
     # Raise via MAX_BATCH_JOBS env var when you need to process more.
     MAX_BATCH_JOBS: int = int(os.getenv("MAX_BATCH_JOBS", "25"))
 
+    # /parse: fields the local regex/lexicon extractor detects with at least this
+    # confidence (0-1) skip the LLM; only the remaining fields are requested.
+    # Set above 1 to always send every field to the LLM.
+    PARSE_LOCAL_MIN_CONFIDENCE: float = float(os.getenv("PARSE_LOCAL_MIN_CONFIDENCE", "0.8"))
+
+    # POST /ingest/batch: max postings per request.
+    INGEST_BATCH_MAX_ITEMS: int = int(os.getenv("INGEST_BATCH_MAX_ITEMS", "5000"))
+
+    # Near-duplicate detection at ingest: estimated Jaccard similarity of word shingles at or above
+    # which a new posting is linked to an existing one (services/near_dup.py).
+    NEAR_DUP_THRESHOLD: float = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+
+    # GET /jobs/semantic and /jobs/<id>/similar: query vectors memoised per worker. Jobs are
+    # embedded by a background thread started after ingest; false leaves it to
+    # `python -m app.services.semantic` (services/semantic.py).
+    SEMANTIC_QUERY_CACHE: int = int(os.getenv("SEMANTIC_QUERY_CACHE", "512"))
+    SEMANTIC_EMBED_IN_BACKGROUND: bool = os.getenv("SEMANTIC_EMBED_IN_BACKGROUND", "true").lower() == "true"
+
+    # GET /jobs/export: rows per server-side cursor fetch, and gzip level when the client accepts gzip.
+    EXPORT_FETCH_ROWS: int = int(os.getenv("EXPORT_FETCH_ROWS", "1000"))
+    EXPORT_GZIP_LEVEL: int = int(os.getenv("EXPORT_GZIP_LEVEL", "6"))
+
+    # Job claims for LLM work: how long a claim lease lives before another worker may
+    # take the job over, and how long a request waits for jobs claimed by someone else.
+    JOB_LEASE_SECONDS: int = int(os.getenv("JOB_LEASE_SECONDS", "600"))
+    CLAIM_WAIT_SECONDS: float = float(os.getenv("CLAIM_WAIT_SECONDS", "120"))
+
+    # /analyze backend: "auto" (LLM when configured, else local), "llm" or "local".
+    # The local scorer blends resume/job embedding similarity, BM25 keyword overlap and
+    # rule features; PREFERRED_WORK_MODE (remote | hybrid | onsite, empty = any) feeds the rules.
+    ANALYZER_BACKEND: str = os.getenv("ANALYZER_BACKEND", "auto").lower()
+    PREFERRED_WORK_MODE: str = os.getenv("PREFERRED_WORK_MODE", "").lower()
+
+    # Resume text sent to /sort and /cull prompts: whitespace-compacted, then cut to this many
+    # characters. Built once per resume version (services/resume_cache.py).
+    RESUME_PROMPT_CHARS: int = int(os.getenv("RESUME_PROMPT_CHARS", "5000"))
+
+    # Two-stage /cull: when there are more candidates than this, only the top-K by
+    # resume/job embedding similarity go to the LLM. 0 disables the prefilter.
+    CULL_PREFILTER_K: int = int(os.getenv("CULL_PREFILTER_K", "50"))
+
+    # GET /rank blend: combined = (w_llm * score + w_pref * preference_norm) / (w_llm + w_pref).
+    # Stored combined_score values follow these; changing them recomputes once on the next refresh.
+    RANK_WEIGHT_LLM: float = float(os.getenv("RANK_WEIGHT_LLM", "0.6"))
+    RANK_WEIGHT_PREFERENCE: float = float(os.getenv("RANK_WEIGHT_PREFERENCE", "0.4"))
+
+    # Read cache for GET /jobs, /jobs/<id> and /rank: serialized bodies per worker, keyed by
+    # route, query, table versions and the release (ETag / If-None-Match works even with 0
+    # entries). APP_VERSION names the release; unset, a hash of the backend sources is used,
+    # so a deploy never answers 304 for a body rendered by the previous code or schema.
+    RESPONSE_CACHE_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_ENTRIES", "256"))
+    RESPONSE_CACHE_MAX_BYTES: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    APP_VERSION: str = os.getenv("APP_VERSION", "")
+
+    # Serving (app/serving.py). WEB_CONCURRENCY worker processes x WEB_THREADS threads each.
+    # Unset DB_POOL_SIZE / DB_MAX_OVERFLOW are derived so that all workers together stay
+    # within DB_MAX_CONNECTIONS (leave headroom below Postgres max_connections).
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "4"))
+    WEB_THREADS: int = int(os.getenv("WEB_THREADS", "4"))
+    DB_MAX_CONNECTIONS: int = int(os.getenv("DB_MAX_CONNECTIONS", "80"))
+    DB_POOL_SIZE: int | None = int(os.environ["DB_POOL_SIZE"]) if os.getenv("DB_POOL_SIZE") else None
+    DB_MAX_OVERFLOW: int | None = int(os.environ["DB_MAX_OVERFLOW"]) if os.getenv("DB_MAX_OVERFLOW") else None
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+    # WEB_MODE=asgi serves app/asgi.py on uvicorn workers instead: /sort, /cull and /parse wait
+    # for the LLM on the event loop, and WEB_THREADS becomes the per-process thread pool for DB
+    # work and every other route. LLM_MAX_CONCURRENCY caps LLM calls in flight per process;
+    # ASYNC_MAX_REQUESTS caps LLM-route requests in flight per process (beyond it: 503).
+    WEB_MODE: str = os.getenv("WEB_MODE", "wsgi").lower()
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+    ASYNC_MAX_REQUESTS: int = int(os.getenv("ASYNC_MAX_REQUESTS", "1000"))
+
+    # Background runs (POST /runs) keep their progress events this long for
+    # GET /runs/<id>/events; older ones are pruned when a run starts.
+    RUN_EVENTS_RETENTION_HOURS: int = int(os.getenv("RUN_EVENTS_RETENTION_HOURS", "24"))
+
+    # Response JSON encoder: "auto" (orjson when installed) or "stdlib".
+    JSON_PROVIDER: str = os.getenv("JSON_PROVIDER", "auto").lower()
+
     # App
     DEBUG: bool = os.getenv("DEBUG", "true").lower() == "true"
     API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Dict, Generator
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
@@ -13,7 +13,28 @@ class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(settings.DATABASE_URL)
+def pool_settings(workers: int, threads: int, max_connections: int) -> Dict[str, int]:
+    """Per-process pool size/overflow: one steady connection per thread, bursts up to an equal
+    share of ``max_connections`` across ``workers`` processes."""
+    per_worker = max(1, max_connections // max(1, workers))
+    pool_size = settings.DB_POOL_SIZE if settings.DB_POOL_SIZE is not None else min(threads, per_worker)
+    max_overflow = (
+        settings.DB_MAX_OVERFLOW if settings.DB_MAX_OVERFLOW is not None else max(0, per_worker - pool_size)
+    )
+    return {"pool_size": pool_size, "max_overflow": max_overflow}
+
+
+def _engine_kwargs() -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {"pool_pre_ping": True, "pool_recycle": settings.DB_POOL_RECYCLE}
+    if settings.DATABASE_URL.startswith("postgresql"):
+        kwargs.update(pool_settings(settings.WEB_CONCURRENCY, settings.WEB_THREADS, settings.DB_MAX_CONNECTIONS))
+        kwargs["pool_timeout"] = settings.DB_POOL_TIMEOUT
+        if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+            kwargs["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return kwargs
+
+
+engine = create_engine(settings.DATABASE_URL, **_engine_kwargs())
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 
@@ -25,3 +46,21 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def end_transaction(db: Session) -> None:
+    """Commit without expiring loaded objects, so the connection goes back to the pool.
+
+    Called before waiting on the LLM: the loaded rows stay usable and a
+    session that is only waiting does not hold a connection.
+    """
+    expire, db.expire_on_commit = db.expire_on_commit, False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire
+
+
+def reset_engine_after_fork() -> None:
+    """Forget pooled connections inherited from the parent without closing them (they are the parent's)."""
+    engine.dispose(close=False)
@@ -0,0 +1,104 @@
+"""
+JSON encoding for API responses.
+
+``FastJSONProvider`` replaces Flask's stdlib provider (set in main.py). With
+orjson installed it encodes straight to bytes and natively handles UUID,
+datetime, enum and numpy values; without it, the stdlib encoder is used with
+the same type conversions, so responses look the same either way
+(JSON_PROVIDER=stdlib forces the fallback).
+
+``row_serializer`` builds, once per endpoint, a function turning a SQL result
+tuple into a response dict with no per-row attribute lookups: values are
+passed through as-is (the encoder formats UUIDs and datetimes) and only the
+named fields get a transform.
+"""
+from __future__ import annotations
+
+import dataclasses
+import enum
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+
+from flask import Response
+from flask.json.provider import JSONProvider
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+_ORJSON_OPTIONS = 0
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, "tolist"):  # numpy arrays and scalars
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def use_orjson() -> bool:
+    return orjson is not None and settings.JSON_PROVIDER != "stdlib"
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact JSON bytes for ``obj``."""
+    if use_orjson():
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class FastJSONProvider(JSONProvider):
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps(obj).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if use_orjson():
+            return orjson.loads(s)
+        return json.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
+
+
+def row_serializer(
+    keys: Sequence[str], transforms: Optional[Mapping[str, Callable[[Any], Any]]] = None
+) -> Callable[[Sequence[Any]], Dict[str, Any]]:
+    """Row tuple -> dict with ``keys`` in order; ``transforms`` apply to non-None values of the named keys."""
+    keys = tuple(keys)
+    steps = [(key, fn) for key, fn in (transforms or {}).items()]
+    unknown = {key for key, _ in steps} - set(keys)
+    if unknown:
+        raise ValueError(f"transforms for unknown keys: {sorted(unknown)}")
+
+    if not steps:
+        return lambda row: dict(zip(keys, row))
+
+    def serialize(row: Sequence[Any]) -> Dict[str, Any]:
+        out = dict(zip(keys, row))
+        for key, fn in steps:
+            value = out[key]
+            if value is not None:
+                out[key] = fn(value)
+        return out
+
+    return serialize
@@ -5,10 +5,13 @@ from pathlib import Path
 from flask import Flask, send_from_directory
 from flask_cors import CORS
 
+from app.api.internal import metrics as internal_metrics
 from app.api.v1 import cull as v1_cull
 from app.api.v1 import jobs as v1_jobs
 from app.api.v1 import preferences as v1_preferences
+from app.api.v1 import runs as v1_runs
 from app.api.v1 import sort as v1_sort
+from app.core.serialization import FastJSONProvider
 
 # Frontend: repo root is backend's parent
 FRONTEND_DIR = Path(__file__).resolve().parent.parent.parent / "frontend"
@@ -19,12 +22,16 @@ app = Flask(
     static_url_path="",
 )
 
-CORS(app)
+app.json = FastJSONProvider(app)
+# Cross-origin access for the web UI and extension; /internal stays same-origin only.
+CORS(app, resources={r"/api/*": {}, r"/health": {}})
 
 app.register_blueprint(v1_jobs.bp, url_prefix="/api/v1")
 app.register_blueprint(v1_cull.bp, url_prefix="/api/v1")
 app.register_blueprint(v1_preferences.bp, url_prefix="/api/v1")
 app.register_blueprint(v1_sort.bp, url_prefix="/api/v1")
+app.register_blueprint(v1_runs.bp, url_prefix="/api/v1")
+app.register_blueprint(internal_metrics.bp, url_prefix="/internal")
 
 
 @app.get("/")
@@ -7,9 +7,9 @@ import uuid
 from datetime import datetime
 from typing import Any, Optional
 
-from sqlalchemy import DateTime, Enum, Float, Integer, JSON, String, Text
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Boolean, Computed, DateTime, Enum, Float, ForeignKey, Integer, JSON, LargeBinary, SmallInteger, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
+from sqlalchemy.orm import Mapped, load_only, mapped_column
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -21,8 +21,51 @@ class JobStatus(str, enum.Enum):
     applied = "applied"
 
 
+# Full-text document for GET /jobs/search (migration 012): title > company > raw_text.
+SEARCH_CONFIG = "english"
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(company, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(raw_text, '')), 'C')"
+)
+
+# Parsed requirements every job must have; parsers write PLACEHOLDER_TEXT when one is missing.
+REQUIRED_STRUCTURED_FIELDS = (
+    "about_summary",
+    "experience_requirements",
+    "expertise_requirements",
+    "business_cultural_requirements",
+    "sponsorship_requirements",
+    "work_location_requirements",
+    "education_requirements",
+)
+PLACEHOLDER_TEXT = "x, y, z"
+
+
+def _structured_field_present_sql(field: str) -> str:
+    # Python truthiness of the value, with blank and placeholder strings counting as missing.
+    value = f"structured_requirements->'{field}'"
+    return (
+        f"CASE jsonb_typeof({value}) "
+        f"WHEN 'string' THEN lower(btrim({value} #>> '{{}}', E' \\t\\n\\r\\f\\x0b')) NOT IN ('', '{PLACEHOLDER_TEXT}') "
+        f"WHEN 'array' THEN {value} <> '[]'::jsonb "
+        f"WHEN 'object' THEN {value} <> '{{}}'::jsonb "
+        f"WHEN 'number' THEN ({value})::numeric <> 0 "
+        f"WHEN 'boolean' THEN ({value})::boolean "
+        "ELSE false END"
+    )
+
+
+# Whether /parse has nothing left to do for a job (migration 015); maintained by Postgres.
+PARSE_COMPLETE_SQL = (
+    "coalesce(jsonb_typeof(structured_requirements) = 'object' AND "
+    + " AND ".join(f"({_structured_field_present_sql(field)})" for field in REQUIRED_STRUCTURED_FIELDS)
+    + ", false)"
+)
+
+
 class Job(Base):
-    """Single source of truth for jobs table; schema matches migrations 001-004."""
+    """Single source of truth for jobs table; schema matches migrations 001-016."""
 
     __tablename__ = "jobs"
 
@@ -34,8 +77,10 @@ class Job(Base):
     company: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     location: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     url: Mapped[str] = mapped_column(String(1000), nullable=False, unique=True)
-    raw_text: Mapped[str] = mapped_column(Text, nullable=False)
-    raw_data: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    # Heavy columns are deferred: list endpoints never fetch them. Routes that need
+    # them add undefer() to their query or call load_columns() afterwards.
+    raw_text: Mapped[str] = mapped_column(Text, nullable=False, deferred=True)
+    raw_data: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True, deferred=True)
 
     # Bookmarklet / public style extras
     selected_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -44,22 +89,50 @@ class Job(Base):
     # Analysis (score 0-100 in DB)
     status: Mapped[JobStatus] = mapped_column(Enum(JobStatus, name="jobstatus"), nullable=False, default=JobStatus.new)
     score: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    analysis: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    analysis: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True, deferred=True)
     resume_recommendation: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     reasoning: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     downsides: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     guidance_3_sentences: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Structured parsing
-    structured_requirements: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    structured_requirements: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    is_parse_complete: Mapped[bool] = mapped_column(Boolean, Computed(PARSE_COMPLETE_SQL, persisted=True), nullable=False)
+    # Filter facets derived from structured_requirements (services/facets.py); NULL when not stated.
+    work_mode: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    sponsorship: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    min_years: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
+    degree_level: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
     parsed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Preference scoring (Embeddings + Vector ELO)
     preference_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    embedding: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    embedding: Mapped[Optional[list]] = mapped_column(JSON, nullable=True, deferred=True)
+    # Set by a trigger whenever embedding is written (migration 020); services/semantic.sync_index reads it.
+    embedded_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Near-duplicate detection (services/near_dup.py): MinHash signature, and the canonical job
+    # this one reposts. Pipelines skip duplicates and copy the canonical job's results.
+    minhash: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True, deferred=True)
+    duplicate_of: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("jobs.id", ondelete="SET NULL"), nullable=True
+    )
+
+    # Generated by Postgres from title/company/raw_text; GIN-indexed, never written by the app.
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True, deferred=True
+    )
+
+    # Materialised ranking, maintained by services/ranking.py (NULL until analyzed)
+    preference_norm: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    combined_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+    # In-flight LLM work lease (see services/job_claims.py)
+    lease_owner: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Metadata
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     analyzed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     @staticmethod
@@ -73,3 +146,9 @@ class Job(Base):
             if not key:
                 key = str(uuid.uuid4())
         return hashlib.sha256(key.encode()).hexdigest()
+
+
+def load_columns(db, jobs: list[Job], *columns) -> None:
+    """Populate deferred or not-yet-loaded ``columns`` on ``jobs`` with one SELECT instead of one per job."""
+    if jobs:
+        db.query(Job).options(load_only(Job.id, *columns)).filter(Job.id.in_([job.id for job in jobs])).all()
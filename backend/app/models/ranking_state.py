@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Float, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class RankingState(Base):
+    """Single row (id=1): ELO bounds and blend weights the stored jobs.combined_score values use."""
+
+    __tablename__ = "ranking_state"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    elo_min: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    elo_max: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    weight_llm: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    weight_preference: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
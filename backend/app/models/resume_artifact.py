@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class ResumeArtifact(Base):
+    """What the pipelines derive from a resume, for one version of its text (migration 017); see services/resume_cache.py."""
+
+    __tablename__ = "resume_artifacts"
+
+    resume_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True
+    )
+    # sha256 of resumes.raw_text the row was built from; a mismatch means the row is stale.
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    compact_text: Mapped[str] = mapped_column(Text, nullable=False)
+    prompt_prefix: Mapped[str] = mapped_column(Text, nullable=False)
+    token_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    # NULL when the embedding model was unavailable at build time.
+    embedding: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
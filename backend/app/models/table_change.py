@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Identity, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class TableChange(Base):
+    """One writing statement on a versioned table, logged by the bump_table_version() trigger (migration 019)."""
+
+    __tablename__ = "table_changes"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    table_name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
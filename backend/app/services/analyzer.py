@@ -1,20 +1,23 @@
 from __future__ import annotations
 
-import hashlib
+import logging
+import math
 import re
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Protocol
+from typing import Optional, Protocol, Sequence
 
 from app.core.config import settings
 from app.models.job import Job
-from app.services.llm import LLMError, claude_chat_json
+from app.services.llm import LLMError, claude_chat_json, llm_enabled
 from app.services.prompts import build_analyzer_messages
 
 SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
 BULLET_PREFIX = re.compile(r"^[\s\-*•]+")
 WHITESPACE = re.compile(r"\s+")
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class AnalyzerResult:
@@ -25,9 +28,14 @@ class AnalyzerResult:
 
 
 class Analyzer(Protocol):
+    uses_llm: bool
+
     def analyze(self, job: Job) -> AnalyzerResult:
         ...
 
+    def analyze_many(self, jobs: Sequence[Job]) -> list[AnalyzerResult]:
+        ...
+
 
 def _normalize_text(text: str) -> str:
     lines = [BULLET_PREFIX.sub("", line).strip() for line in text.splitlines()]
@@ -91,30 +99,64 @@ def _normalize_resume(value: object) -> str:
     return key[:32]
 
 
-def _deterministic_score(seed: str) -> int:
-    digest = hashlib.sha256(seed.encode()).hexdigest()
-    return int(digest[:2], 16) % 101
+def _component(value: float) -> Optional[float]:
+    return None if math.isnan(value) else round(float(value), 3)
+
+
+class LocalAnalyzer:
+    """Scores jobs against the resume without any LLM call (see services/local_scorer.py)."""
+
+    uses_llm = False
+
+    def __init__(self, resume_text: Optional[str] = None, resume_vector: Optional[list[float]] = None):
+        from app.services.local_scorer import LocalFitScorer
 
+        vector = resume_vector
+        if resume_text and vector is None:
+            try:
+                from app.services.preference_engine import embed_resume
+                vector = embed_resume(resume_text)
+            except Exception:
+                logger.warning("Embedding model unavailable; local scores use keywords and rules only",
+                               exc_info=True)
+        self._has_resume = bool(resume_text)
+        self._scorer = LocalFitScorer(resume_text or "", vector, settings.PREFERRED_WORK_MODE)
 
-class StubAnalyzer:
     def analyze(self, job: Job) -> AnalyzerResult:
-        score = _deterministic_score(job.url or job.title or "job")
-        guidance = _fallback_guidance(job)
-        return AnalyzerResult(
-            score=score,
-            recommended_resume="general",
-            guidance_3_sentences=guidance,
-            analysis_raw={
-                "source": "stub",
-                "generated_at": datetime.utcnow().isoformat() + "Z",
-            },
-        )
+        return self.analyze_many([job])[0]
+
+    def analyze_many(self, jobs: Sequence[Job]) -> list[AnalyzerResult]:
+        if not jobs:
+            return []
+        fit = self._scorer.score(jobs)
+        generated_at = datetime.utcnow().isoformat() + "Z"
+        results = []
+        for i, job in enumerate(jobs):
+            results.append(AnalyzerResult(
+                score=int(fit.score[i]),
+                recommended_resume="general",
+                guidance_3_sentences=_fallback_guidance(job),
+                analysis_raw={
+                    "source": "local",
+                    "has_resume": self._has_resume,
+                    "components": {
+                        "embedding": _component(fit.embedding[i]),
+                        "keywords": _component(fit.keywords[i]),
+                        "rules": _component(fit.rules[i]),
+                    },
+                    "matched_terms": fit.matched_terms[i],
+                    "generated_at": generated_at,
+                },
+            ))
+        return results
 
 
 class ClaudeAnalyzer:
+    uses_llm = True
+
     def analyze(self, job: Job) -> AnalyzerResult:
         messages = build_analyzer_messages(job)
-        result = claude_chat_json(messages)
+        result = claude_chat_json(messages, template="analyzer")
         if not isinstance(result, dict):
             raise LLMError("Claude response missing JSON object")
         score = _normalize_score(result.get("score"))
@@ -128,8 +170,17 @@ class ClaudeAnalyzer:
             analysis_raw=result,
         )
 
+    def analyze_many(self, jobs: Sequence[Job]) -> list[AnalyzerResult]:
+        return [self.analyze(job) for job in jobs]
+
+
+def get_analyzer(resume_text: Optional[str] = None, resume_vector: Optional[list[float]] = None) -> Analyzer:
+    """ANALYZER_BACKEND=llm|local picks explicitly; "auto" uses the LLM when one is configured.
 
-def get_analyzer() -> Analyzer:
-    if settings.ANTHROPIC_API_KEY:
+    ``resume_vector`` is the cached resume embedding (services/resume_cache.py);
+    without it the local analyzer embeds ``resume_text`` itself.
+    """
+    backend = settings.ANALYZER_BACKEND
+    if backend == "llm" or (backend == "auto" and llm_enabled()):
         return ClaudeAnalyzer()
-    return StubAnalyzer()
+    return LocalAnalyzer(resume_text, resume_vector)
@@ -0,0 +1,160 @@
+"""
+In-process matrix of job embeddings for vectorized similarity search.
+
+Rows are L2-normalised float32 vectors, so cosine similarity against a query
+is one matrix-vector product. The index is filled incrementally (vectors are
+upserted as jobs are embedded or loaded) and can be bulk-loaded from the
+jobs table. It is per worker: callers pass ``restrict`` to limit results to
+ids they know are live, and must ``discard`` ids when jobs are deleted.
+"""
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+
+
+def _normalise(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class EmbeddingIndex:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ids: List[UUID] = []
+        self._pos: dict[UUID, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._loaded = False
+        # table_versions["jobs"] and database clock of the last services/semantic.sync_index.
+        self.synced_version: Optional[int] = None
+        self.synced_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, job_id: UUID) -> bool:
+        return job_id in self._pos
+
+    def upsert(self, items: Iterable[Tuple[UUID, Sequence[float]]]) -> None:
+        items = list({job_id: vec for job_id, vec in items if vec}.items())
+        if not items:
+            return
+        new = _normalise(np.asarray([vec for _, vec in items], dtype=np.float32))
+        with self._lock:
+            append_ids, append_rows = [], []
+            for (job_id, _), row in zip(items, new):
+                pos = self._pos.get(job_id)
+                if pos is not None:
+                    self._matrix[pos] = row
+                else:
+                    self._pos[job_id] = len(self._ids) + len(append_ids)
+                    append_ids.append(job_id)
+                    append_rows.append(row)
+            if append_rows:
+                block = np.vstack(append_rows)
+                self._matrix = block if self._matrix is None else np.vstack([self._matrix, block])
+                self._ids.extend(append_ids)
+
+    def discard(self, job_ids: Iterable[UUID]) -> None:
+        with self._lock:
+            drop = {job_id for job_id in job_ids if job_id in self._pos}
+            if not drop:
+                return
+            keep = [i for i, job_id in enumerate(self._ids) if job_id not in drop]
+            self._ids = [self._ids[i] for i in keep]
+            self._matrix = self._matrix[keep] if keep else None
+            self._pos = {job_id: i for i, job_id in enumerate(self._ids)}
+
+    def ensure_loaded(self, db) -> None:
+        """Bulk-load every stored job embedding once per process."""
+        if not self._loaded:
+            self.load(db)
+
+    def load(self, db) -> None:
+        """Upsert every stored job embedding."""
+        from app.models.job import Job
+
+        rows = db.query(Job.id, Job.embedding).filter(Job.embedding.isnot(None)).all()
+        self.upsert((row.id, row.embedding) for row in rows)
+        self._loaded = True
+
+    def ids(self) -> List[UUID]:
+        with self._lock:
+            return list(self._ids)
+
+    def vector(self, job_id: UUID) -> Optional[np.ndarray]:
+        with self._lock:
+            pos = self._pos.get(job_id)
+            return None if pos is None else self._matrix[pos].copy()
+
+    def similarities(self, query: Sequence[float], job_ids: Sequence[UUID]) -> np.ndarray:
+        """Cosine similarity of ``query`` to each of ``job_ids`` (NaN where the id is not indexed)."""
+        out = np.full(len(job_ids), np.nan, dtype=np.float32)
+        q = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm == 0 or not len(job_ids):
+            return out
+        with self._lock:
+            if self._matrix is None:
+                return out
+            slots = np.fromiter((self._pos.get(i, -1) for i in job_ids), dtype=np.int64, count=len(job_ids))
+            hit = slots >= 0
+            out[hit] = self._matrix[slots[hit]] @ (q / norm)
+        return out
+
+    def search(
+        self,
+        query: Sequence[float],
+        k: int,
+        restrict: Optional[Iterable[UUID]] = None,
+        exclude: Optional[Iterable[UUID]] = None,
+    ) -> List[Tuple[UUID, float]]:
+        """Top-``k`` (job_id, cosine similarity), highest first."""
+        q = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm == 0 or k <= 0:
+            return []
+        q = q / norm
+        with self._lock:
+            if self._matrix is None:
+                return []
+            if restrict is not None:
+                rows = np.fromiter((self._pos[i] for i in restrict if i in self._pos), dtype=np.int64)
+                if exclude is not None:
+                    excluded = {self._pos[i] for i in exclude if i in self._pos}
+                    if excluded:
+                        rows = rows[~np.isin(rows, list(excluded))]
+                if rows.size == 0:
+                    return []
+                sims = self._matrix[rows] @ q
+            else:
+                # Whole matrix: no row gather (a copy of the matrix); excluded rows are masked instead.
+                rows = np.arange(len(self._ids))
+                sims = self._matrix @ q
+                if exclude is not None:
+                    excluded = [self._pos[i] for i in exclude if i in self._pos]
+                    if excluded:
+                        keep = np.ones(len(rows), dtype=bool)
+                        keep[excluded] = False
+                        rows, sims = rows[keep], sims[keep]
+                if rows.size == 0:
+                    return []
+            ids = self._ids
+        k = min(k, sims.size)
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        return [(ids[rows[i]], float(sims[i])) for i in top]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._ids, self._pos, self._matrix, self._loaded = [], {}, None, False
+            self.synced_version = None
+            self.synced_at = None
+
+
+job_index = EmbeddingIndex()
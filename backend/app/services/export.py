@@ -0,0 +1,123 @@
+"""
+Streaming export of the jobs table.
+
+``export_stream`` yields the encoded (and optionally gzipped) bytes of every
+job, newest first, without holding more than one fetch batch in memory:
+rows come from a server-side cursor (``yield_per``), are encoded one at a
+time, collected into ~64 KB chunks and, with gzip, pushed through a single
+compressor. The session is opened inside the generator, so it lives exactly
+as long as the response body is being sent and is closed when the client
+disconnects.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.serialization import dumps
+from app.models.job import Job
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+CHUNK_BYTES = 64 * 1024
+
+# Everything a user may want to take elsewhere; embeddings and claim leases stay internal.
+EXPORT_COLUMNS: Dict[str, Any] = {
+    column.key: column
+    for column in (
+        Job.id, Job.job_hash, Job.title, Job.company, Job.location, Job.url, Job.status, Job.score,
+        Job.preference_score, Job.combined_score, Job.resume_recommendation, Job.reasoning, Job.downsides,
+        Job.guidance_3_sentences, Job.structured_requirements, Job.analysis, Job.raw_text, Job.raw_data,
+        Job.selected_text, Job.duplicate_of, Job.work_mode, Job.sponsorship, Job.min_years, Job.degree_level,
+        Job.captured_at, Job.created_at, Job.parsed_at, Job.analyzed_at,
+    )
+}
+
+
+def resolve_columns(names: Optional[str]) -> List[Any]:
+    """Columns for a comma-separated ``names`` (all exportable columns when empty); raises ValueError."""
+    if not names or not names.strip():
+        return list(EXPORT_COLUMNS.values())
+    keys = [name.strip() for name in names.split(",") if name.strip()]
+    unknown = [key for key in keys if key not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"unknown columns: {', '.join(unknown)}")
+    return [EXPORT_COLUMNS[key] for key in dict.fromkeys(keys)]
+
+
+def _rows(columns: Sequence[Any], analyzed_only: bool) -> Iterator[Sequence[Any]]:
+    query = select(*columns)
+    if analyzed_only:
+        query = query.where(Job.analyzed_at.isnot(None))
+    query = query.order_by(Job.created_at.desc(), Job.id.desc())
+    with get_db() as db:
+        # yield_per turns on stream_results: a server-side cursor fetched in batches.
+        yield from db.execute(query.execution_options(yield_per=settings.EXPORT_FETCH_ROWS))
+
+
+def ndjson_lines(keys: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    for row in rows:
+        yield dumps(dict(zip(keys, row))) + b"\n"
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode()
+    return str(getattr(value, "value", value))
+
+
+def csv_lines(keys: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(keys)
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+        if buffer.tell() >= CHUNK_BYTES:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def chunked(pieces: Iterable[bytes], size: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """Join small pieces into chunks of about ``size`` bytes."""
+    pending: List[bytes] = []
+    pending_bytes = 0
+    for piece in pieces:
+        pending.append(piece)
+        pending_bytes += len(piece)
+        if pending_bytes >= size:
+            yield b"".join(pending)
+            pending, pending_bytes = [], 0
+    if pending:
+        yield b"".join(pending)
+
+
+def gzipped(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """One gzip member over ``chunks``, emitted as the compressor produces output."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def export_stream(fmt: str, columns: Sequence[Any], analyzed_only: bool = False, gzip: bool = False) -> Iterator[bytes]:
+    keys = [column.key for column in columns]
+    encode = ndjson_lines if fmt == "ndjson" else csv_lines
+    chunks = chunked(encode(keys, _rows(columns, analyzed_only)))
+    return gzipped(chunks, settings.EXPORT_GZIP_LEVEL) if gzip else chunks
@@ -0,0 +1,210 @@
+"""
+Job facets: normalised filter values derived from the parsed requirements.
+
+structured_requirements holds free text per field, which SQL cannot filter
+on. Whenever a job's parse is written, ``set_facets`` derives four plain
+columns from it with the text_features rules the local scorer uses:
+
+  - work_mode     remote / hybrid / onsite, from work_location_requirements
+  - sponsorship   true (offered) / false (ruled out), from sponsorship_requirements
+  - min_years     smallest "N years" in experience_requirements
+  - degree_level  lowest degree named in education_requirements
+
+NULL means the posting does not say. ``filters_from_args`` turns GET /jobs
+query parameters into WHERE clauses, and ``facet_counts`` counts every facet
+value in one pass over ix_jobs_facets (migration 016): each value is counted
+under the other active filters, so selecting "remote" still shows how many
+hybrid jobs there are.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, true, update
+
+from app.models.job import PLACEHOLDER_TEXT, Job
+from app.services.text_features import WORK_MODES, work_mode, years_required
+
+FACET_COLUMNS = ("work_mode", "sponsorship", "min_years", "degree_level")
+DEGREE_LEVELS = ("associate", "bachelor", "master", "doctorate")
+# GET /jobs?years=<band>: bands of min_years, upper bound inclusive (None: open-ended).
+YEARS_BANDS: Dict[str, Tuple[int, Optional[int]]] = {"0-2": (0, 2), "3-5": (3, 5), "6-9": (6, 9), "10+": (10, None)}
+
+# Applied to lower-cased text.
+_NO_SPONSORSHIP_RE = re.compile(
+    r"\b(?:no|not|unable to|cannot|can't|won't|will not|does not|do not|without)\b[^.]{0,40}?\bsponsor"
+    r"|\bsponsor\w*\b[^.]{0,30}?\b(?:not|unavailable|no longer)\b"
+    r"|\bcitizens?(?:hip)? (?:only|required)\b|\bsecurity clearance\b"
+)
+_SPONSORSHIP_RE = re.compile(r"\bsponsor|\bvisa support\b|\bh-?1b\b")
+_NO_DEGREE_RE = re.compile(r"\bno (?:formal )?degree\b|\bdegree (?:is )?not required\b")
+_DEGREE_PATTERNS = (
+    ("associate", re.compile(r"\bassociate'?s? degree\b")),
+    ("bachelor", re.compile(r"\bbachelor|\bundergraduate\b|\bb\.?s\.?c?\b|\bb\.a\.|\bba/bs\b|\bbs/ms\b")),
+    ("master", re.compile(r"\bmaster|\bm\.s\.|\bmsc\b|\bmba\b")),
+    ("doctorate", re.compile(r"\bph\.?d\b|\bdoctora")),
+)
+_DEGREE_RE = re.compile(r"\bdegree\b")
+_YEARS_RE = re.compile(r"\b(\d{1,2})\s*(?:\+|plus)?\s*(?:(?:-|–|to)\s*\d{1,2}\s*\+?\s*)?(?:years?|yrs?)\b")
+
+
+def _field(structured: Any, name: str) -> str:
+    if not isinstance(structured, dict):
+        return ""
+    value = structured.get(name)
+    if not value:
+        return ""
+    text = str(value).strip().lower()
+    return "" if text == PLACEHOLDER_TEXT else text
+
+
+def sponsorship_offered(text: str) -> Optional[bool]:
+    """False when the text rules sponsorship out, True when it offers it, None when silent."""
+    if _NO_SPONSORSHIP_RE.search(text):
+        return False
+    if _SPONSORSHIP_RE.search(text):
+        return True
+    return None
+
+
+def degree_level(text: str) -> Optional[str]:
+    """Lowest degree the text names (the entry bar); a bare "degree" counts as a bachelor's."""
+    if not text or _NO_DEGREE_RE.search(text):
+        return None
+    for level, pattern in _DEGREE_PATTERNS:
+        if pattern.search(text):
+            return level
+    return "bachelor" if _DEGREE_RE.search(text) else None
+
+
+def min_years(text: str) -> Optional[int]:
+    """Smallest "N years" figure; the field is about experience, so "experience" need not follow."""
+    found = years_required(text)
+    if found is not None:
+        return found
+    values = [int(v) for v in _YEARS_RE.findall(text) if 0 < int(v) <= 20]
+    return min(values) if values else None
+
+
+def derive_facets(structured: Any) -> Dict[str, Any]:
+    """Facet column values for a structured_requirements dict (all None when it is not one)."""
+    return {
+        "work_mode": work_mode(_field(structured, "work_location_requirements")),
+        "sponsorship": sponsorship_offered(_field(structured, "sponsorship_requirements")),
+        "min_years": min_years(_field(structured, "experience_requirements")),
+        "degree_level": degree_level(_field(structured, "education_requirements")),
+    }
+
+
+def set_facets(job: Job) -> None:
+    """Refresh ``job``'s facet columns from its structured_requirements; call after writing them."""
+    for name, value in derive_facets(job.structured_requirements).items():
+        setattr(job, name, value)
+
+
+def _csv(args: Mapping[str, str], name: str) -> List[str]:
+    return [value.strip().lower() for value in (args.get(name) or "").split(",") if value.strip()]
+
+
+def _bool(value: str, name: str) -> bool:
+    if value in ("true", "1", "yes"):
+        return True
+    if value in ("false", "0", "no"):
+        return False
+    raise ValueError(f"{name} must be true or false")
+
+
+def _years_band(band: str):
+    low, high = YEARS_BANDS[band]
+    return Job.min_years >= low if high is None else Job.min_years.between(low, high)
+
+
+def filters_from_args(args: Mapping[str, str]) -> Dict[str, Any]:
+    """{facet: WHERE clause} for the facet parameters in ``args``; raises ValueError.
+
+    work_mode=remote,hybrid (remote=true is short for work_mode=remote),
+    sponsorship=true|false, degree=bachelor,master, years=0-2,3-5.
+    Values within a parameter are OR-ed, parameters AND-ed.
+    """
+    filters: Dict[str, Any] = {}
+    modes = _csv(args, "work_mode")
+    if args.get("remote"):
+        if _bool(args["remote"].strip().lower(), "remote"):
+            modes.append("remote")
+        else:
+            filters["remote"] = or_(Job.work_mode.is_(None), Job.work_mode != "remote")
+    unknown = [m for m in modes if m not in WORK_MODES]
+    if unknown:
+        raise ValueError(f"work_mode must be one of {', '.join(WORK_MODES)}")
+    if modes:
+        filters["work_mode"] = Job.work_mode.in_(sorted(set(modes)))
+    if args.get("sponsorship"):
+        filters["sponsorship"] = Job.sponsorship.is_(_bool(args["sponsorship"].strip().lower(), "sponsorship"))
+    degrees = _csv(args, "degree")
+    if any(d not in DEGREE_LEVELS for d in degrees):
+        raise ValueError(f"degree must be one of {', '.join(DEGREE_LEVELS)}")
+    if degrees:
+        filters["degree"] = Job.degree_level.in_(sorted(set(degrees)))
+    bands = _csv(args, "years")
+    if any(b not in YEARS_BANDS for b in bands):
+        raise ValueError(f"years must be one of {', '.join(YEARS_BANDS)}")
+    if bands:
+        filters["years"] = or_(*(_years_band(b) for b in dict.fromkeys(bands)))
+    return filters
+
+
+def facet_counts(db, filters: Mapping[str, Any], analyzed_only: bool = False) -> Dict[str, Any]:
+    """Per-value counts of every facet in one aggregate query; each facet ignores its own filter."""
+    def others(*skip: str):
+        return and_(true(), *(clause for name, clause in filters.items() if name not in skip))
+
+    # remote=false and work_mode=... both constrain work_mode.
+    buckets = {
+        "work_mode": [(mode, Job.work_mode == mode, ("work_mode", "remote")) for mode in WORK_MODES],
+        "sponsorship": [
+            ("true", Job.sponsorship.is_(True), ("sponsorship",)),
+            ("false", Job.sponsorship.is_(False), ("sponsorship",)),
+        ],
+        "degree": [(level, Job.degree_level == level, ("degree",)) for level in DEGREE_LEVELS],
+        "years": [(band, _years_band(band), ("years",)) for band in YEARS_BANDS],
+    }
+    columns = [func.count().filter(others()).label("total")]
+    keys = []
+    for facet, values in buckets.items():
+        for value, clause, skip in values:
+            columns.append(func.count().filter(and_(clause, others(*skip))))
+            keys.append((facet, value))
+    query = select(*columns).select_from(Job)
+    if analyzed_only:
+        query = query.where(Job.analyzed_at.isnot(None))
+    row = db.execute(query).one()
+    counts: Dict[str, Any] = {"total": row[0]}
+    for (facet, value), count in zip(keys, row[1:]):
+        counts.setdefault(facet, {})[value] = count
+    return counts
+
+
+def backfill(db, batch: int = 1000) -> int:
+    """Recompute facets of every parsed job, in id order; commits per batch. Returns the count."""
+    done = 0
+    after = None
+    while True:
+        query = select(Job.id, Job.structured_requirements).where(Job.structured_requirements.isnot(None))
+        if after is not None:
+            query = query.where(Job.id > after)
+        rows = db.execute(query.order_by(Job.id).limit(batch)).all()
+        if not rows:
+            return done
+        db.execute(update(Job), [{"id": row.id, **derive_facets(row.structured_requirements)} for row in rows])
+        db.commit()
+        done += len(rows)
+        after = rows[-1].id
+
+
+if __name__ == "__main__":
+    from app.core.database import get_db
+
+    with get_db() as session:
+        total = backfill(session)
+    print(f"recomputed facets for {total} jobs")
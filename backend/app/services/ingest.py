@@ -0,0 +1,216 @@
+"""
+Set-based job ingest.
+
+``prepare_posting`` validates one capture payload and computes its job_hash.
+
+``upsert_posting`` stores one posting in a single statement (no
+SELECT-then-INSERT, no retry transaction): an insert that skips any
+conflict; if that lost to a different posting on url, an insert under
+``urn:job:<hash>`` whose ON CONFLICT (job_hash) DO UPDATE hands back a row a
+concurrent capture committed meanwhile; otherwise a read of the existing row.
+Exactly one of the three yields the row, with ``is_new``.
+
+``ingest_postings`` writes many postings with multi-row
+INSERT ... ON CONFLICT DO NOTHING RETURNING, so a batch costs a couple of
+statements instead of several round trips per job:
+
+  1. insert every posting not seen earlier in the batch; rows that come back
+     are new;
+  2. look the rest up by job_hash; those are duplicates;
+  3. whatever is left lost only the url unique constraint to a different
+     posting, so it is inserted once more under its ``urn:job:<hash>`` url
+     (what single ingest does), and looked up again in case a concurrent
+     capture got there first;
+  4. the new rows are checked for near duplicates (services/near_dup.py).
+"""
+from __future__ import annotations
+
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+
+from app.models.job import Job, JobStatus
+from app.services.near_dup import link_near_duplicates, posting_text
+
+MAX_RAW_TEXT_CHARS = 50000
+INSERT_CHUNK_ROWS = 500
+
+
+@dataclass
+class IngestResult:
+    index: int
+    status: str  # "new" | "duplicate" | "error"
+    id: Optional[uuid.UUID] = None
+    job_hash: Optional[str] = None
+    detail: Optional[str] = None
+    duplicate_of: Optional[uuid.UUID] = None  # canonical job when a new posting is a near duplicate
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"index": self.index, "status": self.status}
+        if self.id is not None:
+            out["id"] = str(self.id)
+        if self.job_hash is not None:
+            out["job_hash"] = self.job_hash
+        if self.detail is not None:
+            out["detail"] = self.detail
+        if self.duplicate_of is not None:
+            out["duplicate_of"] = str(self.duplicate_of)
+        return out
+
+
+def prepare_posting(data: Any) -> Dict[str, Any]:
+    """Insert-ready column values for one capture payload; raises ValueError with a client-facing message."""
+    if not isinstance(data, dict):
+        raise ValueError("item must be a JSON object")
+    raw_text = data.get("raw_text") or ""
+    if not isinstance(raw_text, str) or not raw_text.strip():
+        raise ValueError("raw_text must not be empty")
+    raw_text = raw_text.strip()
+    if len(raw_text) > MAX_RAW_TEXT_CHARS:
+        raise ValueError("raw_text must be 50,000 characters or fewer")
+
+    job_hash = Job.generate_hash({
+        "title": data.get("title") or "",
+        "company": data.get("company") or "",
+        "location": data.get("location") or "",
+        "url": data.get("url") or "",
+        "raw_text": raw_text,
+    })
+    return {
+        "job_hash": job_hash,
+        "raw_text": raw_text,
+        "raw_data": data.get("raw_data"),
+        "title": data.get("title"),
+        "company": data.get("company"),
+        "location": data.get("location"),
+        "url": (data.get("url") or "").strip() or f"urn:job:{job_hash}",
+    }
+
+
+_INSERT_COLUMNS = "id, job_hash, title, company, location, url, raw_text, raw_data, status, captured_at"
+_INSERT_VALUES = (
+    ":id, :job_hash, :title, :company, :location, {url}, :raw_text, CAST(:raw_data AS json), "
+    "CAST('new' AS jobstatus), now()"
+)
+_UPSERT_SQL = """
+WITH ins AS (
+    INSERT INTO jobs ({insert_columns}) VALUES ({values_url})
+    ON CONFLICT DO NOTHING
+    RETURNING {columns}, true AS is_new
+), ins_urn AS (
+    INSERT INTO jobs ({insert_columns})
+    SELECT {values_urn}
+    WHERE NOT EXISTS (SELECT 1 FROM ins) AND NOT EXISTS (SELECT 1 FROM jobs WHERE job_hash = :job_hash)
+    ON CONFLICT (job_hash) DO UPDATE SET job_hash = EXCLUDED.job_hash
+    RETURNING {columns}, xmax = 0 AS is_new
+)
+SELECT * FROM ins
+UNION ALL SELECT * FROM ins_urn
+UNION ALL
+SELECT {columns}, false AS is_new FROM jobs
+WHERE job_hash = :job_hash AND NOT EXISTS (SELECT 1 FROM ins) AND NOT EXISTS (SELECT 1 FROM ins_urn)
+"""
+
+
+def upsert_posting(db, row: Dict[str, Any], columns: Sequence) -> Tuple[Row, bool]:
+    """Store a ``prepare_posting`` row in one statement; returns (``columns`` of the stored row, is_new).
+
+    Does not commit. Raises IntegrityError only if the urn url is itself taken by
+    another posting (a job edited after capture keeps its old urn url).
+    """
+    names = ", ".join(f"jobs.{column.key}" for column in columns)
+    sql = _UPSERT_SQL.format(
+        insert_columns=_INSERT_COLUMNS,
+        values_url=_INSERT_VALUES.format(url=":url"),
+        values_urn=_INSERT_VALUES.format(url=":urn"),
+        columns=names,
+    )
+    params = {
+        **row,
+        "id": uuid.uuid4(),
+        "urn": f"urn:job:{row['job_hash']}",
+        "raw_data": None if row["raw_data"] is None else json.dumps(row["raw_data"]),
+    }
+    result = db.execute(text(sql), params).one()
+    return result, bool(result.is_new)
+
+
+def _insert_new(db, rows: List[Dict[str, Any]]) -> Dict[str, uuid.UUID]:
+    """Multi-row insert skipping any conflict; returns {job_hash: id} of the rows written."""
+    inserted: Dict[str, uuid.UUID] = {}
+    for lo in range(0, len(rows), INSERT_CHUNK_ROWS):
+        stmt = (
+            insert(Job)
+            .values(rows[lo:lo + INSERT_CHUNK_ROWS])
+            .on_conflict_do_nothing()
+            .returning(Job.id, Job.job_hash)
+        )
+        inserted.update((row.job_hash, row.id) for row in db.execute(stmt))
+    return inserted
+
+
+def _existing(db, hashes: Iterable[str]) -> Dict[str, uuid.UUID]:
+    hashes = list(hashes)
+    if not hashes:
+        return {}
+    return {row.job_hash: row.id for row in db.query(Job.job_hash, Job.id).filter(Job.job_hash.in_(hashes))}
+
+
+def ingest_postings(db, items: List[Any]) -> List[IngestResult]:
+    """Validate and insert ``items`` (capture payloads, or exceptions from decoding them); commits.
+
+    Results are in input order. A posting repeated within the batch is reported
+    as a duplicate of its first occurrence.
+    """
+    results: List[IngestResult] = []
+    rows: Dict[str, Dict[str, Any]] = {}
+    now = datetime.now(timezone.utc)
+    for index, item in enumerate(items):
+        try:
+            if isinstance(item, Exception):
+                raise ValueError(str(item))
+            row = prepare_posting(item)
+        except ValueError as exc:
+            results.append(IngestResult(index, "error", detail=str(exc)))
+            continue
+        results.append(IngestResult(index, "new", job_hash=row["job_hash"]))
+        if row["job_hash"] not in rows:
+            rows[row["job_hash"]] = {**row, "id": uuid.uuid4(), "status": JobStatus.new, "captured_at": now}
+
+    ids = _insert_new(db, list(rows.values()))
+    new_hashes = set(ids)
+    pending = [h for h in rows if h not in ids]
+    ids.update(_existing(db, pending))
+
+    retry = [{**rows[h], "url": f"urn:job:{h}"} for h in pending if h not in ids]
+    if retry:
+        retried = _insert_new(db, retry)
+        new_hashes.update(retried)
+        ids.update(retried)
+        ids.update(_existing(db, [row["job_hash"] for row in retry if row["job_hash"] not in retried]))
+    links = link_near_duplicates(db, [
+        (ids[h], posting_text(rows[h]["title"], rows[h]["company"], rows[h]["raw_text"])) for h in rows if h in new_hashes
+    ])
+    db.commit()
+
+    first_seen: set[str] = set()
+    for result in results:
+        if result.status == "error":
+            continue
+        job_hash = result.job_hash
+        result.id = ids.get(job_hash)
+        if result.id is None:
+            result.status, result.detail = "error", "not stored (url conflict)"
+        elif job_hash in new_hashes and job_hash not in first_seen:
+            result.status = "new"
+            result.duplicate_of = links.get(result.id, (None,))[0]
+        else:
+            result.status = "duplicate"
+        first_seen.add(job_hash)
+    return results
@@ -0,0 +1,162 @@
+"""
+Job-level claims so overlapping /sort, /parse and /analyze requests never pay
+twice for the same job.
+
+Two layers:
+  1. In-process single-flight: the first request in a worker to reach a job
+     owns it; later requests in the same worker get a Future to wait on.
+  2. Cross-process lease: owned jobs are leased in Postgres with
+     UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED) RETURNING id,
+     so another worker's in-flight jobs are skipped rather than re-sent.
+     Leases expire after JOB_LEASE_SECONDS in case a worker dies mid-call.
+
+Callers pass the SQL predicate that makes a job still need the work
+(``pending``); it is rechecked under the row lock, so a job another request
+finished after the caller read its candidates is reported in ``claim.done``
+instead of being sent to the LLM again. Callers process only ``claim.owned``
+and afterwards call ``wait_for_others`` (``yield from wait_steps`` in a flow,
+see llm_flow) to pick up the results of jobs someone else was already working
+on; ``marks`` / ``finished_since`` tell which of those actually got a result.
+"""
+from __future__ import annotations
+
+import time
+import uuid
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Dict, Generator, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, or_, select, update
+
+from app.core.config import settings
+from app.models.job import Job
+from app.services.llm_flow import Wait, run_sync
+from app.services.single_flight import SingleFlight
+
+_flights = SingleFlight()
+
+_POLL_INTERVAL_S = 0.5
+
+
+@dataclass
+class Claim:
+    token: UUID
+    owned: List[UUID] = field(default_factory=list)
+    # Jobs another request in this worker is processing.
+    inflight: Dict[UUID, Future] = field(default_factory=dict)
+    # Jobs leased by another worker.
+    leased_elsewhere: List[UUID] = field(default_factory=list)
+    # Jobs no longer pending when the claim was taken (finished by another request).
+    done: List[UUID] = field(default_factory=list)
+
+    @property
+    def waiting(self) -> List[UUID]:
+        return list(self.inflight) + self.leased_elsewhere
+
+
+def claim_jobs(db, job_ids: Iterable[UUID], pending: Optional[Any] = None) -> Claim:
+    """Claim ``job_ids`` for this request and commit the leases.
+
+    ``pending`` (e.g. ``Job.analyzed_at.is_(None)``) is checked together with
+    the lease, inside the locked subquery; None claims the jobs regardless.
+    """
+    claim = Claim(token=uuid.uuid4())
+    reserved, claim.inflight = _flights.reserve(list(job_ids))
+    if not reserved:
+        return claim
+
+    now = func.now()
+    conditions = [Job.id.in_(reserved), or_(Job.lease_expires_at.is_(None), Job.lease_expires_at < now)]
+    if pending is not None:
+        conditions.append(pending)
+    free = select(Job.id).where(*conditions).with_for_update(skip_locked=True)
+    stmt = (
+        update(Job)
+        .where(Job.id.in_(free.scalar_subquery()))
+        .values(lease_owner=claim.token, lease_expires_at=now + timedelta(seconds=settings.JOB_LEASE_SECONDS))
+        .returning(Job.id)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        leased = set(db.execute(stmt).scalars().all())
+        rest = [job_id for job_id in reserved if job_id not in leased]
+        still_pending = set(rest)
+        if pending is not None and rest:
+            still_pending = set(db.execute(select(Job.id).where(Job.id.in_(rest), pending)).scalars().all())
+        db.commit()
+    except BaseException:
+        _flights.release(reserved)
+        raise
+
+    claim.owned = [job_id for job_id in reserved if job_id in leased]
+    claim.leased_elsewhere = [job_id for job_id in rest if job_id in still_pending]
+    claim.done = [job_id for job_id in rest if job_id not in still_pending]
+    _flights.release(rest)
+    return claim
+
+
+def release_claim(db, claim: Claim) -> None:
+    """Drop this request's leases (committing) and wake in-process waiters. Safe to call twice."""
+    if not claim.owned:
+        return
+    try:
+        db.rollback()
+        db.execute(
+            update(Job)
+            .where(Job.id.in_(claim.owned), Job.lease_owner == claim.token)
+            .values(lease_owner=None, lease_expires_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    finally:
+        _flights.release(claim.owned)
+        claim.owned = []
+
+
+def marks(db, claim: Claim, column) -> Dict[UUID, Any]:
+    """``column`` (e.g. Job.analyzed_at) of the jobs ``claim`` will wait for, read right after claiming."""
+    if not claim.waiting:
+        return {}
+    rows = db.execute(select(Job.id, column).where(Job.id.in_(claim.waiting))).all()
+    db.commit()
+    return {job_id: value for job_id, value in rows}
+
+
+def finished_since(db, released: List[UUID], before: Dict[UUID, Any], column) -> List[UUID]:
+    """The ``released`` jobs whose ``column`` was set while this request waited, i.e. that another request finished."""
+    if not released:
+        return []
+    rows = db.execute(select(Job.id, column).where(Job.id.in_(released), column.isnot(None))).all()
+    db.commit()
+    return [job_id for job_id, value in rows if value != before.get(job_id)]
+
+
+def wait_for_others(db, claim: Claim, timeout: float | None = None) -> List[UUID]:
+    """Block until jobs claimed elsewhere are released (or ``timeout``); return the ids that were released."""
+    return run_sync(wait_steps(db, claim, timeout))
+
+
+def wait_steps(db, claim: Claim, timeout: float | None = None) -> Generator[Wait, None, List[UUID]]:
+    """wait_for_others as a flow: yields the waits instead of blocking on them."""
+    timeout = settings.CLAIM_WAIT_SECONDS if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    done: List[UUID] = []
+
+    if claim.inflight:
+        yield Wait(timeout, tuple(claim.inflight.values()))
+        done.extend(job_id for job_id, fut in claim.inflight.items() if fut.done())
+
+    pending = list(claim.leased_elsewhere)
+    while pending:
+        still_leased = set(db.execute(
+            select(Job.id).where(Job.id.in_(pending), Job.lease_expires_at > func.now())
+        ).scalars().all())
+        db.commit()
+        done.extend(job_id for job_id in pending if job_id not in still_leased)
+        pending = [job_id for job_id in pending if job_id in still_leased]
+        if not pending or time.monotonic() >= deadline:
+            break
+        yield Wait(_POLL_INTERVAL_S)
+    return done
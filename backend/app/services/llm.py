@@ -3,14 +3,20 @@ Anthropic Claude API client.
 
 Requires ANTHROPIC_API_KEY set in environment (or .env file).
 Optionally set ANTHROPIC_MODEL to override the default (claude-opus-4-6).
+With LLM_BACKEND=standin, requests go to the local stand-in at LLM_STANDIN_URL
+instead and no API key is needed. claude_chat_json_async is the same call on
+the async client, used when serving through app/asgi.py.
 """
+import asyncio
 import json
 import re
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
 import anthropic
 
 from app.core.config import settings
+from app.services import llm_metrics
 
 _CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*\n?(.*?)\n?```\s*$", re.DOTALL)
 
@@ -25,15 +31,74 @@ def _strip_code_fence(text: str) -> str:
     return match.group(1).strip() if match else text.strip()
 
 
-def claude_chat_json(messages: List[Dict[str, str]]) -> Dict[str, Any]:
+def llm_enabled() -> bool:
+    """True when LLM calls can be made (real API key or the local stand-in)."""
+    return bool(settings.ANTHROPIC_API_KEY) or settings.LLM_BACKEND == "standin"
+
+
+# One client per process and configuration, so calls reuse its HTTP connection pool.
+_CLIENT: Optional[Tuple[Tuple[str, Optional[str], str], anthropic.Anthropic]] = None
+_CLIENT_LOCK = threading.Lock()
+# Async client and call slots for app/asgi.py; an httpx async pool belongs to one event loop.
+_ASYNC: Optional[Tuple[tuple, asyncio.AbstractEventLoop, anthropic.AsyncAnthropic, asyncio.Semaphore]] = None
+
+
+def _client_kwargs() -> Dict[str, Any]:
+    if settings.LLM_BACKEND == "standin":
+        return {"api_key": settings.ANTHROPIC_API_KEY or "standin", "base_url": settings.LLM_STANDIN_URL}
+    if not settings.ANTHROPIC_API_KEY:
+        raise LLMError("ANTHROPIC_API_KEY is required for LLM features")
+    return {"api_key": settings.ANTHROPIC_API_KEY}
+
+
+def _client() -> anthropic.Anthropic:
+    global _CLIENT
+    config = (settings.LLM_BACKEND, settings.ANTHROPIC_API_KEY, settings.LLM_STANDIN_URL)
+    with _CLIENT_LOCK:
+        if _CLIENT is not None and _CLIENT[0] == config:
+            return _CLIENT[1]
+        client = anthropic.Anthropic(**_client_kwargs())
+        _CLIENT = (config, client)
+        return client
+
+
+def _async_client() -> Tuple[anthropic.AsyncAnthropic, asyncio.Semaphore]:
+    """(client, semaphore of LLM_MAX_CONCURRENCY slots) for the running loop; only touched from that loop."""
+    global _ASYNC
+    loop = asyncio.get_running_loop()
+    config = (settings.LLM_BACKEND, settings.ANTHROPIC_API_KEY, settings.LLM_STANDIN_URL,
+              settings.LLM_MAX_CONCURRENCY)
+    if _ASYNC is None or _ASYNC[0] != config or _ASYNC[1] is not loop:
+        client = anthropic.AsyncAnthropic(**_client_kwargs())
+        _ASYNC = (config, loop, client, asyncio.Semaphore(max(1, settings.LLM_MAX_CONCURRENCY)))
+    return _ASYNC[2], _ASYNC[3]
+
+
+def reset_client() -> None:
+    """Forget the shared clients; a forked worker must not reuse its parent's connections."""
+    global _CLIENT, _CLIENT_LOCK, _ASYNC
+    _CLIENT, _CLIENT_LOCK, _ASYNC = None, threading.Lock(), None
+
+
+def _status_outcome(status_code: int) -> str:
+    if status_code == 429:
+        return "rate_limited"
+    if status_code == 529:
+        return "overloaded"
+    return f"http_{status_code}"
+
+
+def claude_chat_json(messages: List[Dict[str, str]], template: str = "unknown") -> Dict[str, Any]:
     """
     Send a list of messages to Claude and return the parsed JSON response.
 
     A message with role "system" is lifted to Claude's top-level system param.
     Uses streaming with get_final_message() to avoid timeout issues on large inputs.
+    Every call is recorded in llm_metrics under the current endpoint and ``template``.
 
     Args:
         messages: List of {"role": "system"|"user"|"assistant", "content": str}
+        template: Prompt template name used as a metrics label (e.g. "batch_sort").
 
     Returns:
         Parsed JSON dict from Claude's text response.
@@ -41,11 +106,40 @@ def claude_chat_json(messages: List[Dict[str, str]]) -> Dict[str, Any]:
     Raises:
         LLMError: API call failed, or response was not valid JSON.
     """
-    if not settings.ANTHROPIC_API_KEY:
-        raise LLMError("ANTHROPIC_API_KEY is required for LLM features")
-
-    client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-
+    client = _client()
+    with llm_metrics.track_call(template, settings.ANTHROPIC_MODEL) as call:
+        try:
+            with client.messages.stream(**_create_kwargs(messages)) as stream:
+                for event in stream:
+                    if event.type == "content_block_delta":
+                        call.mark_first_token()
+                response = stream.get_final_message()
+        except (anthropic.APIError, UnicodeEncodeError) as exc:
+            raise _request_failed(call, exc) from exc
+        return _json_result(call, response)
+
+
+async def claude_chat_json_async(messages: List[Dict[str, str]], template: str = "unknown") -> Dict[str, Any]:
+    """claude_chat_json on the async client, for the event loop in app/asgi.py.
+
+    At most LLM_MAX_CONCURRENCY calls per process are in flight; later ones
+    wait for a slot (the wait is not counted in the call's latency).
+    """
+    client, slots = _async_client()
+    async with slots:
+        with llm_metrics.track_call(template, settings.ANTHROPIC_MODEL) as call:
+            try:
+                async with client.messages.stream(**_create_kwargs(messages)) as stream:
+                    async for event in stream:
+                        if event.type == "content_block_delta":
+                            call.mark_first_token()
+                    response = await stream.get_final_message()
+            except (anthropic.APIError, UnicodeEncodeError) as exc:
+                raise _request_failed(call, exc) from exc
+            return _json_result(call, response)
+
+
+def _create_kwargs(messages: List[Dict[str, str]]) -> Dict[str, Any]:
     system: str | None = None
     api_messages: List[Dict[str, str]] = []
     for msg in messages:
@@ -61,17 +155,25 @@ def claude_chat_json(messages: List[Dict[str, str]]) -> Dict[str, Any]:
     }
     if system:
         create_kwargs["system"] = system
+    return create_kwargs
 
-    try:
-        with client.messages.stream(**create_kwargs) as stream:
-            response = stream.get_final_message()
-    except anthropic.APIError as exc:
-        raise LLMError(f"Claude API request failed: {exc}") from exc
-    except UnicodeEncodeError as exc:
-        raise LLMError(
-            f"ANTHROPIC_API_KEY contains non-ASCII characters (e.g. an em dash instead of a hyphen). "
-            f"Re-copy it from console.anthropic.com. Detail: {exc}"
-        ) from exc
+
+def _request_failed(call: llm_metrics.LLMCallRecord, exc: Exception) -> LLMError:
+    if isinstance(exc, anthropic.APIStatusError):
+        call.outcome = _status_outcome(exc.status_code)
+        return LLMError(f"Claude API request failed: {exc}")
+    if isinstance(exc, anthropic.APIError):
+        call.outcome = "api_error"
+        return LLMError(f"Claude API request failed: {exc}")
+    call.outcome = "client_error"
+    return LLMError(
+        f"ANTHROPIC_API_KEY contains non-ASCII characters (e.g. an em dash instead of a hyphen). "
+        f"Re-copy it from console.anthropic.com. Detail: {exc}"
+    )
+
+
+def _json_result(call: llm_metrics.LLMCallRecord, response: Any) -> Dict[str, Any]:
+    call.set_usage(response.usage)
 
     text_content: str | None = None
     for block in response.content:
@@ -80,10 +182,24 @@ def claude_chat_json(messages: List[Dict[str, str]]) -> Dict[str, Any]:
             break
 
     if text_content is None:
+        call.outcome = "no_text"
         raise LLMError("Claude response contained no text block")
 
     cleaned = _strip_code_fence(text_content)
     try:
         return json.loads(cleaned)
     except json.JSONDecodeError as exc:
-        raise LLMError(f"Claude response was not valid JSON: {cleaned[:300]}") from exc
\ No newline at end of file
+        call.outcome = "truncated" if response.stop_reason == "max_tokens" else "invalid_json"
+        raise LLMError(f"Claude response was not valid JSON: {cleaned[:300]}") from exc
+
+
+def count_tokens(text: str) -> int:
+    """Input tokens ``text`` costs as a user message: the API's count with a real key, else ~4 chars per token."""
+    if settings.LLM_BACKEND != "standin" and settings.ANTHROPIC_API_KEY:
+        try:
+            return _client().messages.count_tokens(
+                model=settings.ANTHROPIC_MODEL, messages=[{"role": "user", "content": text}]
+            ).input_tokens
+        except (anthropic.APIError, UnicodeEncodeError):
+            pass
+    return (len(text) + 3) // 4
@@ -0,0 +1,190 @@
+"""
+LLM-bound request handlers, written once for both servers.
+
+/sort, /cull and /parse are generators ("flows"). Their DB work runs
+between yields, and instead of calling the LLM inline they yield what they
+are waiting for:
+
+    result = yield LLMCall(messages, "batch_sort")   # one call; an error is raised at the yield
+    results = yield [LLMCall(...), LLMCall(...)]     # independent calls; errors come back as values
+    yield Wait(seconds, futures)                     # a pause (claim waits, see job_claims)
+    yield Progress([("job", {...}), ...])            # events for a streamed run (api/v1/runs.py)
+
+``run_sync`` drives a flow in the WSGI request thread and makes the calls one
+after another, as the handlers always did. ``run_async`` (app/asgi.py) runs
+each DB segment on a thread pool and awaits the calls on the async client,
+so a request waiting for the LLM costs a coroutine, not a thread. Flows call
+database.end_transaction before yielding a call, so no pooled connection is
+held while the LLM is working either.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Executor, Future, wait
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Callable, ContextManager, Dict, Generator, List, Optional, Sequence, Tuple, Union
+
+from app.services import llm
+
+
+@dataclass(frozen=True)
+class LLMCall:
+    messages: List[Dict[str, str]]
+    template: str
+
+
+@dataclass(frozen=True)
+class Wait:
+    """Pause ``seconds``, or until all of ``futures`` are done if that is sooner."""
+    seconds: float
+    futures: Tuple[Future, ...] = ()
+
+
+@dataclass(frozen=True)
+class Progress:
+    """(event, data) pairs reported to the driver's ``on_progress``; ignored without one."""
+    events: List[Tuple[str, Dict[str, Any]]]
+
+
+Step = Union[LLMCall, Wait, Progress, List[LLMCall]]
+Flow = Generator[Step, Any, Any]
+Chat = Callable[..., Any]
+OnProgress = Callable[[Progress], None]
+
+
+def gather(flows: Sequence[Flow]) -> Generator[List[LLMCall], list, list]:
+    """Run sub-flows that only yield LLMCall side by side, batching their calls into list steps.
+
+    Use as ``results = yield from gather(...)``; a sub-flow that raised has its
+    exception in place of its result.
+    """
+    results: list = [None] * len(flows)
+    steps: Dict[int, LLMCall] = {}
+
+    def advance(i: int, reply: Any) -> None:
+        try:
+            step = flows[i].throw(reply) if isinstance(reply, BaseException) else flows[i].send(reply)
+        except StopIteration as stop:
+            results[i] = stop.value
+        except Exception as exc:
+            results[i] = exc
+        else:
+            if not isinstance(step, LLMCall):
+                raise TypeError(f"gather() sub-flows may only yield LLMCall, got {step!r}")
+            steps[i] = step
+
+    for i in range(len(flows)):
+        advance(i, None)
+    while steps:
+        order, batch = list(steps), list(steps.values())
+        steps = {}
+        replies = yield batch
+        for i, reply in zip(order, replies):
+            advance(i, reply)
+    return results
+
+
+def _perform(step: Step, chat: Chat) -> Any:
+    if isinstance(step, LLMCall):
+        return chat(step.messages, template=step.template)
+    if isinstance(step, Wait):
+        if step.futures:
+            wait(step.futures, timeout=step.seconds)
+        else:
+            time.sleep(step.seconds)
+        return None
+    replies = []
+    for call in step:
+        try:
+            replies.append(chat(call.messages, template=call.template))
+        except Exception as exc:
+            replies.append(exc)
+    return replies
+
+
+def run_sync(flow: Flow, chat: Optional[Chat] = None, on_progress: Optional[OnProgress] = None) -> Any:
+    """Drive ``flow`` to completion in this thread and return its value; ``chat`` defaults to claude_chat_json."""
+    chat = chat or llm.claude_chat_json
+    reply: Any = None
+    error: Optional[Exception] = None
+    while True:
+        try:
+            step = flow.throw(error) if error is not None else flow.send(reply)
+        except StopIteration as stop:
+            return stop.value
+        reply, error = None, None
+        if isinstance(step, Progress):
+            if on_progress is not None:
+                on_progress(step)
+            continue
+        try:
+            reply = _perform(step, chat)
+        except Exception as exc:
+            error = exc
+
+
+async def _perform_async(step: Step) -> Any:
+    if isinstance(step, LLMCall):
+        return await llm.claude_chat_json_async(step.messages, template=step.template)
+    if isinstance(step, Wait):
+        if step.futures:
+            await asyncio.wait([asyncio.wrap_future(fut) for fut in step.futures], timeout=step.seconds)
+        else:
+            await asyncio.sleep(step.seconds)
+        return None
+    calls = (llm.claude_chat_json_async(call.messages, template=call.template) for call in step)
+    return list(await asyncio.gather(*calls, return_exceptions=True))
+
+
+async def run_async(
+    flow: Flow,
+    executor: Optional[Executor] = None,
+    context: Optional[Callable[[], ContextManager]] = None,
+    on_progress: Optional[OnProgress] = None,
+) -> Any:
+    """Drive ``flow`` on the running loop and return its value.
+
+    Each segment between yields runs in ``executor`` (inside ``context()``,
+    e.g. a Flask request context, when given), and so does ``on_progress``;
+    LLM calls and waits are awaited on the loop. If this coroutine is
+    cancelled, the flow is closed in the executor so its ``finally`` blocks
+    (claim release, session close) still run.
+    """
+    loop = asyncio.get_running_loop()
+    enter = context or nullcontext
+
+    def segment(reply: Any, error: Optional[Exception]) -> Tuple[bool, Any]:
+        with enter():
+            while True:
+                try:
+                    step = flow.throw(error) if error is not None else flow.send(reply)
+                except StopIteration as stop:
+                    return True, stop.value
+                if not isinstance(step, Progress):
+                    return False, step
+                # Reported here, on the pool, and the flow resumes without a trip through the loop.
+                reply, error = None, None
+                if on_progress is not None:
+                    on_progress(step)
+
+    def close() -> None:
+        with enter():
+            flow.close()
+
+    reply: Any = None
+    error: Optional[Exception] = None
+    try:
+        while True:
+            finished, value = await loop.run_in_executor(executor, segment, reply, error)
+            if finished:
+                return value
+            reply, error = None, None
+            try:
+                reply = await _perform_async(value)
+            except Exception as exc:
+                error = exc
+    finally:
+        if flow.gi_frame is not None:
+            await loop.run_in_executor(executor, close)
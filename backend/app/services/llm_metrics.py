@@ -0,0 +1,313 @@
+"""
+Per-call LLM instrumentation.
+
+Every claude_chat_json call is recorded with endpoint, model, prompt template,
+token usage, time-to-first-token, total latency, outcome and estimated cost.
+Aggregates live in-process (one set per worker) as fixed-bucket histograms and
+are rendered in Prometheus text format by GET /internal/metrics. Set
+LLM_CALL_LOG=true to also append one row per call to the llm_calls table.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from flask import has_request_context, request
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0, 160.0]
+TOKEN_BUCKETS = [100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000]
+
+# USD per million tokens (input, output); longest matching model prefix wins.
+# Cache reads bill at 0.1x input, cache writes at 1.25x input.
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "claude-3-5-haiku": (0.8, 4.0),
+    "claude-haiku-4": (1.0, 5.0),
+    "claude-sonnet-4": (3.0, 15.0),
+    "claude-opus-4": (15.0, 75.0),
+    "claude-opus-4-5": (5.0, 25.0),
+    "claude-opus-4-6": (5.0, 25.0),
+}
+
+
+def _model_price(model: str) -> Tuple[float, float]:
+    if settings.LLM_PRICE_INPUT_PER_MTOK is not None and settings.LLM_PRICE_OUTPUT_PER_MTOK is not None:
+        return settings.LLM_PRICE_INPUT_PER_MTOK, settings.LLM_PRICE_OUTPUT_PER_MTOK
+    best = ""
+    for prefix in MODEL_PRICES:
+        if model.startswith(prefix) and len(prefix) > len(best):
+            best = prefix
+    return MODEL_PRICES.get(best, (0.0, 0.0))
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int,
+                  cache_read_tokens: int = 0, cache_creation_tokens: int = 0) -> float:
+    price_in, price_out = _model_price(model)
+    return (
+        input_tokens * price_in
+        + cache_read_tokens * price_in * 0.1
+        + cache_creation_tokens * price_in * 1.25
+        + output_tokens * price_out
+    ) / 1_000_000
+
+
+class Histogram:
+    """Cumulative fixed-bucket histogram (Prometheus semantics)."""
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        out, running = [], 0
+        for bound, n in zip(self.buckets + [float("inf")], self.counts):
+            running += n
+            out.append(("+Inf" if bound == float("inf") else f"{bound:g}", running))
+        return out
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th observation (capped at the last bound)."""
+        if not self.count:
+            return None
+        target, running = q * self.count, 0
+        for bound, n in zip(self.buckets, self.counts):
+            running += n
+            if running >= target:
+                return bound
+        return self.buckets[-1]
+
+
+@dataclass
+class LLMCallRecord:
+    endpoint: str
+    template: str
+    model: str
+    outcome: str = "ok"
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
+    ttft_s: Optional[float] = None
+    latency_s: float = 0.0
+    started_at: float = field(default_factory=time.time)
+    _t0: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def cost_usd(self) -> float:
+        return estimate_cost(
+            self.model, self.input_tokens, self.output_tokens,
+            self.cache_read_tokens, self.cache_creation_tokens,
+        )
+
+    def mark_first_token(self) -> None:
+        if self.ttft_s is None:
+            self.ttft_s = time.perf_counter() - self._t0
+
+    def set_usage(self, usage: Any) -> None:
+        if usage is None:
+            return
+        self.input_tokens = getattr(usage, "input_tokens", 0) or 0
+        self.output_tokens = getattr(usage, "output_tokens", 0) or 0
+        self.cache_read_tokens = getattr(usage, "cache_read_input_tokens", 0) or 0
+        self.cache_creation_tokens = getattr(usage, "cache_creation_input_tokens", 0) or 0
+
+
+class _Series:
+    def __init__(self) -> None:
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.ttft = Histogram(LATENCY_BUCKETS)
+        self.input_tokens = Histogram(TOKEN_BUCKETS)
+        self.output_tokens = Histogram(TOKEN_BUCKETS)
+        self.cache_read_tokens = 0
+        self.cache_creation_tokens = 0
+        self.cost_usd = 0.0
+        self.outcomes: Dict[str, int] = {}
+
+
+_lock = threading.Lock()
+_series: Dict[Tuple[str, str, str], _Series] = {}
+
+
+# Endpoint label for calls made outside a Flask request context (app/asgi.py sets it per request).
+endpoint_label: ContextVar[Optional[str]] = ContextVar("llm_endpoint", default=None)
+
+
+def _current_endpoint() -> str:
+    label = endpoint_label.get()
+    if label:
+        return label
+    if has_request_context():
+        return request.endpoint or request.path
+    return "-"
+
+
+def record(call: LLMCallRecord) -> None:
+    key = (call.endpoint, call.template, call.model)
+    with _lock:
+        series = _series.get(key)
+        if series is None:
+            series = _series[key] = _Series()
+        series.latency.observe(call.latency_s)
+        if call.ttft_s is not None:
+            series.ttft.observe(call.ttft_s)
+        series.input_tokens.observe(call.input_tokens)
+        series.output_tokens.observe(call.output_tokens)
+        series.cache_read_tokens += call.cache_read_tokens
+        series.cache_creation_tokens += call.cache_creation_tokens
+        series.cost_usd += call.cost_usd
+        series.outcomes[call.outcome] = series.outcomes.get(call.outcome, 0) + 1
+    if settings.LLM_CALL_LOG:
+        _submit_log(call)
+
+
+def _submit_log(call: LLMCallRecord) -> None:
+    # On the event loop (claude_chat_json_async) the INSERT runs in the loop's
+    # default executor instead of blocking every other request.
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _log_call(call)
+        return
+    loop.run_in_executor(None, _log_call, call)
+
+
+def _log_call(call: LLMCallRecord) -> None:
+    from datetime import datetime, timezone
+
+    from app.core.database import get_db
+    from app.models.llm_call import LLMCall
+
+    try:
+        with get_db() as db:
+            db.add(LLMCall(
+                endpoint=call.endpoint,
+                template=call.template,
+                model=call.model,
+                outcome=call.outcome,
+                input_tokens=call.input_tokens,
+                output_tokens=call.output_tokens,
+                cache_read_tokens=call.cache_read_tokens,
+                cache_creation_tokens=call.cache_creation_tokens,
+                ttft_ms=None if call.ttft_s is None else int(call.ttft_s * 1000),
+                latency_ms=int(call.latency_s * 1000),
+                cost_usd=call.cost_usd,
+                created_at=datetime.fromtimestamp(call.started_at, timezone.utc),
+            ))
+            db.commit()
+    except Exception:
+        logger.exception("Failed to write llm_calls row")
+
+
+@contextmanager
+def track_call(template: str, model: str) -> Iterator[LLMCallRecord]:
+    """Time one LLM call; the caller sets usage/outcome. Exceptions default the outcome to "error"."""
+    call = LLMCallRecord(endpoint=_current_endpoint(), template=template, model=model)
+    try:
+        yield call
+    except BaseException:
+        if call.outcome == "ok":
+            call.outcome = "error"
+        raise
+    finally:
+        call.latency_s = time.perf_counter() - call._t0
+        record(call)
+
+
+def reset() -> None:
+    with _lock:
+        _series.clear()
+
+
+# ---------------------------------------------------------------------------
+# Exposition
+# ---------------------------------------------------------------------------
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(key: Tuple[str, str, str], **extra: str) -> str:
+    endpoint, template, model = key
+    pairs = {"endpoint": endpoint, "template": template, "model": model, **extra}
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs.items()) + "}"
+
+
+def _render_histogram(lines: List[str], name: str, help_text: str, attr: str,
+                      snapshot: Dict[Tuple[str, str, str], _Series]) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, series in snapshot.items():
+        hist: Histogram = getattr(series, attr)
+        for le, count in hist.cumulative():
+            lines.append(f"{name}_bucket{_labels(key, le=le)} {count}")
+        lines.append(f"{name}_sum{_labels(key)} {hist.sum:g}")
+        lines.append(f"{name}_count{_labels(key)} {hist.count}")
+
+
+def render_prometheus() -> str:
+    with _lock:
+        snapshot = dict(_series)
+        lines: List[str] = []
+        _render_histogram(lines, "llm_call_latency_seconds", "Total LLM call latency.", "latency", snapshot)
+        _render_histogram(lines, "llm_time_to_first_token_seconds", "Time to first streamed token.", "ttft",
+                          snapshot)
+        _render_histogram(lines, "llm_input_tokens", "Uncached input tokens per call.", "input_tokens", snapshot)
+        _render_histogram(lines, "llm_output_tokens", "Output tokens per call.", "output_tokens", snapshot)
+
+        lines.append("# HELP llm_calls_total LLM calls by outcome.")
+        lines.append("# TYPE llm_calls_total counter")
+        for key, series in snapshot.items():
+            for outcome, n in sorted(series.outcomes.items()):
+                lines.append(f"llm_calls_total{_labels(key, outcome=outcome)} {n}")
+
+        lines.append("# HELP llm_cached_input_tokens_total Input tokens served from / written to the prompt cache.")
+        lines.append("# TYPE llm_cached_input_tokens_total counter")
+        for key, series in snapshot.items():
+            lines.append(f"llm_cached_input_tokens_total{_labels(key, kind='read')} {series.cache_read_tokens}")
+            lines.append(f"llm_cached_input_tokens_total{_labels(key, kind='write')} {series.cache_creation_tokens}")
+
+        lines.append("# HELP llm_cost_usd_total Estimated spend.")
+        lines.append("# TYPE llm_cost_usd_total counter")
+        for key, series in snapshot.items():
+            lines.append(f"llm_cost_usd_total{_labels(key)} {series.cost_usd:.6f}")
+    return "\n".join(lines) + "\n"
+
+
+def summary() -> List[Dict[str, Any]]:
+    """Per (endpoint, template, model) roll-up for humans."""
+    with _lock:
+        out = []
+        for (endpoint, template, model), s in sorted(_series.items()):
+            out.append({
+                "endpoint": endpoint,
+                "template": template,
+                "model": model,
+                "calls": s.latency.count,
+                "outcomes": dict(s.outcomes),
+                "input_tokens": int(s.input_tokens.sum),
+                "output_tokens": int(s.output_tokens.sum),
+                "cache_read_tokens": s.cache_read_tokens,
+                "cache_creation_tokens": s.cache_creation_tokens,
+                "cost_usd": round(s.cost_usd, 6),
+                "latency_p50_s": s.latency.quantile(0.5),
+                "latency_p95_s": s.latency.quantile(0.95),
+                "ttft_p50_s": s.ttft.quantile(0.5),
+            })
+        return out
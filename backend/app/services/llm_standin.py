@@ -0,0 +1,352 @@
+"""
+Local Anthropic-compatible stand-in for the Messages API.
+
+Serves POST /v1/messages (streaming and non-streaming) with deterministic,
+schema-valid JSON for every prompt the app sends: batch sort, cull, parse and
+analyzer. Point the app at it with LLM_BACKEND=standin to load-test /sort,
+/cull, /parse and /analyze without API cost.
+
+Response *content* is a pure function of the request, so repeated runs score
+the same jobs the same way. Latency, streaming rate and injected faults
+(429 rate limit, 529 overloaded, truncated output) are drawn from a seeded RNG
+configured via the LLM_STANDIN_* settings.
+
+Run:
+    python -m app.services.llm_standin --port 5055
+    LLM_BACKEND=standin flask --app app.main run
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from flask import Flask, Response, jsonify, request
+
+from app.core.config import settings
+from app.services.prompts import (
+    ANALYZER_SYSTEM_PROMPT,
+    BATCH_SORT_SYSTEM_PROMPT,
+    CULL_SYSTEM_PROMPT,
+    PARSE_FIELDS,
+    PARSE_SYSTEM_PREFIX,
+)
+
+_CHARS_PER_TOKEN = 4
+_RESUME_KEYS = ["general", "backend", "data", "platform", "ml-eng"]
+
+
+@dataclass(frozen=True)
+class LatencySpec:
+    """Time-to-first-token distribution, parsed from "<dist>:<a>[:<b>]" (ms)."""
+
+    dist: str
+    a: float
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencySpec":
+        parts = (spec or "fixed:0").split(":")
+        dist = parts[0].strip().lower()
+        if dist not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {dist!r}")
+        a = float(parts[1]) if len(parts) > 1 else 0.0
+        b = float(parts[2]) if len(parts) > 2 else 0.0
+        return cls(dist=dist, a=a, b=b)
+
+    def sample_ms(self, rng: random.Random) -> float:
+        if self.dist == "uniform":
+            value = rng.uniform(self.a, self.b)
+        elif self.dist == "normal":
+            value = rng.gauss(self.a, self.b)
+        elif self.dist == "lognormal":
+            value = self.a * math.exp(rng.gauss(0.0, self.b)) if self.a > 0 else 0.0
+        else:
+            value = self.a
+        return max(0.0, value)
+
+
+@dataclass(frozen=True)
+class StandinConfig:
+    latency: LatencySpec
+    tokens_per_sec: float = 0.0
+    rate_429: float = 0.0
+    rate_529: float = 0.0
+    truncate_rate: float = 0.0
+    seed: int = 0
+
+    @classmethod
+    def from_settings(cls) -> "StandinConfig":
+        return cls(
+            latency=LatencySpec.parse(settings.LLM_STANDIN_LATENCY),
+            tokens_per_sec=settings.LLM_STANDIN_TOKENS_PER_SEC,
+            rate_429=settings.LLM_STANDIN_429_RATE,
+            rate_529=settings.LLM_STANDIN_529_RATE,
+            truncate_rate=settings.LLM_STANDIN_TRUNCATE_RATE,
+            seed=settings.LLM_STANDIN_SEED,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Deterministic response bodies
+# ---------------------------------------------------------------------------
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+def _score(seed: str) -> int:
+    return int(_digest(seed)[:4], 16) % 101
+
+
+def _pick(seed: str, options: List[str]) -> str:
+    return options[int(_digest(seed)[4:8], 16) % len(options)]
+
+
+def _guidance(title: str, resume_key: str) -> str:
+    role = title or "this role"
+    return (
+        f"Good bet if you want {role}; use the {resume_key} resume. "
+        "It beats other options because it is easy to compare against similar roles on the same criteria. "
+        "Downside: the posting is light on specifics, so verify scope before applying."
+    )
+
+
+def _json_after(marker: str, text: str) -> Any:
+    idx = text.find(marker)
+    if idx < 0:
+        return None
+    try:
+        return json.loads(text[idx + len(marker):])
+    except json.JSONDecodeError:
+        return None
+
+
+def _parse_fields(system: str) -> List[str]:
+    """Field names from the JSON skeleton in a parse system prompt."""
+    start, end = system.find("{"), system.find("}")
+    if start < 0 or end < start:
+        return []
+    try:
+        return list(json.loads(system[start:end + 1]).keys())
+    except json.JSONDecodeError:
+        return []
+
+
+def _structured_fields(seed: str, title: str, fields: List[str]) -> Dict[str, Optional[str]]:
+    out: Dict[str, Optional[str]] = {}
+    for field in fields:
+        if _score(f"{seed}:{field}") < 10:
+            out[field] = None
+        else:
+            label = field.replace("_requirements", "").replace("_", " ")
+            out[field] = f"Stand-in {label} for {title or 'the role'}."
+    return out
+
+
+def prompt_kind(system: str) -> str:
+    """Classify a request by its system prompt: sort | cull | parse | analyze | unknown."""
+    if system.startswith(BATCH_SORT_SYSTEM_PROMPT):
+        return "sort"
+    if system.startswith(CULL_SYSTEM_PROMPT):
+        return "cull"
+    if system.startswith(PARSE_SYSTEM_PREFIX):
+        return "parse"
+    if system.startswith(ANALYZER_SYSTEM_PROMPT):
+        return "analyze"
+    return "unknown"
+
+
+def build_response_payload(system: str, user: str) -> Any:
+    """Deterministic, schema-valid JSON answer for one request."""
+    kind = prompt_kind(system)
+    if kind == "sort":
+        jobs = _json_after("Jobs to analyse:\n", user) or []
+        out = []
+        for job in jobs:
+            job_id = str(job.get("job_id"))
+            title = job.get("title") or ""
+            resume_key = _pick(job_id, _RESUME_KEYS)
+            item = {"job_id": job_id}
+            item.update(_structured_fields(job_id, title, PARSE_FIELDS))
+            item["score"] = _score(f"{job_id}:{user[:200]}")
+            item["resume_key"] = resume_key
+            item["guidance_3_sentences"] = _guidance(title, resume_key)
+            out.append(item)
+        return out
+    if kind == "cull":
+        payload = _json_after("JSON input:\n", user) or {}
+        resume = str(payload.get("resume") or "")[:200]
+        ranked = [
+            {
+                "job_id": str(job.get("job_id")),
+                "fit_score": _score(f"{job.get('job_id')}:{resume}"),
+                "reasoning": f"Stand-in fit rationale for {job.get('title') or 'this role'}.",
+            }
+            for job in payload.get("jobs") or []
+        ]
+        ranked.sort(key=lambda r: (-r["fit_score"], r["job_id"]))
+        top_n = int(payload.get("top_n") or 10)
+        return {"ranked": ranked, "top_10": [r["job_id"] for r in ranked[:top_n]]}
+    if kind == "parse":
+        title = ""
+        for line in user.splitlines():
+            if line.startswith("Title: "):
+                title = line[len("Title: "):]
+                break
+        return _structured_fields(_digest(user), title, _parse_fields(system))
+    if kind == "analyze":
+        job = _json_after("Job JSON:\n", user) or {}
+        seed = str(job.get("url") or job.get("title") or user)
+        resume_key = _pick(seed, _RESUME_KEYS)
+        return {
+            "score": _score(seed),
+            "recommended_resume": resume_key,
+            "guidance_3_sentences": _guidance(job.get("title") or "", resume_key),
+        }
+    return {}
+
+
+# ---------------------------------------------------------------------------
+# HTTP app
+# ---------------------------------------------------------------------------
+
+def _text_of(content: Any) -> str:
+    """Flatten a string or a list of content blocks to plain text."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return ""
+
+
+def _error(status: int, err_type: str, message: str) -> Response:
+    resp = jsonify({"type": "error", "error": {"type": err_type, "message": message}})
+    resp.status_code = status
+    return resp
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def create_app(config: Optional[StandinConfig] = None) -> Flask:
+    cfg = config or StandinConfig.from_settings()
+    rng = random.Random(cfg.seed)
+    rng_lock = threading.Lock()
+
+    def draw() -> tuple[float, float, float]:
+        with rng_lock:
+            return rng.random(), cfg.latency.sample_ms(rng), rng.uniform(0.3, 0.9)
+
+    app = Flask(__name__)
+
+    @app.get("/health")
+    def health():
+        return {"status": "healthy", "backend": "standin"}
+
+    @app.post("/v1/messages")
+    def messages():
+        body = request.get_json(silent=True) or {}
+        system = _text_of(body.get("system"))
+        user = "\n".join(
+            _text_of(m.get("content")) for m in body.get("messages") or [] if m.get("role") == "user"
+        )
+        model = body.get("model") or "standin"
+
+        roll, ttft_ms, cut = draw()
+        if roll < cfg.rate_429:
+            return _error(429, "rate_limit_error", "Stand-in injected rate limit.")
+        if roll < cfg.rate_429 + cfg.rate_529:
+            return _error(529, "overloaded_error", "Stand-in injected overload.")
+        truncated = roll < cfg.rate_429 + cfg.rate_529 + cfg.truncate_rate
+
+        text = json.dumps(build_response_payload(system, user))
+        stop_reason = "end_turn"
+        if truncated:
+            text = text[: max(1, int(len(text) * cut))]
+            stop_reason = "max_tokens"
+
+        input_tokens = max(1, (len(system) + len(user)) // _CHARS_PER_TOKEN)
+        output_tokens = max(1, len(text) // _CHARS_PER_TOKEN)
+        usage = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        }
+        message_id = f"msg_standin_{uuid.uuid4().hex[:24]}"
+
+        generate_s = output_tokens / cfg.tokens_per_sec if cfg.tokens_per_sec > 0 else 0.0
+
+        if not body.get("stream"):
+            time.sleep(ttft_ms / 1000 + generate_s)
+            return jsonify({
+                "id": message_id,
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": stop_reason,
+                "stop_sequence": None,
+                "usage": usage,
+            })
+
+        def stream() -> Iterator[str]:
+            yield _sse("message_start", {
+                "type": "message_start",
+                "message": {
+                    "id": message_id,
+                    "type": "message",
+                    "role": "assistant",
+                    "model": model,
+                    "content": [],
+                    "stop_reason": None,
+                    "stop_sequence": None,
+                    "usage": {**usage, "output_tokens": 1},
+                },
+            })
+            time.sleep(ttft_ms / 1000)
+            yield _sse("content_block_start", {
+                "type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""},
+            })
+            chunk_chars = 16 * _CHARS_PER_TOKEN
+            delay = (chunk_chars / _CHARS_PER_TOKEN) / cfg.tokens_per_sec if cfg.tokens_per_sec > 0 else 0.0
+            for start in range(0, len(text), chunk_chars):
+                if start and delay:
+                    time.sleep(delay)
+                yield _sse("content_block_delta", {
+                    "type": "content_block_delta",
+                    "index": 0,
+                    "delta": {"type": "text_delta", "text": text[start:start + chunk_chars]},
+                })
+            yield _sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+            yield _sse("message_delta", {
+                "type": "message_delta",
+                "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+                "usage": {"output_tokens": output_tokens},
+            })
+            yield _sse("message_stop", {"type": "message_stop"})
+
+        return Response(stream(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local Anthropic-compatible LLM stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5055)
+    args = parser.parse_args(argv)
+    create_app().run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
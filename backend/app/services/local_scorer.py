@@ -0,0 +1,225 @@
+"""
+Zero-LLM resume/job fit scorer.
+
+Blends three signals per job, each scaled to 0-1:
+  1. Embedding similarity: cosine(resume, job) from the in-process job index
+     (callers load it; jobs.embedding itself is never read here), mapped from
+     the typical all-MiniLM-L6-v2 range [SIM_FLOOR, SIM_CEIL].
+  2. Keyword overlap: BM25 of the resume's terms against the job text, with
+     IDF taken over the jobs being scored, saturating once a job matches
+     about KEYWORD_SATURATION_TERMS terms of average specificity.
+  3. Rules: years of experience (resume vs. posting) and work mode (posting
+     vs. PREFERRED_WORK_MODE).
+
+score = 100 * weighted mean of the signals that are available for that job,
+so a job without an embedding (or a process without the embedding model) is
+scored on keywords and rules alone.
+
+Each job is tokenised once per worker: its term ids and counts are cached
+keyed by job id and text, and scoring a batch is then a handful of numpy
+operations over a (jobs x resume terms) matrix.
+"""
+from __future__ import annotations
+
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.embedding_index import job_index
+from app.services.text_features import term_counts, tokenize, work_mode, years_claimed, years_required
+
+WEIGHT_EMBEDDING = 0.5
+WEIGHT_KEYWORDS = 0.3
+WEIGHT_RULES = 0.2
+
+SIM_FLOOR = 0.15
+SIM_CEIL = 0.65
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+KEYWORD_SATURATION_TERMS = 20
+MAX_QUERY_TERMS = 400
+JOB_TEXT_CHARS = 4000
+
+# Fit of a job's work mode given the preferred one.
+WORK_MODE_FIT: Dict[str, Dict[str, float]] = {
+    "remote": {"remote": 1.0, "hybrid": 0.5, "onsite": 0.0},
+    "hybrid": {"remote": 0.75, "hybrid": 1.0, "onsite": 0.5},
+    "onsite": {"remote": 0.5, "hybrid": 0.75, "onsite": 1.0},
+}
+
+
+@dataclass(frozen=True)
+class _DocTerms:
+    fingerprint: int
+    term_ids: np.ndarray
+    counts: np.ndarray
+    length: int
+    years_required: Optional[int]
+    work_mode: Optional[str]
+
+
+class _DocTermCache:
+    """Per-worker cache of tokenised job text, bounded to ``max_docs`` entries."""
+
+    def __init__(self, max_docs: int = 50_000) -> None:
+        self._lock = threading.Lock()
+        self._vocab: Dict[str, int] = {}
+        self._docs: "OrderedDict[object, _DocTerms]" = OrderedDict()
+        self._max_docs = max_docs
+
+    def lookup(self, terms: Sequence[str]) -> np.ndarray:
+        """Vocabulary ids of ``terms`` (-1 for terms no cached job contains)."""
+        with self._lock:
+            return np.fromiter((self._vocab.get(t, -1) for t in terms), dtype=np.int64, count=len(terms))
+
+    def get(self, job) -> _DocTerms:
+        raw_text = job.raw_text or ""
+        text = f"{job.title or ''}\n{raw_text[:JOB_TEXT_CHARS]}"
+        fingerprint = hash((text, job.location))
+        with self._lock:
+            doc = self._docs.get(job.id)
+            if doc is not None and doc.fingerprint == fingerprint:
+                self._docs.move_to_end(job.id)
+                return doc
+
+        counts = term_counts(text)
+        with self._lock:
+            vocab = self._vocab
+            term_ids = np.fromiter((vocab.setdefault(t, len(vocab)) for t in counts), dtype=np.int64,
+                                   count=len(counts))
+            doc = _DocTerms(
+                fingerprint=fingerprint,
+                term_ids=term_ids,
+                counts=np.fromiter(counts.values(), dtype=np.float32, count=len(counts)),
+                length=sum(counts.values()),
+                years_required=years_required(raw_text),
+                work_mode=work_mode(job.location, raw_text),
+            )
+            self._docs[job.id] = doc
+            if len(self._docs) > self._max_docs:
+                self._docs.popitem(last=False)
+        return doc
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vocab.clear()
+            self._docs.clear()
+
+
+_doc_cache = _DocTermCache()
+
+
+@dataclass
+class FitScores:
+    """Per-job arrays aligned with the scored jobs; component arrays hold NaN where a signal is unavailable."""
+
+    score: np.ndarray
+    embedding: np.ndarray
+    keywords: np.ndarray
+    rules: np.ndarray
+    matched_terms: List[List[str]]
+
+
+def _bm25(query_ids: np.ndarray, docs: List[_DocTerms]) -> tuple[np.ndarray, np.ndarray]:
+    """Returns (n_docs x n_terms term-frequency matrix, normalised BM25 score per doc)."""
+    n, q = len(docs), query_ids.size
+    tf = np.zeros((n, q), dtype=np.float32)
+    if q == 0 or n == 0:
+        return tf, np.zeros(n, dtype=np.float32)
+
+    sizes = np.fromiter((d.term_ids.size for d in docs), dtype=np.int64, count=n)
+    all_ids = np.concatenate([d.term_ids for d in docs]) if sizes.sum() else np.zeros(0, dtype=np.int64)
+    all_counts = np.concatenate([d.counts for d in docs]) if sizes.sum() else np.zeros(0, dtype=np.float32)
+    rows = np.repeat(np.arange(n), sizes)
+
+    column = np.full(int(max(all_ids.max(initial=0), query_ids.max())) + 1, -1, dtype=np.int64)
+    column[query_ids] = np.arange(q)
+    cols = column[all_ids]
+    hit = cols >= 0
+    tf[rows[hit], cols[hit]] = all_counts[hit]
+
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n - df + 0.5) / (df + 0.5)).astype(np.float32)
+    lengths = np.fromiter((d.length for d in docs), dtype=np.float32, count=n)
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(float(lengths.mean()), 1.0))
+    raw = (tf * (BM25_K1 + 1) / (tf + norm[:, None])) @ idf
+
+    seen = df > 0
+    ideal = KEYWORD_SATURATION_TERMS * float(idf[seen].mean()) if seen.any() else 1.0
+    return tf, np.clip(raw / ideal, 0.0, 1.0)
+
+
+class LocalFitScorer:
+    def __init__(self, resume_text: str, resume_vector: Optional[Sequence[float]] = None,
+                 preferred_work_mode: Optional[str] = None):
+        terms = Counter(tokenize(resume_text or ""))
+        self.query_terms = [t for t, _ in terms.most_common(MAX_QUERY_TERMS)]
+        self.resume_years = years_claimed(resume_text or "")
+        self.resume_vector = resume_vector
+        mode = (preferred_work_mode or "").strip().lower()
+        self.preferred_work_mode = mode if mode in WORK_MODE_FIT else None
+
+    def _embedding_component(self, jobs: Sequence) -> np.ndarray:
+        if self.resume_vector is None:
+            return np.full(len(jobs), np.nan, dtype=np.float32)
+        sims = job_index.similarities(self.resume_vector, [job.id for job in jobs])
+        return np.clip((sims - SIM_FLOOR) / (SIM_CEIL - SIM_FLOOR), 0.0, 1.0)
+
+    def _rules_component(self, docs: List[_DocTerms]) -> np.ndarray:
+        n = len(docs)
+        years = np.full(n, np.nan, dtype=np.float32)
+        if self.resume_years is not None:
+            need = np.array([np.nan if d.years_required is None else d.years_required for d in docs],
+                            dtype=np.float32)
+            years = np.clip(1.0 - (need - self.resume_years) / 4.0, 0.0, 1.0)
+        mode = np.full(n, np.nan, dtype=np.float32)
+        if self.preferred_work_mode:
+            fit = WORK_MODE_FIT[self.preferred_work_mode]
+            mode = np.array([fit.get(d.work_mode, np.nan) for d in docs], dtype=np.float32)
+        both = np.stack([years, mode])
+        counts = np.count_nonzero(~np.isnan(both), axis=0)
+        return np.where(counts > 0, np.nansum(both, axis=0) / np.maximum(counts, 1), np.nan)
+
+    def score(self, jobs: Sequence) -> FitScores:
+        docs = [_doc_cache.get(job) for job in jobs]
+        query_ids = _doc_cache.lookup(self.query_terms)
+        known = query_ids >= 0
+        query_ids = query_ids[known]
+        query_terms = [t for t, k in zip(self.query_terms, known) if k]
+
+        tf, keywords = _bm25(query_ids, docs)
+        if not self.query_terms:
+            keywords = np.full(len(docs), np.nan, dtype=np.float32)
+        embedding = self._embedding_component(jobs)
+        rules = self._rules_component(docs)
+
+        components = np.stack([embedding, keywords, rules], axis=1)
+        weights = np.array([WEIGHT_EMBEDDING, WEIGHT_KEYWORDS, WEIGHT_RULES], dtype=np.float32)
+        available = ~np.isnan(components)
+        total = (available * weights).sum(axis=1)
+        blended = np.where(available, components, 0.0) @ weights
+        score = np.where(total > 0, blended / np.maximum(total, 1e-9), 0.5)
+
+        matched: List[List[str]] = [[] for _ in docs]
+        if query_terms:
+            df = np.count_nonzero(tf, axis=0)
+            weight = (tf > 0) / np.maximum(df, 1)  # rarer shared terms first
+            top = np.argsort(-weight, axis=1, kind="stable")[:, :8]
+            for i, cols in enumerate(top):
+                matched[i] = [query_terms[c] for c in cols if tf[i, c] > 0]
+
+        return FitScores(
+            score=np.rint(score * 100).astype(np.int64),
+            embedding=embedding,
+            keywords=keywords,
+            rules=rules,
+            matched_terms=matched,
+        )
+
+
+def clear_cache() -> None:
+    _doc_cache.clear()
@@ -0,0 +1,243 @@
+"""
+Near-duplicate postings: MinHash signatures with an LSH bucket index.
+
+job_hash only catches byte-identical captures. A repost with a new tracking
+URL or a reworded line is caught here instead:
+
+  - A job's text (title, company, raw_text) is lowercased, split into words
+    and shingled into overlapping 5-word runs. Its MinHash signature is the
+    minimum of NUM_PERM universal hashes over the shingle set, stored in
+    jobs.minhash. The share of equal positions in two signatures estimates
+    the Jaccard similarity of their shingle sets.
+  - The signature is cut into BANDS bands of ROWS values. Each band is hashed
+    to a bucket in job_lsh_buckets, so finding candidates at ingest is an
+    indexed lookup of BANDS (band, bucket) pairs, not a scan. With 16 x 8,
+    pairs at Jaccard 0.8 share a bucket ~95% of the time, pairs at 0.5 ~6%.
+  - Candidates whose estimated similarity reaches NEAR_DUP_THRESHOLD link
+    the new job through jobs.duplicate_of to the candidate's canonical job.
+
+Pipelines (/parse, /analyze, /sort, /cull, preference pairs) skip linked
+jobs with ``canonical_only`` and call ``copy_from_canonical`` after writing
+results, so a repost costs nothing to process.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func, insert, tuple_, update
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.models.job import Job
+from app.models.job_lsh_bucket import JobLshBucket
+from app.services.ranking import refresh_scores
+
+SHINGLE_WORDS = 5
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20261019)  # fixed: signatures must be comparable across processes and restarts
+_A = _rng.randint(1, _PRIME, size=(NUM_PERM, 1)).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, size=(NUM_PERM, 1)).astype(np.uint64)
+_WORD = re.compile(r"\w+")
+
+# Results a duplicate takes over from its canonical job.
+COPIED_COLUMNS = (
+    "structured_requirements", "work_mode", "sponsorship", "min_years", "degree_level", "parsed_at", "score",
+    "analysis", "resume_recommendation", "reasoning", "downsides", "guidance_3_sentences", "status", "analyzed_at",
+)
+
+
+def _shingles(text: str) -> Set[str]:
+    words = _WORD.findall(text.lower())
+    if len(words) <= SHINGLE_WORDS:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def posting_text(title: Optional[str], company: Optional[str], raw_text: Optional[str]) -> str:
+    return f"{title or ''} {company or ''} {raw_text or ''}"
+
+
+def signature(text: str) -> Optional[np.ndarray]:
+    """uint32 MinHash signature of ``text``'s word shingles; None when it has no words."""
+    shingles = _shingles(text)
+    if not shingles:
+        return None
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+    # (a * x + b) mod p with a, b < 2^31 and x < 2^32 stays below 2^63: no uint64 overflow.
+    return ((_A * hashes + _B) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def to_bytes(sig: np.ndarray) -> bytes:
+    return sig.astype("<u4").tobytes()
+
+
+def from_bytes(raw: bytes) -> np.ndarray:
+    return np.frombuffer(raw, dtype="<u4")
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return float(np.mean(a == b))
+
+
+def band_buckets(sig: np.ndarray) -> List[Tuple[int, int]]:
+    """(band, signed 64-bit bucket hash) for each band of ``sig``."""
+    raw = to_bytes(sig)
+    width = ROWS * 4
+    return [
+        (band, int.from_bytes(hashlib.blake2b(raw[band * width:(band + 1) * width], digest_size=8).digest(),
+                              "little", signed=True))
+        for band in range(BANDS)
+    ]
+
+
+def _bucket_members(db, keys: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], List[UUID]]:
+    keys = list(set(keys))
+    members: Dict[Tuple[int, int], List[UUID]] = {}
+    for lo in range(0, len(keys), 1000):
+        rows = db.query(JobLshBucket.band, JobLshBucket.bucket, JobLshBucket.job_id).filter(
+            tuple_(JobLshBucket.band, JobLshBucket.bucket).in_(keys[lo:lo + 1000])
+        )
+        for band, bucket, job_id in rows:
+            members.setdefault((band, bucket), []).append(job_id)
+    return members
+
+
+def link_near_duplicates(db, jobs: Sequence[Tuple[UUID, str]]) -> Dict[UUID, Tuple[UUID, float]]:
+    """Sign, index and link freshly inserted ``jobs`` ((id, posting_text) pairs), in order.
+
+    Returns {job_id: (canonical_id, similarity)} for the ones found to be near
+    duplicates of an older job or of an earlier job in ``jobs``; results of
+    already-processed canonical jobs are copied to them and their
+    combined_score is brought up to date. Does not commit.
+    """
+    signed = [(job_id, sig) for job_id, sig in ((job_id, signature(text)) for job_id, text in jobs) if sig is not None]
+    if not signed:
+        return {}
+    buckets = {job_id: band_buckets(sig) for job_id, sig in signed}
+    stored = _bucket_members(db, (key for keys in buckets.values() for key in keys))
+    candidate_ids = {job_id for members in stored.values() for job_id in members}
+    known: Dict[UUID, Tuple[np.ndarray, Optional[UUID]]] = {
+        row.id: (from_bytes(row.minhash), row.duplicate_of)
+        for row in db.query(Job.id, Job.minhash, Job.duplicate_of).filter(
+            Job.id.in_(candidate_ids), Job.minhash.isnot(None)
+        )
+    } if candidate_ids else {}
+
+    links: Dict[UUID, Tuple[UUID, float]] = {}
+    updates, bucket_rows = [], []
+    for job_id, sig in signed:
+        best: Optional[Tuple[float, UUID]] = None
+        for key in buckets[job_id]:
+            for other in stored.get(key, ()):
+                if other == job_id or other not in known:
+                    continue
+                sim = similarity(sig, known[other][0])
+                if sim >= settings.NEAR_DUP_THRESHOLD and (best is None or sim > best[0]):
+                    best = (sim, known[other][1] or other)
+        canonical = None
+        if best is not None:
+            canonical = best[1]
+            links[job_id] = (canonical, best[0])
+        updates.append({"id": job_id, "minhash": to_bytes(sig), "duplicate_of": canonical})
+        # Later jobs in this batch can match this one.
+        known[job_id] = (sig, canonical)
+        for key in buckets[job_id]:
+            stored.setdefault(key, []).append(job_id)
+            bucket_rows.append({"band": key[0], "bucket": key[1], "job_id": job_id})
+
+    db.execute(update(Job), updates)
+    db.execute(insert(JobLshBucket), bucket_rows)
+    if links:
+        copied = copy_from_canonical(db, duplicate_ids=list(links))
+        if copied:
+            refresh_scores(db, copied)
+    return links
+
+
+def canonical_only(query):
+    """Restrict a jobs query to jobs that are not linked duplicates."""
+    return query.filter(Job.duplicate_of.is_(None))
+
+
+def resolve_canonical(db, job_ids: Iterable[UUID]) -> List[UUID]:
+    """``job_ids`` with each linked duplicate replaced by its canonical job, order kept, no repeats."""
+    job_ids = list(job_ids)
+    if not job_ids:
+        return []
+    links = dict(db.query(Job.id, Job.duplicate_of).filter(Job.id.in_(job_ids), Job.duplicate_of.isnot(None)))
+    return list(dict.fromkeys(links.get(job_id, job_id) for job_id in job_ids))
+
+
+def copy_from_canonical(
+    db, canonical_ids: Optional[Iterable[UUID]] = None, duplicate_ids: Optional[Iterable[UUID]] = None
+) -> List[UUID]:
+    """Copy parse/analysis results onto linked duplicates in one UPDATE; returns the duplicates updated.
+
+    Limit by the canonical jobs just processed or by specific duplicates.
+    Flushes pending changes first and leaves committing to the caller.
+    """
+    db.flush()
+    canonical = aliased(Job)
+    values = {name: getattr(canonical, name) for name in COPIED_COLUMNS}
+    values["embedding"] = func.coalesce(canonical.embedding, Job.embedding)
+    stmt = update(Job).where(Job.duplicate_of == canonical.id)
+    if canonical_ids is not None:
+        canonical_ids = list(canonical_ids)
+        if not canonical_ids:
+            return []
+        stmt = stmt.where(canonical.id.in_(canonical_ids))
+    if duplicate_ids is not None:
+        duplicate_ids = list(duplicate_ids)
+        if not duplicate_ids:
+            return []
+        stmt = stmt.where(Job.id.in_(duplicate_ids))
+    stmt = stmt.values(**values).returning(Job.id).execution_options(synchronize_session=False)
+    return list(db.execute(stmt).scalars())
+
+
+def backfill(db, batch: int = 500) -> Tuple[int, int]:
+    """Sign every job without a signature, oldest first (so originals become canonical); commits per batch.
+
+    Returns (signed, linked).
+    """
+    from sqlalchemy.orm import load_only
+
+    signed = linked = 0
+    while True:
+        jobs = (
+            db.query(Job).options(load_only(Job.id, Job.title, Job.company, Job.raw_text))
+            .filter(Job.minhash.is_(None))
+            .order_by(Job.created_at, Job.id)
+            .limit(batch)
+            .all()
+        )
+        if not jobs:
+            return signed, linked
+        links = link_near_duplicates(db, [(job.id, posting_text(job.title, job.company, job.raw_text)) for job in jobs])
+        # Jobs with no words get an empty signature so they are not picked up again.
+        db.execute(
+            update(Job).where(Job.id.in_([job.id for job in jobs]), Job.minhash.is_(None)).values(minhash=b"")
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        db.expunge_all()
+        signed += len(jobs)
+        linked += len(links)
+
+
+if __name__ == "__main__":
+    from app.core.database import get_db
+
+    with get_db() as session:
+        total, dupes = backfill(session)
+    print(f"signed {total} jobs, linked {dupes} near duplicates")
@@ -8,28 +8,45 @@ On each A/B choice:
      This generalises the user's preference to similar-but-uncompared jobs.
 
 Embeddings use sentence-transformers/all-MiniLM-L6-v2 (384-dim, runs on CPU).
-Vectors are stored as JSON arrays in jobs.embedding.
+Vectors are stored as JSON arrays in jobs.embedding (a deferred column) and
+mirrored in the in-process job index, which is what similarity reads use.
 """
 from __future__ import annotations
 
+import hashlib
 import math
-from typing import TYPE_CHECKING, List, Optional
+import threading
+from typing import TYPE_CHECKING, List
+
+from app.services.embedding_index import job_index
 
 if TYPE_CHECKING:
     from app.models.job import Job
 
 _MODEL = None  # lazy-loaded singleton
+_MODEL_LOCK = threading.Lock()
 
 
 def _embedder():
     global _MODEL
     if _MODEL is None:
-        from sentence_transformers import SentenceTransformer
-        _MODEL = SentenceTransformer("all-MiniLM-L6-v2")
+        with _MODEL_LOCK:
+            if _MODEL is None:
+                from sentence_transformers import SentenceTransformer
+                _MODEL = SentenceTransformer("all-MiniLM-L6-v2")
     return _MODEL
 
 
-def _job_text(job: "Job") -> str:
+def reset_embedder() -> None:
+    """Drop the model and memoised resume vectors; a forked worker loads its own model on first use."""
+    global _MODEL, _MODEL_LOCK, _RESUME_VECS_LOCK
+    _MODEL, _MODEL_LOCK = None, threading.Lock()
+    _RESUME_VECS_LOCK = threading.Lock()
+    _RESUME_VECS.clear()
+
+
+def job_text(job: "Job") -> str:
+    """The text a job is embedded from: title, company and the about summary (else the start of the posting)."""
     about = None
     if job.structured_requirements and isinstance(job.structured_requirements, dict):
         about = job.structured_requirements.get("about_summary")
@@ -42,6 +59,31 @@ def get_embedding(text: str) -> List[float]:
     return vec.tolist()
 
 
+def get_embeddings(texts: List[str]) -> List[List[float]]:
+    """Embed many texts in one batched forward pass."""
+    if not texts:
+        return []
+    return _embedder().encode(texts, normalize_embeddings=True, batch_size=64).tolist()
+
+
+_RESUME_VECS: dict[str, List[float]] = {}
+_RESUME_VECS_LOCK = threading.Lock()
+
+
+def embed_resume(text: str) -> List[float]:
+    """Resume embedding, memoised by content hash so each resume is embedded once per process."""
+    key = hashlib.sha256(text.encode()).hexdigest()
+    with _RESUME_VECS_LOCK:
+        vec = _RESUME_VECS.get(key)
+    if vec is None:
+        vec = get_embedding(text[:2000])
+        with _RESUME_VECS_LOCK:
+            if len(_RESUME_VECS) >= 8:
+                _RESUME_VECS.clear()
+            _RESUME_VECS[key] = vec
+    return vec
+
+
 def cosine_sim(a: List[float], b: List[float]) -> float:
     dot = sum(x * y for x, y in zip(a, b))
     norm_a = math.sqrt(sum(x * x for x in a))
@@ -52,11 +94,32 @@ def cosine_sim(a: List[float], b: List[float]) -> float:
 
 
 def ensure_embeddings(jobs: List["Job"], db) -> None:
-    """Embed any jobs that are missing an embedding vector, then flush."""
-    for job in jobs:
-        if job.embedding is None:
-            job.embedding = get_embedding(_job_text(job))
+    """
+    Make sure every job is in the job index: pick up vectors stored since the index
+    was loaded, embed the rest (one batch), then flush. Only the jobs that really
+    need embedding have their text loaded.
+    """
+    from app.models.job import Job, load_columns
+
+    job_index.ensure_loaded(db)
+    missing = [job for job in jobs if job.id not in job_index]
+    if not missing:
+        return
+    stored = (
+        db.query(Job.id, Job.embedding)
+        .filter(Job.id.in_([job.id for job in missing]), Job.embedding.isnot(None))
+        .all()
+    )
+    job_index.upsert((row.id, row.embedding) for row in stored)
+    missing = [job for job in missing if job.id not in job_index]
+    if not missing:
+        return
+    load_columns(db, missing, Job.title, Job.company, Job.structured_requirements, Job.raw_text)
+    vectors = get_embeddings([job_text(job) for job in missing])
+    for job, vec in zip(missing, vectors):
+        job.embedding = vec
     db.flush()
+    job_index.upsert(zip((job.id for job in missing), vectors))
 
 
 _ELO_START = 1000.0
@@ -77,8 +140,9 @@ def record_preference(
     """
     Run ELO + vector spread for one preference choice, then flush.
 
-    winner / loser must already have embeddings.
-    all_jobs is the full list (including winner & loser) to spread to.
+    winner / loser must already be in the job index (see ensure_embeddings).
+    all_jobs is the full list (including winner & loser) to spread to; only
+    id and preference_score are read, similarities come from the index.
     """
     elo_w = winner.preference_score if winner.preference_score is not None else _ELO_START
     elo_l = loser.preference_score if loser.preference_score is not None else _ELO_START
@@ -91,18 +155,16 @@ def record_preference(
     loser.preference_score = elo_l + _K * (0.0 - expected_l)
 
     # Indirect update — spread to all other embedded jobs
-    winner_vec: Optional[List[float]] = winner.embedding
-    loser_vec: Optional[List[float]] = loser.embedding
-
-    if winner_vec and loser_vec:
-        for job in all_jobs:
-            if job.id in (winner.id, loser.id):
-                continue
-            if job.embedding is None:
+    winner_vec = job_index.vector(winner.id)
+    loser_vec = job_index.vector(loser.id)
+
+    if winner_vec is not None and loser_vec is not None:
+        others = [job for job in all_jobs if job.id not in (winner.id, loser.id)]
+        ids = [job.id for job in others]
+        deltas = _K * (job_index.similarities(winner_vec, ids) - job_index.similarities(loser_vec, ids)) * _SPREAD
+        for job, delta in zip(others, deltas.tolist()):
+            if math.isnan(delta):  # not embedded
                 continue
-            sim_w = cosine_sim(job.embedding, winner_vec)
-            sim_l = cosine_sim(job.embedding, loser_vec)
-            delta = _K * (sim_w - sim_l) * _SPREAD
             base = job.preference_score if job.preference_score is not None else _ELO_START
             job.preference_score = base + delta
 
@@ -40,15 +40,98 @@ BATCH_SORT_SYSTEM_PROMPT = (
 )
 
 
-def build_batch_sort_messages(
-    resume_text: str, jobs: List[Dict]
+CULL_SYSTEM_PROMPT = (
+    "You are ranking jobs for FIT only. Ignore location, salary, and prestige. "
+    "Given a resume and job postings, score fit from 0-100 and provide 1-2 sentence reasoning per job. "
+    "Return ONLY valid JSON."
+)
+
+PARSE_FIELDS = [
+    "about_summary",
+    "experience_requirements",
+    "expertise_requirements",
+    "business_cultural_requirements",
+    "sponsorship_requirements",
+    "work_location_requirements",
+    "education_requirements",
+]
+
+PARSE_FIELD_DESCRIPTIONS = {
+    "about_summary": "A 2-3 sentence summary of what the role is about",
+    "experience_requirements": "Years of experience, seniority level, specific experience needed",
+    "expertise_requirements": "Technical skills, programming languages, tools, frameworks, technologies",
+    "business_cultural_requirements": "Company values, culture fit, soft skills, personality traits",
+    "sponsorship_requirements": "Visa sponsorship mentioned, international work authorization, relocation",
+    "work_location_requirements": "Remote, hybrid, in-person, travel requirements, location preferences",
+    "education_requirements": "Degree requirements, certifications, education level, field of study",
+}
+
+PARSE_SYSTEM_PREFIX = "You are a job description parser. Extract structured information from job postings."
+
+
+def build_parse_system_prompt(fields: List[str]) -> str:
+    """System prompt asking for exactly ``fields``; the JSON skeleton doubles as the output schema."""
+    categories = "\n".join(
+        f"{i}. {field}: {PARSE_FIELD_DESCRIPTIONS[field]}" for i, field in enumerate(fields, start=1)
+    )
+    skeleton = "{\n" + ",\n".join(f'  "{field}": "string or null"' for field in fields) + "\n}"
+    return (
+        f"{PARSE_SYSTEM_PREFIX}\n    \n"
+        f"Extract the following categories:\n{categories}\n\n"
+        f"Return ONLY valid JSON with this exact structure:\n{skeleton}\n\n"
+        "If a category is not mentioned in the job description, set it to null. "
+        "Be concise but comprehensive."
+    )
+
+
+def build_parse_messages(
+    raw_text: str, title: str | None, company: str | None, fields: List[str] | None = None
 ) -> List[Dict[str, str]]:
-    """Build messages for a batch sort+score call covering up to 20 jobs at once."""
-    import json as _json
+    """Build messages for a single-job structured parse."""
     user_content = (
-        f"Candidate resume (use this to score fit for each job):\n{resume_text[:5000]}\n\n"
-        f"Jobs to analyse:\n{_json.dumps(jobs, ensure_ascii=True)}"
+        "Parse this job description:\n\n"
+        f"Title: {title or 'Not specified'}\n"
+        f"Company: {company or 'Not specified'}\n\n"
+        f"Description:\n{raw_text[:8000]}"
     )
+    return [
+        {"role": "system", "content": build_parse_system_prompt(fields or PARSE_FIELDS)},
+        {"role": "user", "content": user_content},
+    ]
+
+
+def build_cull_messages(resume_text: str, jobs: List[Dict], top_n: int) -> List[Dict[str, str]]:
+    """Build messages for a single cull call ranking ``jobs`` against the resume."""
+    user_prompt = {
+        "resume": resume_text,
+        "jobs": jobs,
+        "top_n": top_n,
+        "output_format": {
+            "ranked": [{"job_id": "uuid", "fit_score": 0, "reasoning": "short rationale"}],
+            "top_10": ["uuid"],
+        },
+    }
+    return [
+        {"role": "system", "content": CULL_SYSTEM_PROMPT},
+        {"role": "user", "content": f"JSON input:\n{json.dumps(user_prompt)}"},
+    ]
+
+
+def resume_prompt_prefix(resume_text: str) -> str:
+    """Resume block that opens every batch sort user message; built once per resume (services/resume_cache.py)."""
+    return f"Candidate resume (use this to score fit for each job):\n{resume_text}\n\n"
+
+
+def build_batch_sort_messages(
+    resume_prefix: str, jobs: List[Dict]
+) -> List[Dict[str, str]]:
+    """Build messages for a batch sort+score call covering up to 20 jobs at once.
+
+    ``resume_prefix`` comes from resume_prompt_prefix(), so every batch for a
+    resume starts with byte-identical text.
+    """
+    import json as _json
+    user_content = f"{resume_prefix}Jobs to analyse:\n{_json.dumps(jobs, ensure_ascii=True)}"
     return [
         {"role": "system", "content": BATCH_SORT_SYSTEM_PROMPT},
         {"role": "user", "content": user_content},
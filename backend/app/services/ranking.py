@@ -0,0 +1,126 @@
+"""
+Materialised ranking for GET /rank.
+
+Two columns on jobs, NULL until a job is analyzed:
+  - preference_norm: preference_score min-max normalised to 0-100 over the
+    analyzed jobs (50 while fewer than two are rated or all ratings are equal).
+  - combined_score: blend of the LLM score and preference_norm with
+    RANK_WEIGHT_LLM / RANK_WEIGHT_PREFERENCE; a job with only one of the two
+    uses that one, a job with neither gets 0.
+
+ranking_state records the ELO bounds and weights the stored values were
+computed with. Routes that change a component call ``refresh_scores`` with
+the jobs they touched before committing: while the bounds and weights are
+unchanged only those rows are rewritten; when they move, every analyzed row
+is rewritten by one set-based UPDATE. Nothing is loaded into Python.
+
+Other weights can be ranked on the fly with ``blend(Job.score,
+Job.preference_norm, ...)``, which reads the stored components and needs no
+recompute. GET /rank does exactly that while ``stored_current`` is false, so
+the read path never writes. The full rewrite after a RANK_WEIGHT_* change
+happens at startup (app/serving.py ``on_starting``), on the next write that
+calls ``refresh_scores``, or by hand:
+
+    cd backend && python -m app.services.ranking
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Float, and_, case, cast, func, literal, null, update
+
+from app.core.config import settings
+from app.models.job import Job
+from app.models.ranking_state import RankingState
+
+STATE_ID = 1
+
+
+def default_weights() -> Tuple[float, float]:
+    return settings.RANK_WEIGHT_LLM, settings.RANK_WEIGHT_PREFERENCE
+
+
+def blend(score, preference_norm, w_llm: float, w_pref: float):
+    """SQL expression for the combined score of ``score`` (0-100) and ``preference_norm`` (0-100)."""
+    llm = cast(score, Float)
+    both = (literal(w_llm) * llm + literal(w_pref) * preference_norm) / literal(w_llm + w_pref)
+    return case(
+        (and_(score.isnot(None), preference_norm.isnot(None)), both),
+        (score.isnot(None), llm),
+        (preference_norm.isnot(None), preference_norm),
+        else_=literal(0.0),
+    )
+
+
+def _bounds(db) -> Tuple[Optional[float], Optional[float]]:
+    """(min, max) preference_score over analyzed jobs, or (None, None) with fewer than two ratings."""
+    lo, hi, rated = (
+        db.query(func.min(Job.preference_score), func.max(Job.preference_score), func.count(Job.preference_score))
+        .filter(Job.analyzed_at.isnot(None))
+        .one()
+    )
+    return (lo, hi) if rated >= 2 else (None, None)
+
+
+def _preference_norm(lo: Optional[float], hi: Optional[float]):
+    if lo is None or hi == lo:
+        return case((Job.preference_score.is_(None), null()), else_=literal(50.0))
+    return (Job.preference_score - lo) / (hi - lo) * 100.0
+
+
+def refresh_scores(db, job_ids: Optional[Iterable[UUID]] = None) -> None:
+    """Bring preference_norm / combined_score up to date; ``job_ids=None`` rewrites every analyzed job.
+
+    Flushes pending changes first and leaves committing to the caller.
+    """
+    db.flush()
+    lo, hi = _bounds(db)
+    w_llm, w_pref = default_weights()
+    state = db.get(RankingState, STATE_ID, with_for_update=True)
+    if state is None:
+        state = RankingState(id=STATE_ID)
+        db.add(state)
+    current = (state.elo_min, state.elo_max, state.weight_llm, state.weight_preference) == (lo, hi, w_llm, w_pref)
+
+    norm = _preference_norm(lo, hi)
+    stmt = (
+        update(Job)
+        .where(Job.analyzed_at.isnot(None))
+        .values(preference_norm=norm, combined_score=blend(Job.score, norm, w_llm, w_pref))
+        .execution_options(synchronize_session=False)
+    )
+    if current and job_ids is not None:
+        job_ids = list(job_ids)
+        if not job_ids:
+            return
+        stmt = stmt.where(Job.id.in_(job_ids))
+    db.execute(stmt)
+
+    state.elo_min, state.elo_max = lo, hi
+    state.weight_llm, state.weight_preference = w_llm, w_pref
+    state.updated_at = datetime.now(timezone.utc)
+
+
+def stored_current(db) -> bool:
+    """Whether the stored combined_score was built with the configured weights (read only)."""
+    state = db.get(RankingState, STATE_ID)
+    return state is not None and (state.weight_llm, state.weight_preference) == default_weights()
+
+
+def recompute_if_stale(db) -> bool:
+    """Rewrite every analyzed row (and commit) when the weights changed since the last refresh."""
+    if stored_current(db):
+        return False
+    refresh_scores(db)
+    db.commit()
+    return True
+
+
+if __name__ == "__main__":
+    from app.core.database import get_db
+
+    with get_db() as session:
+        changed = recompute_if_stale(session)
+    print("recomputed combined scores" if changed else "combined scores already current")
@@ -0,0 +1,185 @@
+"""
+Deterministic structured-requirements extractor.
+
+A regex/lexicon pass over a posting that fills the parse fields it can detect
+on its own and reports a confidence (0-1) per field. parse_job_description
+only asks the LLM for fields below PARSE_LOCAL_MIN_CONFIDENCE, with a prompt
+listing just those fields.
+
+A confident ``None`` means the topic is not mentioned anywhere (e.g. no visa
+or work-authorisation wording at all), which is what the LLM returns too.
+Free-text fields that need summarising (about_summary, culture) are always
+left to the LLM.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.services.prompts import PARSE_FIELDS
+from app.services.text_features import tokenize, work_mode
+
+MAX_SENTENCES = 3
+MAX_VALUE_CHARS = 600
+
+# Sentence ends, but not after initialisms or e.g./i.e. ("U.S. citizen", "e.g. AWS").
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])(?<![A-Z]\.[A-Z]\.)(?<!e\.g\.)(?<!i\.e\.)\s+|\n+")
+_BULLET = re.compile(r"^[\s\-*•·]+")
+
+_SPONSORSHIP_RE = re.compile(
+    r"\b(?:sponsor(?:ship|ing|ed|s)?|visas?|h-?1b|green card|work authori[sz]ation|authori[sz]ed to work|"
+    r"eligible to work|right to work|work permit|u\.?s\.? citizens?(?:hip)?|security clearance|relocat\w*)\b",
+    re.IGNORECASE,
+)
+_LOCATION_RE = re.compile(
+    r"\b(?:remote|hybrid|on-?site|in[- ]office|in[- ]person|work from home|wfh|"
+    r"days? (?:a|per) week|relocat\w*|travel)\b",
+    re.IGNORECASE,
+)
+_DEGREE_RE = re.compile(
+    r"\b(?:bachelor'?s?|master'?s?|ph\.?d\.?|doctorate|mba|degree|diploma)\b"
+    r"|\b(?:b\.s\.|m\.s\.|b\.a\.|bs/ms|ba/bs)",
+    re.IGNORECASE,
+)
+_CERT_RE = re.compile(r"\bcertif(?:ied|ications?|icates?)\b", re.IGNORECASE)
+_EDUCATION_HINT_RE = re.compile(r"\b(?:education|graduate|coursework|academic)\b", re.IGNORECASE)
+_YEARS_RE = re.compile(r"\b\d{1,2}\s*\+?\s*(?:(?:-|–|to)\s*\d{1,2}\s*\+?\s*)?(?:years?|yrs?)\b", re.IGNORECASE)
+_SENIORITY_RE = re.compile(
+    r"\b(intern|junior|jr\.?|mid[- ]level|senior|sr\.?|staff|principal|lead|head of|director|entry[- ]level)\b",
+    re.IGNORECASE,
+)
+_CULTURE_RE = re.compile(
+    r"\b(?:collaborat\w*|communicat\w*|values|culture|team player|ownership|curious|curiosity|empathy|"
+    r"self-starter|fast-paced|mission|inclusive|diversity)\b",
+    re.IGNORECASE,
+)
+
+# token -> display name; tokens follow text_features.tokenize (lower-case, keeps c++ / c#).
+# Skills that double as everyday words (go, rest, rails, spring, excel) are left out.
+SKILLS: Dict[str, str] = {
+    "python": "Python", "java": "Java", "kotlin": "Kotlin", "scala": "Scala", "golang": "Go",
+    "rust": "Rust", "c++": "C++", "c#": "C#", "ruby": "Ruby", "php": "PHP", "swift": "Swift",
+    "javascript": "JavaScript", "typescript": "TypeScript", "sql": "SQL", "bash": "Bash",
+    "react": "React", "angular": "Angular", "vue": "Vue", "node": "Node.js", "nodejs": "Node.js",
+    "django": "Django", "flask": "Flask", "fastapi": "FastAPI",
+    "graphql": "GraphQL", "grpc": "gRPC",
+    "postgres": "PostgreSQL", "postgresql": "PostgreSQL", "mysql": "MySQL", "mongodb": "MongoDB",
+    "redis": "Redis", "elasticsearch": "Elasticsearch", "snowflake": "Snowflake", "bigquery": "BigQuery",
+    "kafka": "Kafka", "spark": "Spark", "airflow": "Airflow", "dbt": "dbt", "hadoop": "Hadoop",
+    "aws": "AWS", "gcp": "GCP", "azure": "Azure", "docker": "Docker", "kubernetes": "Kubernetes",
+    "k8s": "Kubernetes", "terraform": "Terraform", "ansible": "Ansible", "linux": "Linux", "git": "Git",
+    "pandas": "pandas", "numpy": "NumPy", "pytorch": "PyTorch", "tensorflow": "TensorFlow",
+    "scikit": "scikit-learn", "sklearn": "scikit-learn", "llm": "LLMs", "llms": "LLMs", "nlp": "NLP",
+    "tableau": "Tableau", "looker": "Looker", "figma": "Figma", "salesforce": "Salesforce",
+}
+
+
+@dataclass(frozen=True)
+class FieldExtraction:
+    value: Optional[str]
+    confidence: float
+
+
+def _sentences(text: str) -> List[str]:
+    out = []
+    for part in _SENTENCE_SPLIT.split(text or ""):
+        part = _BULLET.sub("", part).strip()
+        if part:
+            out.append(part)
+    return out
+
+
+def _join(sentences: List[str]) -> str:
+    seen, picked = set(), []
+    for sentence in sentences:
+        if sentence.lower() not in seen:
+            seen.add(sentence.lower())
+            picked.append(sentence if sentence[-1] in ".!?" else sentence + ".")
+        if len(picked) == MAX_SENTENCES:
+            break
+    return " ".join(picked)[:MAX_VALUE_CHARS]
+
+
+def _matching(sentences: List[str], pattern: re.Pattern) -> List[str]:
+    return [s for s in sentences if pattern.search(s)]
+
+
+def _sponsorship(sentences: List[str]) -> FieldExtraction:
+    hits = _matching(sentences, _SPONSORSHIP_RE)
+    if hits:
+        return FieldExtraction(_join(hits), 0.9)
+    return FieldExtraction(None, 0.85)
+
+
+def _work_location(sentences: List[str], location: Optional[str]) -> FieldExtraction:
+    hits = _matching(sentences, _LOCATION_RE)
+    mode = work_mode(location, " ".join(hits))
+    if hits:
+        value = _join(hits)
+        if location and location.lower() not in value.lower():
+            value = f"{value} Location: {location}."
+        return FieldExtraction(value, 0.9 if mode else 0.75)
+    if location and mode:
+        value = location if mode in location.lower() else f"{mode.capitalize()} ({location})"
+        return FieldExtraction(f"{value}.", 0.85)
+    if location:
+        return FieldExtraction(f"Location: {location}.", 0.6)
+    return FieldExtraction(None, 0.5)
+
+
+def _education(sentences: List[str], text: str) -> FieldExtraction:
+    degrees = _matching(sentences, _DEGREE_RE)
+    certs = _matching(sentences, _CERT_RE)
+    if degrees:
+        return FieldExtraction(_join(degrees + certs), 0.9)
+    if certs:
+        return FieldExtraction(_join(certs), 0.8)
+    if _EDUCATION_HINT_RE.search(text):
+        return FieldExtraction(None, 0.5)
+    return FieldExtraction(None, 0.85)
+
+
+def _experience(sentences: List[str], title: Optional[str]) -> FieldExtraction:
+    hits = [s for s in sentences if _YEARS_RE.search(s) and "experience" in s.lower()]
+    seniority = _SENIORITY_RE.search(title or "")
+    prefix = f"Seniority: {seniority.group(1).rstrip('.').capitalize()}. " if seniority else ""
+    if hits:
+        return FieldExtraction((prefix + _join(hits))[:MAX_VALUE_CHARS], 0.9)
+    if prefix:
+        return FieldExtraction(prefix.strip(), 0.6)
+    return FieldExtraction(None, 0.3)
+
+
+def _expertise(text: str) -> FieldExtraction:
+    found: List[str] = []
+    for token in tokenize(text):
+        name = SKILLS.get(token)
+        if name and name not in found:
+            found.append(name)
+    if not found:
+        return FieldExtraction(None, 0.3)
+    return FieldExtraction(", ".join(found), 0.8 if len(found) >= 3 else 0.6)
+
+
+def _culture(sentences: List[str]) -> FieldExtraction:
+    hits = _matching(sentences, _CULTURE_RE)
+    return FieldExtraction(_join(hits) if hits else None, 0.6 if hits else 0.3)
+
+
+def extract_requirements(
+    raw_text: str, title: Optional[str] = None, location: Optional[str] = None
+) -> Dict[str, FieldExtraction]:
+    """Best local guess and confidence for every field in PARSE_FIELDS."""
+    text = raw_text or ""
+    sentences = _sentences(text)
+    result = {
+        "about_summary": FieldExtraction(None, 0.0),
+        "experience_requirements": _experience(sentences, title),
+        "expertise_requirements": _expertise(text),
+        "business_cultural_requirements": _culture(sentences),
+        "sponsorship_requirements": _sponsorship(sentences),
+        "work_location_requirements": _work_location(sentences, location),
+        "education_requirements": _education(sentences, text),
+    }
+    return {field: result[field] for field in PARSE_FIELDS}
@@ -0,0 +1,227 @@
+"""
+Versioned read cache with conditional GET for JSON read endpoints.
+
+Every statement that writes a versioned table appends a row to
+table_changes (statement trigger, migrations 010 and 019). Writers only
+insert, so they never wait on each other or on a shared counter row. A
+table's version is its table_versions.version, which holds the rows folded
+in by ``compact``, plus its row count in table_changes: it grows with every
+committed write, in whatever order transactions commit. Updates that only
+move a job lease (services/job_claims.py) are not logged.
+
+A cached view first reads the versions of the tables it depends on, then:
+  - answers 304 when the request's If-None-Match carries the ETag for
+    (release, endpoint, arguments, versions) — the ETag is derived from
+    those, not from the body, so any worker can answer it without running
+    the view;
+  - otherwise serves the serialized body from an in-process LRU keyed the
+    same way, and only runs the view on a miss.
+
+An unchanged refresh therefore costs one version lookup. Versions are read
+before the view runs, so a body is never stored under a version newer than
+its data; a concurrent write at worst causes one extra miss. The release
+(APP_VERSION, else a hash of the backend sources) keeps a deploy from
+answering 304 with a body the old code rendered.
+
+``compact`` keeps the count cheap. It runs at startup (app/serving.py), in a
+background thread once more than COMPACT_AT rows are logged for a table, and
+by hand:
+
+    cd backend && python -m app.services.response_cache
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Dict, Hashable, Optional, Sequence, Tuple
+
+from flask import Response, make_response, request
+from sqlalchemy import func, select, text
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.models.table_change import TableChange
+from app.models.table_version import TableVersion
+
+logger = logging.getLogger(__name__)
+
+COMPACT_AT = 10_000
+
+_BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
+_RELEASE: Optional[str] = None
+_compacting = threading.Lock()
+# One statement, so a concurrent reader sees the rows either still logged or already folded.
+_FOLD = text(
+    """
+    WITH gone AS (DELETE FROM table_changes WHERE table_name = :table RETURNING 1)
+    UPDATE table_versions SET version = version + (SELECT count(*) FROM gone)
+    WHERE table_name = :table
+    RETURNING (SELECT count(*) FROM gone)
+    """
+)
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    body: bytes
+    mimetype: str
+
+
+class ResponseCache:
+    """LRU of serialized responses bounded by entry count and total body bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, CachedBody]" = OrderedDict()
+        self._bytes = 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, entry: CachedBody) -> None:
+        size = len(entry.body)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.body)
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_ENTRIES, settings.RESPONSE_CACHE_MAX_BYTES)
+
+
+def release_id() -> str:
+    """APP_VERSION, else a digest of the app and migration sources (computed once per process)."""
+    global _RELEASE
+    if _RELEASE is None:
+        if settings.APP_VERSION:
+            _RELEASE = settings.APP_VERSION
+        else:
+            digest = hashlib.sha256()
+            for path in sorted([*_BACKEND_DIR.glob("app/**/*.py"), *_BACKEND_DIR.glob("alembic/versions/*.py")]):
+                digest.update(path.relative_to(_BACKEND_DIR).as_posix().encode())
+                digest.update(path.read_bytes())
+            _RELEASE = digest.hexdigest()[:16]
+    return _RELEASE
+
+
+def table_versions(db, tables: Sequence[str]) -> Tuple[int, ...]:
+    """Current version of each of ``tables``: folded count + logged writing transactions (0 without a row)."""
+    logged = (
+        select(func.count())
+        .select_from(TableChange)
+        .where(TableChange.table_name == TableVersion.table_name)
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        select(TableVersion.table_name, TableVersion.version, logged).where(TableVersion.table_name.in_(tables))
+    ).all()
+    if any(row[2] > COMPACT_AT for row in rows):
+        compact_in_background()
+    versions: Dict[str, int] = {name: folded + count for name, folded, count in rows}
+    return tuple(versions.get(table, 0) for table in tables)
+
+
+def compact(db) -> int:
+    """Fold table_changes rows into table_versions and commit; versions are unchanged. Returns rows folded."""
+    folded = 0
+    for table in db.execute(select(TableVersion.table_name)).scalars().all():
+        folded += db.execute(_FOLD, {"table": table}).scalar() or 0
+        db.commit()
+    return folded
+
+
+def compact_in_background() -> None:
+    """Start ``compact`` on a daemon thread unless this process already runs one."""
+    if not _compacting.acquire(blocking=False):
+        return
+
+    def run():
+        try:
+            with get_db() as db:
+                compact(db)
+        except Exception:
+            logger.exception("table_changes compaction failed")
+        finally:
+            _compacting.release()
+
+    threading.Thread(target=run, name="table-changes-compact", daemon=True).start()
+
+
+def _etag(key: Tuple) -> str:
+    return hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+
+
+def cached_get(*tables: str):
+    """Cache a GET view's 200 responses until a write touches one of ``tables``."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            with get_db() as db:
+                versions = table_versions(db, tables)
+            key = (
+                release_id(),
+                request.endpoint,
+                tuple(sorted(request.args.items(multi=True))),
+                tuple(sorted((k, str(v)) for k, v in kwargs.items())),
+                versions,
+            )
+            etag = _etag(key)
+            headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+            if request.if_none_match.contains(etag):
+                return Response(status=304, headers=headers)
+
+            entry = response_cache.get(key)
+            if entry is None:
+                resp = make_response(view(*args, **kwargs))
+                if resp.status_code != 200:
+                    return resp
+                entry = CachedBody(resp.get_data(), resp.mimetype)
+                response_cache.put(key, entry)
+            return Response(entry.body, mimetype=entry.mimetype, headers=headers)
+
+        return wrapper
+
+    return decorator
+
+
+if __name__ == "__main__":
+    with get_db() as session:
+        folded = compact(session)
+    print(f"folded {folded} table_changes rows into table_versions")
@@ -0,0 +1,152 @@
+"""
+Resume artifacts shared by /sort, /cull and /analyze.
+
+Everything the pipelines derive from the resume is built once per version of
+its text and stored in resume_artifacts, so every worker reuses it:
+
+  - compact_text   whitespace-compacted text, cut to RESUME_PROMPT_CHARS
+  - prompt_prefix  the resume block that opens each batch sort prompt
+  - token_count    input tokens of compact_text
+  - embedding      MiniLM vector of compact_text (cull prefilter, local scorer)
+
+POST /resume builds the row in the same request that stores the text.
+``latest`` reads the newest resume and its row in one indexed query
+(ix_resumes_updated_at); the join also compares the stored content hash with
+sha256 of the current text, so a row built from older text is never used.
+Instead it is rebuilt on first use, which also covers resumes stored before
+the table existed.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from flask import jsonify
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.models.resume import Resume
+from app.models.resume_artifact import ResumeArtifact
+from app.services.llm import count_tokens
+from app.services.prompts import resume_prompt_prefix
+
+logger = logging.getLogger(__name__)
+
+NO_RESUME_DETAIL = "No resume found. Upload a resume first."
+
+_SPACES = re.compile(r"[ \t\f\v\u00a0]+")
+
+
+@dataclass(frozen=True)
+class ResumeArtifacts:
+    resume_id: UUID
+    updated_at: datetime
+    length: int
+    content_hash: str
+    compact_text: str
+    prompt_prefix: str
+    token_count: int
+    embedding: Optional[List[float]]
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def compact(text: str, limit: int) -> str:
+    """Collapse runs of spaces, drop blank and repeated lines, then cut to ``limit`` chars at a line end."""
+    lines: List[str] = []
+    for line in text.splitlines():
+        line = _SPACES.sub(" ", line).strip()
+        if line and (not lines or line != lines[-1]):
+            lines.append(line)
+    out = "\n".join(lines)
+    if len(out) <= limit:
+        return out
+    cut = out.rfind("\n", 0, limit + 1)
+    return out[:cut] if cut > limit // 2 else out[:limit]
+
+
+def _embedding(text: str) -> Optional[List[float]]:
+    try:
+        from app.services.preference_engine import embed_resume
+        return embed_resume(text)
+    except Exception:
+        logger.warning("Embedding model unavailable; resume artifacts stored without an embedding", exc_info=True)
+        return None
+
+
+def build(db, resume: Resume) -> ResumeArtifacts:
+    """Derive the artifacts of ``resume``'s current text and upsert its row (not committed)."""
+    text = resume.raw_text
+    compact_text = compact(text, settings.RESUME_PROMPT_CHARS)
+    values = {
+        "content_hash": content_hash(text),
+        "compact_text": compact_text,
+        "prompt_prefix": resume_prompt_prefix(compact_text),
+        "token_count": count_tokens(compact_text),
+        "embedding": _embedding(compact_text),
+    }
+    db.execute(
+        insert(ResumeArtifact)
+        .values(resume_id=resume.id, **values)
+        .on_conflict_do_update(index_elements=[ResumeArtifact.resume_id], set_={**values, "created_at": func.now()})
+    )
+    return ResumeArtifacts(
+        resume_id=resume.id, updated_at=resume.updated_at, length=len(text), **values
+    )
+
+
+def latest(db) -> Optional[ResumeArtifacts]:
+    """Artifacts of the most recently updated resume; None without a resume.
+
+    A missing or stale row is rebuilt and committed, so call this before the
+    request has pending changes of its own.
+    """
+    current_hash = func.encode(func.sha256(func.convert_to(Resume.raw_text, "UTF8")), "hex")
+    row = db.execute(
+        select(
+            Resume.id, Resume.updated_at, func.length(Resume.raw_text).label("length"),
+            ResumeArtifact.content_hash, ResumeArtifact.compact_text, ResumeArtifact.prompt_prefix,
+            ResumeArtifact.token_count, ResumeArtifact.embedding,
+        )
+        .outerjoin(ResumeArtifact, and_(
+            ResumeArtifact.resume_id == Resume.id, ResumeArtifact.content_hash == current_hash
+        ))
+        .order_by(Resume.updated_at.desc())
+        .limit(1)
+    ).first()
+    if row is None:
+        return None
+    if row.content_hash is None:
+        artifacts = build(db, db.get(Resume, row.id))
+        db.commit()
+        return artifacts
+    return ResumeArtifacts(
+        resume_id=row.id, updated_at=row.updated_at, length=row.length, content_hash=row.content_hash,
+        compact_text=row.compact_text, prompt_prefix=row.prompt_prefix, token_count=row.token_count,
+        embedding=row.embedding,
+    )
+
+
+def latest_or_error(db):
+    """(artifacts, None), or (None, 400 response) when no resume has been uploaded."""
+    artifacts = latest(db)
+    if artifacts is None:
+        return None, (jsonify({"detail": NO_RESUME_DETAIL}), 400)
+    return artifacts, None
+
+
+def embedding_of(artifacts: ResumeArtifacts) -> List[float]:
+    """Stored resume vector, else embedded now (raises when the model is unavailable)."""
+    if artifacts.embedding is not None:
+        return artifacts.embedding
+    from app.services.preference_engine import embed_resume
+
+    return embed_resume(artifacts.compact_text)
@@ -0,0 +1,133 @@
+"""
+Progress log of background runs, streamed as Server-Sent Events.
+
+A run (api/v1/runs.py) appends its events to run_events (migration 018)
+through its RunLog. ``follow_steps`` reads the events after a given seq and
+renders them as SSE frames whose id is the seq. Any worker can serve a
+stream, and a client that reconnects with Last-Event-ID (EventSource does
+this by itself) gets exactly the events it missed.
+
+Events of a run, in order:
+
+  started  {kind}
+  queued   {job_count, waiting_count}    jobs this run sends to the LLM / waits for
+  job      {job_id, ...}                 one per job as its batch is committed
+  done     {status, body}                what the plain POST route would have answered
+
+Rows older than RUN_EVENTS_RETENTION_HOURS are pruned when a run starts.
+"""
+from __future__ import annotations
+
+import json
+import time
+from datetime import timedelta
+from typing import Any, Dict, Generator, Iterable, Iterator, Optional, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.models.run_event import RunEvent
+from app.services.llm_flow import Progress, Wait
+
+TERMINAL_EVENT = "done"
+POLL_INTERVAL_S = 0.5
+KEEPALIVE_S = 15.0
+RETRY_MS = 2000
+_PAGE = 500
+
+
+class RunLog:
+    """Appends one run's events; only the run itself writes, so seq needs no locking."""
+
+    def __init__(self, run_id: UUID) -> None:
+        self.run_id = run_id
+        self.seq = 0
+
+    def append(self, events: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        rows = []
+        for event, data in events:
+            self.seq += 1
+            rows.append({"run_id": self.run_id, "seq": self.seq, "event": event, "data": data})
+        if not rows:
+            return
+        with get_db() as db:
+            db.execute(insert(RunEvent), rows)
+            db.commit()
+
+    def progress(self, step: Progress) -> None:
+        """llm_flow ``on_progress`` callback."""
+        self.append(step.events)
+
+
+def exists(db, run_id: UUID) -> bool:
+    return db.execute(select(RunEvent.seq).where(RunEvent.run_id == run_id).limit(1)).first() is not None
+
+
+def prune(db) -> int:
+    """Delete events older than RUN_EVENTS_RETENTION_HOURS (not committed)."""
+    cutoff = func.now() - timedelta(hours=settings.RUN_EVENTS_RETENTION_HOURS)
+    return db.execute(delete(RunEvent).where(RunEvent.created_at < cutoff)).rowcount
+
+
+def last_event_id(value: Optional[str]) -> int:
+    """The seq a client has already seen (Last-Event-ID header or ?last_event_id=); 0 when absent or invalid."""
+    try:
+        return max(0, int(value or 0))
+    except ValueError:
+        return 0
+
+
+def sse_frame(seq: int, event: str, data: Any) -> str:
+    return f"id: {seq}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def poll(run_id: UUID, after: int) -> Tuple[str, int, bool]:
+    """(SSE frames for events after ``after``, last seq sent, whether the run is done)."""
+    with get_db() as db:
+        rows = db.execute(
+            select(RunEvent.seq, RunEvent.event, RunEvent.data)
+            .where(RunEvent.run_id == run_id, RunEvent.seq > after)
+            .order_by(RunEvent.seq)
+            .limit(_PAGE)
+        ).all()
+    frames = "".join(sse_frame(row.seq, row.event, row.data) for row in rows)
+    last = rows[-1].seq if rows else after
+    return frames, last, any(row.event == TERMINAL_EVENT for row in rows)
+
+
+def follow_steps(run_id: UUID, after: int) -> Generator[Union[str, Wait], None, None]:
+    """The event stream as text chunks, with a Wait between empty polls.
+
+    Keep-alive comments go out every KEEPALIVE_S of silence. A run silent for
+    longer than JOB_LEASE_SECONDS has lost its worker (its job leases have
+    expired too), so the stream ends with a "lost" event instead of polling
+    forever.
+    """
+    yield f"retry: {RETRY_MS}\n\n"
+    last_event = last_chunk = time.monotonic()
+    while True:
+        frames, after, finished = poll(run_id, after)
+        now = time.monotonic()
+        if frames:
+            yield frames
+            last_event = last_chunk = now
+        elif now - last_event >= settings.JOB_LEASE_SECONDS:
+            yield "event: lost\ndata: {}\n\n"
+            return
+        elif now - last_chunk >= KEEPALIVE_S:
+            yield ": keepalive\n\n"
+            last_chunk = now
+        if finished:
+            return
+        yield Wait(POLL_INTERVAL_S)
+
+
+def follow(run_id: UUID, after: int) -> Iterator[str]:
+    """follow_steps for a WSGI streaming response (sleeps in the request thread)."""
+    for chunk in follow_steps(run_id, after):
+        if isinstance(chunk, Wait):
+            time.sleep(chunk.seconds)
+        else:
+            yield chunk
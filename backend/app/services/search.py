@@ -0,0 +1,83 @@
+"""
+Full-text search over jobs (GET /jobs/search).
+
+Matches ``websearch_to_tsquery`` (quoted phrases, ``or``, ``-term``) against
+the generated ``search_vector`` column, so the GIN index finds candidates and
+no document is parsed at query time. Results are ordered by ``ts_rank_cd``
+(weights: title > company > body) then id, and paged by keyset on that pair.
+
+Highlights come from ``ts_headline``, which re-parses the text it marks up;
+it is therefore applied in an outer query to the page of rows only, never to
+every match.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Float, cast, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.engine import Row
+
+from app.models.job import SEARCH_CONFIG, Job
+
+MAX_QUERY_CHARS = 500
+TITLE_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, HighlightAll=true"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=\" … \""
+
+
+def encode_cursor(rank: float, job_id: UUID) -> str:
+    """Opaque keyset cursor pointing just past (rank, id) in (rank DESC, id DESC) order."""
+    raw = json.dumps([rank, str(job_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[float, UUID]:
+    """Inverse of encode_cursor; raises ValueError for anything malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        rank, job_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(rank), UUID(job_id)
+    except (ValueError, TypeError, AttributeError) as exc:
+        raise ValueError("invalid cursor") from exc
+
+
+def search_jobs(
+    db,
+    q: str,
+    columns: Sequence,
+    limit: int,
+    after: Optional[Tuple[float, UUID]] = None,
+    analyzed_only: bool = False,
+) -> Tuple[List[Row], Optional[str]]:
+    """One page of matches for ``q``: rows of ``columns`` + search_rank, title_headline, headline; and the next cursor."""
+    config = literal(SEARCH_CONFIG).cast(REGCONFIG)
+    tsquery = func.websearch_to_tsquery(config, q)
+    # float8, so the value handed out in a cursor compares exactly on the way back in.
+    rank = cast(func.ts_rank_cd(Job.search_vector, tsquery), Float).label("search_rank")
+
+    page = select(Job.id.label("match_id"), rank).where(Job.search_vector.op("@@")(tsquery))
+    if analyzed_only:
+        page = page.where(Job.analyzed_at.isnot(None))
+    if after is not None:
+        page = page.where(tuple_(rank, Job.id) < after)
+    page = page.order_by(rank.desc(), Job.id.desc()).limit(limit + 1).subquery()
+
+    query = (
+        select(
+            *columns,
+            page.c.search_rank,
+            func.ts_headline(config, func.coalesce(Job.title, ""), tsquery, TITLE_HEADLINE_OPTIONS).label("title_headline"),
+            func.ts_headline(config, Job.raw_text, tsquery, HEADLINE_OPTIONS).label("headline"),
+        )
+        .join(page, Job.id == page.c.match_id)
+        .order_by(page.c.search_rank.desc(), Job.id.desc())
+    )
+    rows = db.execute(query).all()
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last.search_rank, last.id)
+    return rows[:limit], next_cursor
@@ -0,0 +1,168 @@
+"""
+Semantic search over job embeddings (GET /jobs/semantic, /jobs/<id>/similar).
+
+Reads go to the in-process job index (services/embedding_index): a query is
+embedded once with the same MiniLM model as the jobs and scored against the
+whole normalised matrix in one matrix-vector product, which stays in the
+low milliseconds for tens of thousands of jobs, so there is no ANN index.
+
+Searches never write. Before one, ``sync_index`` brings the index up to
+date when table_versions says jobs changed: the first time it loads every
+stored vector, later only those with embedded_at (set by a trigger,
+migration 020) after its previous sync minus SYNC_LOOKBACK, which covers
+transactions that commit a little after they wrote. Jobs deleted by another
+worker are dropped from the index when a search result no longer finds them.
+
+Jobs get their vectors from ``embed_in_background``, which ingest starts
+after committing new postings: one thread per process embeds every job
+without a vector, EMBED_CHUNK per transaction. ``python -m
+app.services.semantic`` does the same in the foreground. Query vectors are
+memoised per normalised-query hash; whole responses are cached by the routes.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import undefer
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.models.job import Job
+from app.services.embedding_index import job_index
+from app.services.preference_engine import get_embedding, get_embeddings, job_text
+from app.services.response_cache import table_versions
+
+logger = logging.getLogger(__name__)
+
+MAX_QUERY_CHARS = 500
+EMBED_CHUNK = 64
+SYNC_LOOKBACK = timedelta(minutes=5)
+
+_embedding = threading.Lock()
+
+_QUERY_VECS: "OrderedDict[str, List[float]]" = OrderedDict()
+_QUERY_VECS_LOCK = threading.Lock()
+
+
+def _query_key(q: str) -> str:
+    return hashlib.sha256(" ".join(q.lower().split()).encode()).hexdigest()
+
+
+def embed_query(q: str) -> List[float]:
+    """Embedding of ``q``, memoised (LRU) by the hash of its case- and whitespace-normalised text."""
+    key = _query_key(q)
+    with _QUERY_VECS_LOCK:
+        vec = _QUERY_VECS.get(key)
+        if vec is not None:
+            _QUERY_VECS.move_to_end(key)
+            return vec
+    vec = get_embedding(q)
+    with _QUERY_VECS_LOCK:
+        _QUERY_VECS[key] = vec
+        while len(_QUERY_VECS) > settings.SEMANTIC_QUERY_CACHE:
+            _QUERY_VECS.popitem(last=False)
+    return vec
+
+
+def clear_query_cache() -> None:
+    with _QUERY_VECS_LOCK:
+        _QUERY_VECS.clear()
+
+
+def sync_index(db) -> None:
+    """Pick up vectors stored by any worker since the last sync; a no-op while the jobs version is unchanged."""
+    (version,) = table_versions(db, ("jobs",))
+    if job_index.synced_version == version:
+        return
+    started = db.execute(select(func.clock_timestamp())).scalar()
+    if job_index.synced_at is None:
+        job_index.load(db)
+    else:
+        rows = db.execute(
+            select(Job.id, Job.embedding).where(Job.embedded_at > job_index.synced_at - SYNC_LOOKBACK)
+        ).all()
+        job_index.upsert((row.id, row.embedding) for row in rows)
+    job_index.synced_at = started
+    job_index.synced_version = version
+
+
+def forget_deleted(hit_ids: Iterable[UUID], found: Iterable[UUID]) -> None:
+    """Drop hits whose job row is gone (deleted by another worker) from this worker's index."""
+    found = set(found)
+    job_index.discard([job_id for job_id in hit_ids if job_id not in found])
+
+
+def vector_of(job: Job):
+    """The job's indexed vector, else one computed now and not stored (the background embedder will)."""
+    vec = job_index.vector(job.id)
+    if vec is None:
+        [vec] = get_embeddings([job_text(job)])
+    return vec
+
+
+def embed_missing(db, limit: int) -> int:
+    """Embed up to ``limit`` of the newest jobs without a vector and commit; returns how many."""
+    if limit <= 0:
+        return 0
+    jobs = (
+        db.query(Job).options(undefer(Job.raw_text))
+        .filter(Job.embedding.is_(None)).order_by(Job.created_at.desc()).limit(limit).all()
+    )
+    if jobs:
+        ids = [job.id for job in jobs]
+        vectors = get_embeddings([job_text(job) for job in jobs])
+        for job, vec in zip(jobs, vectors):
+            job.embedding = vec
+        db.commit()
+        job_index.upsert(zip(ids, vectors))
+    return len(jobs)
+
+
+def embed_pending() -> int:
+    """Embed every job without a vector, EMBED_CHUNK per transaction; returns how many."""
+    total = 0
+    with get_db() as db:
+        while True:
+            done = embed_missing(db, EMBED_CHUNK)
+            total += done
+            if done < EMBED_CHUNK:
+                return total
+
+
+def embed_in_background() -> None:
+    """Start ``embed_pending`` on a daemon thread unless this process already runs one."""
+    if not settings.SEMANTIC_EMBED_IN_BACKGROUND or not _embedding.acquire(blocking=False):
+        return
+
+    def run():
+        try:
+            embed_pending()
+        except Exception:
+            logger.exception("Background job embedding failed")
+        finally:
+            _embedding.release()
+
+    threading.Thread(target=run, name="job-embedder", daemon=True).start()
+
+
+def search(
+    query_vec, k: int, min_similarity: float = -1.0, restrict=None, exclude: Optional[List[UUID]] = None
+) -> List[Tuple[UUID, float]]:
+    """Top-``k`` (job_id, cosine similarity) at or above ``min_similarity``, best first."""
+    hits = job_index.search(query_vec, k, restrict=restrict, exclude=exclude)
+    return [(job_id, sim) for job_id, sim in hits if sim >= min_similarity]
+
+
+def analyzed_ids(db) -> List[UUID]:
+    return [row.id for row in db.query(Job.id).filter(Job.analyzed_at.isnot(None))]
+
+
+if __name__ == "__main__":
+    print(f"embedded {embed_pending()} jobs")
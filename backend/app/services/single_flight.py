@@ -0,0 +1,52 @@
+"""
+In-process single-flight coalescing.
+
+The first caller to ``reserve`` a key owns it; concurrent callers asking for
+the same key get the owner's Future instead, and are woken when the owner
+calls ``release``. Keys are per worker process; cross-process coordination
+is the caller's job (see job_claims).
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Hashable, Iterable, List, Tuple
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+
+    def reserve(self, keys: Iterable[Hashable]) -> Tuple[List[Hashable], Dict[Hashable, Future]]:
+        """Return (keys now owned by the caller, {key: Future} for keys someone else owns)."""
+        owned: List[Hashable] = []
+        seen = set()
+        waiting: Dict[Hashable, Future] = {}
+        with self._lock:
+            for key in keys:
+                if key in seen:
+                    continue
+                seen.add(key)
+                fut = self._inflight.get(key)
+                if fut is not None:
+                    waiting[key] = fut
+                else:
+                    self._inflight[key] = Future()
+                    owned.append(key)
+        return owned, waiting
+
+    def release(self, keys: Iterable[Hashable], result: Any = None) -> None:
+        with self._lock:
+            futures = [self._inflight.pop(key, None) for key in keys]
+        for fut in futures:
+            if fut is not None and not fut.done():
+                fut.set_result(result)
+
+    def clear(self) -> None:
+        with self._lock:
+            futures = list(self._inflight.values())
+            self._inflight.clear()
+        for fut in futures:
+            if not fut.done():
+                fut.set_result(None)
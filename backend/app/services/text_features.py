@@ -0,0 +1,103 @@
+"""
+Cheap deterministic text features shared by the local scorer.
+
+Everything here is regex/lexicon based and runs in microseconds per posting:
+tokenisation for keyword matching, years-of-experience detection (required
+by a job, or claimed by a resume) and work-mode detection.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+from datetime import date
+from typing import List, Optional
+
+TOKEN_RE = re.compile(r"[a-z][a-z0-9+#]+")
+
+STOPWORDS = frozenset(
+    """
+    a about above across after again all also am an and any are as at be because been before being
+    below between both but by can could did do does doing down during each etc few for from further
+    had has have having he her here hers him his how i if in into is it its itself just me more most
+    my no nor not of off on once only or other our ours out over own per same she should so some such
+    than that the their theirs them then there these they this those through to too under until up us
+    very via was we were what when where which while who whom why will with within without would you
+    your yours
+    """.split()
+)
+
+# Matched against the lower-cased window just before each "experience", not the whole posting.
+_YEARS_REQUIRED_RE = re.compile(
+    r"(\d{1,2})\s*(?:\+|plus)?\s*(?:(?:-|–|to)\s*\d{1,2}\s*\+?\s*)?(?:years?|yrs?)\b[^.\n]{0,40}?$"
+)
+_YEARS_CLAIMED_RE = re.compile(r"(\d{1,2})\s*\+?\s*(?:years?|yrs?)\b", re.IGNORECASE)
+_YEAR_RANGE_RE = re.compile(
+    r"\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now|today)\b",
+    re.IGNORECASE,
+)
+
+# Applied to lower-cased text.
+_HYBRID_RE = re.compile(r"\bhybrid\b")
+_NOT_REMOTE_RE = re.compile(r"\b(?:not|no|non)[\s-]remote\b")
+_REMOTE_RE = re.compile(r"\b(?:remote|work from home|wfh|distributed team)\b")
+_ONSITE_RE = re.compile(r"\b(?:on[\s-]?site|in[\s-]office|in[\s-]person)\b")
+
+WORK_MODES = ("remote", "hybrid", "onsite")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens (keeps c++ / c#), stopwords and 1-letter tokens dropped."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def term_counts(text: str) -> Counter:
+    """``Counter(tokenize(text))``, but filtering stopwords once per distinct term."""
+    counts = Counter(TOKEN_RE.findall(text.lower()))
+    for word in STOPWORDS.intersection(counts):
+        del counts[word]
+    return counts
+
+
+def years_required(text: str) -> Optional[int]:
+    """Smallest "N years ... experience" figure in a posting (the entry bar), or None."""
+    lower = (text or "").lower()
+    values = []
+    at = lower.find("experience")
+    while at != -1:
+        window = lower[max(0, at - 80):at]
+        for m in _YEARS_REQUIRED_RE.finditer(window):
+            if 0 < int(m.group(1)) <= 20:
+                values.append(int(m.group(1)))
+        at = lower.find("experience", at + 10)
+    return min(values) if values else None
+
+
+def years_claimed(text: str) -> Optional[int]:
+    """Experience a resume claims: the larger of explicit "N years" and the span of its date ranges."""
+    text = text or ""
+    best = max((int(v) for v in _YEARS_CLAIMED_RE.findall(text) if 0 < int(v) <= 50), default=0)
+    starts, ends = [], []
+    this_year = date.today().year
+    for start, end in _YEAR_RANGE_RE.findall(text):
+        starts.append(int(start))
+        ends.append(int(end) if end.isdigit() else this_year)
+    if starts:
+        best = max(best, min(max(ends) - min(starts), 50))
+    return best or None
+
+
+def work_mode(*texts: Optional[str]) -> Optional[str]:
+    """Work mode (remote, hybrid or onsite) from posting text/location; None when nothing is said."""
+    text = " ".join(t for t in texts if t).lower()
+    if "hybrid" in text and _HYBRID_RE.search(text):
+        return "hybrid"
+    not_remote = "remote" in text and _NOT_REMOTE_RE.search(text) is not None
+    remote = not not_remote and _REMOTE_RE.search(text) is not None
+    onsite = not_remote or _ONSITE_RE.search(text) is not None
+    if remote and onsite:
+        return "hybrid"
+    if remote:
+        return "remote"
+    if onsite:
+        return "onsite"
+    return None
@@ -0,0 +1,97 @@
+"""
+Production serving: prefork gunicorn with threaded workers.
+
+    cd backend && gunicorn -c python:app.serving app.main:app
+    cd backend && python -m app.serving            # same thing
+
+WEB_CONCURRENCY worker processes x WEB_THREADS threads each (gthread). The app
+is imported once in the master (preload) and forked; ``post_fork`` then drops
+everything a child must not share with its parent: pooled DB connections,
+the Anthropic HTTP client, the embedding model and per-process caches. The
+DB pool is sized from the same two numbers (core/database.pool_settings).
+
+WEB_MODE=asgi serves app/asgi.py on uvicorn workers instead (same processes,
+same fork reset): /sort, /cull and /parse then wait for the LLM on the event
+loop rather than in a worker thread.
+
+    cd backend && WEB_MODE=asgi gunicorn -c python:app.serving app.asgi:app
+    cd backend && WEB_MODE=asgi python -m app.serving
+
+``python -m app.main`` remains the single-process dev server.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+from app.core.config import settings
+
+bind = f"{settings.API_HOST}:{settings.API_PORT}"
+workers = settings.WEB_CONCURRENCY
+threads = settings.WEB_THREADS
+worker_class = "uvicorn_worker.UvicornWorker" if settings.WEB_MODE == "asgi" else "gthread"
+app_target = "app.asgi:app" if settings.WEB_MODE == "asgi" else "app.main:app"
+preload_app = True
+# /sort, /cull and /analyze hold a request open for LLM calls and claim waits.
+timeout = int(os.getenv("WEB_TIMEOUT", str(int(settings.CLAIM_WAIT_SECONDS) + 60)))
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then so a leak in a native library cannot grow unbounded.
+max_requests = int(os.getenv("WEB_MAX_REQUESTS", "5000"))
+max_requests_jitter = max_requests // 10
+accesslog = os.getenv("WEB_ACCESS_LOG") or None  # "-" for stdout
+
+
+def reset_after_fork() -> None:
+    """Per-process state to rebuild in a freshly forked worker."""
+    from app.core.database import reset_engine_after_fork
+    from app.services import llm_metrics
+    from app.services.embedding_index import job_index
+    from app.services.llm import reset_client
+    from app.services.local_scorer import clear_cache
+    from app.services.preference_engine import reset_embedder
+    from app.services.response_cache import response_cache
+
+    reset_engine_after_fork()
+    reset_client()
+    reset_embedder()
+    job_index.reset()
+    clear_cache()
+    response_cache.clear()
+    llm_metrics.reset()
+
+
+def on_starting(server) -> None:
+    """Once per deploy, in the master: bring the stored rank blend up to new RANK_WEIGHT_* values
+    and fold the table_changes log (services/response_cache.py)."""
+    from app.core.database import get_db
+    from app.services.ranking import recompute_if_stale
+    from app.services.response_cache import compact
+
+    # Both are upkeep the app works without (GET /rank blends on the fly); never block startup on them.
+    try:
+        with get_db() as db:
+            if recompute_if_stale(db):
+                server.log.info("Recomputed combined scores for new rank weights")
+    except Exception:
+        server.log.exception("Rank recompute at startup failed")
+    try:
+        with get_db() as db:
+            compact(db)
+    except Exception:
+        server.log.exception("table_changes compaction at startup failed")
+
+
+def post_fork(server, worker) -> None:
+    reset_after_fork()
+
+
+def main() -> None:
+    from gunicorn.app.wsgiapp import run
+
+    sys.argv = [sys.argv[0], "-c", "python:app.serving", app_target, *sys.argv[1:]]
+    run()
+
+
+if __name__ == "__main__":
+    main()
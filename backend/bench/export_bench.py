@@ -0,0 +1,98 @@
+"""
+GET /jobs/export: throughput and worker memory while streaming the corpus.
+
+    cd backend && python -m bench.export_bench --seed 200000
+    cd backend && python -m bench.export_bench --format csv --gzip
+    cd backend && python -m bench.export_bench --cleanup
+
+Runs against DATABASE_URL (migrations applied) through the Flask test client
+with an unbuffered response, so the body is consumed chunk by chunk as a
+WSGI server would send it. Reports peak RSS growth of the process during the
+stream, then (``--compare``) the growth from materialising the same rows the
+way paging /jobs does, for reference.
+"""
+from __future__ import annotations
+
+import argparse
+import resource
+import time
+import uuid
+
+from sqlalchemy import delete, insert, select
+
+from app.core.database import get_db
+from app.main import app
+from app.models.job import Job, JobStatus
+
+URL_PREFIX = "https://bench.invalid/export/"
+SEED_CHUNK = 2000
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def seed(n: int) -> None:
+    raw_text = "Synthetic posting for export benchmarks. Python, SQL, AWS, Docker. " * 50
+    with get_db() as db:
+        for lo in range(0, n, SEED_CHUNK):
+            db.execute(insert(Job), [
+                {
+                    "id": uuid.uuid4(), "job_hash": uuid.uuid4().hex * 2, "title": f"Export bench role {i}",
+                    "company": "Bench Co", "location": "Remote", "url": f"{URL_PREFIX}{uuid.uuid4()}",
+                    "raw_text": raw_text, "status": JobStatus.new,
+                }
+                for i in range(lo, min(n, lo + SEED_CHUNK))
+            ])
+            db.commit()
+    print(f"seeded {n} jobs")
+
+
+def cleanup() -> None:
+    with get_db() as db:
+        deleted = db.execute(delete(Job).where(Job.url.startswith(URL_PREFIX))).rowcount
+        db.commit()
+    print(f"deleted {deleted} jobs")
+
+
+def run(fmt: str, use_gzip: bool, compare: bool) -> None:
+    headers = {"Accept-Encoding": "gzip"} if use_gzip else {}
+    rss_before = _peak_rss_mb()
+    with app.test_client() as client:
+        t0 = time.perf_counter()
+        resp = client.get(f"/api/v1/jobs/export?format={fmt}", headers=headers, buffered=False)
+        assert resp.status_code == 200, resp.status_code
+        sent = chunks = 0
+        for chunk in resp.response:
+            sent += len(chunk)
+            chunks += 1
+        resp.close()
+        elapsed = time.perf_counter() - t0
+    print(f"export format={fmt} gzip={use_gzip}: {sent / 1e6:.1f} MB in {chunks} chunks, {elapsed:.1f}s "
+          f"({sent / 1e6 / elapsed:.1f} MB/s), peak RSS +{_peak_rss_mb() - rss_before:.0f} MB")
+
+    if compare:
+        rss_before = _peak_rss_mb()
+        with get_db() as db:
+            rows = db.execute(select(Job.id, Job.title, Job.raw_text)).all()
+        print(f"materialised {len(rows)} rows (id, title, raw_text): peak RSS +{_peak_rss_mb() - rss_before:.0f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0, help="insert this many synthetic jobs first")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="also materialise the rows for reference")
+    parser.add_argument("--cleanup", action="store_true", help="delete the synthetic jobs and exit")
+    args = parser.parse_args()
+    if args.cleanup:
+        cleanup()
+        return
+    if args.seed:
+        seed(args.seed)
+    run(args.format, args.gzip, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+GET /jobs facet filters and GET /jobs/facets counts on a large corpus.
+
+    cd backend && python -m bench.facets_bench --seed 100000
+    cd backend && python -m bench.facets_bench --cleanup
+
+Runs against DATABASE_URL (migrations through 016 applied). ``--seed`` inserts
+synthetic parsed postings with a spread of facet values; run VACUUM ANALYZE
+jobs afterwards so counts can use index-only scans. Each filter combination
+is timed for the facet counts and for the first list page, through the same
+service calls and query the routes use (no HTTP, no response cache).
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+
+from sqlalchemy import delete, insert, select
+
+from app.api.v1.jobs import BASE_COLUMNS
+from app.core.database import get_db
+from app.models.job import Job, JobStatus
+from app.services.facets import DEGREE_LEVELS, facet_counts, filters_from_args
+
+URL_PREFIX = "https://bench.invalid/facets/"
+SEED_CHUNK = 2000
+FILTERS = [
+    {},
+    {"remote": "true"},
+    {"remote": "true", "sponsorship": "true"},
+    {"work_mode": "hybrid,onsite", "years": "0-2,3-5"},
+    {"degree": "master,doctorate", "sponsorship": "false"},
+]
+
+
+def seed(n: int) -> None:
+    rng = random.Random(42)
+    with get_db() as db:
+        for lo in range(0, n, SEED_CHUNK):
+            rows = []
+            for i in range(lo, min(n, lo + SEED_CHUNK)):
+                rows.append({
+                    "id": uuid.uuid4(), "job_hash": uuid.uuid4().hex * 2, "title": f"Engineer {i}",
+                    "url": f"{URL_PREFIX}{uuid.uuid4()}", "raw_text": "Synthetic posting. " * 40,
+                    "status": JobStatus.new, "structured_requirements": {"about_summary": "Synthetic."},
+                    "work_mode": rng.choice(["remote", "hybrid", "onsite", None]),
+                    "sponsorship": rng.choice([True, False, None, None]),
+                    "min_years": rng.choice([None, 1, 2, 3, 5, 7, 10]),
+                    "degree_level": rng.choice([None, *DEGREE_LEVELS]),
+                })
+            db.execute(insert(Job), rows)
+            db.commit()
+    print(f"seeded {n} jobs")
+
+
+def cleanup() -> None:
+    with get_db() as db:
+        deleted = db.execute(delete(Job).where(Job.url.startswith(URL_PREFIX))).rowcount
+        db.commit()
+    print(f"deleted {deleted} jobs")
+
+
+def _time(fn, repeat: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def run(limit: int, repeat: int) -> None:
+    with get_db() as db:
+        total = db.query(Job.id).count()
+        print(f"{total} jobs, limit={limit}, {repeat} runs per filter (ms: median / p95)")
+        for args in FILTERS:
+            filters = filters_from_args(args)
+            page = (
+                select(*BASE_COLUMNS).where(*filters.values())
+                .order_by(Job.created_at.desc(), Job.id.desc()).limit(limit)
+            )
+            counts = _time(lambda: facet_counts(db, filters), repeat)
+            listing = _time(lambda: db.execute(page).all(), repeat)
+            label = "&".join(f"{k}={v}" for k, v in args.items()) or "(none)"
+            print(f"  {label:<44} counts {counts[0]:7.1f} / {counts[1]:7.1f}   list {listing[0]:7.1f} / {listing[1]:7.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0, help="insert this many synthetic jobs first")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--cleanup", action="store_true", help="delete the synthetic jobs and exit")
+    args = parser.parse_args()
+    if args.cleanup:
+        cleanup()
+        return
+    if args.seed:
+        seed(args.seed)
+    run(args.limit, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
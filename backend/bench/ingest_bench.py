@@ -0,0 +1,88 @@
+"""
+Ingest throughput: POST /ingest one posting at a time vs POST /ingest/batch.
+
+    cd backend && python -m bench.ingest_bench --n 500
+    cd backend && python -m bench.ingest_bench --cleanup
+
+Runs against DATABASE_URL (migrations applied) through the Flask test client.
+Each run ingests fresh synthetic postings (URL prefix below) with a share of
+repeats, so both paths see new and duplicate items.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import uuid
+
+from sqlalchemy import delete
+
+from app.core.database import get_db
+from app.main import app
+from app.models.job import Job
+
+URL_PREFIX = "https://bench.invalid/ingest/"
+
+
+def _postings(n: int, duplicate_share: float) -> list[dict]:
+    unique = max(1, int(n * (1 - duplicate_share)))
+    base = [
+        {
+            "title": f"Ingest bench role {i}",
+            "company": "Bench Co",
+            "location": "Remote",
+            "url": f"{URL_PREFIX}{uuid.uuid4()}",
+            "raw_text": f"Synthetic posting {i} for ingest benchmarks. " * 40,
+        }
+        for i in range(unique)
+    ]
+    return [base[i % unique] for i in range(n)]
+
+
+def cleanup() -> None:
+    with get_db() as db:
+        deleted = db.execute(delete(Job).where(Job.url.startswith(URL_PREFIX))).rowcount
+        db.commit()
+    print(f"deleted {deleted} jobs")
+
+
+def run(n: int, batch_size: int, duplicate_share: float) -> None:
+    with app.test_client() as client:
+        single = _postings(n, duplicate_share)
+        t0 = time.perf_counter()
+        for posting in single:
+            assert client.post("/api/v1/ingest", json=posting).status_code in (200, 201)
+        single_s = time.perf_counter() - t0
+
+        batched = _postings(n, duplicate_share)
+        t0 = time.perf_counter()
+        new = 0
+        for lo in range(0, n, batch_size):
+            body = "\n".join(json.dumps(p) for p in batched[lo:lo + batch_size])
+            r = client.post("/api/v1/ingest/batch", data=body, content_type="application/x-ndjson")
+            assert r.status_code == 200, r.get_json()
+            new += r.get_json()["new_count"]
+        batch_s = time.perf_counter() - t0
+
+    print(f"{n} postings ({duplicate_share:.0%} repeats), batch size {batch_size}")
+    print(f"{'single':>8} {single_s:8.2f} s {n / single_s:10.0f} jobs/s")
+    print(f"{'batch':>8} {batch_s:8.2f} s {n / batch_s:10.0f} jobs/s  ({new} new)")
+    print(f"speedup  {single_s / batch_s:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--duplicates", type=float, default=0.1, help="share of repeated postings")
+    parser.add_argument("--cleanup", action="store_true", help="delete synthetic jobs and exit")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        cleanup()
+    else:
+        run(args.n, args.batch_size, args.duplicates)
+
+
+if __name__ == "__main__":
+    main()
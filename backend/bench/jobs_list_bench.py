@@ -0,0 +1,66 @@
+"""
+List-endpoint latency and fetched bytes: full Job entities vs. the projected columns.
+
+    cd backend && python -m bench.jobs_pagination_bench --seed 20000   # if the table is empty
+    cd backend && python -m bench.jobs_list_bench --limit 500
+
+"full" undefers every heavy column (what GET /jobs and /rank fetched before the
+projection); "projected" is the query the endpoints run now. Bytes are the
+summed size of the column values the ORM loaded.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, undefer
+
+from app.api.v1.jobs import BASE_COLUMNS, _job_base_fields
+from app.core.database import get_db
+from app.models.job import Job
+
+HEAVY = (Job.raw_text, Job.raw_data, Job.analysis, Job.embedding)
+
+
+def _loaded_bytes(jobs) -> int:
+    total = 0
+    for job in jobs:
+        for value in inspect(job).dict.values():
+            if isinstance(value, (dict, list)):
+                total += len(json.dumps(value, default=str))
+            elif value is not None and not hasattr(value, "_sa_instance_state"):
+                total += len(str(value))
+    return total
+
+
+def measure(options, limit: int, repeat: int) -> tuple[float, int]:
+    samples, fetched = [], 0
+    for _ in range(repeat):
+        with get_db() as db:
+            t0 = time.perf_counter()
+            jobs = db.query(Job).options(*options).order_by(Job.created_at.desc(), Job.id.desc()).limit(limit).all()
+            [_job_base_fields(job) for job in jobs]
+            samples.append(time.perf_counter() - t0)
+            fetched = _loaded_bytes(jobs)
+    return statistics.median(samples) * 1000, fetched
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    for label, options in (
+        ("full", [undefer(column) for column in HEAVY]),
+        ("projected", [load_only(*BASE_COLUMNS)]),
+    ):
+        ms, fetched = measure(options, args.limit, args.repeat)
+        print(f"{label:>10}: {ms:8.1f} ms  {fetched / 1024:10.1f} KiB for {args.limit} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Compare GET /jobs page latency for offset vs keyset pagination at increasing depth.
+
+    cd backend && python -m bench.jobs_pagination_bench --seed 100000   # insert synthetic jobs once
+    cd backend && python -m bench.jobs_pagination_bench                 # time pages
+    cd backend && python -m bench.jobs_pagination_bench --cleanup       # delete the synthetic jobs
+
+Runs against DATABASE_URL (migrations applied) through the Flask test client,
+so timings include serialisation. Synthetic rows use the URL prefix below.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert
+
+from app.core.database import get_db
+from app.main import app
+from app.models.job import Job, JobStatus
+
+URL_PREFIX = "https://bench.invalid/jobs/"
+
+
+def seed(n: int, batch: int = 5000) -> None:
+    start = datetime.now(timezone.utc) - timedelta(seconds=n)
+    with get_db() as db:
+        for lo in range(0, n, batch):
+            rows = []
+            for i in range(lo, min(lo + batch, n)):
+                url = f"{URL_PREFIX}{uuid.uuid4()}"
+                rows.append({
+                    "id": uuid.uuid4(),
+                    "job_hash": Job.generate_hash(url),
+                    "url": url,
+                    "title": f"Bench role {i}",
+                    "company": "Bench Co",
+                    "raw_text": "Synthetic posting for pagination benchmarks. " * 40,
+                    "status": JobStatus.new,
+                    "created_at": start + timedelta(seconds=i),
+                    "analyzed_at": start if i % 3 == 0 else None,
+                })
+            db.execute(insert(Job), rows)
+            db.commit()
+    print(f"seeded {n} jobs")
+
+
+def cleanup() -> None:
+    with get_db() as db:
+        deleted = db.execute(delete(Job).where(Job.url.startswith(URL_PREFIX))).rowcount
+        db.commit()
+    print(f"deleted {deleted} jobs")
+
+
+def _time(client, url: str, repeat: int) -> tuple[float, dict | list]:
+    samples, body = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        r = client.get(url)
+        samples.append(time.perf_counter() - t0)
+        body = r.get_json()
+    return statistics.median(samples) * 1000, body
+
+
+def run(limit: int, depths: list[int], repeat: int) -> None:
+    with app.test_client() as client:
+        print(f"{'depth':>8} {'offset ms':>10} {'keyset ms':>10}")
+        for depth in depths:
+            offset_ms, _ = _time(client, f"/api/v1/jobs?limit={limit}&offset={depth}", repeat)
+            # Walk to the page starting at ``depth`` once, then time fetching it by cursor.
+            cursor, walked = "", 0
+            while walked < depth:
+                step = min(500, depth - walked)
+                body = client.get(f"/api/v1/jobs?limit={step}&cursor={cursor}").get_json()
+                cursor, walked = body["next_cursor"], walked + step
+                if not cursor:
+                    break
+            if depth and not cursor:
+                print(f"{depth:>8} {offset_ms:>10.1f} {'(past end)':>10}")
+                continue
+            keyset_ms, _ = _time(client, f"/api/v1/jobs?limit={limit}&cursor={cursor}", repeat)
+            print(f"{depth:>8} {offset_ms:>10.1f} {keyset_ms:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed", type=int, metavar="N", help="insert N synthetic jobs and exit")
+    parser.add_argument("--cleanup", action="store_true", help="delete synthetic jobs and exit")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--depths", default="0,1000,10000,50000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.seed)
+    elif args.cleanup:
+        cleanup()
+    else:
+        run(args.limit, [int(d) for d in args.depths.split(",")], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Serialization cost of a GET /jobs page: old path vs row serializer + fast provider.
+
+    cd backend && python -m bench.json_serialization_bench --rows 500
+
+No database: synthetic rows shaped like BASE_COLUMNS results. Compares
+  1. ORM-style objects -> _job_base_fields -> Flask's stdlib provider (before),
+  2. result tuples -> row serializer -> stdlib fallback encoder,
+  3. result tuples -> row serializer -> orjson (when installed).
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.api.v1.jobs import BASE_COLUMNS, _base_row, _job_base_fields
+from app.core import serialization
+
+KEYS = [column.key for column in BASE_COLUMNS]
+
+
+def _rows(n: int) -> list[tuple]:
+    now = datetime.now(timezone.utc)
+    structured = {
+        "about_summary": "Build data pipelines and APIs for a logistics platform. " * 3,
+        "expertise_requirements": "Python, SQL, Airflow, AWS, Docker, Kubernetes",
+        "work_location_requirements": "Hybrid, 3 days a week in Austin, TX.",
+    }
+    rows = []
+    for i in range(n):
+        values = {
+            "id": uuid.uuid4(), "job_hash": uuid.uuid4().hex * 2, "title": f"Data Engineer {i}",
+            "company": "Bench Co", "location": "Austin, TX", "url": f"https://bench.invalid/jobs/{i}",
+            "score": i % 100, "preference_score": 1000.0 + i, "resume_recommendation": "general",
+            "reasoning": "Strong overlap on pipelines and cloud tooling. " * 2, "downsides": None,
+            "created_at": now - timedelta(minutes=i), "analyzed_at": now, "structured_requirements": structured,
+            "parsed_at": now, "duplicate_of": None, "work_mode": "hybrid", "sponsorship": None, "min_years": 3,
+            "degree_level": "bachelor",
+        }
+        rows.append(tuple(values[k] for k in KEYS))
+    return rows
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def run(n: int, repeat: int) -> None:
+    rows = _rows(n)
+    objects = [SimpleNamespace(**dict(zip(KEYS, row))) for row in rows]
+
+    app = Flask(__name__)
+    stdlib = DefaultJSONProvider(app)
+    fast = serialization.FastJSONProvider(app)
+
+    def before():
+        return stdlib.response([_job_base_fields(job) for job in objects]).get_data()
+
+    def after():
+        return fast.response([_base_row(row) for row in rows]).get_data()
+
+    with app.app_context():
+        results = {"before (dicts + stdlib provider)": _time(before, repeat)}
+        provider = serialization.settings.JSON_PROVIDER
+        try:
+            serialization.settings.JSON_PROVIDER = "stdlib"
+            results["row serializer + stdlib encoder"] = _time(after, repeat)
+            if serialization.orjson is not None:
+                serialization.settings.JSON_PROVIDER = "auto"
+                results["row serializer + orjson"] = _time(after, repeat)
+        finally:
+            serialization.settings.JSON_PROVIDER = provider
+
+    base = results["before (dicts + stdlib provider)"]
+    print(f"{n} rows, median of {repeat}")
+    for name, ms in results.items():
+        print(f"  {name:<36} {ms:8.2f} ms  {base / ms:5.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
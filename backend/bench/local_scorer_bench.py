@@ -0,0 +1,73 @@
+"""
+Time the local fit scorer over a synthetic corpus.
+
+    cd backend && python -m bench.local_scorer_bench --jobs 10000
+
+Reports the cold pass (every job tokenised) and the warm pass (term cache hit,
+which is the steady state for a worker re-scoring the same corpus).
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import uuid
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services import local_scorer
+from app.services.embedding_index import job_index
+from app.services.local_scorer import LocalFitScorer
+
+SKILLS = (
+    "python flask django fastapi sql postgres mysql redis kafka spark airflow dbt aws gcp azure docker "
+    "kubernetes terraform react typescript node graphql java kotlin go rust c++ pandas numpy pytorch "
+    "tensorflow llm nlp etl analytics tableau looker excel product agile scrum ci cd linux security"
+).split()
+FILLER = (
+    "we are looking for a motivated engineer to join our growing team and build scalable systems that "
+    "delight customers while collaborating closely with product design and data partners every day"
+).split()
+MODES = ("Remote", "Hybrid - New York, NY", "On-site - Austin, TX", "")
+
+
+def _job(rng: random.Random, dim: int) -> SimpleNamespace:
+    words = [rng.choice(SKILLS) if rng.random() < 0.2 else rng.choice(FILLER) for _ in range(rng.randint(300, 600))]
+    words.insert(rng.randrange(len(words)), f"{rng.randint(1, 10)}+ years of experience")
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        title=f"{rng.choice(SKILLS).title()} Engineer",
+        location=rng.choice(MODES),
+        raw_text=" ".join(words),
+        embedding=np.random.default_rng(rng.randrange(1 << 30)).standard_normal(dim).astype(np.float32).tolist(),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=10_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jobs = [_job(rng, args.dim) for _ in range(args.jobs)]
+    resume = " ".join(rng.choice(SKILLS + FILLER) for _ in range(800)) + " 2016 - present"
+    vector = np.random.default_rng(args.seed).standard_normal(args.dim).tolist()
+
+    local_scorer.clear_cache()
+    job_index.reset()
+    job_index.upsert((job.id, job.embedding) for job in jobs)
+    scorer = LocalFitScorer(resume, vector, "remote")
+
+    for label in ("cold", "warm"):
+        t0 = time.perf_counter()
+        fit = scorer.score(jobs)
+        elapsed = time.perf_counter() - t0
+        print(f"{label}: {len(jobs)} jobs in {elapsed:.3f}s ({elapsed / len(jobs) * 1e6:.1f} µs/job), "
+              f"mean score {fit.score.mean():.1f}")
+
+
+if __name__ == "__main__":
+    main()
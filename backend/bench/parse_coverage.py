@@ -0,0 +1,90 @@
+"""
+Report how much /parse LLM usage the local requirements extractor saves.
+
+    cd backend && python -m bench.parse_coverage                      # bundled sample corpus
+    cd backend && python -m bench.parse_coverage --jsonl postings.jsonl
+    cd backend && python -m bench.parse_coverage --from-db 500       # latest jobs in DATABASE_URL
+
+Each input row needs raw_text and may carry title, company and location.
+Prompt sizes are estimated at ~4 characters per token.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from typing import Dict, Iterable, List
+
+from app.core.config import settings
+from app.services.prompts import PARSE_FIELDS, build_parse_messages
+from app.services.requirements_extractor import extract_requirements
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "sample_jobs.jsonl")
+
+
+def _from_jsonl(path: str) -> List[Dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _from_db(limit: int) -> List[Dict]:
+    from app.core.database import get_db
+    from app.models.job import Job
+
+    with get_db() as db:
+        rows = (
+            db.query(Job.title, Job.company, Job.location, Job.raw_text)
+            .order_by(Job.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+        return [row._asdict() for row in rows]
+
+
+def _prompt_tokens(row: Dict, fields: List[str]) -> int:
+    messages = build_parse_messages(row["raw_text"], row.get("title"), row.get("company"), fields=fields)
+    return sum(len(m["content"]) for m in messages) // 4
+
+
+def report(rows: Iterable[Dict], threshold: float) -> Dict:
+    rows = list(rows)
+    local_hits = {field: 0 for field in PARSE_FIELDS}
+    calls = fields_sent = prompt_full = prompt_sent = 0
+    for row in rows:
+        extracted = extract_requirements(row["raw_text"], row.get("title"), row.get("location"))
+        missing = [f for f in PARSE_FIELDS if extracted[f].confidence < threshold]
+        for field in PARSE_FIELDS:
+            local_hits[field] += field not in missing
+        prompt_full += _prompt_tokens(row, PARSE_FIELDS)
+        if missing:
+            calls += 1
+            fields_sent += len(missing)
+            prompt_sent += _prompt_tokens(row, missing)
+    n = max(len(rows), 1)
+    return {
+        "jobs": len(rows),
+        "threshold": threshold,
+        "llm_calls": calls,
+        "llm_calls_saved_pct": round(100 * (1 - calls / n), 1),
+        "fields_requested_pct": round(100 * fields_sent / (n * len(PARSE_FIELDS)), 1),
+        "prompt_tokens_full": prompt_full,
+        "prompt_tokens_sent": prompt_sent,
+        "prompt_tokens_saved_pct": round(100 * (1 - prompt_sent / max(prompt_full, 1)), 1),
+        "local_coverage_pct": {f: round(100 * hits / n, 1) for f, hits in local_hits.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--jsonl", default=SAMPLE)
+    source.add_argument("--from-db", type=int, metavar="N")
+    parser.add_argument("--threshold", type=float, default=settings.PARSE_LOCAL_MIN_CONFIDENCE)
+    args = parser.parse_args()
+
+    rows = _from_db(args.from_db) if args.from_db else _from_jsonl(args.jsonl)
+    print(json.dumps(report(rows, args.threshold), indent=2))
+
+
+if __name__ == "__main__":
+    main()
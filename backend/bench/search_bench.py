@@ -0,0 +1,107 @@
+"""
+GET /jobs/search latency on a large corpus.
+
+    cd backend && python -m bench.search_bench --seed 100000
+    cd backend && python -m bench.search_bench --cleanup
+
+Runs against DATABASE_URL (migrations through 012 applied). ``--seed`` inserts
+synthetic postings whose titles and bodies mix a small tech vocabulary, so
+common terms match tens of thousands of rows and rare ones a handful. Each
+query is timed for its first page and for the page after one cursor hop,
+through the service function the route calls (no HTTP, no response cache).
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+
+from sqlalchemy import delete, insert
+
+from app.api.v1.jobs import BASE_COLUMNS
+from app.core.database import get_db
+from app.models.job import Job, JobStatus
+from app.services.search import decode_cursor, search_jobs
+
+URL_PREFIX = "https://bench.invalid/search/"
+SEED_CHUNK = 2000
+ROLES = ["Data Engineer", "Backend Developer", "ML Engineer", "Site Reliability Engineer", "Product Analyst",
+         "Frontend Developer", "Platform Engineer", "Security Engineer", "Data Scientist", "Engineering Manager"]
+SKILLS = ["python", "golang", "rust", "kubernetes", "terraform", "postgres", "kafka", "spark", "airflow", "react",
+          "typescript", "pytorch", "snowflake", "dbt", "aws", "gcp", "azure", "graphql", "redis", "elasticsearch"]
+FILLER = ("We are hiring to build reliable systems for our customers. You will collaborate with product and "
+          "design, own services end to end and mentor teammates. ")
+QUERIES = ["python", "kubernetes terraform", "\"data engineer\" airflow", "rust -golang", "pytorch or spark",
+           "snowflake dbt remote"]
+
+
+def seed(n: int) -> None:
+    rng = random.Random(42)
+    with get_db() as db:
+        for lo in range(0, n, SEED_CHUNK):
+            rows = []
+            for i in range(lo, min(n, lo + SEED_CHUNK)):
+                skills = rng.sample(SKILLS, 5)
+                mode = rng.choice(["remote", "hybrid", "onsite"])
+                rows.append({
+                    "id": uuid.uuid4(), "job_hash": uuid.uuid4().hex * 2, "title": rng.choice(ROLES),
+                    "company": f"Company {rng.randrange(5000)}", "location": mode, "url": f"{URL_PREFIX}{uuid.uuid4()}",
+                    "raw_text": f"{FILLER * 8} Stack: {', '.join(skills)}. Work mode: {mode}. " + FILLER * 8,
+                    "status": JobStatus.new,
+                })
+            db.execute(insert(Job), rows)
+            db.commit()
+    print(f"seeded {n} jobs")
+
+
+def cleanup() -> None:
+    with get_db() as db:
+        deleted = db.execute(delete(Job).where(Job.url.startswith(URL_PREFIX))).rowcount
+        db.commit()
+    print(f"deleted {deleted} jobs")
+
+
+def _time(fn, repeat: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def run(limit: int, repeat: int) -> None:
+    with get_db() as db:
+        total = db.query(Job.id).count()
+        print(f"{total} jobs, limit={limit}, {repeat} runs per query (ms: median / p95)")
+        for q in QUERIES:
+            _, cursor = search_jobs(db, q, BASE_COLUMNS, limit)
+            first = _time(lambda: search_jobs(db, q, BASE_COLUMNS, limit), repeat)
+            line = f"  {q!r:<28} first page {first[0]:7.1f} / {first[1]:7.1f}"
+            if cursor:
+                after = decode_cursor(cursor)
+                second = _time(lambda: search_jobs(db, q, BASE_COLUMNS, limit, after=after), repeat)
+                line += f"   next page {second[0]:7.1f} / {second[1]:7.1f}"
+            print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0, help="insert this many synthetic jobs first")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--cleanup", action="store_true", help="delete the synthetic jobs and exit")
+    args = parser.parse_args()
+    if args.cleanup:
+        cleanup()
+        return
+    if args.seed:
+        seed(args.seed)
+    run(args.limit, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
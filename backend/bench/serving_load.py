@@ -0,0 +1,86 @@
+"""
+Closed-loop HTTP load test: requests/sec and latency for one GET path.
+
+Start a server, then point this at it:
+
+    cd backend && python -m app.main                        # dev server (port 5000)
+    cd backend && python -m bench.serving_load --url http://127.0.0.1:5000/api/v1/jobs?limit=100
+
+    cd backend && API_PORT=5001 python -m app.serving       # gunicorn, WEB_CONCURRENCY x WEB_THREADS
+    cd backend && python -m bench.serving_load --url http://127.0.0.1:5001/api/v1/jobs?limit=100
+
+Each of --concurrency client threads keeps one keep-alive connection and
+issues requests back to back for --seconds. Conditional requests are off
+(no If-None-Match), so every request runs the full read path.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def _worker(url: str, deadline: float, latencies: list[float], errors: list[int]) -> None:
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    local, failed = [], 0
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status != 200:
+                failed += 1
+        except (OSError, http.client.HTTPException):
+            failed += 1
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+            continue
+        local.append(time.perf_counter() - t0)
+    conn.close()
+    latencies.extend(local)
+    errors.append(failed)
+
+
+def run(url: str, concurrency: int, seconds: float) -> None:
+    latencies: list[float] = []
+    errors: list[int] = []
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(target=_worker, args=(url, deadline, latencies, errors)) for _ in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    if not latencies:
+        print("no successful requests")
+        return
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{url}  concurrency={concurrency}  {elapsed:.1f}s")
+    print(f"  requests  {len(latencies)}  errors {sum(errors)}")
+    print(f"  req/s     {len(latencies) / elapsed:.1f}")
+    print(f"  p50 ms    {statistics.median(latencies) * 1000:.1f}")
+    print(f"  p99 ms    {p99 * 1000:.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:5000/api/v1/jobs?limit=100")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=15)
+    args = parser.parse_args()
+    run(args.url, args.concurrency, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ from collections.abc import Generator
 from contextlib import contextmanager
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
@@ -69,3 +69,16 @@ def client_no_db():
     flask_app.config["TESTING"] = True
     with flask_app.test_client() as c:
         yield c
+
+
+@pytest.fixture
+def sql_statements(engine):
+    """SQL statements the engine executes during the test, for query-shape assertions."""
+    statements: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _capture)
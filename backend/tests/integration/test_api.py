@@ -79,9 +79,868 @@ class TestV1API:
         assert data["top_jobs"][0]["score"] == 85.0
         assert data["top_jobs"][0]["reasoning"] == "Good fit."
 
+    def test_v1_cull_keeps_top_jobs_when_recall_check_fails(self, client):
+        from app.services.llm import LLMError
+
+        client.post("/api/v1/resume", json={"text": "Experienced Python developer."})
+        ids = [
+            client.post("/api/v1/ingest", json={
+                "raw_text": f"Python role {n}.", "title": f"Recall {n}", "url": f"https://example.com/cull-recall-{n}",
+            }).get_json()["id"]
+            for n in range(2)
+        ]
+        stage_one = {"ranked": [{"job_id": ids[0], "fit_score": 70, "reasoning": "Decent."}]}
+        with patch("app.api.v1.cull._prefilter", lambda db, resume, jobs, k: jobs[:1]), \
+                patch("app.services.llm.claude_chat_json", side_effect=[stage_one, LLMError("overloaded")]):
+            r = client.post("/api/v1/cull", json={"job_ids": ids, "top_n": 1, "prefilter_k": 1, "recall_check": True})
+        assert r.status_code == 200
+        data = r.get_json()
+        assert [j["job_id"] for j in data["top_jobs"]] == [ids[0]]
+        assert data["recall"] == {"error": "overloaded"}
+
     def test_v1_cull_422_invalid_top_n(self, client):
         client.post("/api/v1/resume", json={"text": "Resume."})
         r = client.post("/api/v1/cull", json={"top_n": 0})
         assert r.status_code == 422
         r2 = client.post("/api/v1/cull", json={"top_n": 100})
         assert r2.status_code == 422
+
+
+class TestJobClaims:
+    def test_second_claim_waits_for_first(self, client, db_session):
+        from uuid import UUID
+
+        from app.services.job_claims import claim_jobs, release_claim, wait_for_others
+
+        r = client.post("/api/v1/ingest", json={
+            "raw_text": "Claimable role.",
+            "title": "Claim Dev",
+            "url": "https://example.com/claim-test-1",
+        })
+        job_id = UUID(r.get_json()["id"])
+
+        first = claim_jobs(db_session, [job_id])
+        second = claim_jobs(db_session, [job_id])
+        assert first.owned == [job_id]
+        assert second.owned == []
+        assert job_id in second.waiting
+
+        release_claim(db_session, first)
+        assert wait_for_others(db_session, second, timeout=1) == [job_id]
+
+    def test_claim_rechecks_pending_under_lock(self, client, db_session):
+        from datetime import datetime, timezone
+        from uuid import UUID
+
+        from app.models.job import Job
+        from app.services.job_claims import claim_jobs, release_claim
+
+        r = client.post("/api/v1/ingest", json={
+            "raw_text": "Sorted meanwhile.", "title": "Claim Dev", "url": "https://example.com/claim-test-2",
+        })
+        job_id = UUID(r.get_json()["id"])
+        # Another request sorted the job after this one read its candidates.
+        db_session.get(Job, job_id).analyzed_at = datetime.now(timezone.utc)
+        db_session.flush()
+
+        claim = claim_jobs(db_session, [job_id], pending=Job.analyzed_at.is_(None))
+        assert claim.owned == [] and claim.waiting == []
+        assert claim.done == [job_id]
+        release_claim(db_session, claim)
+
+
+class TestJobsPagination:
+    def test_cursor_pages_do_not_overlap(self, client):
+        urls = {f"https://example.com/page-test-{i}" for i in range(3)}
+        for url in urls:
+            client.post("/api/v1/ingest", json={"raw_text": "Paged role.", "title": "Pager", "url": url})
+
+        seen, cursor = [], ""
+        while True:
+            r = client.get(f"/api/v1/jobs?limit=2&cursor={cursor}")
+            assert r.status_code == 200
+            body = r.get_json()
+            seen.extend(j["url"] for j in body["jobs"])
+            if not body["next_cursor"]:
+                break
+            cursor = body["next_cursor"]
+
+        assert len(seen) == len(set(seen))
+        assert urls <= set(seen)
+
+    def test_offset_form_still_returns_list(self, client):
+        r = client.get("/api/v1/jobs?limit=2&offset=0")
+        assert r.status_code == 200
+        assert isinstance(r.get_json(), list)
+
+    def test_bad_cursor_422(self, client):
+        assert client.get("/api/v1/jobs?cursor=not-a-cursor").status_code == 422
+        assert client.get("/api/v1/jobs?cursor=&offset=5").status_code == 422
+
+
+class TestColumnProjection:
+    HEAVY = ("jobs.raw_text", "jobs.raw_data", "jobs.analysis", "jobs.embedding")
+
+    def _selects(self, statements):
+        return [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+    def test_list_endpoints_skip_heavy_columns(self, client, db_session, sql_statements):
+        from datetime import datetime, timezone
+        from uuid import UUID
+
+        from app.models.job import Job
+        from app.services.ranking import refresh_scores
+
+        r = client.post("/api/v1/ingest", json={
+            "raw_text": "Heavy posting. " * 3000,  # ~45 KB
+            "title": "Heavy",
+            "url": "https://example.com/heavy-1",
+        })
+        job = db_session.get(Job, UUID(r.get_json()["id"]))
+        job.analyzed_at = datetime.now(timezone.utc)
+        job.score = 50
+        refresh_scores(db_session, [job.id])
+
+        for path in ("/api/v1/jobs?limit=500", "/api/v1/rank"):
+            sql_statements.clear()
+            r = client.get(path)
+            assert r.status_code == 200
+            selects = self._selects(sql_statements)
+            assert selects
+            for column in self.HEAVY:
+                assert not any(column in s for s in selects), (path, column)
+            # The 45 KB description never reaches the list payload.
+            assert b"Heavy posting. Heavy posting." not in r.data
+
+    def test_detail_loads_text_in_one_query(self, client, sql_statements):
+        r = client.post("/api/v1/ingest", json={
+            "raw_text": "Detail posting.",
+            "title": "Detail",
+            "url": "https://example.com/heavy-2",
+        })
+        job_id = r.get_json()["id"]
+        sql_statements.clear()
+        r = client.get(f"/api/v1/jobs/{job_id}")
+        assert r.get_json()["raw_text"] == "Detail posting."
+        assert len(self._selects(sql_statements)) == 1
+
+
+class TestRanking:
+    def _analyzed(self, client, db_session, n, score, preference_score=None):
+        from datetime import datetime, timezone
+        from uuid import UUID
+
+        from app.models.job import Job
+
+        r = client.post("/api/v1/ingest", json={
+            "raw_text": f"Ranked role {n}.",
+            "title": f"Ranked {n}",
+            "company": "RankCo",
+            "url": f"https://example.com/rank-test-{n}",
+        })
+        job = db_session.get(Job, UUID(r.get_json()["id"]))
+        job.analyzed_at = datetime.now(timezone.utc)
+        job.score = score
+        job.preference_score = preference_score
+        return job
+
+    def test_combined_score_matches_blend(self, client, db_session):
+        from app.services.ranking import refresh_scores
+
+        low = self._analyzed(client, db_session, 1, 90, preference_score=1000.0)
+        high = self._analyzed(client, db_session, 2, 60, preference_score=1100.0)
+        refresh_scores(db_session, [low.id, high.id])
+
+        r = client.get("/api/v1/rank?company=RankCo&limit=10&with_total=1")
+        assert r.status_code == 200
+        body = r.get_json()
+        by_id = {e["job_id"]: e for e in body["ranked"]}
+        # preference_norm spans every analyzed job, so only the ordering is fixed here.
+        assert [e["rank"] for e in body["ranked"]] == list(range(1, len(body["ranked"]) + 1))
+        assert by_id[str(low.id)]["combined_score"] <= 0.6 * 90 + 0.4 * 100
+        assert body["total"] >= 2
+
+    def test_pages_and_custom_weights(self, client, db_session):
+        from app.services.ranking import refresh_scores
+
+        jobs = [self._analyzed(client, db_session, 10 + i, 10 * i) for i in range(5)]
+        refresh_scores(db_session, [job.id for job in jobs])
+
+        first = client.get("/api/v1/rank?company=RankCo&limit=2").get_json()
+        second = client.get(f"/api/v1/rank?company=RankCo&limit=2&offset={first['next_offset']}").get_json()
+        assert second["ranked"][0]["rank"] == 3
+        assert "total" not in first
+        assert client.get("/api/v1/rank?company=RankCo&limit=500").get_json()["next_offset"] is None
+        assert not {e["job_id"] for e in first["ranked"]} & {e["job_id"] for e in second["ranked"]}
+
+        # LLM-only weights rank by score regardless of the stored blend.
+        body = client.get("/api/v1/rank?company=RankCo&w_llm=1&w_pref=0").get_json()
+        assert [e["score"] for e in body["ranked"]] == sorted((e["score"] for e in body["ranked"]), reverse=True)
+
+    def test_bad_params_422(self, client):
+        assert client.get("/api/v1/rank?limit=0").status_code == 422
+        assert client.get("/api/v1/rank?w_llm=0&w_pref=0").status_code == 422
+        assert client.get("/api/v1/rank?min_score=abc").status_code == 422
+
+
+class TestConditionalGet:
+    def test_etag_304_until_a_write(self, client):
+        client.post("/api/v1/ingest", json={
+            "raw_text": "Cached role.", "title": "Cache", "url": "https://example.com/etag-test-1",
+        })
+        r = client.get("/api/v1/jobs?limit=5")
+        etag = r.headers["ETag"]
+        assert r.status_code == 200 and etag
+
+        again = client.get("/api/v1/jobs?limit=5", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.headers["ETag"] == etag
+        # Another query is another representation.
+        assert client.get("/api/v1/jobs?limit=6", headers={"If-None-Match": etag}).status_code == 200
+
+        client.post("/api/v1/ingest", json={
+            "raw_text": "Second cached role.", "title": "Cache 2", "url": "https://example.com/etag-test-2",
+        })
+        r2 = client.get("/api/v1/jobs?limit=5", headers={"If-None-Match": etag})
+        assert r2.status_code == 200
+        assert r2.headers["ETag"] != etag
+        assert any(j["url"] == "https://example.com/etag-test-2" for j in r2.get_json())
+
+    def test_errors_are_not_cached(self, client):
+        r = client.get("/api/v1/jobs/00000000-0000-0000-0000-000000000000")
+        assert r.status_code == 404
+        assert "ETag" not in r.headers
+
+
+    def test_versions_skip_lease_updates_and_survive_compaction(self, client, db_session):
+        from uuid import UUID
+
+        from app.services.job_claims import claim_jobs, release_claim
+        from app.services.response_cache import compact, table_versions
+
+        r = client.post("/api/v1/ingest", json={
+            "raw_text": "Leased role.", "title": "Lease", "url": "https://example.com/etag-test-lease",
+        })
+        job_id = UUID(r.get_json()["id"])
+        (before,) = table_versions(db_session, ("jobs",))
+        release_claim(db_session, claim_jobs(db_session, [job_id]))
+        assert table_versions(db_session, ("jobs",)) == (before,)
+
+        client.patch(f"/api/v1/jobs/{job_id}", json={"status": "applied"})
+        (after,) = table_versions(db_session, ("jobs",))
+        assert after > before
+        compact(db_session)
+        assert table_versions(db_session, ("jobs",)) == (after,)
+
+class TestIngestBatch:
+    def test_ndjson_reports_new_duplicate_and_error(self, client):
+        import json
+
+        lines = [
+            json.dumps({"raw_text": "Batch role A.", "title": "A", "url": "https://example.com/batch-1"}),
+            json.dumps({"raw_text": "Batch role A.", "title": "A", "url": "https://example.com/batch-1"}),
+            "{not json",
+            json.dumps({"raw_text": "", "title": "Empty"}),
+        ]
+        r = client.post("/api/v1/ingest/batch", data="\n".join(lines), content_type="application/x-ndjson")
+        assert r.status_code == 200
+        body = r.get_json()
+        assert [item["status"] for item in body["results"]] == ["new", "duplicate", "error", "error"]
+        assert body["results"][0]["id"] == body["results"][1]["id"]
+        assert (body["new_count"], body["duplicate_count"], body["error_count"]) == (1, 1, 2)
+
+        # Same posting again, as a JSON array: now a duplicate of the stored row.
+        r2 = client.post("/api/v1/ingest/batch", json=[json.loads(lines[0])])
+        assert r2.get_json()["results"][0] == {**body["results"][0], "status": "duplicate"}
+
+    def test_url_collision_falls_back_to_urn(self, client):
+        url = "https://example.com/batch-collide"
+        r = client.post("/api/v1/ingest/batch", json=[
+            {"raw_text": "First text.", "url": url},
+            {"raw_text": "Edited text.", "url": url},
+        ])
+        first, second = r.get_json()["results"]
+        assert first["status"] == second["status"] == "new"
+        detail = client.get(f"/api/v1/jobs/{second['id']}").get_json()
+        assert detail["url"] == f"urn:job:{second['job_hash']}"
+
+    def test_rejects_empty_and_non_list_bodies(self, client):
+        assert client.post("/api/v1/ingest/batch", data="", content_type="application/x-ndjson").status_code == 400
+        assert client.post("/api/v1/ingest/batch", json={"raw_text": "x"}).status_code == 400
+
+
+class TestIngestUpsert:
+    def test_single_statement(self, client, sql_statements):
+        payload = {"raw_text": "Upsert role.", "title": "Upsert", "url": "https://example.com/upsert-1"}
+        sql_statements.clear()
+        first = client.post("/api/v1/ingest", json=payload)
+        assert first.status_code == 201 and first.get_json()["is_new"] is True
+        assert sum("INSERT INTO jobs" in s for s in sql_statements) == 1
+
+        again = client.post("/api/v1/ingest", json=payload)
+        assert again.status_code == 200
+        assert again.get_json()["is_new"] is False
+        assert again.get_json()["id"] == first.get_json()["id"]
+
+    def test_url_collision_gets_urn(self, client):
+        url = "https://example.com/upsert-collide"
+        a = client.post("/api/v1/ingest", json={"raw_text": "Original.", "url": url}).get_json()
+        b = client.post("/api/v1/ingest", json={"raw_text": "Changed.", "url": url}).get_json()
+        assert b["is_new"] is True and b["id"] != a["id"]
+        assert b["url"] == f"urn:job:{b['job_hash']}"
+
+
+class TestConcurrentIngest:
+    """Parallel duplicate captures against committed data (no rolling-back session)."""
+
+    def test_parallel_duplicates_store_one_row(self, client_no_db):
+        import uuid
+        from concurrent.futures import ThreadPoolExecutor
+
+        from sqlalchemy import delete
+
+        from app.core.config import settings
+        from app.core.database import get_db
+        from app.main import app as flask_app
+        from app.models.job import Job
+
+        if not settings.DATABASE_URL.startswith("postgresql"):
+            pytest.skip("Integration tests require Postgres DATABASE_URL")
+
+        url = f"https://example.com/concurrent-{uuid.uuid4()}"
+        payload = {"raw_text": "Captured twice at once.", "title": "Race", "url": url}
+
+        def capture(_):
+            with flask_app.test_client() as c:
+                r = c.post("/api/v1/ingest", json=payload)
+                return r.status_code, r.get_json()
+
+        try:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(capture, range(16)))
+            assert all(code in (200, 201) for code, _ in results), results
+            assert sum(body["is_new"] for _, body in results) == 1
+            assert len({body["id"] for _, body in results}) == 1
+            # The losers must not have fallen back to a urn: row of their own.
+            with get_db() as db:
+                assert db.query(Job).filter(Job.job_hash == results[0][1]["job_hash"]).count() == 1
+        finally:
+            with get_db() as db:
+                db.execute(delete(Job).where(Job.url == url))
+                db.commit()
+
+
+class TestBulkMutations:
+    def _ingest(self, client, n):
+        r = client.post("/api/v1/ingest/batch", json=[
+            {"raw_text": f"Bulk role {i}.", "url": f"https://example.com/bulk-{i}"} for i in range(n)
+        ])
+        return [item["id"] for item in r.get_json()["results"]]
+
+    def test_bulk_delete_is_one_request_and_few_statements(self, client, sql_statements):
+        import uuid
+
+        ids = self._ingest(client, 30)
+        missing = str(uuid.uuid4())
+        sql_statements.clear()
+        r = client.delete("/api/v1/jobs", json={"job_ids": ids + [missing]})
+        assert r.status_code == 200
+        body = r.get_json()
+        assert body["deleted_count"] == 30
+        assert body["not_found"] == [missing]
+        assert sum(s.lstrip().upper().startswith("DELETE FROM JOBS") for s in sql_statements) == 1
+        assert len(sql_statements) < 10
+        assert client.get(f"/api/v1/jobs/{ids[0]}").status_code == 404
+
+    def test_bulk_patch_status_and_clear(self, client, db_session):
+        from datetime import datetime, timezone
+        from uuid import UUID
+
+        from app.models.job import Job, JobStatus
+
+        ids = self._ingest(client, 3)
+        job = db_session.get(Job, UUID(ids[0]))
+        job.score, job.analyzed_at, job.status = 70, datetime.now(timezone.utc), JobStatus.analyzed
+        db_session.flush()
+
+        r = client.patch("/api/v1/jobs", json={"job_ids": ids, "clear": ["analysis"]})
+        assert r.status_code == 200 and r.get_json()["updated_count"] == 3
+        db_session.expire_all()
+        job = db_session.get(Job, UUID(ids[0]))
+        assert job.score is None and job.analyzed_at is None and job.status == JobStatus.new
+
+        r = client.patch("/api/v1/jobs", json={"job_ids": ids[:1], "status": "applied"})
+        assert r.get_json()["updated"] == ids[:1]
+
+    def test_bulk_validation(self, client):
+        assert client.delete("/api/v1/jobs", json={"job_ids": []}).status_code == 422
+        assert client.delete("/api/v1/jobs", json={"job_ids": ["nope"]}).status_code == 422
+        ids = self._ingest(client, 1)
+        assert client.patch("/api/v1/jobs", json={"job_ids": ids, "title": "x"}).status_code == 422
+        assert client.patch("/api/v1/jobs", json={"job_ids": ids, "status": "bogus"}).status_code == 422
+        assert client.patch("/api/v1/jobs", json={"job_ids": ids}).status_code == 422
+
+
+class TestExport:
+    def test_ndjson_export_streams_selected_columns(self, client):
+        import json
+
+        client.post("/api/v1/ingest/batch", json=[
+            {"raw_text": f"Export role {i}.", "title": f"Export {i}", "url": f"https://example.com/export-{i}"}
+            for i in range(3)
+        ])
+        r = client.get("/api/v1/jobs/export?format=ndjson&columns=title,url", buffered=False)
+        assert r.status_code == 200 and r.mimetype == "application/x-ndjson"
+        assert r.is_streamed
+        rows = [json.loads(line) for line in b"".join(r.response).decode().splitlines()]
+        r.close()
+        exported = [row for row in rows if row["url"].startswith("https://example.com/export-")]
+        assert [row["title"] for row in exported] == ["Export 2", "Export 1", "Export 0"]
+        assert set(exported[0]) == {"title", "url"}
+
+    def test_csv_export_gzip(self, client):
+        import csv
+        import gzip
+        import io
+
+        client.post("/api/v1/ingest", json={"raw_text": "Gzip role.", "url": "https://example.com/export-gz"})
+        r = client.get("/api/v1/jobs/export?format=csv&columns=url,raw_text", headers={"Accept-Encoding": "gzip"})
+        assert r.status_code == 200 and r.headers["Content-Encoding"] == "gzip"
+        rows = list(csv.reader(io.StringIO(gzip.decompress(r.data).decode())))
+        assert rows[0] == ["url", "raw_text"]
+        assert ["https://example.com/export-gz", "Gzip role."] in rows
+
+    def test_export_validation(self, client):
+        assert client.get("/api/v1/jobs/export?format=xml").status_code == 422
+        assert client.get("/api/v1/jobs/export?columns=embedding").status_code == 422
+
+
+class TestSearch:
+    def _ingest(self, client):
+        client.post("/api/v1/ingest/batch", json=[
+            {"title": "Rust Engineer", "company": "Ferrous", "raw_text": "Systems work in Rust and Postgres.",
+             "url": "https://example.com/search-1"},
+            {"title": "Data Engineer", "company": "Pipes", "raw_text": "Airflow pipelines; some Rust tooling.",
+             "url": "https://example.com/search-2"},
+            {"title": "Designer", "company": "Pixels", "raw_text": "Figma and user research.",
+             "url": "https://example.com/search-3"},
+        ])
+
+    def test_ranked_and_highlighted(self, client):
+        self._ingest(client)
+        r = client.get("/api/v1/jobs/search?q=rust")
+        assert r.status_code == 200
+        results = r.get_json()["results"]
+        assert [job["title"] for job in results[:2]] == ["Rust Engineer", "Data Engineer"]
+        assert results[0]["title_headline"] == "<mark>Rust</mark> Engineer"
+        assert "<mark>Rust</mark>" in results[1]["headline"]
+        assert results[0]["search_rank"] > results[1]["search_rank"]
+
+    def test_web_search_syntax(self, client):
+        self._ingest(client)
+        titles = [job["title"] for job in client.get("/api/v1/jobs/search?q=rust -airflow").get_json()["results"]]
+        assert "Rust Engineer" in titles and "Data Engineer" not in titles
+
+    def test_keyset_pages(self, client):
+        self._ingest(client)
+        first = client.get("/api/v1/jobs/search?q=rust&limit=1").get_json()
+        assert len(first["results"]) == 1 and first["next_cursor"]
+        second = client.get(f"/api/v1/jobs/search?q=rust&limit=1&cursor={first['next_cursor']}").get_json()
+        assert second["results"][0]["id"] != first["results"][0]["id"]
+
+    def test_uses_gin_index(self, client, db_session):
+        from sqlalchemy import text
+
+        db_session.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join(row[0] for row in db_session.execute(text(
+            "EXPLAIN SELECT id FROM jobs WHERE search_vector @@ websearch_to_tsquery('english', 'rust')"
+        )))
+        assert "ix_jobs_search_vector" in plan
+
+    def test_validation(self, client):
+        assert client.get("/api/v1/jobs/search").status_code == 422
+        assert client.get("/api/v1/jobs/search?q=x&limit=0").status_code == 422
+        assert client.get("/api/v1/jobs/search?q=x&cursor=bad").status_code == 422
+
+
+class TestSemanticSearch:
+    def _seed(self, client, db_session, monkeypatch):
+        from uuid import UUID
+
+        from app.models.job import Job
+        from app.services import semantic
+        from app.services.embedding_index import job_index
+
+        job_index.reset()
+        monkeypatch.setattr(semantic.settings, "SEMANTIC_EMBED_IN_BACKGROUND", False)
+        monkeypatch.setattr(semantic, "get_embedding", lambda q: [1.0, 0.0, 0.0])
+        r = client.post("/api/v1/ingest/batch", json=[
+            {"title": title, "raw_text": f"{title} role.", "url": f"https://example.com/semantic-{i}"}
+            for i, title in enumerate(["Rust Engineer", "Systems Engineer", "Pastry Chef"])
+        ])
+        ids = [item["id"] for item in r.get_json()["results"]]
+        for job_id, vec in zip(ids, [[1.0, 0.0, 0.0], [0.8, 0.6, 0.0], [0.0, 0.0, 1.0]]):
+            db_session.get(Job, UUID(job_id)).embedding = vec
+        db_session.flush()
+        return ids
+
+    def test_query_ranks_by_similarity(self, client, db_session, monkeypatch):
+        ids = self._seed(client, db_session, monkeypatch)
+        r = client.get("/api/v1/jobs/semantic?q=low level rust&k=2")
+        assert r.status_code == 200
+        results = r.get_json()["results"]
+        assert [job["id"] for job in results] == ids[:2]
+        assert results[0]["similarity"] == 1.0 and results[1]["similarity"] == 0.8
+
+        r = client.get("/api/v1/jobs/semantic?q=low level rust&min_similarity=0.9")
+        assert [job["id"] for job in r.get_json()["results"]] == ids[:1]
+
+    def test_more_like_this(self, client, db_session, monkeypatch):
+        ids = self._seed(client, db_session, monkeypatch)
+        r = client.get(f"/api/v1/jobs/{ids[0]}/similar?k=1")
+        assert r.status_code == 200
+        assert [job["id"] for job in r.get_json()["results"]] == [ids[1]]
+
+    def test_searches_do_not_write(self, client, db_session, monkeypatch):
+        from app.services.response_cache import table_versions
+
+        self._seed(client, db_session, monkeypatch)
+        client.post("/api/v1/ingest", json={
+            "raw_text": "Not embedded yet.", "title": "Unembedded", "url": "https://example.com/semantic-new",
+        })
+        before = table_versions(db_session, ("jobs",))
+        client.get("/api/v1/jobs/semantic?q=rust")
+        assert table_versions(db_session, ("jobs",)) == before
+
+    def test_deleted_jobs_drop_out(self, client, db_session, monkeypatch):
+        ids = self._seed(client, db_session, monkeypatch)
+        client.get("/api/v1/jobs/semantic?q=rust")
+        client.delete(f"/api/v1/jobs/{ids[0]}")
+        results = client.get("/api/v1/jobs/semantic?q=rust").get_json()["results"]
+        assert ids[0] not in [job["id"] for job in results]
+
+    def test_validation(self, client):
+        import uuid
+
+        assert client.get("/api/v1/jobs/semantic").status_code == 422
+        assert client.get("/api/v1/jobs/semantic?q=x&k=500").status_code == 422
+        assert client.get(f"/api/v1/jobs/{uuid.uuid4()}/similar").status_code == 404
+
+
+class TestNearDuplicates:
+    BODY = (
+        "We are hiring a backend engineer to design, build and run the services behind our logistics "
+        "platform. You will own APIs end to end, work closely with product and data, and help us scale "
+        "Postgres and Kafka pipelines to millions of shipments a day. Python and SQL required. "
+    ) * 3
+
+    def test_repost_links_to_canonical(self, client):
+        r = client.post("/api/v1/ingest/batch", json=[
+            {"title": "Backend Engineer", "company": "Shipit", "raw_text": self.BODY,
+             "url": "https://example.com/neardup?utm=a"},
+            {"title": "Backend Engineer", "company": "Shipit", "raw_text": self.BODY + "Apply today!",
+             "url": "https://example.com/neardup?utm=b"},
+            {"title": "Pastry Chef", "company": "Crumbs", "raw_text": "Laminated doughs, early mornings.",
+             "url": "https://example.com/neardup-chef"},
+        ])
+        original, repost, other = r.get_json()["results"]
+        assert repost["status"] == "new" and repost["duplicate_of"] == original["id"]
+        assert "duplicate_of" not in original and "duplicate_of" not in other
+
+        r = client.post("/api/v1/ingest", json={
+            "title": "Backend Engineer", "company": "Shipit", "raw_text": "Reposted. " + self.BODY,
+            "url": "https://example.com/neardup?utm=c",
+        })
+        assert r.status_code == 201 and r.get_json()["duplicate_of"] == original["id"]
+
+    def test_duplicates_copy_canonical_results(self, client, db_session):
+        from uuid import UUID
+
+        from app.models.job import Job
+        from app.services.near_dup import copy_from_canonical
+
+        r = client.post("/api/v1/ingest/batch", json=[
+            {"raw_text": self.BODY, "url": "https://example.com/neardup-copy-1"},
+            {"raw_text": self.BODY + "Apply today!", "url": "https://example.com/neardup-copy-2"},
+        ])
+        original, repost = (UUID(item["id"]) for item in r.get_json()["results"])
+        db_session.get(Job, original).score = 77
+        assert copy_from_canonical(db_session, [original]) == [repost]
+        db_session.expire_all()
+        assert db_session.get(Job, repost).score == 77
+
+    def test_repost_of_analyzed_job_is_scored_but_not_ranked(self, client, db_session):
+        from datetime import datetime, timezone
+        from uuid import UUID
+
+        from app.models.job import Job
+        from app.services.ranking import refresh_scores
+
+        r = client.post("/api/v1/ingest", json={
+            "title": "Backend Engineer", "company": "RankDupCo", "raw_text": self.BODY,
+            "url": "https://example.com/neardup-rank-1",
+        })
+        original = db_session.get(Job, UUID(r.get_json()["id"]))
+        original.analyzed_at = datetime.now(timezone.utc)
+        original.score = 80
+        refresh_scores(db_session, [original.id])
+
+        r = client.post("/api/v1/ingest", json={
+            "title": "Backend Engineer", "company": "RankDupCo", "raw_text": self.BODY + "Apply today!",
+            "url": "https://example.com/neardup-rank-2",
+        })
+        assert r.get_json()["duplicate_of"] == str(original.id)
+        db_session.expire_all()
+        assert db_session.get(Job, UUID(r.get_json()["id"])).combined_score is not None
+
+        body = client.get("/api/v1/rank?company=RankDupCo&with_total=1").get_json()
+        assert [e["job_id"] for e in body["ranked"]] == [str(original.id)]
+        assert body["total"] == 1
+
+
+class TestQueryPlans:
+    """Hot selection queries must stay on an index as the tables grow (migrations 008, 009, 014-016)."""
+
+    JOBS = 20000
+
+    def _seed(self, db_session):
+        from sqlalchemy import text
+
+        # Mostly processed jobs with a thin slice of pending work, as in a long-lived install.
+        from app.models.job import REQUIRED_STRUCTURED_FIELDS
+
+        parsed = "jsonb_build_object(" + ", ".join(f"'{field}', 'Seeded'" for field in REQUIRED_STRUCTURED_FIELDS) + ")"
+        db_session.execute(text(
+            "INSERT INTO jobs (id, job_hash, url, raw_text, title, status, score, combined_score, embedding,"
+            " structured_requirements, work_mode, created_at, analyzed_at) "
+            "SELECT gen_random_uuid(), md5('plan-' || i), 'https://example.com/plan/' || i, 'Seeded posting ' || i,"
+            " 'Role ' || (i % 50),"
+            " (CASE WHEN i % 50 = 0 THEN 'new' ELSE 'analyzed' END)::jobstatus,"
+            " CASE WHEN i % 50 = 0 THEN NULL ELSE i % 100 END,"
+            " CASE WHEN i % 50 = 0 THEN NULL ELSE (i % 100) / 100.0 END,"
+            " CASE WHEN i % 50 = 0 THEN NULL ELSE '[0.1, 0.2]'::json END,"
+            f" CASE WHEN i % 50 = 0 THEN NULL ELSE {parsed} END,"
+            " (ARRAY['remote', 'hybrid', 'onsite'])[1 + i % 3],"
+            " now() - i * interval '1 minute',"
+            " CASE WHEN i % 50 = 0 THEN NULL ELSE now() END "
+            f"FROM generate_series(1, {self.JOBS}) AS i"
+        ))
+        db_session.execute(text(
+            "INSERT INTO resumes (id, raw_text, updated_at) "
+            "SELECT gen_random_uuid(), 'Resume ' || i, now() - i * interval '1 hour' FROM generate_series(1, 2000) AS i"
+        ))
+        db_session.execute(text("ANALYZE jobs"))
+        db_session.execute(text("ANALYZE resumes"))
+
+    def _plan(self, db_session, query) -> str:
+        from sqlalchemy import text
+        from sqlalchemy.dialects import postgresql
+
+        stmt = getattr(query, "statement", query)
+        sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        return "\n".join(row[0] for row in db_session.execute(text(f"EXPLAIN {sql}")))
+
+    def test_hot_queries_avoid_seq_scans(self, db_session):
+        from sqlalchemy import select
+
+        from app.api.v1.jobs import BASE_COLUMNS
+        from app.api.v1.sort import _rank_columns
+        from app.models.job import Job
+        from app.models.resume import Resume
+        from app.services.near_dup import canonical_only
+
+        self._seed(db_session)
+        queries = {
+            "parse candidates": canonical_only(select(Job.id)).where(~Job.is_parse_complete),
+            "sort candidates": canonical_only(db_session.query(Job.id)).filter(Job.analyzed_at.is_(None)),
+            "analyze pending": canonical_only(db_session.query(Job).filter(Job.analyzed_at.is_(None))),
+            "latest resume": db_session.query(Resume).order_by(Resume.updated_at.desc()).limit(1),
+            "rank page": select(*_rank_columns(Job.combined_score)).where(Job.combined_score.isnot(None))
+            .order_by(Job.combined_score.desc(), Job.id).limit(20),
+            "jobs page": select(*BASE_COLUMNS).order_by(Job.created_at.desc(), Job.id.desc()).limit(50),
+            "analyzed jobs page": select(*BASE_COLUMNS).where(Job.analyzed_at.isnot(None))
+            .order_by(Job.created_at.desc(), Job.id.desc()).limit(50),
+            "remote jobs page": select(*BASE_COLUMNS).where(Job.work_mode == "remote")
+            .order_by(Job.created_at.desc(), Job.id.desc()).limit(50),
+            "unembedded jobs": db_session.query(Job).filter(Job.embedding.is_(None))
+            .order_by(Job.created_at.desc()).limit(256),
+        }
+        seq_scans = {}
+        for name, query in queries.items():
+            plan = self._plan(db_session, query)
+            if "Seq Scan" in plan:
+                seq_scans[name] = plan
+        assert not seq_scans, "\n\n".join(f"{name}:\n{plan}" for name, plan in seq_scans.items())
+
+
+class TestParseSelection:
+    def test_is_parse_complete_follows_required_fields(self, client, db_session):
+        from app.models.job import REQUIRED_STRUCTURED_FIELDS, Job
+
+        full = {field: "Stated" for field in REQUIRED_STRUCTURED_FIELDS}
+        cases = [
+            (None, False),
+            (full, True),
+            ({**full, "education_requirements": "  "}, False),
+            ({**full, "education_requirements": " X, Y, Z "}, False),
+            ({**full, "education_requirements": []}, False),
+            ({**full, "education_requirements": ["BSc"]}, True),
+            ({k: v for k, v in full.items() if k != "about_summary"}, False),
+            ("not an object", False),
+        ]
+        jobs = []
+        for i, (structured, _) in enumerate(cases):
+            job = Job(job_hash=f"parse-flag-{i}", url=f"https://example.com/parse-flag-{i}", raw_text="Role.",
+                      structured_requirements=structured)
+            db_session.add(job)
+            jobs.append(job)
+        db_session.flush()
+        db_session.expire_all()
+        assert [job.is_parse_complete for job in jobs] == [expected for _, expected in cases]
+
+    def test_parse_selects_only_incomplete_canonical_jobs(self, client, db_session, monkeypatch):
+        from uuid import UUID
+
+        from app.api.v1 import jobs as jobs_api
+        from app.models.job import REQUIRED_STRUCTURED_FIELDS, Job
+
+        parsed_titles = []
+
+        def fake_parse(raw_text, title, company, location):
+            parsed_titles.append(title)
+            return {field: f"{title} {field}" for field in REQUIRED_STRUCTURED_FIELDS}
+            yield  # a flow that needs no LLM call
+
+        monkeypatch.setattr(jobs_api, "parse_job_steps", fake_parse)
+        r = client.post("/api/v1/ingest/batch", json=[
+            {"title": "Done", "raw_text": "Already parsed.", "url": "https://example.com/parse-sel-1"},
+            {"title": "Pending", "raw_text": "Needs a parse.", "url": "https://example.com/parse-sel-2"},
+        ])
+        done, pending = (UUID(item["id"]) for item in r.get_json()["results"])
+        db_session.get(Job, done).structured_requirements = {field: "Stated" for field in REQUIRED_STRUCTURED_FIELDS}
+        db_session.flush()
+
+        r = client.post("/api/v1/parse", json={"job_ids": [str(done), str(pending)]})
+        assert r.status_code == 200 and r.get_json()["parsed_count"] == 1
+        assert parsed_titles == ["Pending"]
+        db_session.expire_all()
+        assert db_session.get(Job, pending).is_parse_complete
+
+        r = client.post("/api/v1/parse", json={"job_ids": [str(done), str(pending)]})
+        assert r.get_json()["message"] == "All jobs already have structured requirements."
+
+
+class TestFacets:
+    def _seed(self, client, db_session):
+        from uuid import UUID
+
+        from app.models.job import Job
+        from app.services.facets import set_facets
+
+        postings = [
+            ("Remote Dev", "Fully remote.", "Visa sponsorship available."),
+            ("Remote Dev 2", "Remote-first team.", "Unable to sponsor visas."),
+            ("Office Dev", "On-site in Berlin.", "Visa sponsorship available."),
+        ]
+        r = client.post("/api/v1/ingest/batch", json=[
+            {"title": title, "raw_text": f"{title} role.", "url": f"https://example.com/facets-{i}"}
+            for i, (title, _, _) in enumerate(postings)
+        ])
+        for item, (_, location, sponsorship) in zip(r.get_json()["results"], postings):
+            job = db_session.get(Job, UUID(item["id"]))
+            job.structured_requirements = {
+                "work_location_requirements": location, "sponsorship_requirements": sponsorship,
+            }
+            set_facets(job)
+        db_session.flush()
+
+    def test_filters_list(self, client, db_session):
+        self._seed(client, db_session)
+        r = client.get("/api/v1/jobs?remote=true&sponsorship=true")
+        assert [job["title"] for job in r.get_json()] == ["Remote Dev"]
+        assert r.get_json()[0]["work_mode"] == "remote" and r.get_json()[0]["sponsorship"] is True
+        r = client.get("/api/v1/jobs?work_mode=remote,onsite&cursor=")
+        assert {job["title"] for job in r.get_json()["jobs"]} == {"Remote Dev", "Remote Dev 2", "Office Dev"}
+
+    def test_counts_ignore_own_filter(self, client, db_session):
+        self._seed(client, db_session)
+        counts = client.get("/api/v1/jobs/facets?remote=true").get_json()
+        assert counts["total"] == 2
+        assert counts["work_mode"] == {"remote": 2, "hybrid": 0, "onsite": 1}
+        assert counts["sponsorship"] == {"true": 1, "false": 1}
+
+    def test_validation(self, client):
+        assert client.get("/api/v1/jobs?work_mode=space").status_code == 422
+        assert client.get("/api/v1/jobs/facets?years=1-3").status_code == 422
+
+
+class TestResumeArtifacts:
+    def test_post_resume_builds_artifacts(self, client, db_session):
+        from app.models.resume_artifact import ResumeArtifact
+        from app.services.resume_cache import content_hash
+
+        text = "Senior engineer.\n\n\nPython    and   SQL.\nPython    and   SQL."
+        r = client.post("/api/v1/resume", json={"text": text})
+        assert r.status_code == 200
+        body = r.get_json()
+        assert body["length"] == len(text) and body["token_count"] > 0
+
+        row = db_session.query(ResumeArtifact).one()
+        assert str(row.resume_id) == body["id"]
+        assert row.content_hash == content_hash(text)
+        assert row.compact_text == "Senior engineer.\nPython and SQL."
+        assert row.prompt_prefix.endswith("Python and SQL.\n\n")
+
+    def test_stale_artifacts_are_rebuilt(self, client, db_session):
+        from sqlalchemy import update
+
+        from app.models.resume import Resume
+        from app.models.resume_artifact import ResumeArtifact
+        from app.services import resume_cache
+
+        client.post("/api/v1/resume", json={"text": "Old resume."})
+        # Text changed without going through POST /resume.
+        db_session.execute(update(Resume).values(raw_text="New resume."))
+        db_session.flush()
+
+        artifacts = resume_cache.latest(db_session)
+        assert artifacts.compact_text == "New resume."
+        assert db_session.query(ResumeArtifact).one().content_hash == resume_cache.content_hash("New resume.")
+        assert client.get("/api/v1/resume").get_json()["length"] == len("New resume.")
+
+
+class TestRuns:
+    def test_parse_run_streams_job_events_and_resumes(self, client, db_session, monkeypatch):
+        from app.api.v1 import jobs as jobs_api
+        from app.api.v1 import runs as runs_api
+        from app.models.job import REQUIRED_STRUCTURED_FIELDS
+
+        def fake_parse(raw_text, title, company, location):
+            return {field: f"{title} {field}" for field in REQUIRED_STRUCTURED_FIELDS}
+            yield  # a flow that needs no LLM call
+
+        monkeypatch.setattr(jobs_api, "parse_job_steps", fake_parse)
+        monkeypatch.setattr(runs_api, "launcher", runs_api.run_inline)
+        r = client.post("/api/v1/ingest/batch", json=[
+            {"title": "Streamed", "raw_text": "Needs a parse.", "url": "https://example.com/run-1"},
+        ])
+        job_id = r.get_json()["results"][0]["id"]
+
+        r = client.post("/api/v1/runs", json={"kind": "parse", "job_ids": [job_id]})
+        assert r.status_code == 202
+        events_url = r.get_json()["events_url"]
+
+        r = client.get(events_url)
+        assert r.status_code == 200 and r.mimetype == "text/event-stream"
+        frames = [f for f in r.get_data(as_text=True).split("\n\n") if f.startswith("id:")]
+        events = [f.split("\n")[1].removeprefix("event: ") for f in frames]
+        assert events == ["started", "queued", "job", "done"]
+        assert f'"job_id":"{job_id}"' in frames[2]
+        assert '"status":200' in frames[3]
+
+        r = client.get(events_url, headers={"Last-Event-ID": "3"})
+        assert [f for f in r.get_data(as_text=True).split("\n\n") if f.startswith("id:")] == frames[3:]
+
+    def test_unknown_run_is_404(self, client):
+        r = client.get("/api/v1/runs/00000000-0000-0000-0000-000000000000/events")
+        assert r.status_code == 404
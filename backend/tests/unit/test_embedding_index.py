@@ -0,0 +1,47 @@
+"""Unit tests for the in-process embedding index (no DB, no model)."""
+from uuid import uuid4
+
+import numpy as np
+
+from app.services.embedding_index import EmbeddingIndex
+
+
+def _index(vectors):
+    idx = EmbeddingIndex()
+    ids = [uuid4() for _ in vectors]
+    idx.upsert(zip(ids, vectors))
+    return idx, ids
+
+
+class TestEmbeddingIndex:
+    def test_search_orders_by_cosine(self):
+        idx, ids = _index([[1, 0], [0.7, 0.7], [0, 1], [-1, 0]])
+        hits = idx.search([1, 0], k=2)
+        assert [h[0] for h in hits] == [ids[0], ids[1]]
+        assert hits[0][1] == np.float32(1.0)
+
+    def test_restrict_and_exclude(self):
+        idx, ids = _index([[1, 0], [0.7, 0.7], [0, 1]])
+        hits = idx.search([1, 0], k=5, restrict=[ids[1], ids[2]])
+        assert [h[0] for h in hits] == [ids[1], ids[2]]
+        hits = idx.search([1, 0], k=5, exclude=[ids[0]])
+        assert ids[0] not in [h[0] for h in hits]
+
+    def test_upsert_replaces_and_discard_removes(self):
+        idx, ids = _index([[1, 0], [0, 1]])
+        idx.upsert([(ids[1], [1, 0.01]), (ids[1], [1, 0.01])])
+        assert len(idx) == 2
+        assert idx.search([1, 0], k=1)[0][0] in ids
+        idx.discard([ids[0]])
+        assert len(idx) == 1
+        assert idx.search([1, 0], k=5)[0][0] == ids[1]
+
+    def test_empty_index(self):
+        assert EmbeddingIndex().search([1, 0], k=3) == []
+
+    def test_similarities_nan_for_unknown_ids(self):
+        idx, ids = _index([[1, 0], [0, 1]])
+        sims = idx.similarities([1, 0], [ids[1], uuid4(), ids[0]])
+        assert sims[0] == np.float32(0.0)
+        assert np.isnan(sims[1])
+        assert sims[2] == np.float32(1.0)
@@ -0,0 +1,67 @@
+"""Unit tests for export encoding and chunking (no DB)."""
+import csv
+import gzip
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.job import JobStatus
+from app.services.export import EXPORT_COLUMNS, chunked, csv_lines, gzipped, ndjson_lines, resolve_columns
+
+
+class TestResolveColumns:
+    def test_default_is_all_exportable(self):
+        keys = [column.key for column in resolve_columns(None)]
+        assert keys == list(EXPORT_COLUMNS)
+        assert "raw_text" in keys and "embedding" not in keys
+
+    def test_selection_keeps_order_and_drops_repeats(self):
+        assert [c.key for c in resolve_columns(" title, id,title ")] == ["title", "id"]
+
+    def test_unknown_column(self):
+        with pytest.raises(ValueError, match="embedding"):
+            resolve_columns("id,embedding")
+
+
+ROWS = [
+    (uuid.UUID(int=1), "Dev, \"Senior\"", JobStatus.analyzed, {"skills": ["python"]},
+     datetime(2026, 1, 2, tzinfo=timezone.utc), None),
+]
+KEYS = ["id", "title", "status", "structured_requirements", "created_at", "score"]
+
+
+class TestEncoders:
+    def test_ndjson(self):
+        lines = b"".join(ndjson_lines(KEYS, ROWS)).decode().splitlines()
+        assert json.loads(lines[0]) == {
+            "id": str(uuid.UUID(int=1)), "title": "Dev, \"Senior\"", "status": "analyzed",
+            "structured_requirements": {"skills": ["python"]}, "created_at": "2026-01-02T00:00:00+00:00",
+            "score": None,
+        }
+
+    def test_csv(self):
+        body = b"".join(csv_lines(KEYS, ROWS)).decode()
+        header, row = list(csv.reader(io.StringIO(body)))
+        assert header == KEYS
+        assert row == [
+            str(uuid.UUID(int=1)), "Dev, \"Senior\"", "analyzed", '{"skills":["python"]}',
+            "2026-01-02T00:00:00+00:00", "",
+        ]
+
+    def test_csv_header_without_rows(self):
+        assert b"".join(csv_lines(KEYS, [])).decode().strip() == ",".join(KEYS)
+
+
+class TestStreaming:
+    def test_chunked_joins_small_pieces(self):
+        chunks = list(chunked((b"x" * 10 for _ in range(25)), size=100))
+        assert [len(c) for c in chunks] == [100, 100, 50]
+
+    def test_gzipped_round_trips_and_streams(self):
+        pieces = [uuid.uuid4().hex.encode() * 4 for _ in range(20000)]
+        out = list(gzipped(iter(pieces), level=1))
+        assert len(out) > 2
+        assert gzip.decompress(b"".join(out)) == b"".join(pieces)
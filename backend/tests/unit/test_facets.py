@@ -0,0 +1,87 @@
+"""Unit tests for facet derivation and GET /jobs facet filters (no DB)."""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models.job import PLACEHOLDER_TEXT, Job
+from app.services import facets
+
+
+def _sql(filters) -> str:
+    query = select(Job.id).where(*filters.values())
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class TestDeriveFacets:
+    def test_parsed_fields(self):
+        derived = facets.derive_facets({
+            "work_location_requirements": "Fully remote within the US.",
+            "sponsorship_requirements": "We sponsor H-1B visas.",
+            "experience_requirements": "Seniority: Senior. 5+ years of backend experience, 2 years leading teams.",
+            "education_requirements": "Bachelor's or Master's in Computer Science.",
+        })
+        assert derived == {"work_mode": "remote", "sponsorship": True, "min_years": 5, "degree_level": "bachelor"}
+
+    def test_unparsed_and_placeholders(self):
+        empty = dict.fromkeys(facets.FACET_COLUMNS)
+        assert facets.derive_facets(None) == empty
+        assert facets.derive_facets("not a dict") == empty
+        assert facets.derive_facets({"work_location_requirements": PLACEHOLDER_TEXT.upper()}) == empty
+
+    @pytest.mark.parametrize("text, expected", [
+        ("Visa sponsorship is available.", True),
+        ("We are unable to sponsor visas at this time.", False),
+        ("Sponsorship is not available for this role.", False),
+        ("Must be authorized to work without sponsorship.", False),
+        ("US citizens only; security clearance required.", False),
+        ("", None),
+    ])
+    def test_sponsorship(self, text, expected):
+        assert facets.sponsorship_offered(text.lower()) is expected
+
+    @pytest.mark.parametrize("text, expected", [
+        ("phd in machine learning preferred", "doctorate"),
+        ("master's degree or equivalent", "master"),
+        ("degree in a quantitative field", "bachelor"),
+        ("associate's degree or bootcamp", "associate"),
+        ("no degree required", None),
+        ("aws certification", None),
+    ])
+    def test_degree_level(self, text, expected):
+        assert facets.degree_level(text) == expected
+
+    def test_min_years_without_experience_word(self):
+        assert facets.min_years("3-5 years in a data role") == 3
+        assert facets.min_years("seniority: senior") is None
+
+    def test_set_facets(self):
+        job = Job(structured_requirements={"work_location_requirements": "Hybrid, 2 days in office."})
+        facets.set_facets(job)
+        assert (job.work_mode, job.sponsorship, job.min_years, job.degree_level) == ("hybrid", None, None, None)
+
+
+class TestFiltersFromArgs:
+    def test_no_filters(self):
+        assert facets.filters_from_args({}) == {}
+
+    def test_remote_shorthand_and_lists(self):
+        filters = facets.filters_from_args({"remote": "true", "work_mode": "hybrid", "degree": "Master,bachelor"})
+        sql = _sql(filters)
+        assert "jobs.work_mode IN ('hybrid', 'remote')" in sql
+        assert "jobs.degree_level IN ('bachelor', 'master')" in sql
+
+    def test_remote_false_keeps_unknown(self):
+        sql = _sql(facets.filters_from_args({"remote": "false"}))
+        assert "jobs.work_mode IS NULL OR jobs.work_mode != 'remote'" in sql
+
+    def test_sponsorship_and_years(self):
+        sql = _sql(facets.filters_from_args({"sponsorship": "yes", "years": "0-2,10+"}))
+        assert "jobs.sponsorship IS true" in sql
+        assert "jobs.min_years BETWEEN 0 AND 2 OR jobs.min_years >= 10" in sql
+
+    @pytest.mark.parametrize("args", [
+        {"remote": "maybe"}, {"work_mode": "space"}, {"sponsorship": "2"}, {"degree": "mfa"}, {"years": "1-3"},
+    ])
+    def test_invalid(self, args):
+        with pytest.raises(ValueError):
+            facets.filters_from_args(args)
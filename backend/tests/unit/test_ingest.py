@@ -0,0 +1,33 @@
+"""Unit tests for ingest payload preparation (no DB)."""
+import pytest
+
+from app.models.job import Job
+from app.services.ingest import IngestResult, prepare_posting
+
+
+class TestPreparePosting:
+    def test_hash_matches_single_ingest(self):
+        row = prepare_posting({"title": "Dev", "company": "Co", "url": "https://example.com/1", "raw_text": "  Role.  "})
+        assert row["raw_text"] == "Role."
+        assert row["job_hash"] == Job.generate_hash({
+            "title": "Dev", "company": "Co", "location": "", "url": "https://example.com/1", "raw_text": "Role.",
+        })
+        assert row["url"] == "https://example.com/1"
+
+    def test_missing_url_gets_urn(self):
+        row = prepare_posting({"raw_text": "Role."})
+        assert row["url"] == f"urn:job:{row['job_hash']}"
+
+    @pytest.mark.parametrize("payload, message", [
+        ({"raw_text": "   "}, "raw_text must not be empty"),
+        ({"raw_text": "x" * 50001}, "50,000"),
+        (["not", "an", "object"], "JSON object"),
+    ])
+    def test_invalid_payloads(self, payload, message):
+        with pytest.raises(ValueError, match=message):
+            prepare_posting(payload)
+
+
+class TestIngestResult:
+    def test_to_dict_omits_unset_fields(self):
+        assert IngestResult(3, "error", detail="bad").to_dict() == {"index": 3, "status": "error", "detail": "bad"}
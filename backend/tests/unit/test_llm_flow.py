@@ -0,0 +1,190 @@
+"""Unit tests for the flow drivers shared by the WSGI and ASGI servers (no DB, no network)."""
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from app.services import llm, llm_flow
+from app.services.llm import LLMError
+from app.services.llm_flow import LLMCall, Progress, Wait, gather, run_async, run_sync
+
+
+def _chat(messages, template="unknown"):
+    if messages == "fail":
+        raise LLMError("down")
+    return {"echo": messages, "template": template}
+
+
+async def _chat_async(messages, template="unknown"):
+    await asyncio.sleep(0)
+    return _chat(messages, template)
+
+
+def _flow(log):
+    log.append("before")
+    try:
+        yield LLMCall("fail", "t")
+    except LLMError as exc:
+        log.append(f"caught {exc}")
+    first = yield LLMCall("a", "t")
+    pair = yield [LLMCall("b", "t"), LLMCall("fail", "t")]
+    yield Wait(0)
+    return first["echo"], pair[0]["echo"], type(pair[1]).__name__
+
+
+def _progress_flow():
+    yield Progress([("queued", {"job_count": 2})])
+    result = yield LLMCall("a", "t")
+    yield Progress([("job", {"job_id": "1"}), ("job", {"job_id": "2"})])
+    return result["echo"]
+
+
+def _parse_like(name):
+    result = yield LLMCall(name, "parse")
+    return result["echo"]
+
+
+class TestRunSync:
+    def test_calls_errors_and_waits(self):
+        log = []
+        assert run_sync(_flow(log), chat=_chat) == ("a", "b", "LLMError")
+        assert log == ["before", "caught down"]
+
+    def test_default_chat_is_looked_up_at_call_time(self, monkeypatch):
+        monkeypatch.setattr(llm, "claude_chat_json", _chat)
+        assert run_sync(_parse_like("x")) == "x"
+
+    def test_unhandled_error_propagates(self):
+        def flow():
+            yield LLMCall("fail", "t")
+
+        with pytest.raises(LLMError):
+            run_sync(flow(), chat=_chat)
+
+    def test_progress_reported_in_order(self):
+        seen = []
+        assert run_sync(_progress_flow(), chat=_chat, on_progress=seen.append) == "a"
+        assert [event for step in seen for event, _ in step.events] == ["queued", "job", "job"]
+
+    def test_progress_ignored_without_callback(self):
+        assert run_sync(_progress_flow(), chat=_chat) == "a"
+
+    def test_wait_returns_when_futures_done(self):
+        fut = Future()
+        threading.Timer(0.05, fut.set_result, [None]).start()
+
+        def flow():
+            yield Wait(5, (fut,))
+            return fut.done()
+
+        assert run_sync(flow(), chat=_chat) is True
+
+
+class TestGather:
+    def test_batches_calls_and_keeps_order(self):
+        seen = []
+
+        def chat(messages, template="unknown"):
+            seen.append(messages)
+            return _chat(messages, template)
+
+        def outer():
+            return (yield from gather([_parse_like("a"), _parse_like("fail"), _parse_like("c")]))
+
+        results = run_sync(outer(), chat=chat)
+        assert seen == ["a", "fail", "c"]
+        assert results[0] == "a" and results[2] == "c"
+        assert isinstance(results[1], LLMError)
+
+    def test_flows_without_calls(self):
+        def done(value):
+            return value
+            yield
+
+        assert run_sync(gather([done(1), done(2)]), chat=_chat) == [1, 2]
+
+
+class TestRunAsync:
+    def test_same_result_as_sync(self, monkeypatch):
+        monkeypatch.setattr(llm, "claude_chat_json_async", _chat_async)
+        log = []
+        with ThreadPoolExecutor(2) as pool:
+            assert asyncio.run(run_async(_flow(log), pool)) == ("a", "b", "LLMError")
+        assert log == ["before", "caught down"]
+
+    def test_progress_reported_on_the_pool(self, monkeypatch):
+        monkeypatch.setattr(llm, "claude_chat_json_async", _chat_async)
+        seen = []
+
+        async def main():
+            result = await run_async(_progress_flow(), on_progress=lambda step: seen.append(
+                (threading.current_thread().name, step.events[0][0])
+            ))
+            return threading.current_thread().name, result
+
+        loop_thread, result = asyncio.run(main())
+        assert result == "a"
+        assert [event for _, event in seen] == ["queued", "job"]
+        assert all(thread != loop_thread for thread, _ in seen)
+
+    def test_segments_run_off_the_loop_thread_inside_context(self, monkeypatch):
+        from contextlib import contextmanager
+
+        monkeypatch.setattr(llm, "claude_chat_json_async", _chat_async)
+        entered = []
+
+        @contextmanager
+        def context():
+            entered.append(threading.current_thread().name)
+            yield
+
+        def flow():
+            yield LLMCall("a", "t")
+            return threading.current_thread().name
+
+        async def main():
+            return threading.current_thread().name, await run_async(flow(), context=context)
+
+        loop_thread, flow_thread = asyncio.run(main())
+        assert flow_thread != loop_thread
+        assert len(entered) == 2 and loop_thread not in entered
+
+    def test_parallel_calls_overlap(self, monkeypatch):
+        active, peak = [0], [0]
+
+        async def slow_chat(messages, template="unknown"):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.01)
+            active[0] -= 1
+            return {"echo": messages}
+
+        monkeypatch.setattr(llm, "claude_chat_json_async", slow_chat)
+        flows = [_parse_like(str(i)) for i in range(5)]
+        assert asyncio.run(run_async(gather(flows))) == ["0", "1", "2", "3", "4"]
+        assert peak[0] == 5
+
+    def test_cancel_closes_flow(self, monkeypatch):
+        closed = []
+
+        async def hang(messages, template="unknown"):
+            await asyncio.sleep(10)
+
+        def flow():
+            try:
+                yield LLMCall("a", "t")
+            finally:
+                closed.append(True)
+
+        monkeypatch.setattr(llm_flow.llm, "claude_chat_json_async", hang)
+
+        async def main():
+            task = asyncio.ensure_future(run_async(flow()))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        assert closed == [True]
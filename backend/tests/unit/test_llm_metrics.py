@@ -0,0 +1,180 @@
+"""Unit tests for LLM call instrumentation (no network beyond localhost)."""
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+from app.services import llm_metrics
+from app.services.llm_metrics import Histogram, estimate_cost, track_call
+
+
+@pytest.fixture(autouse=True)
+def _clean_metrics():
+    llm_metrics.reset()
+    yield
+    llm_metrics.reset()
+
+
+class TestHistogram:
+    def test_cumulative_buckets(self):
+        h = Histogram([1.0, 2.0])
+        for v in (0.5, 1.5, 1.7, 9.0):
+            h.observe(v)
+        assert h.cumulative() == [("1", 1), ("2", 3), ("+Inf", 4)]
+        assert h.count == 4
+        assert h.sum == pytest.approx(12.7)
+
+    def test_quantile(self):
+        h = Histogram([1.0, 2.0, 4.0])
+        for v in (0.5, 1.5, 1.5, 3.0):
+            h.observe(v)
+        assert h.quantile(0.5) == 2.0
+        assert h.quantile(1.0) == 4.0
+        assert Histogram([1.0]).quantile(0.5) is None
+
+
+class TestCost:
+    def test_longest_prefix_wins(self):
+        assert estimate_cost("claude-opus-4-6", 1_000_000, 0) == pytest.approx(5.0)
+        assert estimate_cost("claude-opus-4-1", 1_000_000, 0) == pytest.approx(15.0)
+
+    def test_cache_pricing(self):
+        cost = estimate_cost("claude-haiku-4-5", 0, 0, cache_read_tokens=1_000_000, cache_creation_tokens=1_000_000)
+        assert cost == pytest.approx(0.1 + 1.25)
+
+    def test_unknown_model_is_free(self):
+        assert estimate_cost("some-local-model", 1000, 1000) == 0.0
+
+
+class TestTrackCall:
+    def test_records_outcome_and_usage(self):
+        with track_call("cull", "claude-haiku-4-5") as call:
+            call.input_tokens, call.output_tokens = 1200, 300
+        with pytest.raises(RuntimeError):
+            with track_call("cull", "claude-haiku-4-5"):
+                raise RuntimeError("boom")
+        [row] = llm_metrics.summary()
+        assert row["template"] == "cull"
+        assert row["calls"] == 2
+        assert row["outcomes"] == {"ok": 1, "error": 1}
+        assert row["input_tokens"] == 1200
+
+    def test_prometheus_exposition(self):
+        with track_call("parse", "claude-haiku-4-5"):
+            pass
+        text = llm_metrics.render_prometheus()
+        assert "# TYPE llm_call_latency_seconds histogram" in text
+        assert 'llm_calls_total{endpoint="-",template="parse",model="claude-haiku-4-5",outcome="ok"} 1' in text
+        assert 'le="+Inf"' in text
+
+
+class TestClaudeChatJsonRecordsUsage:
+    def test_usage_and_ttft_recorded(self, monkeypatch):
+        from app.core import config
+        from app.services.llm import claude_chat_json
+        from app.services.llm_standin import LatencySpec, StandinConfig, create_app
+        from app.services.prompts import build_parse_messages
+
+        server = make_server("127.0.0.1", 0, create_app(StandinConfig(latency=LatencySpec.parse("fixed:0"))),
+                             threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            monkeypatch.setattr(config.settings, "LLM_BACKEND", "standin")
+            monkeypatch.setattr(config.settings, "LLM_STANDIN_URL", f"http://127.0.0.1:{server.server_port}")
+            claude_chat_json(build_parse_messages("Python role", "Dev", "Acme"), template="parse")
+        finally:
+            server.shutdown()
+        [row] = llm_metrics.summary()
+        assert row["template"] == "parse"
+        assert row["outcomes"] == {"ok": 1}
+        assert row["input_tokens"] > 0
+        assert row["output_tokens"] > 0
+        assert row["ttft_p50_s"] is not None
+
+    def test_async_call_log_written_off_the_loop(self, monkeypatch):
+        import asyncio
+
+        from app.core import config
+        from app.services.llm import claude_chat_json_async
+        from app.services.llm_standin import LatencySpec, StandinConfig, create_app
+        from app.services.prompts import build_parse_messages
+
+        logged = []
+        monkeypatch.setattr(llm_metrics, "_log_call", lambda call: logged.append((call.template, threading.get_ident())))
+        server = make_server("127.0.0.1", 0, create_app(StandinConfig(latency=LatencySpec.parse("fixed:0"))),
+                             threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            monkeypatch.setattr(config.settings, "LLM_BACKEND", "standin")
+            monkeypatch.setattr(config.settings, "LLM_STANDIN_URL", f"http://127.0.0.1:{server.server_port}")
+            monkeypatch.setattr(config.settings, "LLM_CALL_LOG", True)
+
+            async def one_call():
+                await claude_chat_json_async(build_parse_messages("Python role", "Dev", "Acme"), template="parse")
+                return threading.get_ident()
+
+            # asyncio.run waits for the default executor, so the row write has finished.
+            loop_thread = asyncio.run(one_call())
+        finally:
+            server.shutdown()
+        assert [template for template, _ in logged] == ["parse"]
+        assert logged[0][1] != loop_thread
+
+
+class TestMetricsEndpoint:
+    def _get(self, **headers):
+        from app.main import app
+
+        return app.test_client().get("/internal/metrics", headers={"Origin": "http://example.com", **headers})
+
+    def test_disabled_without_token(self, monkeypatch):
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+        assert self._get(Authorization="Bearer anything").status_code == 404
+
+    def test_requires_bearer_token(self, monkeypatch):
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+        assert self._get().status_code == 401
+        assert self._get(Authorization="Bearer wrong").status_code == 401
+        r = self._get(Authorization="Bearer s3cret")
+        assert r.status_code == 200
+        assert "access-control-allow-origin" not in r.headers
+
+
+class TestRunEndpointLabel:
+    def test_run_calls_are_labelled_with_their_route(self, monkeypatch):
+        from app.api.v1 import runs as runs_api
+        from app.main import app
+        from app.services import llm
+        from app.services.llm_flow import LLMCall
+
+        def fake_chat(messages, template="unknown"):
+            with track_call(template, "test-model"):
+                return {}
+
+        class Log:
+            run_id = "test"
+
+            def __init__(self):
+                self.events = []
+
+            def append(self, events):
+                self.events.extend(events)
+
+            def progress(self, step):
+                self.append(step.events)
+
+        def flow():
+            yield LLMCall([{"role": "user", "content": "hi"}], "cull")
+            return {"ok": True}
+
+        monkeypatch.setattr(llm, "claude_chat_json", fake_chat)
+        log = Log()
+        endpoint, _ = runs_api.FLOWS["cull"]
+        runs_api.run_inline(app, log, flow(), endpoint)
+        assert [row["endpoint"] for row in llm_metrics.summary()] == ["cull.begin_cull"]
+        assert log.events[-1][0] == "done"
+        assert llm_metrics.endpoint_label.get() is None
@@ -0,0 +1,131 @@
+"""Unit tests for the local LLM stand-in (no network beyond localhost)."""
+import json
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+from app.services.llm_standin import LatencySpec, StandinConfig, build_response_payload, create_app
+from app.services.prompts import (
+    PARSE_FIELDS,
+    build_batch_sort_messages,
+    build_cull_messages,
+    build_parse_messages,
+    resume_prompt_prefix,
+)
+
+
+def _split(messages):
+    system = next(m["content"] for m in messages if m["role"] == "system")
+    user = next(m["content"] for m in messages if m["role"] == "user")
+    return system, user
+
+
+def _quiet_config(**overrides):
+    return StandinConfig(latency=LatencySpec.parse("fixed:0"), **overrides)
+
+
+class TestResponsePayload:
+    def test_batch_sort_returns_item_per_job(self):
+        jobs = [{"job_id": f"id-{i}", "title": "Dev", "company": "Acme", "raw_text": "x"} for i in range(3)]
+        result = build_response_payload(*_split(build_batch_sort_messages(resume_prompt_prefix("resume"), jobs)))
+        assert [r["job_id"] for r in result] == ["id-0", "id-1", "id-2"]
+        for item in result:
+            assert 0 <= item["score"] <= 100
+            assert set(PARSE_FIELDS) <= set(item)
+            assert item["resume_key"]
+
+    def test_cull_ranks_all_jobs(self):
+        jobs = [{"job_id": f"id-{i}", "title": "Dev"} for i in range(5)]
+        result = build_response_payload(*_split(build_cull_messages("resume", jobs, 2)))
+        assert len(result["ranked"]) == 5
+        assert len(result["top_10"]) == 2
+        scores = [r["fit_score"] for r in result["ranked"]]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_parse_returns_only_requested_fields(self):
+        fields = ["about_summary", "expertise_requirements"]
+        result = build_response_payload(*_split(build_parse_messages("text", "Dev", "Acme", fields)))
+        assert set(result) == set(fields)
+
+    def test_deterministic(self):
+        msgs = build_cull_messages("resume", [{"job_id": "a"}, {"job_id": "b"}], 1)
+        assert build_response_payload(*_split(msgs)) == build_response_payload(*_split(msgs))
+
+
+class TestLatencySpec:
+    def test_parse_and_sample(self):
+        import random
+        spec = LatencySpec.parse("uniform:10:20")
+        value = spec.sample_ms(random.Random(0))
+        assert 10 <= value <= 20
+
+    def test_unknown_distribution_raises(self):
+        with pytest.raises(ValueError):
+            LatencySpec.parse("pareto:1")
+
+
+class TestStandinApp:
+    def test_injects_429(self):
+        app = create_app(_quiet_config(rate_429=1.0))
+        r = app.test_client().post("/v1/messages", json={"messages": [{"role": "user", "content": "hi"}]})
+        assert r.status_code == 429
+        assert r.get_json()["error"]["type"] == "rate_limit_error"
+
+    def test_injects_529(self):
+        app = create_app(_quiet_config(rate_529=1.0))
+        r = app.test_client().post("/v1/messages", json={"messages": [{"role": "user", "content": "hi"}]})
+        assert r.status_code == 529
+
+    def test_truncated_output_sets_max_tokens(self):
+        system, user = _split(build_cull_messages("resume", [{"job_id": "a"}], 1))
+        app = create_app(_quiet_config(truncate_rate=1.0))
+        r = app.test_client().post("/v1/messages", json={
+            "system": system, "messages": [{"role": "user", "content": user}],
+        })
+        body = r.get_json()
+        assert body["stop_reason"] == "max_tokens"
+        with pytest.raises(json.JSONDecodeError):
+            json.loads(body["content"][0]["text"])
+
+
+class TestClaudeChatJsonAgainstStandin:
+    def test_streaming_round_trip(self, monkeypatch):
+        from app.core import config
+        from app.services.llm import claude_chat_json
+
+        server = make_server("127.0.0.1", 0, create_app(_quiet_config()), threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            monkeypatch.setattr(config.settings, "LLM_BACKEND", "standin")
+            monkeypatch.setattr(config.settings, "ANTHROPIC_API_KEY", None)
+            monkeypatch.setattr(config.settings, "LLM_STANDIN_URL", f"http://127.0.0.1:{server.server_port}")
+            result = claude_chat_json(build_parse_messages("Python role", "Dev", "Acme"))
+        finally:
+            server.shutdown()
+        assert set(result) == set(PARSE_FIELDS)
+
+    def test_async_round_trip(self, monkeypatch):
+        import asyncio
+
+        from app.core import config
+        from app.services.llm import claude_chat_json_async
+
+        server = make_server("127.0.0.1", 0, create_app(_quiet_config()), threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            monkeypatch.setattr(config.settings, "LLM_BACKEND", "standin")
+            monkeypatch.setattr(config.settings, "ANTHROPIC_API_KEY", None)
+            monkeypatch.setattr(config.settings, "LLM_STANDIN_URL", f"http://127.0.0.1:{server.server_port}")
+            monkeypatch.setattr(config.settings, "LLM_MAX_CONCURRENCY", 2)
+
+            async def three_calls():
+                messages = build_parse_messages("Python role", "Dev", "Acme")
+                return await asyncio.gather(*(claude_chat_json_async(messages) for _ in range(3)))
+
+            results = asyncio.run(three_calls())
+        finally:
+            server.shutdown()
+        assert all(set(result) == set(PARSE_FIELDS) for result in results)
@@ -0,0 +1,93 @@
+"""Unit tests for the zero-LLM local fit scorer (no DB, no embedding model)."""
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.services import local_scorer
+from app.services.analyzer import LocalAnalyzer
+from app.services.embedding_index import job_index
+from app.services.local_scorer import LocalFitScorer
+from app.services.text_features import work_mode, years_claimed, years_required
+
+RESUME = """
+Senior data engineer, 2016 - present. Python, Spark, Airflow, dbt and Postgres pipelines on AWS.
+Built Kafka streaming ETL and Terraform-managed infrastructure.
+"""
+
+
+def _job(title, text, location=""):
+    return SimpleNamespace(id=uuid4(), title=title, raw_text=text, location=location)
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    local_scorer.clear_cache()
+    job_index.reset()
+    yield
+    local_scorer.clear_cache()
+    job_index.reset()
+
+
+class TestTextFeatures:
+    def test_years_required_takes_entry_bar(self):
+        text = "Requires 5+ years of professional experience. 3-5 years experience with SQL."
+        assert years_required(text) == 3
+        assert years_required("Great team, competitive pay.") is None
+
+    def test_years_claimed_uses_date_span(self):
+        assert years_claimed("ACME 2011 – 2015. Initech 2015 - 2020.") == 9
+        assert years_claimed("12 years building APIs") == 12
+
+    def test_work_mode(self):
+        assert work_mode("Remote (US)") == "remote"
+        assert work_mode("This role is not remote; on-site in Austin") == "onsite"
+        assert work_mode("2 days in office, otherwise remote") == "hybrid"
+        assert work_mode("Hybrid - New York, NY") == "hybrid"
+        assert work_mode("Competitive salary") is None
+
+
+class TestLocalFitScorer:
+    def test_keyword_overlap_ranks_relevant_job_first(self):
+        jobs = [
+            _job("Data Engineer", "Python Spark Airflow dbt Postgres Kafka on AWS. 3+ years of experience."),
+            _job("Pastry Chef", "Laminated doughs, croissants, early mornings. 3+ years of experience."),
+        ]
+        fit = LocalFitScorer(RESUME).score(jobs)
+        assert fit.score[0] > fit.score[1]
+        assert "airflow" in fit.matched_terms[0]
+        assert fit.matched_terms[1] == []
+        assert np.isnan(fit.embedding).all()
+
+    def test_rules_penalise_missing_years_and_wrong_mode(self):
+        jobs = [
+            _job("Engineer", "Python role. 5 years of experience.", "Remote"),
+            _job("Engineer", "Python role. 15 years of experience.", "On-site - Austin, TX"),
+        ]
+        fit = LocalFitScorer(RESUME, preferred_work_mode="remote").score(jobs)
+        assert fit.rules[0] == pytest.approx(1.0)
+        assert fit.rules[1] == pytest.approx(0.0)
+
+    def test_embedding_similarity_used_when_available(self):
+        near = _job("Engineer", "Python role.")
+        far = _job("Engineer", "Python role.")
+        job_index.upsert([(near.id, [1.0, 0.0]), (far.id, [0.0, 1.0])])
+        fit = LocalFitScorer(RESUME, resume_vector=[1.0, 0.0]).score([near, far])
+        assert fit.embedding[0] == pytest.approx(1.0)
+        assert fit.embedding[1] == pytest.approx(0.0)
+        assert fit.score[0] > fit.score[1]
+
+    def test_no_resume_scores_neutral(self):
+        fit = LocalFitScorer("").score([_job("Engineer", "Anything")])
+        assert fit.score.tolist() == [50]
+
+
+class TestLocalAnalyzer:
+    def test_analyze_many_returns_one_result_per_job(self):
+        jobs = [_job("Data Engineer", "Python Spark Airflow"), _job("Chef", "Croissants")]
+        results = LocalAnalyzer(None).analyze_many(jobs)
+        assert len(results) == 2
+        assert all(0 <= r.score <= 100 for r in results)
+        assert results[0].analysis_raw["source"] == "local"
+        assert results[0].analysis_raw["has_resume"] is False
@@ -0,0 +1,59 @@
+"""Unit tests for MinHash signatures and LSH banding (no DB)."""
+import random
+
+import numpy as np
+import pytest
+
+from app.services import near_dup
+
+
+def _posting(seed: int, n: int = 300) -> str:
+    rng = random.Random(seed)
+    vocab = [f"{w}{i}" for w in ("build", "data", "team", "cloud", "ship", "own", "scale", "hire") for i in range(40)]
+    return " ".join(rng.choice(vocab) for _ in range(n))
+
+
+def _jaccard(a: str, b: str) -> float:
+    sa, sb = near_dup._shingles(a), near_dup._shingles(b)
+    return len(sa & sb) / len(sa | sb)
+
+
+class TestSignature:
+    def test_deterministic_and_round_trips(self):
+        text = _posting(1)
+        sig = near_dup.signature(text)
+        assert sig.shape == (near_dup.NUM_PERM,) and sig.dtype == np.uint32
+        assert np.array_equal(sig, near_dup.signature(text))
+        assert np.array_equal(near_dup.from_bytes(near_dup.to_bytes(sig)), sig)
+
+    def test_no_words(self):
+        assert near_dup.signature(" ,.- ") is None
+
+    def test_estimate_tracks_jaccard(self):
+        original = _posting(2)
+        words = original.split()
+        words[150:153] = ["reworded", "line", "here"]
+        repost = " ".join(words)
+        estimate = near_dup.similarity(near_dup.signature(original), near_dup.signature(repost))
+        assert estimate == pytest.approx(_jaccard(original, repost), abs=0.08)
+        assert estimate >= near_dup.settings.NEAR_DUP_THRESHOLD
+
+    def test_case_and_punctuation_do_not_matter(self):
+        text = _posting(3)
+        noisy = text.upper().replace(" ", " , ")
+        assert near_dup.similarity(near_dup.signature(text), near_dup.signature(noisy)) == 1.0
+
+
+class TestBanding:
+    def test_near_duplicates_share_buckets_unrelated_do_not(self):
+        original = _posting(4)
+        repost = original + " apply via our new careers page"
+        other = _posting(5)
+        buckets = set(near_dup.band_buckets(near_dup.signature(original)))
+        assert len(buckets) == near_dup.BANDS
+        assert buckets & set(near_dup.band_buckets(near_dup.signature(repost)))
+        assert not buckets & set(near_dup.band_buckets(near_dup.signature(other)))
+
+    def test_bucket_fits_bigint(self):
+        for _, bucket in near_dup.band_buckets(near_dup.signature(_posting(6))):
+            assert -(2 ** 63) <= bucket < 2 ** 63
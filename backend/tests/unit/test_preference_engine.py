@@ -0,0 +1,44 @@
+"""Unit tests for the ELO + vector spread update (no DB, no embedding model)."""
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services.embedding_index import job_index
+from app.services.preference_engine import record_preference
+
+
+class _FakeSession:
+    def flush(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _clean_index():
+    job_index.reset()
+    yield
+    job_index.reset()
+
+
+def _job(score=None):
+    return SimpleNamespace(id=uuid4(), preference_score=score)
+
+
+class TestRecordPreference:
+    def test_direct_and_spread_updates(self):
+        winner, loser, like_winner, like_loser, unembedded = (_job() for _ in range(5))
+        job_index.upsert([
+            (winner.id, [1.0, 0.0]),
+            (loser.id, [0.0, 1.0]),
+            (like_winner.id, [0.9, 0.1]),
+            (like_loser.id, [0.1, 0.9]),
+        ])
+        jobs = [winner, loser, like_winner, like_loser, unembedded]
+
+        record_preference(winner, loser, jobs, _FakeSession())
+
+        assert winner.preference_score == pytest.approx(1016.0)
+        assert loser.preference_score == pytest.approx(984.0)
+        assert like_winner.preference_score > 1000.0
+        assert like_loser.preference_score < 1000.0
+        assert unembedded.preference_score is None
@@ -0,0 +1,82 @@
+"""Unit tests for the local requirements extractor and the reduced LLM parse (no network calls)."""
+import pytest
+
+from app.services import job_parser
+from app.services.prompts import PARSE_FIELDS
+from app.services.requirements_extractor import extract_requirements
+
+POSTING = """
+We build payment rails for small businesses.
+Requirements:
+- 6+ years of professional software engineering experience.
+- Python, PostgreSQL, Kafka and Kubernetes in production.
+Bachelor's degree in Computer Science or equivalent.
+This is a fully remote role. Candidates must be authorized to work in the U.S. and we are unable to sponsor visas.
+"""
+
+
+class TestExtractRequirements:
+    def test_confident_fields(self):
+        result = extract_requirements(POSTING, "Senior Backend Engineer", "Remote (US)")
+        assert set(result) == set(PARSE_FIELDS)
+        assert "6+ years" in result["experience_requirements"].value
+        assert result["experience_requirements"].value.startswith("Seniority: Senior.")
+        assert "unable to sponsor" in result["sponsorship_requirements"].value
+        assert "fully remote" in result["work_location_requirements"].value
+        assert "Bachelor's degree" in result["education_requirements"].value
+        assert result["expertise_requirements"].value == "Python, PostgreSQL, Kafka, Kubernetes"
+        for field in ("experience_requirements", "sponsorship_requirements", "education_requirements"):
+            assert result[field].confidence >= 0.8
+
+    def test_unmentioned_topics_are_confidently_empty(self):
+        result = extract_requirements("Friendly team building marketing sites in React.")
+        assert result["sponsorship_requirements"].value is None
+        assert result["sponsorship_requirements"].confidence >= 0.8
+        assert result["education_requirements"].value is None
+
+    def test_summary_always_left_to_llm(self):
+        assert extract_requirements(POSTING)["about_summary"].confidence == 0.0
+
+    def test_initialisms_do_not_split_sentences(self):
+        result = extract_requirements("Must be a U.S. citizen and able to obtain a clearance.")
+        assert result["sponsorship_requirements"].value == "Must be a U.S. citizen and able to obtain a clearance."
+
+
+class TestParseOnlyMissingFields:
+    def test_llm_asked_only_for_low_confidence_fields(self, monkeypatch):
+        sent = {}
+
+        def fake_chat(messages, template="unknown"):
+            sent["system"] = messages[0]["content"]
+            return {"about_summary": "Payments platform role.", "business_cultural_requirements": ""}
+
+        monkeypatch.setattr(job_parser, "claude_chat_json", fake_chat)
+        parsed = job_parser.parse_job_description(POSTING, "Senior Backend Engineer", "Acme", "Remote (US)")
+
+        assert '"about_summary"' in sent["system"]
+        assert '"sponsorship_requirements"' not in sent["system"]
+        assert parsed["about_summary"] == "Payments platform role."
+        assert parsed["business_cultural_requirements"] is None
+        assert "unable to sponsor" in parsed["sponsorship_requirements"]
+        assert "sponsorship_requirements" in parsed["_extraction"]["local"]
+        assert "about_summary" in parsed["_extraction"]["llm"]
+
+    def test_threshold_above_one_sends_everything(self, monkeypatch):
+        from app.core import config
+
+        monkeypatch.setattr(config.settings, "PARSE_LOCAL_MIN_CONFIDENCE", 1.1)
+        monkeypatch.setattr(job_parser, "claude_chat_json", lambda messages, template="unknown": {})
+        parsed = job_parser.parse_job_description(POSTING)
+        assert parsed["_extraction"]["llm"] == PARSE_FIELDS
+
+    def test_llm_failure_keeps_local_fields(self, monkeypatch):
+        from app.services.llm import LLMError
+
+        def failing(messages, template="unknown"):
+            raise LLMError("down")
+
+        monkeypatch.setattr(job_parser, "claude_chat_json", failing)
+        parsed = job_parser.parse_job_description(POSTING, location="Remote (US)")
+        assert parsed["_error"] == "down"
+        assert parsed["about_summary"] is None
+        assert parsed["education_requirements"]
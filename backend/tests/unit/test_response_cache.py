@@ -0,0 +1,58 @@
+"""Unit tests for the versioned response cache LRU."""
+from app.services import response_cache
+from app.services.response_cache import CachedBody, ResponseCache
+
+
+def _body(n: int) -> CachedBody:
+    return CachedBody(b"x" * n, "application/json")
+
+
+class TestResponseCache:
+    def test_hit_and_miss_counted(self):
+        cache = ResponseCache(max_entries=4, max_bytes=1000)
+        assert cache.get("a") is None
+        cache.put("a", _body(10))
+        assert cache.get("a").body == b"x" * 10
+        assert cache.stats() == {"entries": 1, "bytes": 10, "hits": 1, "misses": 1}
+
+    def test_evicts_least_recently_used_entry(self):
+        cache = ResponseCache(max_entries=2, max_bytes=1000)
+        cache.put("a", _body(1))
+        cache.put("b", _body(1))
+        cache.get("a")
+        cache.put("c", _body(1))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+
+    def test_byte_bound(self):
+        cache = ResponseCache(max_entries=10, max_bytes=100)
+        cache.put("a", _body(60))
+        cache.put("b", _body(60))
+        assert len(cache) == 1 and cache.get("b") is not None
+        cache.put("huge", _body(101))
+        assert cache.get("huge") is None
+
+    def test_replacing_a_key_keeps_byte_count(self):
+        cache = ResponseCache(max_entries=10, max_bytes=100)
+        cache.put("a", _body(50))
+        cache.put("a", _body(20))
+        assert cache.stats()["bytes"] == 20
+
+    def test_zero_entries_disables_storage(self):
+        cache = ResponseCache(max_entries=0, max_bytes=100)
+        cache.put("a", _body(1))
+        assert len(cache) == 0
+
+
+class TestReleaseId:
+    def test_app_version_wins(self, monkeypatch):
+        monkeypatch.setattr(response_cache, "_RELEASE", None)
+        monkeypatch.setattr(response_cache.settings, "APP_VERSION", "2026.10.20")
+        assert response_cache.release_id() == "2026.10.20"
+
+    def test_source_digest_is_stable(self, monkeypatch):
+        monkeypatch.setattr(response_cache.settings, "APP_VERSION", "")
+        monkeypatch.setattr(response_cache, "_RELEASE", None)
+        first = response_cache.release_id()
+        monkeypatch.setattr(response_cache, "_RELEASE", None)
+        assert response_cache.release_id() == first and len(first) == 16
@@ -0,0 +1,29 @@
+"""Unit tests for the resume artifact helpers (no DB)."""
+from app.services import resume_cache
+from app.services.prompts import build_batch_sort_messages, resume_prompt_prefix
+
+
+class TestCompact:
+    def test_collapses_spaces_and_repeated_lines(self):
+        text = "  Jane Doe \n\n\n\tPython  developer\nPython developer\n\nSQL  "
+        assert resume_cache.compact(text, 1000) == "Jane Doe\nPython developer\nSQL"
+
+    def test_cuts_at_line_end(self):
+        text = "\n".join(f"line {i:02d}" for i in range(20))
+        out = resume_cache.compact(text, 40)
+        assert out == "line 00\nline 01\nline 02\nline 03\nline 04"
+        assert len(out) <= 40
+
+    def test_cuts_mid_line_when_no_break_is_close(self):
+        assert resume_cache.compact("short\n" + "x" * 100, 50) == "short\n" + "x" * 44
+
+
+def test_content_hash_is_sha256_hex():
+    assert resume_cache.content_hash("abc") == "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
+
+
+def test_sort_batches_share_prefix():
+    prefix = resume_prompt_prefix("Jane Doe\nPython developer")
+    first = build_batch_sort_messages(prefix, [{"job_id": "a"}])[1]["content"]
+    second = build_batch_sort_messages(prefix, [{"job_id": "b"}])[1]["content"]
+    assert first.startswith(prefix) and second.startswith(prefix)
@@ -0,0 +1,52 @@
+"""Unit tests for run event SSE framing and stream control (DB reads patched out)."""
+import uuid
+
+from app.core.config import settings
+from app.services import run_events
+from app.services.llm_flow import Wait
+
+
+def test_sse_frame():
+    frame = run_events.sse_frame(3, "job", {"job_id": "a", "score": 80})
+    assert frame == 'id: 3\nevent: job\ndata: {"job_id":"a","score":80}\n\n'
+
+
+def test_last_event_id():
+    assert run_events.last_event_id(None) == 0
+    assert run_events.last_event_id("") == 0
+    assert run_events.last_event_id("7") == 7
+    assert run_events.last_event_id("-2") == 0
+    assert run_events.last_event_id("junk") == 0
+
+
+def _scripted_poll(monkeypatch, batches):
+    calls = []
+
+    def poll(run_id, after):
+        calls.append(after)
+        frames, last, finished = batches.pop(0) if batches else ("", after, False)
+        return frames, last, finished
+
+    monkeypatch.setattr(run_events, "poll", poll)
+    return calls
+
+
+def test_follow_resumes_after_id_and_stops_at_done(monkeypatch):
+    calls = _scripted_poll(monkeypatch, [("a", 5, False), ("", 5, False), ("b", 6, True)])
+    chunks = list(run_events.follow_steps(uuid.uuid4(), 4))
+    texts = [c for c in chunks if not isinstance(c, Wait)]
+    assert texts == [f"retry: {run_events.RETRY_MS}\n\n", "a", "b"]
+    assert calls == [4, 5, 5]
+
+
+def test_follow_keepalive_then_lost(monkeypatch):
+    _scripted_poll(monkeypatch, [])
+    monkeypatch.setattr(run_events, "KEEPALIVE_S", 0)
+    monkeypatch.setattr(settings, "JOB_LEASE_SECONDS", 3600)
+    steps = run_events.follow_steps(uuid.uuid4(), 0)
+    assert next(steps).startswith("retry:")
+    assert next(steps) == ": keepalive\n\n"
+
+    monkeypatch.setattr(settings, "JOB_LEASE_SECONDS", 0)
+    chunks = [c for c in steps if not isinstance(c, Wait)]
+    assert chunks[-1] == "event: lost\ndata: {}\n\n"
@@ -0,0 +1,18 @@
+"""Unit tests for search cursors (no DB)."""
+import uuid
+
+import pytest
+
+from app.services.search import decode_cursor, encode_cursor
+
+
+class TestSearchCursor:
+    def test_round_trip_is_exact(self):
+        job_id = uuid.uuid4()
+        rank = 0.1 + 0.2  # not representable in float4
+        assert decode_cursor(encode_cursor(rank, job_id)) == (rank, job_id)
+
+    @pytest.mark.parametrize("token", ["", "not-base64!", "WzEsMl0", "WyJ4IiwieSJd"])
+    def test_malformed(self, token):
+        with pytest.raises(ValueError):
+            decode_cursor(token)
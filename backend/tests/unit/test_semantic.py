@@ -0,0 +1,58 @@
+"""Unit tests for semantic search helpers (no DB, no embedding model)."""
+from uuid import uuid4
+
+import pytest
+
+from app.services import semantic
+from app.services.embedding_index import job_index
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    job_index.reset()
+    semantic.clear_query_cache()
+    yield
+    job_index.reset()
+    semantic.clear_query_cache()
+
+
+class TestEmbedQuery:
+    def test_memoised_by_normalised_text(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(semantic, "get_embedding", lambda q: calls.append(q) or [1.0, 0.0])
+        assert semantic.embed_query("Remote  Rust") == [1.0, 0.0]
+        assert semantic.embed_query("remote rust") == [1.0, 0.0]
+        assert calls == ["Remote  Rust"]
+
+    def test_lru_bound(self, monkeypatch):
+        monkeypatch.setattr(semantic, "get_embedding", lambda q: [float(len(q))])
+        monkeypatch.setattr(semantic.settings, "SEMANTIC_QUERY_CACHE", 2)
+        for q in ("a", "bb", "ccc"):
+            semantic.embed_query(q)
+        assert len(semantic._QUERY_VECS) == 2
+
+
+class TestSearch:
+    def test_min_similarity_and_exclude(self):
+        ids = [uuid4() for _ in range(3)]
+        job_index.upsert(zip(ids, [[1, 0], [0.6, 0.8], [0, 1]]))
+        hits = semantic.search([1, 0], k=3, min_similarity=0.5)
+        assert [job_id for job_id, _ in hits] == ids[:2]
+        hits = semantic.search([1, 0], k=3, exclude=[ids[0]])
+        assert ids[0] not in [job_id for job_id, _ in hits]
+
+    def test_hits_for_deleted_jobs_are_forgotten(self):
+        ids = [uuid4() for _ in range(2)]
+        job_index.upsert(zip(ids, [[1, 0], [0, 1]]))
+        semantic.forget_deleted(ids, found=[ids[1]])
+        assert ids[0] not in job_index and ids[1] in job_index
+
+
+class TestVectorOf:
+    def test_unindexed_job_is_embedded_without_storing(self, monkeypatch):
+        from app.models.job import Job
+
+        monkeypatch.setattr(semantic, "get_embeddings", lambda texts: [[0.0, 1.0] for _ in texts])
+        job = Job(id=uuid4(), title="Dev", company="Acme", raw_text="Role.")
+        assert list(semantic.vector_of(job)) == [0.0, 1.0]
+        assert job.id not in job_index and job.embedding is None
@@ -0,0 +1,59 @@
+"""Unit tests for the JSON provider and row serializers (no DB)."""
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from flask import Flask, jsonify
+
+from app.core import serialization
+from app.core.serialization import FastJSONProvider, dumps, row_serializer
+from app.models.job import JobStatus
+
+PAYLOAD = {
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "at": datetime(2026, 10, 19, 12, 30, 5, 123456, tzinfo=timezone.utc),
+    "status": JobStatus.analyzed,
+    "text": "café — ok",
+    "n": [1, 2.5, None, True],
+}
+EXPECTED = {
+    "id": "12345678-1234-5678-1234-567812345678",
+    "at": "2026-10-19T12:30:05.123456+00:00",
+    "status": "analyzed",
+    "text": "café — ok",
+    "n": [1, 2.5, None, True],
+}
+
+
+class TestDumps:
+    @pytest.mark.parametrize("provider", ["auto", "stdlib"])
+    def test_native_types_encode_the_same_on_both_backends(self, provider, monkeypatch):
+        monkeypatch.setattr(serialization.settings, "JSON_PROVIDER", provider)
+        assert json.loads(dumps(PAYLOAD)) == EXPECTED
+
+    def test_unknown_type_raises(self):
+        with pytest.raises(TypeError):
+            dumps({"x": object()})
+
+
+class TestRowSerializer:
+    def test_keys_in_order_and_transforms_skip_none(self):
+        serialize = row_serializer(["a", "b", "c"], {"b": lambda v: v * 2})
+        assert list(serialize((1, 2, 3))) == ["a", "b", "c"]
+        assert serialize((1, 2, 3)) == {"a": 1, "b": 4, "c": 3}
+        assert serialize((1, None, 3))["b"] is None
+
+    def test_transform_for_unknown_key_rejected(self):
+        with pytest.raises(ValueError):
+            row_serializer(["a"], {"b": str})
+
+
+class TestProvider:
+    def test_jsonify_uses_provider(self):
+        app = Flask(__name__)
+        app.json = FastJSONProvider(app)
+        with app.app_context():
+            resp = jsonify(PAYLOAD)
+        assert resp.mimetype == "application/json"
+        assert json.loads(resp.get_data()) == EXPECTED
@@ -0,0 +1,72 @@
+"""Unit tests for serving configuration (pool sizing, fork reset; no DB)."""
+from app.core.database import pool_settings
+
+
+class TestPoolSettings:
+    def test_workers_share_connection_budget(self):
+        sizes = pool_settings(workers=4, threads=4, max_connections=80)
+        assert sizes == {"pool_size": 4, "max_overflow": 16}
+        assert 4 * (sizes["pool_size"] + sizes["max_overflow"]) <= 80
+
+    def test_tight_budget_caps_pool_below_threads(self):
+        assert pool_settings(workers=8, threads=16, max_connections=40) == {"pool_size": 5, "max_overflow": 0}
+
+    def test_env_overrides_win(self, monkeypatch):
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", 2)
+        monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 1)
+        assert pool_settings(workers=4, threads=4, max_connections=80) == {"pool_size": 2, "max_overflow": 1}
+
+
+class TestResetAfterFork:
+    def test_drops_per_process_state(self):
+        from app.serving import reset_after_fork
+        from app.services.embedding_index import job_index
+        from app.services.response_cache import CachedBody, response_cache
+
+        job_index.upsert([("a", [1.0, 0.0])])
+        response_cache.put("k", CachedBody(b"{}", "application/json"))
+        reset_after_fork()
+        assert len(job_index) == 0
+        assert len(response_cache) == 0
+
+
+class TestAsgiApp:
+    def _request(self, method, path, **kwargs):
+        import asyncio
+
+        import httpx
+
+        from app.asgi import app
+
+        async def call():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.request(method, path, headers={"Origin": "http://example.com"}, **kwargs)
+
+        return asyncio.run(call())
+
+    def test_flask_routes_pass_through(self):
+        r = self._request("GET", "/health")
+        assert r.status_code == 200 and r.json() == {"status": "healthy"}
+
+    def test_flow_route_response_goes_through_flask(self):
+        # Rejected before any DB access; the flow still runs in a request context and after_request hooks apply.
+        r = self._request("POST", "/api/v1/cull", json={"top_n": 0})
+        assert r.status_code == 422
+        assert r.json() == {"detail": "top_n must be between 1 and 50"}
+        assert r.headers["access-control-allow-origin"] == "http://example.com"
+
+    def test_admission_limit(self, monkeypatch):
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "ASYNC_MAX_REQUESTS", 0)
+        r = self._request("POST", "/api/v1/sort", json={})
+        assert r.status_code == 503
+        assert r.headers["retry-after"] == "5"
+
+    def test_runs_rejects_unknown_kind(self):
+        r = self._request("POST", "/api/v1/runs", json={"kind": "rank"})
+        assert r.status_code == 422
+        assert r.json() == {"detail": "kind must be one of: sort, parse, cull"}
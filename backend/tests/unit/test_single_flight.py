@@ -0,0 +1,48 @@
+"""Unit tests for in-process single-flight coalescing."""
+import threading
+
+from app.services.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    def test_first_caller_owns_later_callers_wait(self):
+        sf = SingleFlight()
+        owned, waiting = sf.reserve(["a", "b"])
+        assert owned == ["a", "b"] and waiting == {}
+
+        owned2, waiting2 = sf.reserve(["b", "c"])
+        assert owned2 == ["c"]
+        assert set(waiting2) == {"b"}
+        assert not waiting2["b"].done()
+
+        sf.release(["b"], result="done")
+        assert waiting2["b"].result(timeout=1) == "done"
+
+    def test_released_key_can_be_reserved_again(self):
+        sf = SingleFlight()
+        sf.reserve(["a"])
+        sf.release(["a"])
+        owned, waiting = sf.reserve(["a"])
+        assert owned == ["a"] and waiting == {}
+
+    def test_duplicate_keys_in_one_call(self):
+        sf = SingleFlight()
+        owned, waiting = sf.reserve(["a", "a"])
+        assert owned == ["a"] and waiting == {}
+
+    def test_concurrent_reserve_has_exactly_one_owner(self):
+        sf = SingleFlight()
+        barrier = threading.Barrier(8)
+        owners = []
+
+        def worker():
+            barrier.wait()
+            owned, _ = sf.reserve(["job"])
+            owners.extend(owned)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert owners == ["job"]
@@ -6,6 +6,9 @@ const resumeFile = document.getElementById("resumeFile");
 const uploadResumeBtn = document.getElementById("uploadResumeBtn");
 const resumeStatus = document.getElementById("resumeStatus");
 const analyzedOnlyToggle = document.getElementById("analyzedOnly");
+const searchInput = document.getElementById("searchInput");
+const workModeFilter = document.getElementById("workModeFilter");
+const sponsorshipFilter = document.getElementById("sponsorshipFilter");
 const toast = document.getElementById("toast");
 const jobList = document.getElementById("jobList");
 const jobCount = document.getElementById("jobCount");
@@ -138,17 +141,50 @@ async function loadJobs() {
     if (analyzedOnlyToggle.checked) {
       params.set("analyzed_only", "true");
     }
-    const response = await apiFetch(`/api/v1/jobs?${params.toString()}`);
-    state.jobs = await response.json();
+    const query = searchInput.value.trim();
+    if (query) {
+      params.set("q", query);
+      params.set("limit", "100");
+      const response = await apiFetch(`/api/v1/jobs/search?${params.toString()}`);
+      state.jobs = (await response.json()).results;
+    } else {
+      if (workModeFilter.value) {
+        params.set("work_mode", workModeFilter.value);
+      }
+      if (sponsorshipFilter.value) {
+        params.set("sponsorship", sponsorshipFilter.value);
+      }
+      const [response, facetResponse] = await Promise.all([
+        apiFetch(`/api/v1/jobs?${params.toString()}`),
+        apiFetch(`/api/v1/jobs/facets?${params.toString()}`),
+      ]);
+      state.jobs = await response.json();
+      renderFacetCounts(await facetResponse.json());
+    }
     renderJobs();
   } catch (error) {
     setToast(error.message, "error");
   }
 }
 
+function renderFacetCounts(counts) {
+  const label = (option, count) => {
+    option.dataset.label = option.dataset.label || option.textContent;
+    option.textContent = count === undefined ? option.dataset.label : `${option.dataset.label} (${count})`;
+  };
+  for (const option of workModeFilter.options) {
+    label(option, option.value ? counts.work_mode[option.value] : undefined);
+  }
+  for (const option of sponsorshipFilter.options) {
+    label(option, option.value ? counts.sponsorship[option.value] : undefined);
+  }
+}
+
 function renderJobs() {
   if (!state.jobs.length) {
-    jobList.innerHTML = `<div class="job-card">No jobs yet. Capture one via the extension.</div>`;
+    jobList.innerHTML = searchInput.value.trim() || workModeFilter.value || sponsorshipFilter.value
+      ? `<div class="job-card">No jobs match this search.</div>`
+      : `<div class="job-card">No jobs yet. Capture one via the extension.</div>`;
     jobCount.textContent = "0 jobs";
     return;
   }
@@ -159,7 +195,8 @@ function renderJobs() {
       const score = typeof job.score === "number" ? `${Math.round(job.score)}%` : "—";
       const rank = state.rankMap[job.id];
       const rankBadge = rank ? `<span class="tag accent">#${rank}</span>` : "";
-      const title = job.title || "Untitled role";
+      const title = job.title_headline ? highlightHtml(job.title_headline) : escapeHtml(job.title || "Untitled role");
+      const snippet = job.headline ? `<p class="job-snippet">${highlightHtml(job.headline)}</p>` : "";
       const meta = [job.company, job.location].filter(Boolean).join(" · ") || "Unknown source";
       const sourceLink = job.url
         ? `<a class="tag tag-link" href="${escapeHtml(job.url)}" target="_blank" rel="noreferrer">Source</a>`
@@ -171,8 +208,9 @@ function renderJobs() {
         <article class="job-card" data-id="${job.id}">
           <header>
             <div>
-              <h3>${escapeHtml(title)}</h3>
+              <h3>${title}</h3>
               <div class="job-meta">${escapeHtml(meta)}</div>
+              ${snippet}
             </div>
             <label class="job-checkbox">
               <input type="checkbox" class="select-job" data-id="${job.id}" />
@@ -196,22 +234,56 @@ function renderJobs() {
 }
 
 async function sortJobs() {
+  // Runs in the background; scores fill in as each batch is committed (GET /runs/<id>/events).
   try {
-    const response = await apiFetch("/api/v1/sort", {
+    const response = await apiFetch("/api/v1/runs", {
       method: "POST",
-      body: JSON.stringify({}),
+      body: JSON.stringify({ kind: "sort" }),
     });
-    const result = await response.json();
-    setToast(result.message || `Sorted ${result.sorted_count} job(s).`, "success");
-    await loadJobs();
+    const run = await response.json();
+    followRun(run.events_url, "Sorted");
   } catch (error) {
     setToast(error.message, "error");
   }
 }
 
+function followRun(eventsUrl, verb) {
+  const source = new EventSource(`${apiBase()}${eventsUrl}`);
+  let total = 0;
+  let done = 0;
+
+  source.addEventListener("queued", (event) => {
+    total = JSON.parse(event.data).job_count;
+    setToast(`${verb} 0 of ${total}…`, "success");
+  });
+  source.addEventListener("job", (event) => {
+    const data = JSON.parse(event.data);
+    done += 1;
+    const job = state.jobs.find((item) => item.id === data.job_id);
+    if (job && typeof data.score === "number") {
+      job.score = data.score;
+      renderJobs();
+    }
+    setToast(`${verb} ${done} of ${total || "?"}…`, "success");
+  });
+  source.addEventListener("done", async (event) => {
+    source.close();
+    const { status, body } = JSON.parse(event.data);
+    const message = (body && (body.message || body.detail)) || `${verb} ${done} job(s).`;
+    setToast(message, status < 400 ? "success" : "error");
+    await loadJobs();
+  });
+  source.addEventListener("lost", () => {
+    source.close();
+    setToast("Lost track of the run; reloading jobs.", "error");
+    loadJobs();
+  });
+}
+
 async function rankJobs() {
   try {
-    const response = await apiFetch("/api/v1/rank");
+    // Badges only matter for the jobs on screen; the top 500 covers the job list.
+    const response = await apiFetch("/api/v1/rank?limit=500&with_total=1");
     const result = await response.json();
     if (result.ranked && result.ranked.length) {
       state.rankMap = {};
@@ -220,7 +292,7 @@ async function rankJobs() {
       });
       const top = result.ranked[0];
       setToast(
-        `Ranked ${result.ranked.length} jobs. #1: ${top.title || "Untitled"} @ ${top.company || "?"}`,
+        `Ranked ${result.total ?? result.ranked.length} jobs. #1: ${top.title || "Untitled"} @ ${top.company || "?"}`,
         "success"
       );
       renderJobs();
@@ -368,6 +440,11 @@ function escapeHtml(text) {
   return div.innerHTML;
 }
 
+// Search headlines wrap matches in <mark>; escape everything else.
+function highlightHtml(text) {
+  return escapeHtml(text).replace(/&lt;(\/?)mark&gt;/g, "<$1mark>");
+}
+
 function showDetailModalPlaceholder() {
   state.currentJobId = null;
   detailTitle.textContent = "Job details";
@@ -464,8 +541,13 @@ async function deleteSelected() {
   if (!ids.length) return;
   if (!window.confirm(`Delete ${ids.length} selected job${ids.length === 1 ? "" : "s"}? This cannot be undone.`)) return;
   try {
-    await Promise.all(ids.map((id) => apiFetch(`/api/v1/jobs/${id}`, { method: "DELETE" })));
-    setToast(`Deleted ${ids.length} job${ids.length === 1 ? "" : "s"}.`, "success");
+    const response = await apiFetch("/api/v1/jobs", {
+      method: "DELETE",
+      body: JSON.stringify({ job_ids: ids }),
+    });
+    const result = await response.json();
+    const count = result.deleted_count;
+    setToast(`Deleted ${count} job${count === 1 ? "" : "s"}.`, "success");
     await loadJobs();
   } catch (error) {
     setToast(error.message, "error");
@@ -490,6 +572,13 @@ cullAllBtn.addEventListener("click", rankJobs);
 deleteSelectedBtn.addEventListener("click", deleteSelected);
 
 analyzedOnlyToggle.addEventListener("change", loadJobs);
+workModeFilter.addEventListener("change", loadJobs);
+sponsorshipFilter.addEventListener("change", loadJobs);
+let searchTimer = null;
+searchInput.addEventListener("input", () => {
+  clearTimeout(searchTimer);
+  searchTimer = setTimeout(loadJobs, 250);
+});
 refreshBtn.addEventListener("click", async () => {
   const originalText = refreshBtn.textContent;
   refreshBtn.textContent = "Refreshing…";